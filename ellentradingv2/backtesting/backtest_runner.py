@@ -1,12 +1,16 @@
 from collections import defaultdict
 from datetime import datetime
 from core.models.symbol import Symbol
-from backtesting.models import HistoricalMarketDataPoint
+from backtesting.bar_columns import OHLCV_COLUMNS, load_candle_columns
 from strategies.models import OpenStrategy
 from risk.risk_manager import RiskManager
 from django.utils.timezone import timedelta
 from collections import Counter
-from strategies.base.factory import get_entry_strategy
+from strategies.base.bar_window import BarWindow
+from strategies.base.vectorized import vectorized_decisions
+from backtesting.strategies.adapter import build_backtest_strategy
+from backtesting.signal_tape import SignalTape, strategy_version_hash
+from signals.recent_index import RecentSignalIndex
 
 class BacktestRunner:
     def __init__(self, symbol: Symbol, initial_balance: float, strategies: list[OpenStrategy], start_date: datetime, end_date: datetime):
@@ -44,67 +48,99 @@ class BacktestRunner:
 
         return False
 
-    def run(self):
+    def build_strategies(self, strategy_list):
+        """Estrategias en vivo (las mismas que corre el runner) por id de OpenStrategy."""
+        strategies = {}
+        for strategy_instance in strategy_list:
+            try:
+                strategies[strategy_instance.id] = build_backtest_strategy(strategy_instance)
+            except ValueError as e:
+                print(f"⚠️ {e}")
+        return strategies
+
+    def evaluate_strategies(self, strategies, window, current_candle, precomputed=None):
+        """
+        Evalúa las estrategias (evaluate(), sin DB) sobre la ventana y devuelve las señales de la vela actual.
+        precomputed: {strategy_id: {índice: StrategyDecision}} de las estrategias vectorizadas.
+        Las decisiones (precomputadas o no) pasan por is_duplicate_signal contra el
+        signal_index de la corrida, como en vivo.
+        """
+        current_time = current_candle.timestamp
+        signals_this_bar = []
+        precomputed = precomputed or {}
+
+        for strategy_id, strategy in strategies.items():
+            if len(window) < strategy.required_bars:
+                continue
+
+            if strategy_id in precomputed:
+                decision = precomputed[strategy_id].get(len(window) - 1)
+            else:
+                decision = strategy.evaluate(window[-strategy.required_bars:], self.symbol)
+            if decision and strategy.is_duplicate_signal(self.symbol, decision.signal_type, execution_mode="backtest"):
+                continue
+            if decision:
+                strategy.signal_index.record(self.symbol, strategy.strategy_instance, decision.signal_type)
+                print(f"✅ Señal generada por {strategy.strategy_instance.name} @ {current_time} → {decision.signal_type}")
+                signal = decision.to_signal(self.symbol)
+                signal.timestamp = current_time
+                signal.market_data = current_candle
+                signal.is_from_backtest = True
+                signals_this_bar.append(signal)
+
+        return signals_this_bar
+
+    def run(self, use_tape=True):
         strategies_by_timeframe = defaultdict(list)
         for strat in self.strategies:
             strategies_by_timeframe[strat.timeframe].append(strat)
 
-        for timeframe, strategy_list in strategies_by_timeframe.items():
-            candles = HistoricalMarketDataPoint.objects.select_related("indicators").filter(
-                symbol=self.symbol.symbol,
-                timeframe=timeframe,
-                timestamp__range=(self.start_date, self.end_date)
-            ).order_by("timestamp")
-
-            print(f"📊 Cargando {len(candles)} velas para {self.symbol.symbol} en timeframe {timeframe}")
-
-            for i in range(len(candles)):
-                window = candles[:i + 1]
-                if not window:
-                    continue
+        # Un solo RiskManager por corrida: el contexto (config / condiciones) no cambia entre velas
+        rm = RiskManager(self.symbol.symbol, execution_mode="backtest", capital=self.initial_balance)
 
-                current_candle = window[-1]
+        for timeframe, strategy_list in strategies_by_timeframe.items():
+            version = strategy_version_hash(strategy_list)
+            tape = SignalTape.load(self.symbol.symbol, timeframe, version, self.start_date, self.end_date) if use_tape else None
+            if tape is not None:
+                print(f"📼 Reproduciendo signal tape {version} ({len(tape)} señales), sin evaluar estrategias")
+                taped_signals = tape.signals_by_timestamp({s.id: s for s in strategy_list}, self.symbol)
+            else:
+                taped_signals = None
+                tape = SignalTape(self.symbol.symbol, timeframe, version, self.start_date, self.end_date)
+
+            strategies = self.build_strategies(strategy_list) if taped_signals is None else {}
+            # Deduplicación como en vivo, pero en memoria y con el reloj de la vela
+            signal_index = RecentSignalIndex(use_db=False)
+            for strategy in strategies.values():
+                strategy.signal_index = signal_index
+            indicators = {name for strategy in strategies.values() for name in strategy.REQUIRED_INDICATORS}
+            # BarStore columnar si cubre el rango y está al día con la DB, si no una sola query
+            columns = load_candle_columns(self.symbol.symbol, timeframe, self.start_date, self.end_date, indicators)
+            bars = BarWindow(columns, indicators=[name for name in columns if name != "time" and name not in OHLCV_COLUMNS])
+            print(f"📊 Cargando {len(bars)} velas para {self.symbol.symbol} en timeframe {timeframe}")
+            precomputed = {
+                strategy_id: dict(vectorized_decisions(strategy, bars, strategy.required_bars - 1))
+                for strategy_id, strategy in strategies.items()
+                if strategy.generate_signals_vectorized is not None
+            }
+
+            for i in range(len(bars)):
+                current_candle = bars[i]
                 current_time = current_candle.timestamp
-                signals_this_bar = []
-
-                for strategy_instance in strategy_list:
-                    strategy = get_entry_strategy(strategy_instance.name.lower().replace(" strategy", "").replace(" ", "_"))
 
-                    if not strategy:
-                        continue
-
-                    strategy.strategy_instance = strategy_instance
-                    strategy.timeframe = strategy_instance.timeframe
-                    strategy.required_bars = strategy_instance.required_bars
-
-                    if len(window) < strategy.required_bars:
-                        continue
-
-                    signal = strategy.should_generate_signal(
-                        self.symbol,
-                        execution_mode="backtest",
-                        candles=window
-                    )
-                    if signal:
-                        print(f"✅ Señal generada por {strategy_instance.name} @ {current_time} → {signal.signal}")
-                        signal.timestamp = current_time
-                        signal.market_data = current_candle
-                        signal.strategy = strategy_instance
-                        signal.timeframe = strategy_instance.timeframe
-                        signal.is_from_backtest = True
-
-                        # 🔥 Inyectar .symbol como si fuera una relación real
-                        from types import SimpleNamespace
-
-                        from core.models.symbol import Symbol
-                        signal.symbol = Symbol.objects.get(symbol=current_candle.symbol)
+                if taped_signals is not None:
+                    signals_this_bar = taped_signals.get(current_time, [])
+                else:
+                    signal_index.as_of = current_time
+                    signals_this_bar = self.evaluate_strategies(strategies, bars[:i + 1], current_candle, precomputed)
+                    for signal in signals_this_bar:
+                        tape.record(signal)
 
                 if signals_this_bar:
                     self.signals.extend(signals_this_bar)
 
                     # ✅ RiskManager sobre todas las señales actuales
-                    rm = RiskManager(self.symbol.symbol, execution_mode="backtest", capital=self.initial_balance)
-                    rm.signals = [
+                    active_signals = [
                         s for s in self.signals
                         if s.symbol.symbol == self.symbol.symbol and
                            s.timeframe == timeframe and
@@ -112,9 +148,12 @@ class BacktestRunner:
                            s.timestamp <= current_time
                     ]
 
-                    trade = rm.analyze_and_execute(price=current_candle.close, current_time=current_time)
+                    rm.capital = self.initial_balance
+                    trade = rm.analyze_and_execute(
+                        price=current_candle.close, current_time=current_time, signals=active_signals
+                    )
                     if trade:
-                        future_candles = candles[i + 1:]
+                        future_candles = bars[i + 1:]
                         from backtesting.strategies.backtest_watcher import BacktestWatcher
                         watcher = BacktestWatcher(trade, future_candles)
                         result = watcher.simulate()
@@ -128,6 +167,9 @@ class BacktestRunner:
                         self.initial_balance += trade.pnl
                         self.trades.append(trade)
 
+            if taped_signals is None and use_tape:
+                tape.save()
+
         reasons = Counter()
         for trade in self.trades:
             reason = getattr(trade, "notes", "Unknown")
@@ -0,0 +1,67 @@
+# backtesting/bar_columns.py
+
+"""
+Velas + indicadores de backtesting (HistoricalMarketDataPoint / TechnicalIndicator)
+en columnas NumPy, para BacktestRunner.
+
+Usa el mismo BarStore columnar que backtestingV2, en su propio directorio
+(<BAR_STORE_DIR>/backtesting/<SYMBOL>/<timeframe>/, se llena con
+`barstore_import --source backtesting`). Si el store no cubre el rango o su
+data_version ya no coincide con la DB, una sola query values_list.
+"""
+
+import numpy as np
+
+from backtesting.models import HistoricalMarketDataPoint, TechnicalIndicator
+from backtesting.signal_tape import data_version
+from backtestingV2.utils.bar_store import BarStore, get_store_dir
+from core.utils.time import to_epoch_ns
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+INDICATOR_COLUMNS = [
+    f.name for f in TechnicalIndicator._meta.fields
+    if f.name not in ("id", "market_data", "created_at")
+]
+STORE_NAMESPACE = "backtesting"
+
+
+def get_bar_store(symbol: str, timeframe: str) -> BarStore:
+    return BarStore(symbol, timeframe, root=get_store_dir() / STORE_NAMESPACE)
+
+
+def partition_data_version(symbol: str, timeframe: str, start, end) -> dict:
+    return data_version(symbol, [timeframe], start, end)
+
+
+def load_candle_columns(symbol: str, timeframe: str, start, end, indicators=None, use_store=True) -> dict:
+    """
+    OHLCV + indicadores de (symbol, timeframe, [start, end]) como columnas NumPy
+    ('time' en epoch ns UTC, indicadores ausentes como NaN). Indicadores que no
+    existen en TechnicalIndicator se ignoran (las estrategias los leen como None).
+    """
+    indicators = INDICATOR_COLUMNS if indicators is None else [n for n in indicators if n in INDICATOR_COLUMNS]
+
+    if use_store:
+        store = get_bar_store(symbol, timeframe)
+        wanted = [*OHLCV_COLUMNS, *indicators]
+        if store.covers(start, end) and all(name in store.meta["columns"] for name in wanted):
+            if store.covers(start, end, data_version=partition_data_version(symbol, timeframe, *store.synced_range())):
+                return store.read(start, end, columns=wanted)
+            print(f"♻️ BarStore {symbol} [{timeframe}] desactualizado respecto de la DB: se lee de la DB")
+
+    fields = ["timestamp", *OHLCV_COLUMNS, *[f"indicators__{name}" for name in indicators]]
+    rows = list(
+        HistoricalMarketDataPoint.objects.filter(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamp__range=(start, end)
+        ).order_by("timestamp").values_list(*fields)
+    )
+
+    n = len(rows)
+    columns = {"time": np.fromiter((to_epoch_ns(r[0]) for r in rows), dtype=np.int64, count=n)}
+    for offset, name in enumerate([*OHLCV_COLUMNS, *indicators], start=1):
+        columns[name] = np.fromiter(
+            (np.nan if r[offset] is None else r[offset] for r in rows), dtype=np.float64, count=n
+        )
+    return columns
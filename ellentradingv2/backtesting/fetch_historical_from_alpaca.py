@@ -1,5 +1,5 @@
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 from django.db import transaction
 from alpaca.data.historical import StockHistoricalDataClient
@@ -41,7 +41,10 @@ def fetch_block(symbol: str, tf_str: str, timeframe, start_date: datetime, end_d
         print("⚠️ No se recibieron datos.")
         return
 
-    df = bars.df.reset_index()
+    save_block(bars.df.reset_index(), symbol, tf_str)
+
+
+def save_block(df: pd.DataFrame, symbol: str, tf_str: str):
     df["timestamp"] = pd.to_datetime(df["timestamp"])
     df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
 
@@ -59,7 +62,7 @@ def fetch_block(symbol: str, tf_str: str, timeframe, start_date: datetime, end_d
             continue
 
         nuevos.append(HistoricalMarketDataPoint(
-            symbol=row["symbol"],
+            symbol=symbol,
             timeframe=tf_str,
             timestamp=row["timestamp"],
             open=row["open"],
@@ -77,13 +80,28 @@ def fetch_block(symbol: str, tf_str: str, timeframe, start_date: datetime, end_d
     else:
         print(f"✅ No había nuevas velas para {symbol} [{tf_str}].")
 
+TIMEFRAME_SECONDS = {
+    "1h": 3600,
+    "15m": 900,
+    "5m": 300,
+}
+
+
 def run():
-    current_end = END_DATE
-    while current_end > MIN_DATE:
-        current_start = current_end - timedelta(days=90)
-        for tf_str, timeframe in TIMEFRAMES.items():
-            fetch_block(SYMBOL, tf_str, timeframe, current_start, current_end)
-        current_end = current_start  # move to next block back in time
+    """
+    Backfill concurrente y reanudable (chunks en paralelo bajo el rate limit de
+    Alpaca, checkpoint por rango). Ver backtestingV2/utils/fetcher.py.
+    """
+    from backtestingV2.utils.fetcher import AlpacaStockFetcher
+
+    fetcher = AlpacaStockFetcher(API_KEY, API_SECRET)
+    for tf_str, seconds in TIMEFRAME_SECONDS.items():
+        fetcher.fetch_range(
+            SYMBOL, seconds, MIN_DATE, END_DATE,
+            on_chunk=lambda rows, tf_str=tf_str: save_block(
+                pd.DataFrame(rows).rename(columns={"time": "timestamp"}), SYMBOL, tf_str
+            )
+        )
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
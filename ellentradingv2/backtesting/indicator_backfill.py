@@ -0,0 +1,265 @@
+# backtesting/indicator_backfill.py
+
+"""
+Backfill de indicadores históricos (TechnicalIndicator) por partición (símbolo, timeframe).
+
+- Cada partición se procesa en orden (timestamp, id) con paginación keyset:
+  no hay count() ni OFFSET, cada página cuesta lo mismo.
+- Se calcula página por página, siempre desde la primera vela de la partición,
+  y el resultado es el mismo que un cálculo de una sola pasada (iter_computed):
+  · cada página lleva como prefijo las últimas `warmup` velas anteriores, así
+    los indicadores de ventana no se cortan en los bordes y las EMAs / Wilder
+    convergen (el error del arranque decae como (1-α)^warmup: con el default
+    ema_200 queda por debajo de la precisión de float64);
+  · obv / ad_line / vwap son acumulados desde la primera vela y supertrend
+    arrastra sus bandas finales sin límite: se continúan con el estado de la
+    página anterior en vez de reiniciarse en el prefijo;
+  · ichimoku_chikou mira LOOKAHEAD velas adelante: las últimas de cada página
+    se escriben junto con la siguiente, cuando ya se conocen esas velas.
+  Las páginas anteriores a la primera vela a escribir solo avanzan el estado
+  acumulado. La memoria queda acotada a warmup + page_size velas.
+- Cada página inserta sus velas sin indicadores con bulk_create; con --reindex
+  se upsertean todas las velas de la partición (sin borrar antes: una corrida
+  cortada deja los indicadores viejos, nunca la partición vacía).
+- Las particiones corren en un ProcessPoolExecutor.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from django.db import connections, transaction
+from django.db.models import Q
+
+from backtesting.models import HistoricalMarketDataPoint, TechnicalIndicator
+from strategies.indicators import kernels
+from strategies.indicators.registry import compute_indicators, required_warmup
+
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+INDICATOR_FIELDS = [
+    f.name for f in TechnicalIndicator._meta.fields
+    if f.name not in ("id", "market_data", "created_at")
+]
+DEFAULT_WARMUP = max(4000, required_warmup() * 20)  # EMAs / Wilder convergen a precisión de float64
+DEFAULT_PAGE_SIZE = 50_000
+DEFAULT_BATCH_SIZE = 5000
+FRAME_COLUMNS = ["id", "timestamp", *OHLCV_FIELDS]
+# Acumulados desde la primera vela de la partición (vwap se acumula aparte: close * volume / volume)
+CUMULATIVE_FIELDS = ["obv", "ad_line"]
+# Lo que hace falta calcular en las páginas anteriores a la primera vela a escribir (supertrend lee atr_14)
+CARRY_INPUTS = [*CUMULATIVE_FIELDS, "atr_14"]
+LOOKAHEAD = 26  # ichimoku_chikou = close 26 velas adelante
+
+
+def list_partitions(symbol=None, timeframe=None, only_missing=True) -> list:
+    """[(symbol, timeframe)] con velas (sin indicadores si only_missing)."""
+    qs = HistoricalMarketDataPoint.objects.all()
+    if only_missing:
+        qs = qs.filter(indicators__isnull=True)
+    if symbol:
+        qs = qs.filter(symbol=symbol)
+    if timeframe:
+        qs = qs.filter(timeframe=timeframe)
+    return list(qs.order_by("symbol", "timeframe").values_list("symbol", "timeframe").distinct())
+
+
+def iter_pages(symbol, timeframe, after=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Velas de la partición en orden (timestamp, id), de a page_size, desde el
+    cursor `after` = (timestamp, id) exclusivo. Cada página es (ids, timestamps, ohlcv).
+    """
+    base = HistoricalMarketDataPoint.objects.filter(symbol=symbol, timeframe=timeframe)
+    cursor = after
+    while True:
+        qs = base
+        if cursor is not None:
+            ts, pk = cursor
+            qs = qs.filter(Q(timestamp__gt=ts) | Q(timestamp=ts, id__gt=pk))
+        rows = list(qs.order_by("timestamp", "id").values_list("id", "timestamp", *OHLCV_FIELDS)[:page_size])
+        if not rows:
+            return
+        yield rows
+        cursor = (rows[-1][1], rows[-1][0])
+        if len(rows) < page_size:
+            return
+
+
+def _value(x):
+    if x is None:
+        return None
+    try:
+        return None if np.isnan(x) else float(x)
+    except TypeError:
+        return None
+
+
+def _write_indicators(ids, values, columns, reindex, batch_size) -> int:
+    written = 0
+    for lo in range(0, len(ids), batch_size):
+        hi = min(lo + batch_size, len(ids))
+        objs = [
+            TechnicalIndicator(market_data_id=ids[i], **{c: _value(values[c][i]) for c in columns})
+            for i in range(lo, hi)
+        ]
+        with transaction.atomic():
+            if reindex:
+                # created_at también: es la "última modificación" que mira data_version (signal tape / caché)
+                TechnicalIndicator.objects.bulk_create(
+                    objs, update_conflicts=True, unique_fields=["market_data"], update_fields=[*columns, "created_at"],
+                )
+                written += len(objs)
+            else:
+                written += len(TechnicalIndicator.objects.bulk_create(objs, ignore_conflicts=True))
+    return written
+
+
+class _CarriedState:
+    """Estado de obv / ad_line / vwap / supertrend al final de la última página calculada."""
+
+    def __init__(self):
+        self.last = None  # {columna: valor en la última vela}
+        self.price_volume = 0.0
+        self.volume = 0.0
+        self.supertrend = None  # estado de kernels.supertrend_with_state
+
+    def apply(self, computed, start):
+        """Reemplaza en `computed` (prefijo + página) los valores arrastrados de las filas desde `start`."""
+        for column in CUMULATIVE_FIELDS:
+            if column not in computed.columns:
+                continue
+            local = computed[column].to_numpy(dtype=np.float64)
+            if self.last is not None:
+                # Las diferencias dentro del frame son exactas: solo falta el nivel de la página anterior
+                computed.loc[start:, column] = local[start:] - local[start - 1] + self.last[column]
+
+        page = computed.iloc[start:]
+        price_volume = pd.Series(np.r_[self.price_volume, (page["close"] * page["volume"]).to_numpy()]).cumsum()
+        volume = pd.Series(np.r_[self.volume, page["volume"].to_numpy()]).cumsum()
+        computed.loc[start:, "vwap"] = (price_volume / volume).to_numpy()[1:]
+
+        if "atr_14" in computed.columns:
+            values, self.supertrend = kernels.supertrend_with_state(
+                page["high"], page["low"], page["close"], page["atr_14"], state=self.supertrend
+            )
+            computed.loc[start:, "supertrend"] = values
+
+        self.price_volume = float(price_volume.iloc[-1])
+        self.volume = float(volume.iloc[-1])
+        self.last = {c: float(computed[c].iloc[-1]) for c in CUMULATIVE_FIELDS if c in computed.columns}
+
+
+def iter_computed(pages, first, warmup=DEFAULT_WARMUP, context_label=""):
+    """
+    Indicadores de las velas desde `first` = (timestamp, id), calculados página
+    por página sobre `pages` (las filas de iter_pages desde la primera vela de
+    la partición). Genera DataFrames con id, timestamp y las columnas de
+    indicadores, en orden; concatenados son iguales a un cálculo de una sola
+    pasada sobre toda la partición.
+    """
+    warmup = max(warmup, LOOKAHEAD)
+    carry = _CarriedState()
+    prefix = pd.DataFrame([], columns=FRAME_COLUMNS)
+    held = None  # últimas LOOKAHEAD velas de la página anterior, esperando su chikou
+
+    for rows in pages:
+        page = pd.DataFrame(rows, columns=FRAME_COLUMNS)
+        frame = pd.concat([prefix, page], ignore_index=True) if len(prefix) else page
+        ohlcv = frame[OHLCV_FIELDS].astype(np.float64)
+        last_ts, last_id = rows[-1][1], rows[-1][0]
+        before_first = (last_ts, last_id) < first
+
+        # Antes de la primera vela a escribir solo importa el estado acumulado
+        computed = compute_indicators(
+            ohlcv, columns=CARRY_INPUTS if before_first else None, context_label=context_label
+        )
+        carry.apply(computed, len(prefix))
+
+        if held is not None:
+            if "ichimoku_chikou" in computed.columns:
+                held["ichimoku_chikou"] = computed["ichimoku_chikou"].to_numpy()[len(prefix) - len(held):len(prefix)]
+            yield held
+            held = None
+
+        if not before_first:
+            targets = computed.iloc[len(prefix):].assign(id=page["id"].to_numpy(), timestamp=page["timestamp"].to_numpy())
+            after_first = [(ts, pk) >= first for ts, pk in zip(page["timestamp"], page["id"])]
+            targets = targets[after_first]
+            tail = targets["id"].isin(page["id"].iloc[-LOOKAHEAD:]).to_numpy()
+            held = targets[tail].copy() if tail.any() else None
+            if (~tail).any():
+                yield targets[~tail]
+
+        prefix = frame.iloc[-warmup:]
+
+    if held is not None:
+        yield held
+
+
+def backfill_partition(symbol, timeframe, reindex=False, warmup=DEFAULT_WARMUP,
+                       page_size=DEFAULT_PAGE_SIZE, batch_size=DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Calcula e inserta los indicadores que faltan en (symbol, timeframe) página por
+    página; con reindex recalcula y upsertea toda la partición. Devuelve stats.
+    """
+    t0 = perf_counter()
+    label = f"{symbol} [{timeframe}]"
+
+    partition = HistoricalMarketDataPoint.objects.filter(symbol=symbol, timeframe=timeframe)
+    missing = partition.filter(indicators__isnull=True)
+    first = (partition if reindex else missing).order_by("timestamp", "id").values_list("timestamp", "id").first()
+    if first is None:
+        return {"partition": label, "bars": 0, "inserted": 0, "seconds": 0.0}
+
+    bars = inserted = 0
+    pages = iter_pages(symbol, timeframe, page_size=max(page_size, LOOKAHEAD))
+
+    for computed in iter_computed(pages, tuple(first), warmup=warmup, context_label=label):
+        columns = [c for c in INDICATOR_FIELDS if c in computed.columns]
+        if reindex:
+            targets = computed
+        else:
+            chunk_missing = set(missing.filter(
+                timestamp__gte=computed["timestamp"].iloc[0], timestamp__lte=computed["timestamp"].iloc[-1]
+            ).values_list("id", flat=True))
+            targets = computed[computed["id"].isin(chunk_missing).to_numpy()]
+
+        inserted += _write_indicators(
+            targets["id"].tolist(), {c: targets[c].to_numpy() for c in columns}, columns, reindex, batch_size
+        )
+        bars += len(computed)
+
+    elapsed = perf_counter() - t0
+    return {"partition": label, "bars": bars, "inserted": inserted, "seconds": round(elapsed, 3)}
+
+
+def _backfill_worker(symbol, timeframe, options):
+    try:
+        return backfill_partition(symbol, timeframe, **options)
+    finally:
+        connections.close_all()
+
+
+def run_backfill(partitions, max_workers=4, **options) -> list:
+    """Procesa las particiones en paralelo (una por proceso). Devuelve las stats de cada una."""
+    results = []
+    if max_workers <= 1:
+        for symbol, timeframe in partitions:
+            stats = backfill_partition(symbol, timeframe, **options)
+            print(f"✅ {stats['partition']}: {stats['inserted']} indicadores ({stats['bars']} velas) en {stats['seconds']}s")
+            results.append(stats)
+        return results
+
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_backfill_worker, s, tf, options): (s, tf) for s, tf in partitions}
+        for future in as_completed(futures):
+            symbol, timeframe = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                print(f"❌ {symbol} [{timeframe}]: {e}")
+                continue
+            print(f"✅ {stats['partition']}: {stats['inserted']} indicadores ({stats['bars']} velas) en {stats['seconds']}s")
+            results.append(stats)
+    return results
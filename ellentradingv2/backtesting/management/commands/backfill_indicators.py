@@ -0,0 +1,47 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from backtesting.indicator_backfill import (
+    list_partitions, run_backfill, DEFAULT_WARMUP, DEFAULT_PAGE_SIZE, DEFAULT_BATCH_SIZE
+)
+
+
+class Command(BaseCommand):
+    help = "Backfill de TechnicalIndicator por (símbolo, timeframe): warm-up correcto, keyset paging y procesos en paralelo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--symbol", help="Ej: BTC/USD (opcional)")
+        parser.add_argument("--timeframe", help="Ej: 1m, 5m, 1h (opcional)")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--reindex", action="store_true",
+                            help="Recalcula y upsertea todos los indicadores de cada partición")
+        parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                            help="Velas de contexto (prefijo) antes de cada página")
+        parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        partitions = list_partitions(
+            symbol=options["symbol"], timeframe=options["timeframe"], only_missing=not options["reindex"]
+        )
+        if not partitions:
+            self.stdout.write("⏩ No hay velas sin indicadores.")
+            return
+
+        self.stdout.write(f"🔍 {len(partitions)} particiones con {options['workers']} procesos")
+        t0 = perf_counter()
+        results = run_backfill(
+            partitions,
+            max_workers=options["workers"],
+            reindex=options["reindex"],
+            warmup=options["warmup"],
+            page_size=options["page_size"],
+            batch_size=options["batch_size"],
+        )
+
+        inserted = sum(r["inserted"] for r in results)
+        elapsed = perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {inserted} indicadores en {len(results)}/{len(partitions)} particiones, {elapsed:.1f}s"
+        ))
@@ -0,0 +1,65 @@
+# backtesting/result_cache.py
+
+"""
+Memoización de resultados de BacktestView.
+
+La clave es un hash estable de todo lo que determina el resultado:
+símbolo, rango, capital, estrategias (código + parámetros), RiskSettings,
+ajustes dinámicos del risk manager, versión de los datos históricos en el
+rango y el código del motor (ENGINE_MODULES). Si llegan velas nuevas al
+rango, cambia una estrategia o el runner / risk layer, la clave cambia sola y
+el resultado viejo deja de usarse.
+"""
+
+import hashlib
+import json
+import zlib
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from backtesting.signal_tape import data_version, source_fingerprint, strategy_version_hash
+from risk.context import analyze_market_conditions, get_dynamic_config_adjustments
+from risk.risk_settings import RiskSettings
+
+# Código del motor que afecta resultados: runner + watcher / adapter, risk layer y base de estrategias
+ENGINE_MODULES = ("backtesting.backtest_runner", "backtesting.strategies", "risk", "strategies.base")
+
+CACHE_ALIAS = "backtest_results"
+
+
+def risk_fingerprint() -> dict:
+    settings = RiskSettings.objects.filter(name="default").first()
+    return {
+        "settings": settings.as_config_dict() if settings else None,
+        # load_risk_context aplica ajustes según trades recientes: también forman parte del resultado
+        "dynamic": get_dynamic_config_adjustments(analyze_market_conditions()),
+    }
+
+
+def backtest_cache_key(symbol, strategies, start, end, capital) -> str:
+    payload = {
+        "engine": source_fingerprint(*ENGINE_MODULES),
+        "symbol": symbol.symbol,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "capital": capital,
+        "strategies": strategy_version_hash(strategies),
+        "data": data_version(symbol.symbol, {s.timeframe for s in strategies}, start, end),
+        "risk": risk_fingerprint(),
+    }
+    raw = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+    return f"backtest:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def get_cached_result(key: str):
+    blob = caches[CACHE_ALIAS].get(key)
+    if blob is None:
+        return None
+    return json.loads(zlib.decompress(blob))
+
+
+def set_cached_result(key: str, result: dict):
+    # JSON comprimido: summary + trades ocupan una fracción de lo que ocuparía el pickle
+    blob = zlib.compress(json.dumps(result, cls=DjangoJSONEncoder).encode(), 6)
+    caches[CACHE_ALIAS].set(key, blob)
@@ -0,0 +1,210 @@
+# backtesting/signal_tape.py
+
+"""
+Signal tape: registro columnar de las señales que generó una corrida de
+backtest, por (symbol, timeframe, hash de versión de estrategias).
+
+Como la evaluación de estrategias es determinística dado (velas, código,
+parámetros), una corrida que solo cambia RiskSettings / config del decision
+engine puede reproducir la cinta directo en la capa de riesgo sin volver a
+evaluar ninguna estrategia.
+
+La cinta se invalida sola si cambia el código de las estrategias o de los
+módulos compartidos que usan (strategies.base, strategies.indicators), sus
+parámetros, o las velas / indicadores del rango que cubre (data_version).
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+
+from backtesting.models import HistoricalMarketDataPoint
+from core.models.enums import SignalType
+from core.utils.time import to_epoch_ns, from_epoch_ns
+from strategies.base.factory import STRATEGY_CLASS_MAP
+
+_DIRECTIONS = {SignalType.BUY: 1, SignalType.SELL: -1, SignalType.WATCH: 0}
+_DIRECTIONS_REVERSE = {v: k for k, v in _DIRECTIONS.items()}
+
+# Campos de OpenStrategy que cambian qué señales se generan
+_STRATEGY_PARAM_FIELDS = ("name", "confidence_threshold", "required_bars", "timeframe", "priority", "validity_minutes", "score")
+
+# Código compartido por todas las estrategias que también decide qué señales salen
+SHARED_SIGNAL_MODULES = ("strategies.base", "strategies.indicators")
+
+
+def get_tape_dir() -> Path:
+    return Path(getattr(settings, "SIGNAL_TAPE_DIR", Path(settings.BASE_DIR) / "data" / "signal_tapes"))
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(*modules) -> str:
+    """sha1 del código de los módulos dados; un paquete cuenta con todos sus .py (en orden de ruta)."""
+    h = hashlib.sha1()
+    for name in modules:
+        module = importlib.import_module(name)
+        origin = Path(module.__file__)
+        paths = sorted(origin.parent.rglob("*.py")) if hasattr(module, "__path__") else [origin]
+        for path in paths:
+            h.update(f"{name}:{path.relative_to(origin.parent)}".encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def data_version(symbol: str, timeframes, start, end) -> dict:
+    """Cantidad de velas + última modificación (velas e indicadores) en el rango."""
+    stats = HistoricalMarketDataPoint.objects.filter(
+        symbol=symbol,
+        timeframe__in=list(timeframes),
+        timestamp__range=(start, end)
+    ).aggregate(
+        bars=Count("id"),
+        bars_updated=Max("updated_at"),
+        indicators_updated=Max("indicators__created_at"),
+    )
+    return {k: str(v) for k, v in stats.items()}
+
+
+def strategy_version_hash(strategies) -> str:
+    """
+    Hash estable de código + constantes + parámetros de un conjunto de OpenStrategy.
+    Cualquier cambio en el módulo de la estrategia, en los módulos compartidos
+    (SHARED_SIGNAL_MODULES) o en sus parámetros genera una cinta nueva.
+    """
+    h = hashlib.sha1()
+    h.update(source_fingerprint(*SHARED_SIGNAL_MODULES).encode())
+    for s in sorted(strategies, key=lambda x: x.id or 0):
+        h.update(json.dumps([s.id, *[getattr(s, f) for f in _STRATEGY_PARAM_FIELDS]], default=str).encode())
+
+        class_ref = STRATEGY_CLASS_MAP.get(s.name)
+        if class_ref is None:
+            continue
+        try:
+            h.update(inspect.getsource(inspect.getmodule(class_ref)).encode())
+        except (OSError, TypeError):
+            h.update(class_ref.__qualname__.encode())
+        constants = {k: v for k, v in vars(class_ref).items() if k.isupper()}
+        h.update(json.dumps(constants, sort_keys=True, default=str).encode())
+
+    return h.hexdigest()[:16]
+
+
+class SignalTape:
+    """
+    Columnas: timestamp (int64 ns), strategy_id (int64), direction (int8),
+    confidence (float32), price (float64). Se guarda como .npz comprimido junto
+    con el rango cubierto (start / end) y la data_version de ese rango, para
+    saber si sirve para otra corrida.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, version: str, start=None, end=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.version = version
+        self.start = start
+        self.end = end
+        self._rows = []
+        self.columns = None
+
+    @property
+    def path(self) -> Path:
+        return get_tape_dir() / self.symbol / self.timeframe / f"{self.version}.npz"
+
+    # ---------- escritura ----------
+
+    def record(self, signal):
+        self._rows.append((
+            to_epoch_ns(signal.timestamp),
+            signal.strategy.id,
+            _DIRECTIONS.get(signal.signal, 0),
+            signal.confidence_score or 0,
+            signal.price or 0,
+        ))
+
+    def save(self):
+        rows = sorted(self._rows)
+        self.columns = {
+            "timestamp": np.array([r[0] for r in rows], dtype=np.int64),
+            "strategy_id": np.array([r[1] for r in rows], dtype=np.int64),
+            "direction": np.array([r[2] for r in rows], dtype=np.int8),
+            "confidence": np.array([r[3] for r in rows], dtype=np.float32),
+            "price": np.array([r[4] for r in rows], dtype=np.float64),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            self.path,
+            coverage=np.array([to_epoch_ns(self.start), to_epoch_ns(self.end)], dtype=np.int64),
+            data_version=np.array(self._data_version(self.start, self.end)),
+            **self.columns
+        )
+        print(f"💾 Signal tape guardada: {self.path.name} ({len(rows)} señales)")
+
+    # ---------- lectura ----------
+
+    def _data_version(self, start, end) -> str:
+        return json.dumps(data_version(self.symbol, [self.timeframe], start, end), sort_keys=True)
+
+    @classmethod
+    def load(cls, symbol: str, timeframe: str, version: str, start, end):
+        """
+        Devuelve la cinta si existe, cubre [start, end] y las velas / indicadores
+        del rango cubierto no cambiaron desde que se grabó; si no None.
+        """
+        tape = cls(symbol, timeframe, version, start, end)
+        if not tape.path.exists():
+            return None
+
+        with np.load(tape.path) as data:
+            covered_start, covered_end = data["coverage"]
+            if covered_start > to_epoch_ns(start) or covered_end < to_epoch_ns(end):
+                return None
+            if "data_version" not in data.files:
+                return None
+            recorded = str(data["data_version"])
+            if recorded != tape._data_version(from_epoch_ns(int(covered_start)), from_epoch_ns(int(covered_end))):
+                print(f"♻️ Signal tape {version}: cambiaron las velas / indicadores del rango, se regenera")
+                return None
+            tape.columns = {k: data[k] for k in data.files if k not in ("coverage", "data_version")}
+
+        return tape
+
+    def __len__(self):
+        return len(self.columns["timestamp"]) if self.columns else len(self._rows)
+
+    def signals_by_timestamp(self, strategies_by_id: dict, symbol_obj) -> dict:
+        """
+        Reconstruye las señales como objetos livianos (mismos atributos que usa
+        la capa de riesgo), agrupadas por timestamp de vela.
+        """
+        start_ns, end_ns = to_epoch_ns(self.start), to_epoch_ns(self.end)
+        grouped = defaultdict(list)
+        c = self.columns
+
+        for i in range(len(c["timestamp"])):
+            ts_ns = int(c["timestamp"][i])
+            strategy = strategies_by_id.get(int(c["strategy_id"][i]))
+            if strategy is None or ts_ns < start_ns or ts_ns > end_ns:
+                continue
+            timestamp = from_epoch_ns(ts_ns)
+            grouped[timestamp].append(SimpleNamespace(
+                symbol=symbol_obj,
+                signal=_DIRECTIONS_REVERSE[int(c["direction"][i])],
+                confidence_score=float(c["confidence"][i]),
+                price=float(c["price"][i]),
+                strategy=strategy,
+                timeframe=strategy.timeframe,
+                timestamp=timestamp,
+                received_at=timestamp,
+                is_from_backtest=True,
+            ))
+
+        return grouped
@@ -0,0 +1,100 @@
+# backtesting/strategies/adapter.py
+
+"""
+Adaptador de backtest sobre las estrategias en vivo.
+
+Antes había una copia de cada estrategia en backtesting/strategies/* sobre
+BacktestStrategy.set_candles, que se iba desfasando de la versión en vivo.
+Ahora el backtest instancia las mismas clases (STRATEGY_CLASS_MAP) y llama a
+EntryStrategy.evaluate() sobre vistas de una BarWindow: mismo código de
+scoring que en vivo, sin DB ni logs por vela. La deduplicación (opcional) usa
+un RecentSignalIndex en memoria con el reloj de la vela, como el portfolio backtest.
+
+Las estrategias con generate_signals_vectorized() (strategies/base/vectorized.py)
+se calculan en una sola pasada sobre toda la historia; check_vectorized_parity()
+compara ese camino contra el vela a vela.
+"""
+
+from datetime import timedelta
+from time import perf_counter
+from types import SimpleNamespace
+
+from core.utils.time import TIMEFRAME_MINUTES, from_epoch_ns
+from signals.recent_index import RecentSignalIndex
+from strategies.base.bar_window import BarWindow
+from strategies.base.factory import STRATEGY_CLASS_MAP
+from strategies.base.vectorized import vectorized_decisions
+
+
+def build_backtest_strategy(strategy_instance):
+    """Estrategia en vivo para una fila de OpenStrategy (ValueError si no está mapeada)."""
+    class_ref = STRATEGY_CLASS_MAP.get(strategy_instance.name)
+    if class_ref is None:
+        raise ValueError(f"❌ Estrategia no reconocida para backtest: {strategy_instance.name}")
+    return class_ref(strategy_instance=strategy_instance)
+
+
+def load_window(queryset, strategy, time_field="timestamp"):
+    """Velas del queryset (todas, cronológicas) con los indicadores que lee la estrategia."""
+    return BarWindow.from_queryset(queryset, time_field=time_field, indicators=strategy.REQUIRED_INDICATORS)
+
+
+def evaluate_bars(strategy, bars: BarWindow, symbol=None, dedupe=False, start=None, vectorized=True):
+    """
+    Recorre `bars` vela a vela y devuelve (índice, StrategyDecision) por cada señal.
+    Cada vela ve solo las últimas required_bars velas cerradas, como en vivo.
+    Si la estrategia define generate_signals_vectorized() (y vectorized=True) las
+    decisiones salen de una sola pasada sobre toda la historia.
+    Con dedupe=True descarta repeticiones de la misma dirección dentro del timeframe.
+    """
+    required = strategy.required_bars
+    first = max(required - 1, start or 0)
+    index = RecentSignalIndex(use_db=False) if dedupe else None
+    window = timedelta(minutes=TIMEFRAME_MINUTES.get(strategy.timeframe, 60))
+
+    if vectorized and strategy.generate_signals_vectorized is not None:
+        candidates = vectorized_decisions(strategy, bars, first)
+    else:
+        candidates = ((i, strategy.evaluate(bars[i + 1 - required:i + 1], symbol)) for i in range(first, len(bars)))
+
+    decisions = []
+    for i, decision in candidates:
+        if decision is None:
+            continue
+        if index is not None:
+            index.as_of = from_epoch_ns(bars.time[i])
+            if index.is_recent(symbol, strategy.strategy_instance, decision.signal_type, window):
+                continue
+            index.record(symbol, strategy.strategy_instance, decision.signal_type)
+        decisions.append((i, decision))
+
+    return decisions
+
+
+def check_vectorized_parity(strategy, bars: BarWindow, symbol=None):
+    """
+    Corre evaluate_bars() vela a vela y vectorizado sobre las mismas velas y compara
+    (índice, dirección, confianza). mismatches vacío = mismas señales.
+    """
+    if strategy.generate_signals_vectorized is None:
+        raise ValueError(f"❌ {strategy.name} no define generate_signals_vectorized()")
+
+    t0 = perf_counter()
+    per_bar = {i: (d.signal_type, d.confidence) for i, d in evaluate_bars(strategy, bars, symbol, vectorized=False)}
+    t1 = perf_counter()
+    fast = {i: (d.signal_type, d.confidence) for i, d in evaluate_bars(strategy, bars, symbol)}
+    t2 = perf_counter()
+
+    mismatches = [
+        (i, per_bar.get(i), fast.get(i))
+        for i in sorted(per_bar.keys() | fast.keys())
+        if per_bar.get(i) != fast.get(i)
+    ]
+    return SimpleNamespace(
+        strategy=strategy.name,
+        bars=len(bars),
+        signals=len(per_bar),
+        mismatches=mismatches,
+        per_bar_seconds=t1 - t0,
+        vectorized_seconds=t2 - t1,
+    )
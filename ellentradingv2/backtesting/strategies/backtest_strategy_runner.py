@@ -1,6 +1,6 @@
 from backtesting.models.HistoricalSignal import Signal
 from backtesting.models.HistoricalMarketDataPoint import HistoricalMarketDataPoint
-from backtesting.strategies.backtesting_factory import build_backtest_strategy
+from backtesting.strategies.adapter import build_backtest_strategy, load_window, evaluate_bars
 from core.models import OpenStrategy
 from collections import defaultdict
 
@@ -29,13 +29,7 @@ def run_entry_strategies(symbol_code="AAPL", verbose=True):
     if verbose:
         print(f"🚀 Iniciando backtest completo para {symbol_code}...\n")
 
-    # Cargar todas las velas del símbolo
-    all_candles = list(
-        HistoricalMarketDataPoint.objects
-        .filter(symbol=symbol_code)
-        .select_related("indicators")
-        .order_by("timestamp")
-    )
+    candles = HistoricalMarketDataPoint.objects.filter(symbol=symbol_code)
 
     for estrategia_inst in estrategias:
         try:
@@ -48,37 +42,33 @@ def run_entry_strategies(symbol_code="AAPL", verbose=True):
         tf = estrategia.timeframe
         required = estrategia.required_bars
 
-        velas_tf = [c for c in all_candles if c.timeframe == tf]
+        # Una query values_list por estrategia (sus indicadores) + los ids para market_data
+        velas_tf = candles.filter(timeframe=tf)
+        bars = load_window(velas_tf, estrategia)
+        market_data_ids = list(velas_tf.order_by("timestamp").values_list("id", flat=True))
 
-        if len(velas_tf) < required:
+        if len(bars) < required:
             if verbose:
                 print(f"⏭️ {estrategia.name} — Insuficientes velas para {tf}")
             continue
 
         if verbose:
-            print(f"📈 Ejecutando {estrategia.name} ({tf}) con {len(velas_tf)} velas...")
-
-        for i in range(required, len(velas_tf)):
-            ventana = velas_tf[i - required:i]
-            estrategia.set_candles(ventana)
-            signal = estrategia.should_generate_signal(symbol_code)
-
-            if signal:
-                conteo[estrategia.name] += 1
-
-                _, created = Signal.objects.get_or_create(
-                    strategy=estrategia_inst,
-                    signal=signal.signal,
-                    timestamp=signal.timestamp,
-                    market_data=signal.market_data,
-                    defaults={
-                        'confidence_score': signal.confidence_score,
-                        'is_from_backtest': True,
-                        'timeframe': signal.timeframe
-                    }
-                )
-
-
+            print(f"📈 Ejecutando {estrategia.name} ({tf}) con {len(bars)} velas...")
+
+        for i, decision in evaluate_bars(estrategia, bars, symbol_code):
+            conteo[estrategia.name] += 1
+
+            Signal.objects.get_or_create(
+                strategy=estrategia_inst,
+                signal=decision.signal_type,
+                timestamp=decision.timestamp,
+                market_data_id=market_data_ids[i],
+                defaults={
+                    'confidence_score': decision.confidence,
+                    'is_from_backtest': True,
+                    'timeframe': tf
+                }
+            )
 
     # Resumen
     if verbose:
@@ -1,3 +1,61 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from backtesting.indicator_backfill import INDICATOR_FIELDS, OHLCV_FIELDS, iter_computed
+from strategies.indicators.benchmarks import synthetic_bars
+from strategies.indicators.registry import compute_indicators
+
+
+def _partition_rows(n, seed=0):
+    """Filas de iter_pages (id, timestamp, OHLCV) de una partición sintética de velas de 1m."""
+    bars = synthetic_bars(n, seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        (i + 1, start + timedelta(minutes=i), *map(float, values))
+        for i, values in enumerate(bars[OHLCV_FIELDS].itertuples(index=False))
+    ]
+
+
+def _pages(rows, page_size):
+    return [rows[lo:lo + page_size] for lo in range(0, len(rows), page_size)]
+
+
+class PagedBackfillTests(SimpleTestCase):
+    """iter_computed() página por página da lo mismo que compute_indicators() sobre toda la partición."""
+
+    n = 12_000
+    page_size = 2_500
+    warmup = 4_000
+
+    def setUp(self):
+        self.rows = _partition_rows(self.n)
+        frame = pd.DataFrame([r[2:] for r in self.rows], columns=OHLCV_FIELDS)
+        self.single_pass = compute_indicators(frame)
+
+    def paged(self, first_index):
+        first = (self.rows[first_index][1], self.rows[first_index][0])
+        chunks = list(iter_computed(_pages(self.rows, self.page_size), first, warmup=self.warmup))
+        return pd.concat(chunks, ignore_index=True)
+
+    def assert_same_as_single_pass(self, paged, first_index):
+        self.assertEqual(paged["id"].tolist(), [r[0] for r in self.rows[first_index:]])
+        expected = self.single_pass.iloc[first_index:].reset_index(drop=True)
+        for column in INDICATOR_FIELDS:
+            if column not in expected.columns:
+                continue
+            with self.subTest(column=column):
+                np.testing.assert_allclose(
+                    paged[column].to_numpy(dtype=np.float64), expected[column].to_numpy(dtype=np.float64),
+                    rtol=1e-9, atol=1e-9, equal_nan=True,
+                )
+
+    def test_reindex_whole_partition(self):
+        self.assert_same_as_single_pass(self.paged(0), 0)
+
+    def test_starts_at_first_missing_bar(self):
+        # La primera vela a escribir cae en medio de una página: lo anterior solo es estado / prefijo
+        first_index = 7_300
+        self.assert_same_as_single_pass(self.paged(first_index), first_index)
@@ -40,7 +40,7 @@ estrategias_sin_senales()
 from core.models import OpenStrategy
 from backtesting.models.HistoricalMarketDataPoint import HistoricalMarketDataPoint
 from backtesting.models.HistoricalSignal import Signal
-from backtesting.strategies.backtesting_factory import build_backtest_strategy
+from backtesting.strategies.adapter import build_backtest_strategy, load_window, evaluate_bars
 
 from collections import defaultdict
 
@@ -49,26 +49,21 @@ def run_full_backtest(symbol_code="AAPL"):
     conteo = defaultdict(int)
 
     print(f"🧠 Cargando velas históricas para {symbol_code}...")
-    all_candles = list(HistoricalMarketDataPoint.objects.filter(symbol=symbol_code).select_related("indicators").order_by("timestamp"))
+    candles = HistoricalMarketDataPoint.objects.filter(symbol=symbol_code)
 
     for estrategia_inst in estrategias:
         print(f"\n🔍 Evaluando estrategia: {estrategia_inst.name}")
         estrategia = build_backtest_strategy(estrategia_inst)
         tf = estrategia.timeframe
-        filtered = [c for c in all_candles if c.timeframe == tf]
+        bars = load_window(candles.filter(timeframe=tf), estrategia)
 
-        if len(filtered) < estrategia.required_bars + 1:
+        if len(bars) < estrategia.required_bars + 1:
             print(f"⛔ No hay suficientes velas para {tf}")
             continue
 
-        for i in range(estrategia.required_bars, len(filtered)):
-            ventana = filtered[i - estrategia.required_bars:i]
-            estrategia.set_candles(ventana)
-            signal = estrategia.should_generate_signal(symbol_code)
-
-            if signal:
-                conteo[estrategia_inst.name] += 1
-                print(f"✅ {estrategia_inst.name} — {signal.signal.upper()} @ {signal.timestamp.date()} conf={signal.confidence_score}")
+        for _, decision in evaluate_bars(estrategia, bars, symbol_code):
+            conteo[estrategia_inst.name] += 1
+            print(f"✅ {estrategia_inst.name} — {decision.signal_type.upper()} @ {decision.timestamp.date()} conf={decision.confidence}")
 
     print("\n📊 RESUMEN FINAL:")
     for nombre, cantidad in conteo.items():
@@ -9,6 +9,7 @@ from core.models.symbol import Symbol
 from strategies.models import OpenStrategy
 from .backtest_runner import BacktestRunner
 from .backtest_session import BacktestSession
+from .result_cache import backtest_cache_key, get_cached_result, set_cached_result
 
 class BacktestView(APIView):
     def post(self, request):
@@ -22,6 +23,12 @@ class BacktestView(APIView):
             symbol = Symbol.objects.get(symbol=symbol_name)
             strategies = list(OpenStrategy.objects.filter(id__in=strategy_ids))
 
+            # ⚡ Misma configuración + mismos datos → resultado memorizado
+            cache_key = backtest_cache_key(symbol, strategies, start_date, end_date, initial_balance)
+            cached = get_cached_result(cache_key)
+            if cached is not None:
+                return Response({**cached, "cached": True})
+
             runner = BacktestRunner(symbol, initial_balance, strategies, start_date, end_date)
             signals, trades = runner.run()
 
@@ -43,10 +50,13 @@ class BacktestView(APIView):
                 for t in trades
             ]
 
-            return Response({
+            result = {
                 "summary": summary,
                 "trades": trades_data
-            })
+            }
+            set_cached_result(cache_key, result)
+
+            return Response(result)
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
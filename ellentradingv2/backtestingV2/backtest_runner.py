@@ -2,7 +2,11 @@
 
 from datetime import datetime
 from core.models import Symbol
-from backtestingV2.models import HistoricalMarketDataPoint, HistoricalTrade
+from backtestingV2.models import HistoricalTrade
+from backtestingV2.utils.shared_bars import load_bar_columns
+from backtestingV2.utils.simulation import build_bar_proxies
+from backtesting.strategies.adapter import build_backtest_strategy
+from signals.recent_index import RecentSignalIndex
 from strategies.models import OpenStrategy
 from risk.risk_manager import RiskManager
 
@@ -17,24 +21,37 @@ def run_backtest(symbol_str, from_date, to_date, timeframe, capital):
         print(f"❌ Símbolo {symbol_str} no encontrado en DB.")
         return
 
-    bars = HistoricalMarketDataPoint.objects.filter(
-        symbol=symbol,
-        timeframe=timeframe,
-        start_time__gte=from_date,
-        start_time__lte=to_date
-    ).order_by("start_time")
+    # BarStore columnar si cubre el rango y está al día con la DB, si no una sola query
+    bars = build_bar_proxies(load_bar_columns(symbol, timeframe, from_date, to_date))
 
     print(f"📊 Backtest: {symbol_str} desde {from_date} hasta {to_date} ({len(bars)} velas)")
 
+    strategies = []
+    for strategy_instance in OpenStrategy.objects.filter(execution_mode="backtest"):
+        try:
+            strategies.append(build_backtest_strategy(strategy_instance))
+        except ValueError as e:
+            print(f"⚠️ {e}")
+
+    # Deduplicación como en vivo, pero en memoria y con el reloj de la vela
+    signal_index = RecentSignalIndex(use_db=False)
+    for strategy in strategies:
+        strategy.signal_index = signal_index
+
     trades = []
 
-    for bar in bars:
+    for i, bar in enumerate(bars):
         # 🧠 1. Ejecutar estrategias activas (modo backtest)
         generated_signals = []
-        for strategy in OpenStrategy.objects.filter(execution_mode="backtest"):
+        signal_index.as_of = bar.start_time
+        for strategy in strategies:
+            if i + 1 < strategy.required_bars:
+                continue
             try:
-                signal = strategy.should_generate_signal(bar)
+                window = bars[i + 1 - strategy.required_bars:i + 1]
+                signal = strategy.should_generate_signal(symbol, execution_mode="backtest", candles=window)
                 if signal:
+                    signal_index.record(symbol, strategy.strategy_instance, signal.signal)
                     generated_signals.append(signal)  # Solo en memoria
             except Exception as e:
                 print(f"⚠️ Error en {strategy.name}: {e}")
@@ -0,0 +1,97 @@
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import make_aware
+
+from backtestingV2.models import HistoricalMarketDataPoint, HistoricalLiveTechnicalIndicator
+from backtestingV2.utils.bar_store import BarStore
+from backtestingV2.utils.shared_bars import OHLCV_COLUMNS, INDICATOR_COLUMNS
+from core.models import Symbol
+from core.utils.time import from_epoch_ns, timeframe_to_timedelta
+
+
+def _value(x):
+    return None if np.isnan(x) else float(x)
+
+
+class Command(BaseCommand):
+    help = "Carga velas + indicadores desde el BarStore columnar a las tablas de backtestingV2."
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbol", help="Ej: BTCUSD")
+        parser.add_argument("timeframe", help="Ej: 1m, 5m, 1h")
+        parser.add_argument("--from", dest="start", help="YYYY-MM-DD (opcional)")
+        parser.add_argument("--to", dest="end", help="YYYY-MM-DD (opcional)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            symbol = Symbol.objects.get(symbol=options["symbol"].replace("-", "").replace("/", ""))
+        except Symbol.DoesNotExist:
+            raise CommandError(f"❌ Símbolo '{options['symbol']}' no existe en DB")
+
+        timeframe = options["timeframe"]
+        store = BarStore(symbol.symbol, timeframe)
+        if not store.exists():
+            raise CommandError(f"❌ No hay store para {symbol.symbol} [{timeframe}] en {store.path}")
+
+        start = make_aware(datetime.strptime(options["start"], "%Y-%m-%d")) if options["start"] else None
+        end = make_aware(datetime.strptime(options["end"], "%Y-%m-%d")) if options["end"] else None
+        columns = store.read(start, end)
+        indicator_names = [c for c in INDICATOR_COLUMNS if c in columns]
+        bar_duration = timeframe_to_timedelta(timeframe)
+        batch_size = options["batch_size"]
+        n = len(columns["time"])
+
+        self.stdout.write(f"📤 Exportando {n} velas de {symbol.symbol} [{timeframe}] a la DB")
+        t0 = perf_counter()
+        inserted_indicators = 0
+
+        for lo in range(0, n, batch_size):
+            hi = min(lo + batch_size, n)
+            times = [from_epoch_ns(t) for t in columns["time"][lo:hi]]
+
+            with transaction.atomic():
+                HistoricalMarketDataPoint.objects.bulk_create([
+                    HistoricalMarketDataPoint(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        start_time=ts,
+                        end_time=ts + bar_duration,
+                        is_closed=True,
+                        source="bar_store",
+                        **{name: float(columns[name][lo + i]) for name in OHLCV_COLUMNS}
+                    )
+                    for i, ts in enumerate(times)
+                ], ignore_conflicts=True)
+
+                # ids de las velas del batch (incluye las que ya existían) con una sola query
+                ids = dict(HistoricalMarketDataPoint.objects.filter(
+                    symbol=symbol, timeframe=timeframe, start_time__gte=times[0], start_time__lte=times[-1]
+                ).values_list("start_time", "id"))
+
+                # Solo las velas sin indicadores: con ignore_conflicts bulk_create devuelve
+                # todos los objetos, también los que chocaron, así que no sirve para contar
+                existing = set(HistoricalLiveTechnicalIndicator.objects.filter(
+                    market_data_id__in=ids.values()
+                ).values_list("market_data_id", flat=True))
+                missing = [
+                    HistoricalLiveTechnicalIndicator(
+                        market_data_id=ids[ts],
+                        **{name: _value(columns[name][lo + i]) for name in indicator_names}
+                    )
+                    for i, ts in enumerate(times) if ts in ids and ids[ts] not in existing
+                ]
+                HistoricalLiveTechnicalIndicator.objects.bulk_create(missing, ignore_conflicts=True)
+                inserted_indicators += len(missing)
+
+            self.stdout.write(f"   • {hi}/{n}")
+
+        elapsed = perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {n} velas exportadas en {elapsed:.1f}s ({n / elapsed if elapsed else 0:.0f} velas/s), "
+            f"{inserted_indicators} filas de indicadores"
+        ))
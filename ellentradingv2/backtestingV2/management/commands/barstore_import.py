@@ -0,0 +1,76 @@
+from datetime import datetime
+from functools import partial
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import make_aware
+
+from backtestingV2.utils.bar_store import BarStore, sync_store
+from backtestingV2.utils.shared_bars import load_bar_columns, partition_data_version
+from core.models import Symbol
+from core.utils.time import from_epoch_ns
+
+
+class Command(BaseCommand):
+    help = "Copia velas + indicadores de backtestingV2 (o backtesting, con --source) al BarStore columnar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbol", help="Ej: BTCUSD")
+        parser.add_argument("timeframe", help="Ej: 1m, 5m, 1h")
+        parser.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="end", required=True, help="YYYY-MM-DD")
+        parser.add_argument("--chunk-days", type=int, default=30, help="Días por query (limita memoria)")
+        parser.add_argument("--source", choices=["backtestingV2", "backtesting"], default="backtestingV2",
+                            help="Tablas de origen: backtestingV2 (default) o backtesting (BacktestRunner)")
+
+    def _source(self, options):
+        """(store, load_columns(desde, hasta), data_version(desde, hasta), etiqueta) según --source."""
+        timeframe = options["timeframe"]
+        if options["source"] == "backtesting":
+            from backtesting.bar_columns import get_bar_store, load_candle_columns, partition_data_version as version
+
+            # backtesting guarda el símbolo como texto (BTC/USD), tal cual
+            symbol = options["symbol"]
+            return (get_bar_store(symbol, timeframe),
+                    partial(load_candle_columns, symbol, timeframe, use_store=False),
+                    partial(version, symbol, timeframe), symbol)
+
+        try:
+            symbol = Symbol.objects.get(symbol=options["symbol"].replace("-", "").replace("/", ""))
+        except Symbol.DoesNotExist:
+            raise CommandError(f"❌ Símbolo '{options['symbol']}' no existe en DB")
+        return (BarStore(symbol.symbol, timeframe),
+                partial(load_bar_columns, symbol, timeframe, use_store=False),
+                partial(partition_data_version, symbol, timeframe), symbol.symbol)
+
+    def handle(self, *args, **options):
+        timeframe = options["timeframe"]
+        store, load_columns, data_version, label = self._source(options)
+        start = make_aware(datetime.strptime(options["start"], "%Y-%m-%d"))
+        end = make_aware(datetime.strptime(options["end"], "%Y-%m-%d"))
+
+        # Append-only: si el store ya tiene datos se continúa desde la última vela
+        if len(store):
+            times = store.column("time")
+            first, last = from_epoch_ns(times[0]), from_epoch_ns(times[-1])
+            if start < first:
+                self.stderr.write(
+                    f"⚠️ El store {label} [{timeframe}] empieza en {first} y es append-only: "
+                    f"el rango {start.date()} → {first} no se importa. Para incluirlo borrá {store.path} "
+                    f"y volvé a importar desde {start.date()}."
+                )
+            if last >= end:
+                self.stdout.write(self.style.SUCCESS(f"✅ Store {label} [{timeframe}] ya cubre hasta {last}"))
+                return
+            start = max(start, last)
+
+        self.stdout.write(f"📦 Importando {label} [{timeframe}] {start.date()} → {end.date()} a {store.path}")
+        t0 = perf_counter()
+        total = sync_store(store, load_columns, data_version, start, end,
+                           chunk_days=options["chunk_days"], log=self.stdout.write)
+
+        elapsed = perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {total} velas importadas en {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} velas/s). "
+            f"Store: {len(store)} velas, {len(store.columns)} columnas"
+        ))
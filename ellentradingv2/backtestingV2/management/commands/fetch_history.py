@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from backtestingV2.utils.bulk_import import import_bars_dataframe, recompute_indicators
+from backtestingV2.utils.fetcher import CoinbaseFetcher, AlpacaStockFetcher
+from core.models import Symbol
+from risk.context import ALPACA_API_KEY, ALPACA_SECRET_KEY
+
+GRANULARITY_TO_TF = {60: "1m", 300: "5m", 900: "15m", 1800: "30m", 3600: "1h", 86400: "1D"}
+
+
+class Command(BaseCommand):
+    help = "Backfill histórico concurrente y reanudable (Coinbase / Alpaca) hacia backtestingV2."
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbols", nargs="+", help="Ej: BTC-USD ETH-USD (coinbase) o AAPL MSFT (alpaca)")
+        parser.add_argument("--exchange", choices=["coinbase", "alpaca"], default="coinbase")
+        parser.add_argument("--granularity", type=int, default=900, choices=sorted(GRANULARITY_TO_TF))
+        parser.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="end", required=True, help="YYYY-MM-DD")
+        parser.add_argument("--workers", type=int, default=8, help="Requests en vuelo por símbolo")
+        parser.add_argument("--base-url", help="Override del endpoint (p.ej. servidor stub local)")
+        parser.add_argument("--restart", action="store_true", help="Ignora el checkpoint y pide todo de nuevo")
+
+    def handle(self, *args, **options):
+        start = datetime.strptime(options["start"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(options["end"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        granularity = options["granularity"]
+        tf_str = GRANULARITY_TO_TF[granularity]
+
+        if options["exchange"] == "coinbase":
+            fetcher = CoinbaseFetcher(base_url=options["base_url"], max_workers=options["workers"])
+        else:
+            fetcher = AlpacaStockFetcher(
+                ALPACA_API_KEY, ALPACA_SECRET_KEY, base_url=options["base_url"], max_workers=options["workers"]
+            )
+
+        incomplete = []
+        for raw_symbol in options["symbols"]:
+            product_id = raw_symbol.replace("/", "-").upper()
+            try:
+                symbol = Symbol.objects.get(symbol=product_id.replace("-", ""))
+            except Symbol.DoesNotExist:
+                raise CommandError(f"❌ Símbolo '{raw_symbol}' no existe en DB")
+
+            stats = fetcher.fetch_range(
+                product_id, granularity, start, end,
+                on_chunk=lambda rows, symbol=symbol: import_bars_dataframe(
+                    pd.DataFrame(rows), symbol, tf_str, source=f"{options['exchange']}_rest", with_indicators=False
+                ),
+                resume=not options["restart"],
+            )
+            if stats["complete"]:
+                recompute_indicators(symbol, tf_str, start, end)
+            else:
+                incomplete.append(raw_symbol)
+
+            rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+            self.stdout.write(
+                f"📊 {raw_symbol}: {stats['rows']} velas, {stats['fetched_chunks']} chunks nuevos, "
+                f"{stats['skipped_chunks']} ya hechos, {len(stats['failed_chunks'])} fallidos ({rate:.0f} velas/s)"
+            )
+
+        if incomplete:
+            self.stderr.write(f"⚠️ Incompletos (volver a correr para reanudar): {', '.join(incomplete)}")
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ Backfill completo"))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backtestingV2.utils.bulk_import import read_bars_file, import_bars_dataframe, DEFAULT_BATCH_SIZE
+from core.models import Symbol
+
+
+class Command(BaseCommand):
+    help = "Importa velas OHLCV desde archivos CSV / Parquet locales a backtestingV2 (bulk, con indicadores)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbol", help="Ej: BTCUSD")
+        parser.add_argument("timeframe", help="Ej: 1m, 5m, 1h")
+        parser.add_argument("files", nargs="+", help="Archivos .csv / .parquet (columnas time, open, high, low, close, volume)")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--overwrite", action="store_true", help="Actualiza también las velas existentes")
+        parser.add_argument("--no-indicators", action="store_true", help="Solo velas, sin calcular indicadores")
+        parser.add_argument("--source", default="file_import")
+
+    def handle(self, *args, **options):
+        try:
+            symbol = Symbol.objects.get(symbol=options["symbol"].replace("-", "").replace("/", ""))
+        except Symbol.DoesNotExist:
+            raise CommandError(f"❌ Símbolo '{options['symbol']}' no existe en DB")
+
+        totals = {"rows": 0, "new_bars": 0, "indicators": 0, "seconds": 0.0}
+        for path in options["files"]:
+            try:
+                df = read_bars_file(path)
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+
+            self.stdout.write(f"📂 {path}: {len(df)} filas")
+            stats = import_bars_dataframe(
+                df, symbol, options["timeframe"],
+                source=options["source"],
+                with_indicators=not options["no_indicators"],
+                overwrite=options["overwrite"],
+                batch_size=options["batch_size"],
+            )
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+
+        rate = totals["rows"] / totals["seconds"] if totals["seconds"] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['rows']} filas ({totals['new_bars']} velas nuevas, {totals['indicators']} indicadores) "
+            f"en {totals['seconds']:.1f}s → {rate:.0f} filas/s"
+        ))
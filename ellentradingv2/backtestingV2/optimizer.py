@@ -0,0 +1,346 @@
+# backtestingV2/optimizer.py
+
+"""
+Optimización walk-forward de parámetros.
+
+Claves del espacio de parámetros:
+  - "StochasticOscillatorStrategy.EXTREME_OVERBOUGHT" → constante de la clase (se pisa en la instancia)
+  - "StochasticOscillatorStrategy.confidence_threshold" → campo del OpenStrategy de esa estrategia
+  - "OpenStrategy.confidence_threshold" → campo del OpenStrategy de todas las estrategias
+  - "RiskSettings.sl_buffer_pct" → campo de RiskSettings (config del risk manager)
+
+Nada se guarda en DB: todas las copias son en memoria.
+
+Caché:
+  - Las columnas OHLCV + indicadores se cargan una sola vez en shared memory.
+  - Cada worker arma los proxies de vela (con su dict de indicadores) una sola vez.
+  - Las señales por vela se memorizan por combinación de parámetros de estrategia,
+    así que candidatos que solo cambian RiskSettings reutilizan las señales.
+"""
+
+import copy
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from django.db import connections
+
+from backtestingV2.utils.shared_bars import SharedBarArrays
+from backtestingV2.utils.simulation import build_bar_proxies, open_position, update_position, position_pnl
+from core.models import Symbol
+from core.utils.time import is_signal_active
+from risk.decision_engine import resolve_direction, categorize_signals
+from risk.signal_scoring import evaluate_categorized
+from risk.risk_settings import RiskSettings
+from strategies.base.factory import STRATEGY_CLASS_MAP
+from strategies.models import OpenStrategy
+
+# Estado por proceso worker (se inicializa en _init_worker)
+_WORKER = {}
+
+
+# ---------- espacio de parámetros ----------
+
+def build_param_grid(space: dict) -> list:
+    """Producto cartesiano de {clave: [valores]}."""
+    keys = list(space.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def sample_param_space(space: dict, n_samples: int, seed=None) -> list:
+    """Random search: n_samples candidatos distintos del grid (sin repetir)."""
+    rng = random.Random(seed)
+    grid_size = int(np.prod([len(v) for v in space.values()])) if space else 0
+    if grid_size <= n_samples:
+        return build_param_grid(space)
+
+    seen = set()
+    candidates = []
+    while len(candidates) < n_samples:
+        params = {k: rng.choice(list(v)) for k, v in space.items()}
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def split_params(params: dict):
+    """Separa parámetros de estrategia (afectan señales) de parámetros de riesgo."""
+    strategy_params = {k: v for k, v in params.items() if not k.startswith("RiskSettings.")}
+    risk_params = {k.split(".", 1)[1]: v for k, v in params.items() if k.startswith("RiskSettings.")}
+    return strategy_params, risk_params
+
+
+def walk_forward_windows(n_bars: int, in_sample: int, out_of_sample: int, step=None) -> list:
+    """
+    Ventanas rolling [(is_start, is_end, oos_start, oos_end)] en índices de vela
+    (end exclusivo). Por defecto avanza de a out_of_sample velas.
+    """
+    step = step or out_of_sample
+    windows = []
+    start = 0
+    while start + in_sample + out_of_sample <= n_bars:
+        is_end = start + in_sample
+        windows.append((start, is_end, is_end, is_end + out_of_sample))
+        start += step
+    return windows
+
+
+# ---------- estrategias y config en memoria ----------
+
+def build_strategies(open_strategies, strategy_params: dict) -> list:
+    """Instancia las estrategias sobre copias en memoria de OpenStrategy con los parámetros aplicados."""
+    open_fields = {f.name for f in OpenStrategy._meta.fields}
+    strategies = []
+
+    for s in open_strategies:
+        class_ref = STRATEGY_CLASS_MAP.get(s.name)
+        if not class_ref:
+            print(f"⚠️ Estrategia '{s.name}' no está en STRATEGY_CLASS_MAP, se omite.")
+            continue
+
+        instance = copy.copy(s)
+        overrides = {}
+        for key, value in strategy_params.items():
+            target, attr = key.split(".", 1)
+            if target == "OpenStrategy" or (target == class_ref.__name__ and attr in open_fields):
+                setattr(instance, attr, value)
+            elif target == class_ref.__name__:
+                overrides[attr] = value
+
+        strategy = class_ref(strategy_instance=instance)
+        for attr, value in overrides.items():
+            if not hasattr(class_ref, attr):
+                raise ValueError(f"❌ {class_ref.__name__} no tiene el atributo '{attr}'")
+            setattr(strategy, attr, value)
+        strategies.append(strategy)
+
+    return strategies
+
+
+def build_risk_config(base_settings, risk_params: dict) -> dict:
+    settings = copy.copy(base_settings)
+    for attr, value in risk_params.items():
+        if not hasattr(settings, attr):
+            raise ValueError(f"❌ RiskSettings no tiene el campo '{attr}'")
+        setattr(settings, attr, value)
+    return settings.as_config_dict()
+
+
+# ---------- worker ----------
+
+def _init_worker(manifest, symbol_obj, open_strategies, base_settings, capital):
+    shared = SharedBarArrays.attach(manifest)
+    # Proxies de vela: una sola vez por proceso, compartidos por todas las ventanas y candidatos
+    bars = build_bar_proxies(shared)
+
+    _WORKER.update(
+        shared=shared,
+        bars=bars,
+        symbol=symbol_obj,
+        open_strategies=open_strategies,
+        base_settings=base_settings,
+        capital=capital,
+        signal_cache={},
+    )
+
+
+def _signals_at(strategies, strategy_key, index):
+    """Señales de la vela `index` para una combinación de parámetros de estrategia (memorizadas)."""
+    cache = _WORKER["signal_cache"].setdefault(strategy_key, {})
+    if index in cache:
+        return cache[index]
+
+    bars = _WORKER["bars"]
+    signals = []
+    feature_cache = {}  # features de esta vela compartidos entre estrategias
+    for strategy in strategies:
+        required = strategy.required_bars
+        if index + 1 < required:
+            continue
+        strategy.feature_cache = feature_cache
+        try:
+            signal = strategy.should_generate_signal(
+                _WORKER["symbol"], execution_mode="backtest", candles=bars[index + 1 - required:index + 1]
+            )
+            if signal:
+                signals.append(signal)
+        except Exception as e:
+            print(f"⚠️ Error en {strategy.name}: {e}")
+
+    cache[index] = signals
+    return signals
+
+
+def _simulate_window(strategies, strategy_key, config, start, end):
+    """Simula una ventana [start, end) con una sola posición abierta a la vez."""
+    bars = _WORKER["bars"]
+    capital = _WORKER["capital"]
+    equity = capital
+    peak = capital
+    max_drawdown = 0.0
+    pnls = []
+    position = None
+    pending = []
+
+    for i in range(start, end):
+        bar = bars[i]
+
+        if position:
+            result = update_position(position, bar.high, bar.low, bar.close)
+            if result:
+                exit_price, _ = result
+                pnl = position_pnl(position, exit_price)
+                equity += pnl
+                pnls.append(pnl)
+                position = None
+                peak = max(peak, equity)
+                max_drawdown = max(max_drawdown, (peak - equity) / peak if peak else 0.0)
+
+        pending.extend(_signals_at(strategies, strategy_key, i))
+        pending = [s for s in pending if is_signal_active(s, bar.start_time)]
+        if position or not pending:
+            continue
+
+        direction, filtered, _ = resolve_direction(pending, config, verbose=False)
+        if not direction:
+            continue
+        decision = evaluate_categorized(categorize_signals(filtered), direction, config, verbose=False)
+        if not decision["approved"]:
+            continue
+
+        notional = equity * config["risk_pct"]
+        if notional < config["min_notional"] or bar.close <= 0:
+            continue
+        position = open_position(bar.close, str(direction), notional / bar.close, config, opened_at=bar.start_time)
+        pending = []
+
+    # Posición abierta al final de la ventana: se cierra al último close
+    if position:
+        pnl = position_pnl(position, bars[end - 1].close)
+        equity += pnl
+        pnls.append(pnl)
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, (peak - equity) / peak if peak else 0.0)
+
+    wins = [p for p in pnls if p > 0]
+    return {
+        "return_pct": (equity - capital) / capital * 100,
+        "trades": len(pnls),
+        "win_rate": len(wins) / len(pnls) * 100 if pnls else 0.0,
+        "max_drawdown_pct": max_drawdown * 100,
+    }
+
+
+def _evaluate_group(strategy_params: dict, risk_candidates: list, windows: list) -> list:
+    """Evalúa todos los candidatos que comparten parámetros de estrategia (mismas señales)."""
+    strategies = build_strategies(_WORKER["open_strategies"], strategy_params)
+    strategy_key = tuple(sorted(strategy_params.items()))
+    rows = []
+
+    try:
+        for risk_params in risk_candidates:
+            config = build_risk_config(_WORKER["base_settings"], risk_params)
+            per_window = []
+            for window_id, (is_start, is_end, oos_start, oos_end) in enumerate(windows):
+                in_sample = _simulate_window(strategies, strategy_key, config, is_start, is_end)
+                out_sample = _simulate_window(strategies, strategy_key, config, oos_start, oos_end)
+                per_window.append((window_id, in_sample, out_sample))
+
+            params = {**strategy_params, **{f"RiskSettings.{k}": v for k, v in risk_params.items()}}
+            rows.append({"params": params, "windows": per_window})
+    finally:
+        # Cada strategy_key pertenece a un solo grupo: sus señales no se vuelven a pedir
+        _WORKER["signal_cache"].pop(strategy_key, None)
+
+    return rows
+
+
+# ---------- orquestación ----------
+
+def run_walk_forward(symbol_str, timeframe, start, end, param_space: dict, strategy_names=None,
+                     search="grid", n_samples=50, seed=None, in_sample=500, out_of_sample=100,
+                     step=None, capital=10000, risk_settings_name="default", max_workers=None):
+    """
+    Evalúa el espacio de parámetros sobre ventanas walk-forward y devuelve un
+    DataFrame ordenado por retorno out-of-sample promedio.
+    """
+    symbol = Symbol.objects.get(symbol=symbol_str.replace("-", ""))
+    open_strategies = OpenStrategy.objects.all()
+    if strategy_names:
+        open_strategies = open_strategies.filter(name__in=strategy_names)
+    open_strategies = list(open_strategies)
+    base_settings = RiskSettings.objects.filter(name=risk_settings_name).first() or RiskSettings(name=risk_settings_name)
+
+    if search == "grid":
+        candidates = build_param_grid(param_space)
+    elif search == "random":
+        candidates = sample_param_space(param_space, n_samples, seed=seed)
+    else:
+        raise ValueError(f"❌ Tipo de búsqueda inválido: {search}")
+
+    # Agrupar candidatos por parámetros de estrategia → cada grupo genera señales una sola vez
+    groups = {}
+    for params in candidates:
+        strategy_params, risk_params = split_params(params)
+        key = tuple(sorted(strategy_params.items()))
+        groups.setdefault(key, (strategy_params, []))[1].append(risk_params)
+
+    with SharedBarArrays.create(symbol, timeframe, start, end) as shared:
+        windows = walk_forward_windows(len(shared), in_sample, out_of_sample, step)
+        if not windows:
+            raise ValueError(
+                f"❌ {len(shared)} velas no alcanzan para una ventana ({in_sample} IS + {out_of_sample} OOS)"
+            )
+
+        print(f"🧪 Walk-forward {symbol.symbol} {timeframe}: {len(candidates)} candidatos, "
+              f"{len(groups)} grupos de señales, {len(windows)} ventanas")
+
+        # Las conexiones no deben heredarse en los procesos hijos
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared.manifest, symbol, open_strategies, base_settings, capital),
+        ) as pool:
+            futures = [
+                pool.submit(_evaluate_group, strategy_params, risk_candidates, windows)
+                for strategy_params, risk_candidates in groups.values()
+            ]
+            results = [row for future in futures for row in future.result()]
+
+    return rank_results(results, len(windows))
+
+
+def rank_results(results: list, n_windows: int) -> pd.DataFrame:
+    """Tabla con una fila por candidato, ordenada por retorno OOS promedio."""
+    if not results:
+        return pd.DataFrame()
+
+    # Qué candidato gana el in-sample de cada ventana (el que se "elegiría" en walk-forward)
+    selected = [0] * len(results)
+    for window_id in range(n_windows):
+        best = max(range(len(results)), key=lambda i: results[i]["windows"][window_id][1]["return_pct"])
+        selected[best] += 1
+
+    rows = []
+    for idx, result in enumerate(results):
+        in_samples = [w[1] for w in result["windows"]]
+        out_samples = [w[2] for w in result["windows"]]
+        rows.append({
+            **result["params"],
+            "is_return_pct": float(np.mean([m["return_pct"] for m in in_samples])),
+            "oos_return_pct": float(np.mean([m["return_pct"] for m in out_samples])),
+            "oos_return_std": float(np.std([m["return_pct"] for m in out_samples])),
+            "oos_trades": int(sum(m["trades"] for m in out_samples)),
+            "oos_win_rate": float(np.mean([m["win_rate"] for m in out_samples])),
+            "oos_max_drawdown_pct": float(max(m["max_drawdown_pct"] for m in out_samples)),
+            "windows_selected": selected[idx],
+        })
+
+    df = pd.DataFrame(rows).sort_values(["oos_return_pct", "is_return_pct"], ascending=False)
+    df.insert(0, "rank", range(1, len(df) + 1))
+    return df.reset_index(drop=True)
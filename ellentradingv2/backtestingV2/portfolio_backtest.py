@@ -0,0 +1,283 @@
+# backtestingV2/portfolio_backtest.py
+
+"""
+Backtest de portafolio multi-símbolo con capital compartido.
+
+1. Por símbolo (en paralelo, un proceso por símbolo): una query para las
+   columnas OHLCV + indicadores y evaluación de estrategias → señales compactas.
+   Las señales no dependen del estado del portafolio, así que se precalculan.
+2. Un solo loop ordenado por tiempo: heapq.merge de los streams de velas de
+   todos los símbolos sobre un ledger único de cash / posiciones, aplicando
+   las mismas reglas que live (risk.validation.evaluate_trade_rules) sin
+   tocar la DB por evento.
+"""
+
+import heapq
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from django.db import connections
+
+from backtestingV2.optimizer import build_strategies
+from backtestingV2.utils.shared_bars import load_bar_columns
+from backtestingV2.utils.simulation import build_bar_proxies, open_position, update_position, position_pnl
+from core.models import Symbol
+from core.utils.time import from_epoch_ns, is_signal_active
+from risk.context import get_enhanced_default_config
+from risk.decision_engine import resolve_direction, categorize_signals
+from risk.risk_settings import RiskSettings
+from risk.signal_scoring import evaluate_categorized
+from risk.validation import evaluate_trade_rules
+from signals.recent_index import RecentSignalIndex
+from strategies.base.vectorized import vectorized_decisions
+from strategies.models import OpenStrategy
+
+# Cuántos PnL cerrados por símbolo se usan para el multiplicador de volatilidad
+RECENT_PNLS = 20
+
+
+def _symbol_stream(symbol_str, timeframe, start, end, open_strategies):
+    """
+    Worker: carga las velas de un símbolo y evalúa las estrategias.
+    Devuelve columnas de precio + señales como tuplas (bar_index, strategy_id, signal, confidence).
+    """
+    symbol = Symbol.objects.get(symbol=symbol_str)
+    columns = load_bar_columns(symbol, timeframe, start, end)
+    bars = build_bar_proxies(columns)
+    strategies = build_strategies(open_strategies, {})
+
+    # Deduplicación como en vivo, pero en memoria y con el reloj de la vela
+    signal_index = RecentSignalIndex(use_db=False)
+    for strategy in strategies:
+        strategy.signal_index = signal_index
+
+    # Estrategias con generate_signals_vectorized(): una pasada sobre toda la historia
+    precomputed = {}
+    for strategy in strategies:
+        if strategy.generate_signals_vectorized is None:
+            continue
+        try:
+            precomputed[strategy] = dict(vectorized_decisions(strategy, bars, strategy.required_bars - 1))
+        except Exception as e:
+            print(f"⚠️ Vectorizado falló en {strategy.name} ({symbol_str}): {e}. Se evalúa vela a vela.")
+
+    signals = []
+    for i in range(len(bars)):
+        feature_cache = {}  # features de esta vela compartidos entre estrategias
+        signal_index.as_of = from_epoch_ns(columns["time"][i])
+        for strategy in strategies:
+            required = strategy.required_bars
+            if i + 1 < required:
+                continue
+            strategy.feature_cache = feature_cache
+            try:
+                if strategy in precomputed:
+                    decision = precomputed[strategy].get(i)
+                else:
+                    decision = strategy.evaluate(bars[i + 1 - required:i + 1], symbol)
+            except Exception as e:
+                print(f"⚠️ Error en {strategy.name} ({symbol_str}): {e}")
+                continue
+            if decision and not strategy.is_duplicate_signal(symbol, decision.signal_type, execution_mode="backtest"):
+                signal_index.record(symbol, strategy.strategy_instance, decision.signal_type)
+                signals.append((i, strategy.strategy_instance.id, decision.signal_type, decision.confidence or 0))
+
+    prices = {name: columns[name] for name in ("time", "high", "low", "close")}
+    return symbol_str, prices, signals
+
+
+class PortfolioLedger:
+    """
+    Cash + posiciones abiertas + contadores diarios compartidos por todos los símbolos.
+    """
+
+    def __init__(self, capital: float):
+        self.initial_capital = capital
+        self.cash = capital
+        self.positions = {}  # symbol_str → posición (SimpleNamespace)
+        self.daily_counts = defaultdict(lambda: defaultdict(int))  # fecha → symbol_str → trades
+        self.recent_pnls = defaultdict(list)
+        self.closed = []
+        self.peak_equity = capital
+        self.max_drawdown = 0.0
+
+    @property
+    def exposure(self) -> float:
+        return sum(p.notional for p in self.positions.values())
+
+    @property
+    def equity(self) -> float:
+        # Valuado al costo: el cash más lo invertido en posiciones abiertas
+        return self.cash + self.exposure
+
+    def risk_state(self, symbol_str, day) -> dict:
+        counts = self.daily_counts[day]
+        return {
+            "in_position": symbol_str in self.positions,
+            "symbol_trades_today": counts[symbol_str],
+            "total_trades_today": sum(counts.values()),
+            "open_symbols": [p.symbol for p in self.positions.values()],
+            "current_exposure": self.exposure,
+            "recent_pnls": self.recent_pnls[symbol_str],
+        }
+
+    def open(self, symbol, symbol_str, price, direction, amount_usd, config, opened_at, strategy):
+        position = open_position(price, direction, amount_usd / price, config, opened_at=opened_at, strategy=strategy)
+        position.symbol = symbol
+        position.notional = amount_usd
+        self.cash -= amount_usd
+        self.positions[symbol_str] = position
+        self.daily_counts[opened_at.date()][symbol_str] += 1
+
+    def close(self, symbol_str, exit_price, reason, closed_at):
+        position = self.positions.pop(symbol_str)
+        pnl = position_pnl(position, exit_price)
+        self.cash += position.notional + pnl
+
+        pnls = self.recent_pnls[symbol_str]
+        pnls.append(pnl)
+        del pnls[:-RECENT_PNLS]
+
+        self.closed.append({
+            "symbol": symbol_str,
+            "direction": position.direction,
+            "strategy": position.strategy,
+            "entry_price": position.price,
+            "exit_price": exit_price,
+            "notional": position.notional,
+            "pnl": pnl,
+            "reason": reason,
+            "opened_at": position.opened_at,
+            "closed_at": closed_at,
+        })
+
+        self.peak_equity = max(self.peak_equity, self.equity)
+        if self.peak_equity:
+            self.max_drawdown = max(self.max_drawdown, (self.peak_equity - self.equity) / self.peak_equity)
+
+    def summary(self) -> dict:
+        wins = [t for t in self.closed if t["pnl"] > 0]
+        return {
+            "initial_capital": self.initial_capital,
+            "final_equity": round(self.equity, 2),
+            "return_pct": round((self.equity - self.initial_capital) / self.initial_capital * 100, 2),
+            "trades": len(self.closed),
+            "win_rate": round(len(wins) / len(self.closed) * 100, 2) if self.closed else 0.0,
+            "max_drawdown_pct": round(self.max_drawdown * 100, 2),
+        }
+
+
+def run_portfolio_backtest(symbols, timeframe, start, end, capital=10000, strategy_ids=None,
+                           risk_settings_name="default", max_workers=None):
+    """
+    Corre el backtest de portafolio y devuelve (summary, trades).
+    """
+    symbols = [s.replace("-", "").replace("/", "") for s in symbols]
+    symbol_objs = {s.symbol: s for s in Symbol.objects.filter(symbol__in=symbols)}
+    missing = set(symbols) - set(symbol_objs)
+    if missing:
+        raise ValueError(f"❌ Símbolos no encontrados en DB: {sorted(missing)}")
+
+    open_strategies = OpenStrategy.objects.filter(timeframe=timeframe)
+    if strategy_ids:
+        open_strategies = open_strategies.filter(id__in=strategy_ids)
+    open_strategies = list(open_strategies)
+    strategies_by_id = {s.id: s for s in open_strategies}
+
+    # Misma config base que el RiskManager, sin los ajustes dinámicos de trades live
+    config = get_enhanced_default_config()
+    settings = RiskSettings.objects.filter(name=risk_settings_name).first()
+    if settings:
+        config.update(settings.as_config_dict())
+
+    # 1️⃣ Streams por símbolo en paralelo
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_symbol_stream, s, timeframe, start, end, open_strategies)
+            for s in symbols
+        ]
+        streams = [f.result() for f in futures]
+
+    prices = {}
+    signals_at = {}
+    for symbol_str, symbol_prices, symbol_signals in streams:
+        prices[symbol_str] = symbol_prices
+        by_bar = defaultdict(list)
+        for bar_index, strategy_id, direction, confidence in symbol_signals:
+            by_bar[bar_index].append((strategy_id, direction, confidence))
+        signals_at[symbol_str] = by_bar
+
+    print(f"📊 Portfolio backtest: {len(symbols)} símbolos, "
+          f"{sum(len(p['time']) for p in prices.values())} velas, "
+          f"{sum(len(s[2]) for s in streams)} señales")
+
+    # 2️⃣ Stream único ordenado por tiempo (heap merge) sobre un ledger compartido
+    ledger = PortfolioLedger(capital)
+    pending = defaultdict(list)
+
+    def events(symbol_str):
+        times = prices[symbol_str]["time"]
+        return ((int(times[i]), symbol_str, i) for i in range(len(times)))
+
+    for time_ns, symbol_str, i in heapq.merge(*(events(s) for s in symbols)):
+        p = prices[symbol_str]
+        bar_time = from_epoch_ns(time_ns)
+        close = float(p["close"][i])
+
+        position = ledger.positions.get(symbol_str)
+        if position:
+            result = update_position(position, float(p["high"][i]), float(p["low"][i]), close)
+            if result:
+                ledger.close(symbol_str, *result, closed_at=bar_time)
+
+        for strategy_id, direction, confidence in signals_at[symbol_str].get(i, ()):
+            strategy = strategies_by_id[strategy_id]
+            pending[symbol_str].append(SimpleNamespace(
+                symbol=symbol_objs[symbol_str],
+                signal=direction,
+                confidence_score=confidence,
+                price=close,
+                strategy=strategy,
+                timeframe=strategy.timeframe,
+                timestamp=bar_time,
+                received_at=bar_time,
+            ))
+
+        active = [s for s in pending[symbol_str] if is_signal_active(s, bar_time)]
+        pending[symbol_str] = active
+        if not active or symbol_str in ledger.positions:
+            continue
+
+        direction, filtered, _ = resolve_direction(active, config, verbose=False)
+        if not direction:
+            continue
+        decision = evaluate_categorized(categorize_signals(filtered), direction, config, verbose=False)
+        if not decision["approved"]:
+            continue
+
+        signal = decision["signal"]
+        ok, amount_or_reason = evaluate_trade_rules(
+            close, signal.symbol, signal.confidence_score or 50, ledger.cash,
+            config["risk_pct"], config["min_notional"],
+            state=ledger.risk_state(symbol_str, bar_time.date()),
+            verbose=False,
+        )
+        if not ok or amount_or_reason > ledger.cash:
+            continue
+
+        ledger.open(
+            signal.symbol, symbol_str, close, str(direction), amount_or_reason, config,
+            opened_at=bar_time, strategy=signal.strategy.name,
+        )
+        pending[symbol_str] = []
+
+    # Posiciones abiertas al final: se cierran al último close de su símbolo
+    for symbol_str in list(ledger.positions):
+        p = prices[symbol_str]
+        ledger.close(symbol_str, float(p["close"][-1]), "end_of_data", closed_at=from_epoch_ns(p["time"][-1]))
+
+    summary = ledger.summary()
+    print(f"🏁 Portfolio backtest terminado: {summary}")
+    return summary, ledger.closed
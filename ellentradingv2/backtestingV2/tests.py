@@ -1,3 +1,146 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from backtestingV2.utils.fetcher import CoinbaseFetcher
+
+
+class _StubCoinbaseHandler(BaseHTTPRequestHandler):
+    """/products/<symbol>/candles: una vela por request en `start`; self.server.script decide fallas."""
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        start = datetime.fromisoformat(params["start"][0])
+        server = self.server
+        with server.lock:
+            attempt = server.attempts.get(start, 0) + 1
+            server.attempts[start] = attempt
+        status, body, headers = server.script(start, attempt)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def _candle(start):
+    t = int(start.timestamp())
+    return json.dumps([[t, 99.0, 101.0, 100.0, 100.5, 10.0]])
+
+
+def _ok(start, attempt):
+    return 200, _candle(start), {}
+
+
+class StubServer:
+    def __init__(self, script=_ok):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubCoinbaseHandler)
+        self.httpd.script = script
+        self.httpd.attempts = {}
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def attempts(self):
+        return self.httpd.attempts
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# 3 chunks de 300 velas de 1m (5h cada uno)
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 1, 1, 15, tzinfo=timezone.utc)
+CHUNK_STARTS = [START.replace(hour=h) for h in (0, 5, 10)]
+
+
+class FetcherStubServerTests(SimpleTestCase):
+    """HistoricalFetcher contra un servidor HTTP local: reintentos, 429 y reanudación por checkpoint."""
+
+    def setUp(self):
+        self.checkpoints = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(FETCH_CHECKPOINT_DIR=self.checkpoints.name)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.checkpoints.cleanup()
+
+    def fetch(self, server, retries=3, resume=True):
+        rows = []
+        fetcher = CoinbaseFetcher(base_url=server.url, max_workers=3, retries=retries, timeout=5)
+        stats = fetcher.fetch_range("BTC-USD", 60, START, END, on_chunk=rows.extend, resume=resume)
+        return stats, rows
+
+    def test_retries_server_errors(self):
+        def flaky(start, attempt):
+            return (500, "{}", {}) if attempt == 1 else _ok(start, attempt)
+
+        with StubServer(flaky) as server:
+            stats, rows = self.fetch(server)
+
+        self.assertTrue(stats["complete"])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(sorted(server.attempts.values()), [2, 2, 2])
+
+    def test_honors_429_retry_after(self):
+        def throttled(start, attempt):
+            return (429, "{}", {"Retry-After": "0"}) if attempt == 1 else _ok(start, attempt)
+
+        with StubServer(throttled) as server:
+            stats, rows = self.fetch(server)
+
+        self.assertTrue(stats["complete"])
+        self.assertEqual(sorted(r["time"] for r in rows), [int(s.timestamp()) for s in CHUNK_STARTS])
+
+    def test_resumes_failed_chunks_from_checkpoint(self):
+        broken = CHUNK_STARTS[1]
+
+        def one_chunk_down(start, attempt):
+            return (503, "{}", {"Retry-After": "0"}) if start == broken else _ok(start, attempt)
+
+        # Mismo servidor en las dos corridas: el checkpoint incluye la base_url
+        with StubServer(one_chunk_down) as server:
+            stats, rows = self.fetch(server, retries=1)
+            self.assertFalse(stats["complete"])
+            self.assertEqual(stats["failed_chunks"], [(broken.isoformat(), CHUNK_STARTS[2].isoformat())])
+            self.assertEqual(len(rows), 2)
+
+            server.httpd.script = _ok
+            server.attempts.clear()
+            stats, rows = self.fetch(server)
+
+        self.assertTrue(stats["complete"])
+        self.assertEqual(stats["skipped_chunks"], 2)
+        self.assertEqual(list(server.attempts), [broken])
+        self.assertEqual(len(rows), 1)
+
+    def test_malformed_payload_is_a_failed_chunk(self):
+        def garbage(start, attempt):
+            return (200, json.dumps({"message": "nope"}), {}) if start == CHUNK_STARTS[0] else _ok(start, attempt)
+
+        with StubServer(garbage) as server:
+            stats, rows = self.fetch(server)
+
+        self.assertFalse(stats["complete"])
+        self.assertEqual(len(stats["failed_chunks"]), 1)
+        self.assertEqual(len(rows), 2)
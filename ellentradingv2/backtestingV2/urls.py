@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import download_historical_data, run_backtest_view
+from .views import download_historical_data, run_backtest_view, OptimizeView, PortfolioBacktestView
 
 urlpatterns = [
     path("download_data/", download_historical_data, name="download_historical_data"),
     path("run_backtest/", run_backtest_view),
+    path("optimize/", OptimizeView.as_view()),
+    path("portfolio_backtest/", PortfolioBacktestView.as_view()),
 
 ]
@@ -0,0 +1,234 @@
+# backtestingV2/utils/bar_store.py
+
+"""
+Store columnar en disco para velas históricas + indicadores.
+
+Un directorio por (symbol, timeframe):
+
+    <BAR_STORE_DIR>/<SYMBOL>/<timeframe>/
+        meta.json        → largo, dtype de cada columna, rango cubierto, data_version
+        time.bin         → int64 epoch ns (UTC), ordenado, sin duplicados
+        open.bin ...     → float64 (NaN = sin dato)
+
+Los archivos son arrays crudos (little-endian) que se leen con np.memmap:
+cargar un año de velas de 1m no crea objetos Python por fila y un rango
+se resuelve con searchsorted sobre la columna time.
+
+El store es append-only: una vela que cambia en la DB después de importarla no
+se actualiza acá. Por eso meta.json guarda la data_version de la DB (cantidad
+de velas + última modificación de velas / indicadores) del rango sincronizado;
+los lectores la comparan con la actual y, si difiere, leen de la DB.
+"""
+
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from core.utils.time import from_epoch_ns, to_epoch_ns
+
+_TIME_DTYPE = "<i8"
+_VALUE_DTYPE = "<f8"
+
+
+def get_store_dir() -> Path:
+    return Path(getattr(settings, "BAR_STORE_DIR", Path(settings.BASE_DIR) / "data" / "bar_store"))
+
+
+class BarStore:
+    def __init__(self, symbol: str, timeframe: str, root=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.path = Path(root or get_store_dir()) / symbol / timeframe
+        self._meta = None
+
+    # ---------- metadata ----------
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    def exists(self) -> bool:
+        return self.meta_path.exists()
+
+    @property
+    def meta(self) -> dict:
+        if self._meta is None:
+            self._meta = json.loads(self.meta_path.read_text())
+        return self._meta
+
+    def _write_meta(self, meta: dict):
+        # Escritura atómica: meta.json define cuántas filas son válidas en cada columna
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.meta_path)
+        self._meta = meta
+
+    def __len__(self):
+        return self.meta["length"] if self.exists() else 0
+
+    @property
+    def columns(self) -> list:
+        return list(self.meta["columns"].keys())
+
+    def covers(self, start, end, data_version=None) -> bool:
+        """
+        True si el store tiene sincronizado todo el rango [start, end]. Con
+        data_version (la actual de la DB para synced_range()) además exige que
+        coincida con la guardada al sincronizar.
+        """
+        if not self.exists() or self.meta["synced_from"] is None:
+            return False
+        if self.meta["synced_from"] > to_epoch_ns(start) or self.meta["synced_to"] < to_epoch_ns(end):
+            return False
+        return data_version is None or self.meta.get("data_version") == data_version
+
+    def synced_range(self):
+        """(desde, hasta) sincronizados como datetimes UTC, o None si nunca se sincronizó."""
+        if not self.exists() or self.meta["synced_from"] is None:
+            return None
+        return from_epoch_ns(self.meta["synced_from"]), from_epoch_ns(self.meta["synced_to"])
+
+    def set_data_version(self, data_version):
+        meta = dict(self.meta)
+        meta["data_version"] = data_version
+        self._write_meta(meta)
+
+    # ---------- lectura ----------
+
+    def _column_file(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def column(self, name: str) -> np.ndarray:
+        dtype = self.meta["columns"][name]
+        length = self.meta["length"]
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_file(name), dtype=dtype, mode="r", shape=(length,))
+
+    def slice_for(self, start=None, end=None) -> slice:
+        times = self.column("time")
+        lo = 0 if start is None else int(np.searchsorted(times, to_epoch_ns(start), side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, to_epoch_ns(end), side="right"))
+        return slice(lo, hi)
+
+    def read(self, start=None, end=None, columns=None) -> dict:
+        """
+        Columnas del rango [start, end] como vistas memmap (sin copia).
+        `columns` limita qué columnas se devuelven ("time" siempre va incluida).
+        """
+        names = self.columns if columns is None else ["time", *[c for c in columns if c != "time"]]
+        unknown = [n for n in names if n not in self.meta["columns"]]
+        if unknown:
+            raise ValueError(f"❌ Columnas no presentes en el store {self.symbol} {self.timeframe}: {unknown}")
+
+        window = self.slice_for(start, end)
+        return {name: self.column(name)[window] for name in names}
+
+    # ---------- escritura ----------
+
+    def append(self, columns: dict, synced_from=None, synced_to=None) -> int:
+        """
+        Agrega filas al final. Solo se agregan filas con time posterior a la última
+        guardada (idempotente ante re-imports). Columnas nuevas se rellenan con NaN
+        hacia atrás; columnas existentes que no vengan se rellenan con NaN.
+        Devuelve la cantidad de filas agregadas.
+        """
+        times = np.asarray(columns["time"], dtype=_TIME_DTYPE)
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        keep = np.ones(len(times), dtype=bool)
+        keep[1:] = times[1:] != times[:-1]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self.exists():
+            meta = dict(self.meta)
+            meta["columns"] = dict(meta["columns"])
+            if meta["length"]:
+                keep &= times > self.column("time")[-1]
+        else:
+            meta = {
+                "symbol": self.symbol,
+                "timeframe": self.timeframe,
+                "length": 0,
+                "columns": {"time": _TIME_DTYPE},
+                "synced_from": None,
+                "synced_to": None,
+                "data_version": None,
+            }
+
+        rows = order[keep]
+        n_new = len(rows)
+        length = meta["length"]
+
+        for name, values in columns.items():
+            if name == "time":
+                continue
+            if name not in meta["columns"]:
+                # Columna nueva: NaN para las filas que ya existían
+                np.full(length, np.nan, dtype=_VALUE_DTYPE).tofile(self._column_file(name))
+                meta["columns"][name] = _VALUE_DTYPE
+
+        # Descartar bytes de un append previo que no llegó a actualizar meta.json
+        for name, dtype in meta["columns"].items():
+            column_file = self._column_file(name)
+            if column_file.exists():
+                os.truncate(column_file, length * np.dtype(dtype).itemsize)
+
+        if n_new:
+            with open(self._column_file("time"), "ab") as f:
+                times[keep].tofile(f)
+            for name, dtype in meta["columns"].items():
+                if name == "time":
+                    continue
+                if name in columns:
+                    data = np.asarray(columns[name], dtype=dtype)[rows]
+                else:
+                    data = np.full(n_new, np.nan, dtype=dtype)
+                with open(self._column_file(name), "ab") as f:
+                    data.tofile(f)
+
+        meta["length"] = length + n_new
+        # Append-only: el inicio del rango cubierto se fija con la primera importación
+        if synced_from is not None and meta["synced_from"] is None:
+            meta["synced_from"] = to_epoch_ns(synced_from)
+        if synced_to is not None:
+            ns = to_epoch_ns(synced_to)
+            meta["synced_to"] = ns if meta["synced_to"] is None else max(meta["synced_to"], ns)
+
+        self._write_meta(meta)
+        return n_new
+
+
+def sync_store(store: BarStore, load_columns, data_version, start, end, chunk_days=30, log=print) -> int:
+    """
+    Importa [start, end] al store por chunks de chunk_days con load_columns(start, end)
+    (desde la DB) y guarda data_version(desde, hasta) del rango sincronizado.
+
+    Si el store ya estaba desactualizado respecto de la DB (su data_version no
+    coincide) no se marca como al día: append-only no corrige las velas viejas,
+    así que los lectores siguen yendo a la DB hasta que se lo reconstruya.
+    Devuelve la cantidad de velas agregadas.
+    """
+    synced = store.synced_range()
+    fresh = synced is None or store.meta.get("data_version") == data_version(*synced)
+    if not fresh:
+        log(f"⚠️ El store {store.symbol} [{store.timeframe}] no coincide con la DB (velas cambiadas después de "
+            f"importarlas): se leerá de la DB. Para reconstruirlo borrá {store.path} y volvé a importar.")
+
+    total = 0
+    cursor = start
+    delta = timedelta(days=chunk_days)
+    while cursor < end:
+        chunk_end = min(cursor + delta, end)
+        added = store.append(load_columns(cursor, chunk_end), synced_from=start, synced_to=chunk_end)
+        total += added
+        log(f"   • {cursor.date()} → {chunk_end.date()}: +{added} velas")
+        cursor = chunk_end
+
+    if fresh and store.exists():
+        store.set_data_version(data_version(*store.synced_range()))
+    return total
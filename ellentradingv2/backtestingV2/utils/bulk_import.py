@@ -0,0 +1,232 @@
+# backtestingV2/utils/bulk_import.py
+
+"""
+Pipeline de importación masiva de velas + indicadores históricos.
+
+- Una sola query por rango para saber qué velas ya existen (dedupe).
+- Velas e indicadores se escriben con bulk_create(update_conflicts=True)
+  en batches, dentro de una transacción por batch.
+- Devuelve estadísticas de throughput para poder comparar corridas.
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from backtestingV2.models import HistoricalMarketDataPoint, HistoricalLiveTechnicalIndicator
+from backtestingV2.utils.historical_indicators import calculate_all_historical_indicators
+from backtestingV2.utils.shared_bars import OHLCV_COLUMNS, INDICATOR_COLUMNS
+from core.utils.time import timeframe_to_timedelta
+from strategies.indicators.registry import required_warmup
+
+DEFAULT_BATCH_SIZE = 5000
+
+_TIME_ALIASES = ("time", "timestamp", "start_time", "date", "datetime")
+
+
+def read_bars_file(path) -> pd.DataFrame:
+    """
+    Lee un CSV o Parquet local con columnas time/open/high/low/close/volume
+    (acepta timestamp / start_time / date como alias de time).
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    elif path.suffix.lower() in (".csv", ".gz"):
+        df = pd.read_csv(path)
+    else:
+        raise ValueError(f"❌ Formato no soportado: {path.suffix} (usar .csv o .parquet)")
+
+    df.columns = [c.lower() for c in df.columns]
+    time_col = next((c for c in _TIME_ALIASES if c in df.columns), None)
+    if time_col is None:
+        raise ValueError(f"❌ {path.name} no tiene columna de tiempo ({', '.join(_TIME_ALIASES)})")
+
+    df = df.rename(columns={time_col: "time"})
+    missing = [c for c in OHLCV_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ {path.name} no tiene las columnas {missing}")
+
+    return normalize_bars_df(df)
+
+
+def normalize_bars_df(df: pd.DataFrame) -> pd.DataFrame:
+    """time en UTC aware, ordenado y sin duplicados."""
+    df = df.copy()
+    if np.issubdtype(df["time"].dtype, np.number):
+        df["time"] = pd.to_datetime(df["time"], unit="s", utc=True)
+    else:
+        df["time"] = pd.to_datetime(df["time"], utc=True)
+    return df.sort_values("time").drop_duplicates("time", keep="last").reset_index(drop=True)
+
+
+def existing_bar_ids(symbol, timeframe: str, start, end) -> dict:
+    """{start_time: id} de las velas ya guardadas en el rango, con una sola query."""
+    return dict(
+        HistoricalMarketDataPoint.objects.filter(
+            symbol=symbol,
+            timeframe=timeframe,
+            start_time__gte=start,
+            start_time__lte=end
+        ).values_list("start_time", "id")
+    )
+
+
+def _clean(value):
+    if value is None:
+        return None
+    try:
+        return None if np.isnan(value) else float(value)
+    except TypeError:
+        return value
+
+
+def bulk_upsert_bars(df: pd.DataFrame, symbol, timeframe: str, source: str, batch_size=DEFAULT_BATCH_SIZE) -> int:
+    bar_duration = timeframe_to_timedelta(timeframe)
+    times = df["time"].dt.to_pydatetime()
+    values = {c: df[c].to_numpy(dtype=np.float64) for c in OHLCV_COLUMNS}
+    written = 0
+
+    for lo in range(0, len(df), batch_size):
+        hi = min(lo + batch_size, len(df))
+        with transaction.atomic():
+            HistoricalMarketDataPoint.objects.bulk_create(
+                [
+                    HistoricalMarketDataPoint(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        start_time=times[i],
+                        end_time=times[i] + bar_duration,
+                        is_closed=True,
+                        source=source,
+                        **{c: float(values[c][i]) for c in OHLCV_COLUMNS}
+                    )
+                    for i in range(lo, hi)
+                ],
+                update_conflicts=True,
+                unique_fields=["symbol", "timeframe", "start_time"],
+                # received_at también: es la "última modificación" que mira data_version (BarStore)
+                update_fields=[*OHLCV_COLUMNS, "end_time", "is_closed", "source", "received_at"],
+            )
+        written += hi - lo
+    return written
+
+
+def bulk_upsert_indicators(df: pd.DataFrame, bar_ids: dict, batch_size=DEFAULT_BATCH_SIZE) -> int:
+    columns = [c for c in INDICATOR_COLUMNS if c in df.columns]
+    if not columns:
+        return 0
+
+    times = df["time"].dt.to_pydatetime()
+    values = {c: df[c].to_numpy() for c in columns}
+    rows = [i for i in range(len(df)) if times[i] in bar_ids]
+    written = 0
+
+    for lo in range(0, len(rows), batch_size):
+        chunk = rows[lo:lo + batch_size]
+        with transaction.atomic():
+            HistoricalLiveTechnicalIndicator.objects.bulk_create(
+                [
+                    HistoricalLiveTechnicalIndicator(
+                        market_data_id=bar_ids[times[i]],
+                        **{c: _clean(values[c][i]) for c in columns}
+                    )
+                    for i in chunk
+                ],
+                update_conflicts=True,
+                unique_fields=["market_data"],
+                update_fields=[*columns, "created_at"],
+            )
+        written += len(chunk)
+    return written
+
+
+def import_bars_dataframe(df: pd.DataFrame, symbol, timeframe: str, source="bulk_import",
+                          with_indicators=True, overwrite=False, batch_size=DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Importa un DataFrame OHLCV (time, open, high, low, close, volume).
+
+    - overwrite=False: solo se insertan velas que no existen (las existentes no se tocan).
+    - with_indicators: calcula indicadores sobre las velas guardadas del rango con
+      prefijo de warm-up (recompute_indicators) y los escribe para las velas nuevas
+      (todas las del rango con overwrite=True).
+    """
+    t0 = perf_counter()
+    df = normalize_bars_df(df)
+    if df.empty:
+        return {"rows": 0, "new_bars": 0, "written_bars": 0, "indicators": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+
+    start, end = df["time"].iloc[0].to_pydatetime(), df["time"].iloc[-1].to_pydatetime()
+    existing = existing_bar_ids(symbol, timeframe, start, end)
+
+    times = df["time"].dt.to_pydatetime()
+    is_new = np.fromiter((t not in existing for t in times), dtype=bool, count=len(times))
+    bars_df = df if overwrite else df[is_new]
+
+    written_bars = bulk_upsert_bars(bars_df, symbol, timeframe, source, batch_size=batch_size) if len(bars_df) else 0
+    t_bars = perf_counter()
+
+    indicators = 0
+    if with_indicators and written_bars:
+        # Sobre el OHLCV guardado (con overwrite=False las velas existentes conservan el suyo)
+        only = None if overwrite else set(times[is_new])
+        indicators = recompute_indicators(symbol, timeframe, start, end, batch_size=batch_size, only=only)
+
+    elapsed = perf_counter() - t0
+    stats = {
+        "rows": len(df),
+        "new_bars": int(is_new.sum()),
+        "written_bars": written_bars,
+        "indicators": indicators,
+        "bars_seconds": round(t_bars - t0, 3),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(df) / elapsed, 1) if elapsed else 0.0,
+    }
+    print(f"📥 Import {symbol} [{timeframe}]: {stats['rows']} filas, {stats['new_bars']} nuevas, "
+          f"{indicators} indicadores en {stats['seconds']}s ({stats['rows_per_sec']} filas/s)")
+    return stats
+
+
+def warmup_rows(symbol, timeframe: str, start, count) -> list:
+    """Las `count` velas guardadas anteriores a start (id, time, OHLCV), en orden cronológico."""
+    rows = (
+        HistoricalMarketDataPoint.objects
+        .filter(symbol=symbol, timeframe=timeframe, start_time__lt=start)
+        .order_by("-start_time")
+        .values_list("id", "start_time", *OHLCV_COLUMNS)[:count]
+    )
+    return list(rows)[::-1]
+
+
+def recompute_indicators(symbol, timeframe: str, start, end, batch_size=DEFAULT_BATCH_SIZE, only=None) -> int:
+    """
+    Recalcula y upsertea los indicadores de las velas ya guardadas en [start, end]
+    (una query para las velas + bulk upsert), p.ej. después de importar por chunks.
+
+    Se calcula con un prefijo de required_warmup() velas guardadas antes de start,
+    así las primeras velas del rango (sma_200, ichimoku, macd...) quedan igual que
+    en un cálculo sobre toda la historia; solo se escriben las velas del rango.
+    only: start_times a escribir (None = todas las del rango).
+    """
+    rows = list(
+        HistoricalMarketDataPoint.objects.filter(
+            symbol=symbol,
+            timeframe=timeframe,
+            start_time__gte=start,
+            start_time__lte=end
+        ).order_by("start_time").values_list("id", "start_time", *OHLCV_COLUMNS)
+    )
+    if not rows:
+        return 0
+
+    bar_ids = {t: i for i, t, *_ in rows if only is None or t in only}
+    if not bar_ids:
+        return 0
+
+    prefix = warmup_rows(symbol, timeframe, start, required_warmup())
+    df = pd.DataFrame(prefix + rows, columns=["id", "time", *OHLCV_COLUMNS])
+    df = calculate_all_historical_indicators(df.drop(columns="id"), context_label=f"{symbol} {timeframe}")
+    return bulk_upsert_indicators(df.iloc[len(prefix):].reset_index(drop=True), bar_ids, batch_size=batch_size)
@@ -0,0 +1,291 @@
+# backtestingV2/utils/fetcher.py
+
+"""
+Fetcher histórico concurrente y reanudable.
+
+- Los chunks de un rango se piden en paralelo (ThreadPoolExecutor) sobre una
+  requests.Session con pool keep-alive.
+- Un TokenBucket por exchange (compartido entre símbolos del mismo proceso)
+  limita la tasa de requests a lo que permite el exchange.
+- Cada chunk completado se persiste (callback on_chunk) y se anota en un
+  checkpoint JSON: una re-ejecución solo pide los chunks pendientes.
+- Un chunk que falla (request, payload o on_chunk) no aborta el resto: queda
+  pendiente para la próxima corrida.
+- base_url es configurable, así se puede apuntar a un servidor HTTP local de prueba.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TokenBucket:
+    """Rate limiter thread-safe: `rate` tokens por segundo, ráfagas de hasta `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Un bucket por exchange y proceso, compartido por todos los fetchers de ese exchange
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(exchange: str, rate: float, capacity: int) -> TokenBucket:
+    with _BUCKETS_LOCK:
+        if exchange not in _BUCKETS:
+            _BUCKETS[exchange] = TokenBucket(rate, capacity)
+        return _BUCKETS[exchange]
+
+
+def get_checkpoint_dir() -> Path:
+    return Path(getattr(settings, "FETCH_CHECKPOINT_DIR", Path(settings.BASE_DIR) / "data" / "fetch_checkpoints"))
+
+
+class Checkpoint:
+    """Chunks completados de un (exchange, símbolo, timeframe, rango), persistidos en JSON."""
+
+    def __init__(self, key: str):
+        self.path = get_checkpoint_dir() / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+        self.key = key
+        self._lock = threading.Lock()
+        self.done = set()
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            self.done = set(data.get("done", []))
+
+    def mark(self, chunk_id: str):
+        with self._lock:
+            self.done.add(chunk_id)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"key": self.key, "done": sorted(self.done)}))
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+        self.done = set()
+
+
+class HistoricalFetcher:
+    """
+    Base: parte el rango en chunks, los pide en paralelo bajo el token bucket y
+    llama on_chunk(rows) por cada chunk recibido. Las subclases definen
+    chunk_span(), request_chunk() y parse().
+    """
+
+    exchange = None
+    default_base_url = None
+    rate_per_sec = 5.0
+    burst = 5
+
+    def __init__(self, base_url=None, max_workers=8, timeout=15, retries=3):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.bucket = get_bucket(self.exchange, self.rate_per_sec, self.burst)
+        self.session = self._build_session(retries)
+
+    def _build_session(self, retries: int) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    # ---------- a implementar por exchange ----------
+
+    def chunk_span(self, granularity: int) -> timedelta:
+        raise NotImplementedError
+
+    def request_chunk(self, symbol: str, granularity: int, start: datetime, end: datetime):
+        raise NotImplementedError
+
+    def parse(self, payload) -> list:
+        raise NotImplementedError
+
+    # ---------- orquestación ----------
+
+    def chunks(self, granularity: int, start: datetime, end: datetime) -> list:
+        span = self.chunk_span(granularity)
+        chunks = []
+        cursor = start
+        while cursor < end:
+            chunk_end = min(cursor + span, end)
+            chunks.append((cursor, chunk_end))
+            cursor = chunk_end
+        return chunks
+
+    def _fetch_chunk(self, symbol, granularity, start, end) -> list:
+        self.bucket.acquire()
+        payload = self.request_chunk(symbol, granularity, start, end)
+        return self.parse(payload)
+
+    def fetch_range(self, symbol: str, granularity: int, start: datetime, end: datetime, on_chunk, resume=True) -> dict:
+        """
+        Pide todos los chunks pendientes de [start, end). on_chunk(rows) se llama
+        desde el hilo principal (persistencia serializada). Devuelve estadísticas.
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+
+        checkpoint = Checkpoint(f"{self.exchange}|{self.base_url}|{symbol}|{granularity}|{start.isoformat()}|{end.isoformat()}")
+        if not resume:
+            checkpoint.clear()
+
+        all_chunks = self.chunks(granularity, start, end)
+        pending = [(s, e) for s, e in all_chunks if s.isoformat() not in checkpoint.done]
+        print(f"📡 {self.exchange} {symbol} [{granularity}s]: {len(pending)}/{len(all_chunks)} chunks pendientes")
+
+        t0 = time.perf_counter()
+        rows_total = 0
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._fetch_chunk, symbol, granularity, s, e): (s, e) for s, e in pending}
+            for future in as_completed(futures):
+                s, e = futures[future]
+                # Cualquier error del chunk (red, payload malformado, on_chunk) lo deja
+                # pendiente en el checkpoint sin abortar el resto
+                try:
+                    rows = future.result()
+                except Exception as exc:
+                    print(f"⚠️ Chunk {s} → {e} falló: {exc}")
+                    failed.append((s.isoformat(), e.isoformat()))
+                    continue
+
+                try:
+                    if rows:
+                        on_chunk(rows)
+                except Exception as exc:
+                    print(f"⚠️ Chunk {s} → {e} no se pudo guardar: {exc}")
+                    failed.append((s.isoformat(), e.isoformat()))
+                    continue
+                rows_total += len(rows)
+                checkpoint.mark(s.isoformat())
+
+        elapsed = time.perf_counter() - t0
+        stats = {
+            "chunks": len(all_chunks),
+            "fetched_chunks": len(pending) - len(failed),
+            "skipped_chunks": len(all_chunks) - len(pending),
+            "failed_chunks": failed,
+            "rows": rows_total,
+            "seconds": round(elapsed, 3),
+            "complete": not failed,
+        }
+        if not failed:
+            checkpoint.clear()
+        print(f"✅ {self.exchange} {symbol}: {rows_total} velas en {elapsed:.1f}s, {len(failed)} chunks fallidos")
+        return stats
+
+
+class CoinbaseFetcher(HistoricalFetcher):
+    exchange = "coinbase"
+    default_base_url = "https://api.exchange.coinbase.com"
+    rate_per_sec = 10.0  # límite público de Coinbase Exchange
+    burst = 10
+    MAX_CANDLES = 300  # Coinbase devuelve como máximo 300 velas por request
+
+    def __init__(self, base_url=None, **kwargs):
+        base_url = base_url or getattr(settings, "COINBASE_REST_URL", None)
+        super().__init__(base_url=base_url, **kwargs)
+
+    def chunk_span(self, granularity: int) -> timedelta:
+        return timedelta(seconds=granularity * self.MAX_CANDLES)
+
+    def request_chunk(self, symbol, granularity, start, end):
+        r = self.session.get(
+            f"{self.base_url}/products/{symbol}/candles",
+            params={"start": start.isoformat(), "end": end.isoformat(), "granularity": granularity},
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def parse(self, payload) -> list:
+        rows = []
+        for t, low, high, open_, close, volume in payload:
+            rows.append({"time": t, "open": open_, "high": high, "low": low, "close": close, "volume": volume})
+        return rows
+
+
+class AlpacaStockFetcher(HistoricalFetcher):
+    exchange = "alpaca"
+    default_base_url = "https://data.alpaca.markets"
+    rate_per_sec = 3.0  # 200 requests / minuto en el plan gratuito
+    burst = 3
+    MAX_BARS = 10000
+
+    _TIMEFRAMES = {60: "1Min", 300: "5Min", 900: "15Min", 1800: "30Min", 3600: "1Hour", 86400: "1Day"}
+
+    def __init__(self, api_key, api_secret, base_url=None, **kwargs):
+        base_url = base_url or getattr(settings, "ALPACA_DATA_URL", None)
+        super().__init__(base_url=base_url, **kwargs)
+        self.session.headers.update({"APCA-API-KEY-ID": api_key, "APCA-API-SECRET-KEY": api_secret})
+
+    def chunk_span(self, granularity: int) -> timedelta:
+        return timedelta(seconds=granularity * self.MAX_BARS)
+
+    def request_chunk(self, symbol, granularity, start, end):
+        bars = []
+        page_token = None
+        while True:
+            params = {
+                "timeframe": self._TIMEFRAMES[granularity],
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "limit": self.MAX_BARS,
+            }
+            if page_token:
+                params["page_token"] = page_token
+                self.bucket.acquire()
+            r = self.session.get(f"{self.base_url}/v2/stocks/{symbol}/bars", params=params, timeout=self.timeout)
+            r.raise_for_status()
+            payload = r.json()
+            bars.extend(payload.get("bars") or [])
+            page_token = payload.get("next_page_token")
+            if not page_token:
+                return bars
+
+    def parse(self, payload) -> list:
+        return [
+            {"time": b["t"], "open": b["o"], "high": b["h"], "low": b["l"], "close": b["c"], "volume": b["v"]}
+            for b in payload
+        ]
@@ -1,18 +1,18 @@
-from backtestingV2.models import HistoricalMarketDataPoint, HistoricalLiveTechnicalIndicator
+from backtestingV2.utils.bulk_import import existing_bar_ids, bulk_upsert_indicators, normalize_bars_df
 import pandas as pd
 
 def save_indicators_from_df(df: pd.DataFrame, symbol, timeframe: str):
-    for idx, row in df.iterrows():
-        start_time = row["time"]
-        try:
-            point = HistoricalMarketDataPoint.objects.get(symbol=symbol, timeframe=timeframe, start_time=start_time)
-            indicators = HistoricalLiveTechnicalIndicator(
-                market_data=point,
-                **{field.name: row.get(field.name) for field in HistoricalLiveTechnicalIndicator._meta.fields
-                   if field.name != "id" and field.name != "market_data"}
-            )
-            indicators.save()
-        except HistoricalMarketDataPoint.DoesNotExist:
-            print(f"❌ No se encontró MarketDataPoint para {symbol} @ {start_time}")
-        except Exception as e:
-            print(f"⚠️ Error al guardar indicadores para {symbol} @ {start_time}: {e}")
+    """
+    Guarda los indicadores del DataFrame para las velas ya existentes:
+    una query por rango para los ids + bulk upsert en batches.
+    """
+    if df.empty:
+        return 0
+    df = normalize_bars_df(df)
+    bar_ids = existing_bar_ids(symbol, timeframe, df["time"].iloc[0].to_pydatetime(), df["time"].iloc[-1].to_pydatetime())
+
+    missing = len(df) - sum(1 for t in df["time"].dt.to_pydatetime() if t in bar_ids)
+    if missing:
+        print(f"❌ No se encontró MarketDataPoint para {missing} filas de {symbol} [{timeframe}]")
+
+    return bulk_upsert_indicators(df, bar_ids)
@@ -0,0 +1,188 @@
+# backtestingV2/utils/shared_bars.py
+
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from django.db.models import Count, Max
+from backtestingV2.models import HistoricalMarketDataPoint, HistoricalLiveTechnicalIndicator
+from core.utils.time import to_epoch_ns
+from backtestingV2.utils.bar_store import BarStore
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Todas las columnas numéricas de indicadores (sin id / market_data / created_at)
+INDICATOR_COLUMNS = [
+    f.name for f in HistoricalLiveTechnicalIndicator._meta.fields
+    if f.name not in ("id", "market_data", "created_at")
+]
+
+_ALIGNMENT = 64  # cada columna arranca alineada a 64 bytes dentro del bloque
+
+
+def _symbol_filter(symbol) -> dict:
+    return {"symbol": symbol} if not isinstance(symbol, str) else {"symbol__symbol": symbol}
+
+
+def partition_data_version(symbol, timeframe: str, start, end) -> dict:
+    """Cantidad de velas + última modificación (velas e indicadores) de la partición en el rango."""
+    stats = HistoricalMarketDataPoint.objects.filter(
+        timeframe=timeframe,
+        start_time__gte=start,
+        start_time__lte=end,
+        **_symbol_filter(symbol)
+    ).aggregate(
+        bars=Count("id"),
+        bars_updated=Max("received_at"),
+        indicators_updated=Max("indicators__created_at"),
+    )
+    return {k: str(v) for k, v in stats.items()}
+
+
+def load_bar_columns(symbol, timeframe: str, start, end, indicators=None, use_store=True) -> dict:
+    """
+    Carga OHLCV + indicadores de (symbol, timeframe, rango) en columnas NumPy.
+
+    Si el BarStore columnar cubre el rango y sigue al día con la DB (data_version
+    del rango sincronizado, una query agregada) se lee de ahí (memmap); si no,
+    una sola query (values_list), sin instanciar modelos del ORM.
+
+    'time' se devuelve como int64 (epoch en nanosegundos, UTC).
+    Indicadores ausentes quedan como NaN.
+    """
+    indicators = INDICATOR_COLUMNS if indicators is None else list(indicators)
+    unknown = [name for name in indicators if name not in INDICATOR_COLUMNS]
+    if unknown:
+        raise ValueError(f"❌ Indicadores desconocidos: {unknown}")
+
+    if use_store:
+        store = BarStore(symbol if isinstance(symbol, str) else symbol.symbol, timeframe)
+        wanted = [*OHLCV_COLUMNS, *indicators]
+        if store.covers(start, end) and all(name in store.meta["columns"] for name in wanted):
+            if store.covers(start, end, data_version=partition_data_version(symbol, timeframe, *store.synced_range())):
+                return store.read(start, end, columns=wanted)
+            print(f"♻️ BarStore {store.symbol} [{timeframe}] desactualizado respecto de la DB: se lee de la DB")
+
+    fields = ["start_time", *OHLCV_COLUMNS, *[f"indicators__{name}" for name in indicators]]
+
+    rows = list(
+        HistoricalMarketDataPoint.objects.filter(
+            timeframe=timeframe,
+            start_time__gte=start,
+            start_time__lte=end,
+            **_symbol_filter(symbol)
+        ).order_by("start_time").values_list(*fields)
+    )
+
+    n = len(rows)
+    columns = {"time": np.fromiter((to_epoch_ns(r[0]) for r in rows), dtype=np.int64, count=n)}
+    for offset, name in enumerate([*OHLCV_COLUMNS, *indicators], start=1):
+        columns[name] = np.fromiter(
+            (np.nan if r[offset] is None else r[offset] for r in rows), dtype=np.float64, count=n
+        )
+    return columns
+
+
+class SharedBarArrays:
+    """
+    Columnas de velas materializadas una sola vez en un bloque de
+    multiprocessing.shared_memory. El proceso dueño crea el bloque con
+    `create` / `from_columns`; los workers reciben `manifest` (picklable)
+    y llaman a `attach`, obteniendo vistas NumPy de solo lectura sin copia.
+    """
+
+    def __init__(self, shm, manifest, owner=False):
+        self._shm = shm
+        self.manifest = manifest
+        self.owner = owner
+        self._columns = {}
+
+        for name, (offset, dtype, length) in manifest["columns"].items():
+            arr = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            if not owner:
+                arr.flags.writeable = False
+            self._columns[name] = arr
+
+    # ---------- construcción ----------
+
+    @classmethod
+    def from_columns(cls, columns: dict, meta=None):
+        layout = {}
+        size = 0
+        for name, arr in columns.items():
+            arr = np.ascontiguousarray(arr)
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            layout[name] = (size, arr.dtype.str, len(arr))
+            size += arr.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        manifest = {"shm_name": shm.name, "columns": layout, "meta": meta or {}}
+        shared = cls(shm, manifest, owner=True)
+
+        for name, arr in columns.items():
+            shared._columns[name][:] = arr
+            shared._columns[name].flags.writeable = False
+
+        return shared
+
+    @classmethod
+    def create(cls, symbol, timeframe: str, start, end, indicators=None):
+        columns = load_bar_columns(symbol, timeframe, start, end, indicators=indicators)
+        meta = {
+            "symbol": symbol if isinstance(symbol, str) else symbol.symbol,
+            "timeframe": timeframe,
+            "start": str(start),
+            "end": str(end),
+        }
+        return cls.from_columns(columns, meta=meta)
+
+    @classmethod
+    def attach(cls, manifest):
+        shm = shared_memory.SharedMemory(name=manifest["shm_name"])
+        # El worker no es dueño del bloque: evitar que el resource_tracker lo borre al salir
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return cls(shm, manifest, owner=False)
+
+    # ---------- acceso ----------
+
+    @property
+    def columns(self):
+        return list(self._columns.keys())
+
+    @property
+    def meta(self):
+        return self.manifest.get("meta", {})
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __len__(self):
+        return len(self._columns["time"]) if "time" in self._columns else 0
+
+    def as_dict(self):
+        return dict(self._columns)
+
+    # ---------- ciclo de vida ----------
+
+    def close(self):
+        self._columns = {}
+        self._shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        self.unlink()
+
+    def __reduce__(self):
+        # Al mandarse a otro proceso viaja solo el manifest, nunca los datos
+        return (SharedBarArrays.attach, (self.manifest,))
@@ -0,0 +1,78 @@
+# backtestingV2/utils/simulation.py
+
+from types import SimpleNamespace
+from risk.utils import generate_exit_parameters
+from strategies.base.bar_window import BarWindow
+
+
+def build_bar_proxies(columns) -> BarWindow:
+    """
+    Envuelve columnas (dict o SharedBarArrays) en una BarWindow: slicear da
+    vistas sin copia y bars[i] devuelve un BarRow con la misma forma que
+    esperan las estrategias (OHLCV + start_time + indicators, NaN → None).
+    """
+    return BarWindow(columns)
+
+
+def open_position(price, direction: str, quantity: float, config: dict, opened_at=None, strategy=None):
+    """
+    Crea una posición en memoria con SL / TP / trailing calculados igual que
+    en vivo (generate_exit_parameters).
+    """
+    direction = direction.lower()
+    exit_params = generate_exit_parameters(price, direction, config)
+    return SimpleNamespace(
+        direction=direction,
+        price=price,
+        quantity=quantity,
+        opened_at=opened_at,
+        strategy=strategy,
+        extreme=price,
+        trailing_active=False,
+        **exit_params
+    )
+
+
+def update_position(position, high: float, low: float, close: float):
+    """
+    Avanza una posición con una vela (high / low / close).
+    Devuelve (exit_price, reason) si la posición se cierra en esta vela o None.
+
+    Orden conservador: primero SL, luego TP, luego trailing.
+    El trailing solo se activa cuando el precio supera trailing_level; desde
+    ahí el stop sigue al extremo a una distancia de trailing_stop (porcentaje).
+    """
+    if position.direction == "buy":
+        if low <= position.stop_loss:
+            return position.stop_loss, "stop_loss"
+        if high >= position.take_profit:
+            return position.take_profit, "take_profit"
+
+        position.extreme = max(position.extreme, high)
+        if not position.trailing_active and position.extreme >= position.trailing_level:
+            position.trailing_active = True
+        if position.trailing_active:
+            trail_price = position.extreme * (1 - position.trailing_stop)
+            if close <= trail_price:
+                return close, "trailing_stop"
+    else:
+        if high >= position.stop_loss:
+            return position.stop_loss, "stop_loss"
+        if low <= position.take_profit:
+            return position.take_profit, "take_profit"
+
+        position.extreme = min(position.extreme, low)
+        if not position.trailing_active and position.extreme <= position.trailing_level:
+            position.trailing_active = True
+        if position.trailing_active:
+            trail_price = position.extreme * (1 + position.trailing_stop)
+            if close >= trail_price:
+                return close, "trailing_stop"
+
+    return None
+
+
+def position_pnl(position, exit_price: float) -> float:
+    if position.direction == "buy":
+        return (exit_price - position.price) * position.quantity
+    return (position.price - exit_price) * position.quantity
@@ -1,12 +1,15 @@
 from django.http import JsonResponse
-from datetime import datetime, timedelta
-import requests
+from datetime import datetime, timezone as dt_timezone
 import pandas as pd
 from core.models import Symbol
-from backtestingV2.models import HistoricalMarketDataPoint
-from backtestingV2.utils.historical_indicators import calculate_all_historical_indicators
-from backtestingV2.utils.save_utils import save_indicators_from_df
+from backtestingV2.utils.bulk_import import import_bars_dataframe, recompute_indicators
+from backtestingV2.utils.fetcher import CoinbaseFetcher
 from backtestingV2.backtest_runner import run_backtest
+from backtestingV2.optimizer import run_walk_forward
+from backtestingV2.portfolio_backtest import run_portfolio_backtest
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
 
 # 🧠 Mapeo de segundos a formato tipo estrategia
 TIMEFRAME_MAP = {
@@ -42,69 +45,35 @@ def download_historical_data(request):
     except Symbol.DoesNotExist:
         return JsonResponse({"error": f"Símbolo '{symbol_clean}' no existe en DB"}, status=404)
 
-    start = datetime.strptime(from_date, "%Y-%m-%d")
-    end = datetime.strptime(to_date, "%Y-%m-%d")
-    delta = timedelta(days=30)
-    cursor = start
-    all_rows = []
-
-    while cursor < end:
-        chunk_end = min(cursor + delta, end)
-        url = f"https://api.exchange.coinbase.com/products/{product_id}/candles"
-        params = {
-            "start": cursor.isoformat(),
-            "end": chunk_end.isoformat(),
-            "granularity": granularity
-        }
+    start = datetime.strptime(from_date, "%Y-%m-%d").replace(tzinfo=dt_timezone.utc)
+    end = datetime.strptime(to_date, "%Y-%m-%d").replace(tzinfo=dt_timezone.utc)
+
+    # 📡 Chunks en paralelo (rate limit + keep-alive); cada chunk se guarda al llegar
+    # y queda en el checkpoint, así un rerun solo pide lo que falta.
+    fetcher = CoinbaseFetcher()
+    stats = fetcher.fetch_range(
+        product_id, granularity, start, end,
+        on_chunk=lambda rows: import_bars_dataframe(
+            pd.DataFrame(rows), symbol_obj, tf_str, source="coinbase_rest", with_indicators=False
+        )
+    )
 
-        try:
-            print(f"📡 Fetching: {url} | {cursor.date()} → {chunk_end.date()}")
-            r = requests.get(url, params=params, timeout=15)
-            r.raise_for_status()
-        except requests.exceptions.ReadTimeout:
-            return JsonResponse({"error": "⏳ Timeout al conectar con Coinbase. Intenta con un rango menor."}, status=504)
-        except requests.exceptions.RequestException as e:
-            return JsonResponse({"error": f"❌ Error de red: {str(e)}"}, status=500)
-
-        candles = r.json()
-        for c in candles:
-            t, low, high, open_, close, volume = c
-            start_time = datetime.utcfromtimestamp(t)
-            end_time = start_time + timedelta(seconds=granularity)
-            HistoricalMarketDataPoint.objects.get_or_create(
-                symbol=symbol_obj,
-                timeframe=tf_str,  # ✅ Ya no es "900s", es "15m"
-                start_time=start_time,
-                defaults={
-                    "open": open_,
-                    "high": high,
-                    "low": low,
-                    "close": close,
-                    "volume": volume,
-                    "end_time": end_time,
-                    "source": "coinbase_rest"
-                }
-            )
-            all_rows.append({
-                "time": start_time,
-                "open": open_,
-                "high": high,
-                "low": low,
-                "close": close,
-                "volume": volume
-            })
-
-        cursor = chunk_end
-
-    if not all_rows:
+    if not stats["complete"]:
+        return JsonResponse({
+            "error": f"⚠️ {len(stats['failed_chunks'])} chunks fallaron; volvé a ejecutar para reanudar.",
+            "stats": stats
+        }, status=502)
+
+    if not stats["rows"] and not stats["skipped_chunks"]:
         return JsonResponse({"error": "No se obtuvieron datos históricos para ese rango."}, status=404)
 
-    # 📈 Calcular indicadores
-    df = pd.DataFrame(sorted(all_rows, key=lambda x: x["time"]))
-    df = calculate_all_historical_indicators(df)
-    save_indicators_from_df(df, symbol_obj, tf_str)  # ✅ usar el mismo tf
+    # 📈 Indicadores sobre la serie completa del rango (solo con el fetch completo)
+    stats["indicators"] = recompute_indicators(symbol_obj, tf_str, start, end)
 
-    return JsonResponse({"message": f"{len(df)} puntos e indicadores procesados para {symbol_str}."})
+    return JsonResponse({
+        "message": f"{stats['rows']} puntos e indicadores procesados para {symbol_str}.",
+        "stats": stats
+    })
 
 
 def run_backtest_view(request):
@@ -126,3 +95,73 @@ def run_backtest_view(request):
     )
 
     return JsonResponse({"message": f"✅ Backtest completado para {symbol}."})
+
+
+class OptimizeView(APIView):
+    """
+    POST JSON:
+    {
+      "symbol": "BTCUSD", "from": "2024-01-01", "to": "2024-06-01", "timeframe": "900",
+      "params": {"StochasticOscillatorStrategy.EXTREME_OVERBOUGHT": [80, 85, 90],
+                 "RiskSettings.sl_buffer_pct": [0.02, 0.03]},
+      "search": "grid" | "random", "n_samples": 50, "seed": 42,
+      "in_sample": 500, "out_of_sample": 100, "step": 100,
+      "capital": 10000, "strategies": ["Stochastic Oscillator Strategy"], "top": 20
+    }
+    """
+
+    def post(self, request):
+        try:
+            data = request.data
+            timeframe = str(data.get("timeframe", "900"))
+            df = run_walk_forward(
+                symbol_str=data["symbol"],
+                timeframe=TIMEFRAME_MAP.get(timeframe, f"{int(timeframe) // 60}m"),
+                start=datetime.strptime(data["from"], "%Y-%m-%d"),
+                end=datetime.strptime(data["to"], "%Y-%m-%d"),
+                param_space=data["params"],
+                strategy_names=data.get("strategies"),
+                search=data.get("search", "grid"),
+                n_samples=int(data.get("n_samples", 50)),
+                seed=data.get("seed"),
+                in_sample=int(data.get("in_sample", 500)),
+                out_of_sample=int(data.get("out_of_sample", 100)),
+                step=data.get("step"),
+                capital=float(data.get("capital", 10000)),
+            )
+        except KeyError as e:
+            return Response({"error": f"Parámetro faltante: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        except (ValueError, Symbol.DoesNotExist) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        top = int(data.get("top", 20))
+        return Response({"results": df.head(top).to_dict(orient="records"), "candidates": len(df)})
+
+
+class PortfolioBacktestView(APIView):
+    """
+    POST JSON:
+    {
+      "symbols": ["BTCUSD", "ETHUSD", "AAPL"], "from": "2024-01-01", "to": "2024-12-31",
+      "timeframe": "300", "capital": 10000, "strategy_ids": [1, 2, 3]
+    }
+    """
+
+    def post(self, request):
+        try:
+            data = request.data
+            timeframe = str(data.get("timeframe", "300"))
+            summary, trades = run_portfolio_backtest(
+                symbols=data["symbols"],
+                timeframe=TIMEFRAME_MAP.get(timeframe, f"{int(timeframe) // 60}m"),
+                start=datetime.strptime(data["from"], "%Y-%m-%d"),
+                end=datetime.strptime(data["to"], "%Y-%m-%d"),
+                capital=float(data.get("capital", 10000)),
+                strategy_ids=data.get("strategy_ids"),
+            )
+        except KeyError as e:
+            return Response({"error": f"Parámetro faltante: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"summary": summary, "trades": trades})
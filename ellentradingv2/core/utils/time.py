@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.utils import timezone
 
 
@@ -36,18 +36,27 @@ def get_active_signals(symbol_name, execution_mode="simulated", current_time=Non
             active_signals.append(s)
     return active_signals
 
+TIMEFRAME_MINUTES = {
+    "1m": 1,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "4h": 240,
+    "1d": 1440,
+    "1D": 1440
+}
+
+
+def timeframe_to_timedelta(timeframe: str) -> timedelta:
+    minutes = TIMEFRAME_MINUTES.get(timeframe)
+    if not minutes:
+        raise ValueError(f"❌ Timeframe desconocido: {timeframe}")
+    return timedelta(minutes=minutes)
+
+
 def normalize_timestamp_by_timeframe(timestamp, timeframe):
-    tf_minutes = {
-        "1m": 1,
-        "5m": 5,
-        "15m": 15,
-        "30m": 30,
-        "1h": 60,
-        "4h": 240,
-        "1d": 1440
-    }
-
-    minutes = tf_minutes.get(timeframe)
+    minutes = TIMEFRAME_MINUTES.get(timeframe)
     if not minutes:
         raise ValueError(f"❌ Timeframe desconocido: {timeframe}")
 
@@ -57,3 +66,18 @@ def normalize_timestamp_by_timeframe(timestamp, timeframe):
     minute = normalized_minutes % 60
 
     return timestamp.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def to_epoch_ns(dt: datetime) -> int:
+    """Convierte un datetime (aware o UTC naive) a epoch en nanosegundos, sin pasar por float."""
+    if timezone.is_naive(dt):
+        dt = dt.replace(tzinfo=dt_timezone.utc)
+    return ((dt - _EPOCH) // timedelta(microseconds=1)) * 1000
+
+
+def from_epoch_ns(ns: int) -> datetime:
+    """Inverso de to_epoch_ns: devuelve un datetime aware en UTC."""
+    return _EPOCH + timedelta(microseconds=int(ns) // 1000)
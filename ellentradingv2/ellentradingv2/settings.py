@@ -111,6 +111,25 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Resultados de backtest memorizados por hash de configuración (ver backtesting/result_cache.py)
+    'backtest_results': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'data' / 'backtest_results',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    # Snapshots que publica el proceso del pipeline para la API de monitoring (ver monitoring/profiler.py)
+    'monitoring': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'data' / 'monitoring',
+        'TIMEOUT': None,
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -152,3 +171,28 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Signal tapes de backtest (señales columnar por symbol / timeframe / versión de estrategias)
+SIGNAL_TAPE_DIR = BASE_DIR / "data" / "signal_tapes"
+
+# Store columnar de velas históricas (ver backtestingV2/utils/bar_store.py)
+BAR_STORE_DIR = BASE_DIR / "data" / "bar_store"
+
+# Fetcher histórico: endpoints (override para servidores stub locales) y checkpoints de chunks
+COINBASE_REST_URL = "https://api.exchange.coinbase.com"
+ALPACA_DATA_URL = "https://data.alpaca.markets"
+FETCH_CHECKPOINT_DIR = BASE_DIR / "data" / "fetch_checkpoints"
+
+# Profiler del pipeline por vela (ver monitoring/profiler.py)
+PROFILER_ENABLED = True
+PROFILER_TRACK_ALLOCATIONS = False  # tracemalloc: costoso, solo para investigar
+PROFILER_PUBLISH_SECONDS = 60
+
+# Latencia del pipeline exchange → trade en formato Prometheus (ver monitoring/metrics.py)
+METRICS_PUBLISH_SECONDS = 15
+
+# Trazas vela → señal → trade (ver monitoring/tracing.py)
+TRACING_ENABLED = True
+TRACE_BUFFER_SIZE = 10_000   # spans en memoria; si no se guardan a tiempo se descartan los más viejos
+TRACE_FLUSH_BATCH = 500
+TRACE_FLUSH_SECONDS = 5
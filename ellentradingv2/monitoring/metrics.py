@@ -0,0 +1,252 @@
+# monitoring/metrics.py
+
+"""
+Latencia del pipeline en vivo, de la hora del exchange hasta el trade, exportada
+en formato texto de Prometheus.
+
+Cada vela abre un timeline con la hora del evento en el exchange (cierre de la
+vela) y la hora de cada transición:
+
+    received → saved → resampled → indicators → strategies → risk → trade
+
+Las etapas que no reciben la vela (estrategias, riesgo, ejecución) marcan el
+timeline en curso del símbolo. Cuenta la primera marca de cada etapa por vela;
+"strategies" es la primera señal persistida o el fin de la evaluación.
+
+Cada marca observa:
+- ellen_pipeline_stage_seconds{stage}: tiempo desde la transición anterior
+- ellen_pipeline_since_exchange_seconds{stage}: tiempo desde el evento del exchange
+Además:
+- ellen_pipeline_lag_seconds{symbol}: ahora - cierre de la última vela que llegó a
+  "strategies" (calculado al scrapear, para alertar si el sistema se atrasa)
+- ellen_pipeline_queue_depth{queue}: colas registradas (register_queue / adjust_queue)
+
+Cada proceso del pipeline (start_stream, startaggregator) publica su estado en el
+cache "monitoring" cada METRICS_PUBLISH_SECONDS bajo su propia clave (ver
+monitoring/process_cache.py); /api/monitoring/metrics/ renderiza todos con un label
+`process` por serie, así los contadores de cada proceso no retroceden.
+"""
+
+import threading
+from datetime import datetime, timezone as dt_timezone
+from time import monotonic
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.utils.time import timeframe_to_timedelta
+from monitoring.process_cache import publish_for_process, published_by_process
+
+STAGES = ("received", "saved", "resampled", "indicators", "strategies", "risk", "trade")
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+METRICS_CACHE_KEY = "metrics:pipeline"
+
+
+def _symbol_label(symbol):
+    return symbol if symbol is None or isinstance(symbol, str) else symbol.symbol
+
+
+def _aware(dt):
+    return dt.replace(tzinfo=dt_timezone.utc) if timezone.is_naive(dt) else dt
+
+
+class Histogram:
+    """Histograma de buckets fijos (conteo por bucket, no acumulado; se acumula al renderizar)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def state(self) -> dict:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "count": self.count, "sum": self.sum}
+
+
+class PipelineMetrics:
+    """
+    pipeline_metrics.bar_received("BTCUSD", "1m", bar_start)   # abre el timeline de la vela
+    pipeline_metrics.mark(symbol, "saved")                      # transición de la vela en curso
+    pipeline_metrics.state()                                    # dict picklable para publicar
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = {}          # símbolo → timeline de la última vela recibida
+        self._stage = {}            # etapa → Histogram (desde la transición anterior)
+        self._since_exchange = {}   # etapa → Histogram (desde el evento del exchange)
+        self._last_processed = {}   # símbolo → cierre de la última vela que llegó a "strategies"
+        self._queues = {}           # nombre → callable que devuelve la profundidad
+        self._queue_counts = {}     # nombre → contador (adjust_queue)
+
+    # ---------- timelines ----------
+
+    def bar_received(self, symbol, timeframe, bar_time, exchange_at=None, at=None):
+        """Abre el timeline de una vela. exchange_at por defecto = cierre de la vela."""
+        bar_time = _aware(bar_time)
+        exchange_at = _aware(exchange_at) if exchange_at else bar_time + timeframe_to_timedelta(timeframe)
+        timeline = SimpleNamespace(
+            symbol=_symbol_label(symbol), timeframe=timeframe, bar_time=bar_time,
+            exchange_at=exchange_at, marks={}, last_at=exchange_at,
+        )
+        with self._lock:
+            self._current[timeline.symbol] = timeline
+        self._mark(timeline, "received", at)
+        return timeline
+
+    def mark(self, symbol, stage, at=None):
+        """Transición `stage` de la vela en curso del símbolo (nada si no hay vela abierta)."""
+        timeline = self._current.get(_symbol_label(symbol))
+        if timeline is not None:
+            self._mark(timeline, stage, at)
+
+    def _mark(self, timeline, stage, at=None):
+        at = at or timezone.now()
+        with self._lock:
+            if stage in timeline.marks:
+                return
+            timeline.marks[stage] = at
+            self._stage.setdefault(stage, Histogram()).observe(max(0.0, (at - timeline.last_at).total_seconds()))
+            self._since_exchange.setdefault(stage, Histogram()).observe(
+                max(0.0, (at - timeline.exchange_at).total_seconds())
+            )
+            timeline.last_at = at
+            if stage == "strategies":
+                previous = self._last_processed.get(timeline.symbol)
+                if previous is None or timeline.exchange_at > previous:
+                    self._last_processed[timeline.symbol] = timeline.exchange_at
+
+    # ---------- colas ----------
+
+    def register_queue(self, name, depth_func):
+        """Cola con tamaño consultable (p.ej. asyncio.Queue.qsize)."""
+        self._queues[name] = depth_func
+
+    def adjust_queue(self, name, delta):
+        """Contador de trabajos pendientes (+1 al encolar, -1 al terminar)."""
+        with self._lock:
+            self._queue_counts[name] = self._queue_counts.get(name, 0) + delta
+
+    # ---------- estado ----------
+
+    def state(self) -> dict:
+        queues = {}
+        for name, depth_func in list(self._queues.items()):
+            try:
+                queues[name] = depth_func()
+            except Exception:
+                continue
+        with self._lock:
+            queues.update(self._queue_counts)
+            return {
+                "published_at": timezone.now().isoformat(),
+                "stage_seconds": {stage: h.state() for stage, h in self._stage.items()},
+                "since_exchange_seconds": {stage: h.state() for stage, h in self._since_exchange.items()},
+                "last_processed": {symbol: at.isoformat() for symbol, at in self._last_processed.items()},
+                "queues": queues,
+            }
+
+
+# Métricas del proceso
+pipeline_metrics = PipelineMetrics()
+
+
+# ---------- publicación ----------
+
+_last_publish = {"at": None}
+
+
+def publish_metrics():
+    """Guarda el estado de este proceso en el cache "monitoring" para el endpoint de la app web."""
+    publish_for_process(METRICS_CACHE_KEY, pipeline_metrics.state())
+
+
+def maybe_publish_metrics():
+    """publish_metrics() como mucho una vez cada METRICS_PUBLISH_SECONDS."""
+    interval = getattr(settings, "METRICS_PUBLISH_SECONDS", 15)
+    last = _last_publish["at"]
+    if last is not None and monotonic() - last < interval:
+        return False
+    _last_publish["at"] = monotonic()
+    publish_metrics()
+    return True
+
+
+def published_metrics() -> dict:
+    """{proceso: state()} de los procesos que publicaron."""
+    return published_by_process(METRICS_CACHE_KEY)
+
+
+# ---------- formato Prometheus ----------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histograms(lines, name, help_text, states, key):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for process, state in sorted(states.items()):
+        histograms = state[key]
+        for stage in sorted(histograms, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            h = histograms[stage]
+            cumulative = 0
+            for bound, count in zip(h["buckets"], h["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(process=process, stage=stage, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(process=process, stage=stage, le='+Inf')} {h['count']}")
+            lines.append(f"{name}_sum{_labels(process=process, stage=stage)} {_format_number(h['sum'])}")
+            lines.append(f"{name}_count{_labels(process=process, stage=stage)} {h['count']}")
+
+
+def render_prometheus(states: dict, at=None) -> str:
+    """
+    Texto de exposición de Prometheus (0.0.4) a partir de {proceso: state()}; cada
+    serie lleva el label `process`. El lag se calcula contra `at`.
+    """
+    at = at or timezone.now()
+    lines = []
+    _render_histograms(lines, "ellen_pipeline_stage_seconds",
+                       "Latencia de cada etapa desde la transición anterior de la vela.", states, "stage_seconds")
+    _render_histograms(lines, "ellen_pipeline_since_exchange_seconds",
+                       "Latencia desde el evento del exchange (cierre de la vela) hasta cada etapa.",
+                       states, "since_exchange_seconds")
+
+    lines.append("# HELP ellen_pipeline_lag_seconds Ahora menos el cierre de la última vela procesada por símbolo.")
+    lines.append("# TYPE ellen_pipeline_lag_seconds gauge")
+    for process, state in sorted(states.items()):
+        for symbol, processed_at in sorted(state["last_processed"].items()):
+            lag = (at - datetime.fromisoformat(processed_at)).total_seconds()
+            lines.append(f"ellen_pipeline_lag_seconds{_labels(process=process, symbol=symbol)} "
+                         f"{_format_number(max(0.0, lag))}")
+
+    lines.append("# HELP ellen_pipeline_queue_depth Trabajos pendientes por cola.")
+    lines.append("# TYPE ellen_pipeline_queue_depth gauge")
+    for process, state in sorted(states.items()):
+        for queue, depth in sorted(state["queues"].items()):
+            lines.append(f"ellen_pipeline_queue_depth{_labels(process=process, queue=queue)} {depth}")
+
+    lines.append("# HELP ellen_metrics_published_timestamp_seconds Última publicación de cada proceso del pipeline.")
+    lines.append("# TYPE ellen_metrics_published_timestamp_seconds gauge")
+    for process, state in sorted(states.items()):
+        published = datetime.fromisoformat(state["published_at"])
+        lines.append(f"ellen_metrics_published_timestamp_seconds{_labels(process=process)} "
+                     f"{_format_number(published.timestamp())}")
+    return "\n".join(lines) + "\n"
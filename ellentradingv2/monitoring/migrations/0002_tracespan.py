@@ -0,0 +1,29 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TraceSpan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trace_id', models.CharField(db_index=True, max_length=32)),
+                ('span_id', models.CharField(max_length=16)),
+                ('parent_id', models.CharField(blank=True, max_length=16, null=True)),
+                ('name', models.CharField(max_length=30)),
+                ('symbol', models.CharField(blank=True, max_length=20, null=True)),
+                ('started_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField()),
+                ('signal_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('trade_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('attributes', models.JSONField(blank=True, default=dict)),
+            ],
+        ),
+    ]
@@ -8,3 +8,24 @@ class SystemLog(models.Model):
 
     def __str__(self):
         return f"[{self.timestamp}] {self.level} - {self.source}: {self.message[:50]}"
+
+
+class TraceSpan(models.Model):
+    """Span de una traza vela → señal → trade (ver monitoring/tracing.py)."""
+    trace_id = models.CharField(max_length=32, db_index=True)
+    span_id = models.CharField(max_length=16)
+    parent_id = models.CharField(max_length=16, null=True, blank=True)
+    name = models.CharField(max_length=30)  # bar, resample, indicators, strategies, signal, risk, trade
+    symbol = models.CharField(max_length=20, null=True, blank=True)
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField()
+    signal_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    trade_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    attributes = models.JSONField(default=dict, blank=True)
+
+    @property
+    def duration_ms(self):
+        return round((self.ended_at - self.started_at).total_seconds() * 1000, 3)
+
+    def __str__(self):
+        return f"{self.trace_id[:8]}/{self.span_id} {self.name} {self.symbol or ''} ({self.duration_ms} ms)"
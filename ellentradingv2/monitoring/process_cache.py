@@ -0,0 +1,46 @@
+# monitoring/process_cache.py
+
+"""
+Estado de monitoreo publicado por proceso en el cache "monitoring".
+
+start_stream (dispatcher + resampleo) y startaggregator corren en procesos
+distintos y cada uno tiene su propio profiler / métricas / trazas. Cada proceso
+publica bajo "<prefijo>:<rol>" y registra su rol en "<prefijo>:processes", así la
+app web lee todos sin que uno pise al otro.
+"""
+
+import os
+import sys
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def process_role() -> str:
+    """MONITORING_PROCESS_ROLE, o el comando de manage.py (start_stream, startaggregator...), o el pid."""
+    role = getattr(settings, "MONITORING_PROCESS_ROLE", None)
+    if role:
+        return role
+    if len(sys.argv) > 1 and os.path.basename(sys.argv[0]).startswith("manage"):
+        return sys.argv[1]
+    return f"pid-{os.getpid()}"
+
+
+def publish_for_process(prefix, value):
+    cache = caches["monitoring"]
+    role = process_role()
+    cache.set(f"{prefix}:{role}", value, timeout=None)
+    roles = cache.get(f"{prefix}:processes") or []
+    if role not in roles:
+        cache.set(f"{prefix}:processes", sorted({*roles, role}), timeout=None)
+
+
+def published_by_process(prefix) -> dict:
+    """{rol: valor} de los procesos que publicaron bajo `prefix` ({} si ninguno)."""
+    cache = caches["monitoring"]
+    published = {}
+    for role in cache.get(f"{prefix}:processes") or []:
+        value = cache.get(f"{prefix}:{role}")
+        if value is not None:
+            published[role] = value
+    return published
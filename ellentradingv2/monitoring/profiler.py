@@ -0,0 +1,242 @@
+# monitoring/profiler.py
+
+"""
+Profiler en memoria del pipeline por vela.
+
+    with measure("strategy", strategy=name, symbol=symbol, timeframe="5m"):
+        ...
+
+Cada medición registra tiempo de pared, queries a la DB (cantidad y tiempo, vía
+connection.execute_wrapper) y, con PROFILER_TRACK_ALLOCATIONS, los bytes netos
+asignados durante el bloque (tracemalloc; con varios hilos es aproximado).
+Se agrega por (etapa, estrategia, símbolo, timeframe) con una muestra acotada
+de tiempos para p50 / p95 / p99.
+
+Etapas: fetch, resample, indicators, strategy, risk, execution.
+
+Cada proceso del pipeline (start_stream: resampleo; startaggregator: fetch,
+indicadores, estrategias) publica su snapshot cada PROFILER_PUBLISH_SECONDS en el
+cache "monitoring" bajo su propia clave (lo lee /api/monitoring/profile/) y en el
+grupo log_stream.
+"""
+
+import os
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from time import monotonic, perf_counter
+from types import SimpleNamespace
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection
+from django.utils.timezone import now
+
+from monitoring.process_cache import process_role, publish_for_process, published_by_process
+
+# Tiempos guardados por clave para los percentiles
+SAMPLE_SIZE = 1024
+PROFILE_CACHE_KEY = "profiler:snapshot"
+
+
+def profiler_enabled() -> bool:
+    return getattr(settings, "PROFILER_ENABLED", True)
+
+
+def track_allocations() -> bool:
+    return getattr(settings, "PROFILER_TRACK_ALLOCATIONS", False)
+
+
+def _label(value):
+    """Symbol / OpenStrategy → su código o nombre; strings tal cual."""
+    if value is None or isinstance(value, str):
+        return value
+    return getattr(value, "symbol", None) or getattr(value, "name", None) or str(value)
+
+
+def _percentile(ordered, pct):
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class StageStats:
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "samples", "queries", "db_seconds",
+                 "alloc_bytes", "alloc_samples")
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = deque(maxlen=sample_size)
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.alloc_bytes = 0
+        self.alloc_samples = 0
+
+    def add(self, sample):
+        self.count += 1
+        self.errors += int(sample.error)
+        self.total_seconds += sample.seconds
+        self.max_seconds = max(self.max_seconds, sample.seconds)
+        self.samples.append(sample.seconds)
+        self.queries += sample.queries
+        self.db_seconds += sample.db_seconds
+        if sample.alloc_bytes is not None:
+            self.alloc_bytes += sample.alloc_bytes
+            self.alloc_samples += 1
+
+    def as_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": _ms(self.total_seconds / self.count) if self.count else None,
+            "p50_ms": _ms(_percentile(ordered, 50)),
+            "p95_ms": _ms(_percentile(ordered, 95)),
+            "p99_ms": _ms(_percentile(ordered, 99)),
+            "max_ms": _ms(self.max_seconds),
+            "queries_per_call": round(self.queries / self.count, 2) if self.count else None,
+            "db_ms_per_call": _ms(self.db_seconds / self.count) if self.count else None,
+            "alloc_kb_per_call": round(self.alloc_bytes / self.alloc_samples / 1024, 1) if self.alloc_samples else None,
+        }
+
+
+class Profiler:
+    """
+    profiler.record(sample)                 # sample de measure()
+    profiler.snapshot(stage="strategy")     # filas ordenadas por p95
+    """
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.started_at = now()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, sample):
+        key = (sample.stage, sample.strategy, sample.symbol, sample.timeframe)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StageStats(self.sample_size)
+            stats.add(sample)
+
+    def snapshot(self, stage=None, strategy=None, symbol=None, timeframe=None) -> list:
+        with self._lock:
+            rows = [
+                {"stage": k[0], "strategy": k[1], "symbol": k[2], "timeframe": k[3], **stats.as_dict()}
+                for k, stats in self._stats.items()
+                if (stage is None or k[0] == stage) and (strategy is None or k[1] == strategy)
+                and (symbol is None or k[2] == symbol) and (timeframe is None or k[3] == timeframe)
+            ]
+        return sorted(rows, key=lambda r: r["p95_ms"] or 0, reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+            self.started_at = now()
+
+
+# Profiler del proceso
+profiler = Profiler()
+
+
+@contextmanager
+def measure(stage, strategy=None, symbol=None, timeframe=None, record=True):
+    """
+    Mide el bloque y lo registra en `profiler`. Con record=False solo llena el
+    sample devuelto (p.ej. en un worker del pool, que lo manda al proceso principal).
+    """
+    sample = SimpleNamespace(
+        stage=stage, strategy=_label(strategy), symbol=_label(symbol), timeframe=timeframe,
+        seconds=0.0, queries=0, db_seconds=0.0, alloc_bytes=None, error=False,
+    )
+    if not profiler_enabled():
+        yield sample
+        return
+
+    allocations = track_allocations()
+    if allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0] if allocations else 0
+
+    def count_query(execute, sql, params, many, context):
+        t0 = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            sample.queries += 1
+            sample.db_seconds += perf_counter() - t0
+
+    t0 = perf_counter()
+    try:
+        with connection.execute_wrapper(count_query):
+            yield sample
+    except Exception:
+        sample.error = True
+        raise
+    finally:
+        sample.seconds = perf_counter() - t0
+        if allocations:
+            sample.alloc_bytes = tracemalloc.get_traced_memory()[0] - memory_before
+        if record:
+            profiler.record(sample)
+
+
+# ---------- publicación ----------
+
+_last_publish = {"at": None}
+
+
+def publish_profile(limit=25):
+    """
+    Guarda el snapshot de este proceso en el cache "monitoring" (para la API, que
+    corre en otro proceso) y lo manda a log_stream como un log de source "profiler".
+    """
+    rows = profiler.snapshot()
+    published = {"process": process_role(), "pid": os.getpid(), "since": profiler.started_at.isoformat(),
+                 "published_at": now().isoformat(), "rows": rows}
+    publish_for_process(PROFILE_CACHE_KEY, published)
+
+    slowest = ", ".join(
+        f"{r['stage']}:{r['strategy'] or r['symbol'] or '-'} p95={r['p95_ms']}ms" for r in rows[:3]
+    )
+    payload = {
+        "type": "send_log",
+        "log": {
+            "timestamp": now().strftime("%Y-%m-%d %H:%M:%S"),
+            "level": "INFO",
+            "source": "profiler",
+            "message": f"⏱️ Profile {published['process']} ({len(rows)} claves) | más lentas: {slowest or '-'}",
+            "profile": rows[:limit],
+        },
+    }
+    async_to_sync(get_channel_layer().group_send)("log_stream", payload)
+
+
+def maybe_publish_profile():
+    """publish_profile() como mucho una vez cada PROFILER_PUBLISH_SECONDS."""
+    if not profiler_enabled():
+        return False
+    interval = getattr(settings, "PROFILER_PUBLISH_SECONDS", 60)
+    last = _last_publish["at"]
+    if last is not None and monotonic() - last < interval:
+        return False
+    _last_publish["at"] = monotonic()
+    publish_profile()
+    return True
+
+
+def published_profile() -> dict:
+    """{proceso: último snapshot publicado} de los procesos del pipeline ({} si ninguno publicó)."""
+    return published_by_process(PROFILE_CACHE_KEY)
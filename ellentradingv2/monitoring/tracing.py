@@ -0,0 +1,268 @@
+# monitoring/tracing.py
+
+"""
+Trazas livianas vela → señal → trade.
+
+Cada vela que entra al pipeline abre una traza (span raíz "bar"); las etapas
+registran spans hijos con inicio / fin:
+
+    bar → resample → indicators
+        → strategies → signal (strategy, signal_id) → risk → trade (trade_id)
+
+Propagación: el span activo vive en un ContextVar (lo copian create_task,
+sync_to_async y asyncio.to_thread), así que lo que corre dentro del contexto de
+la vela cuelga de su span. Las etapas que corren fuera de ese contexto (el
+agregador procesa todos los símbolos juntos) cuelgan de la traza en curso del
+símbolo. Sin traza activa span() no registra nada.
+
+Los spans terminados van a un ring buffer en memoria (TRACE_BUFFER_SIZE; si no
+se vacía a tiempo se descartan los más viejos) y se guardan en lotes en
+TraceSpan con maybe_flush_traces(), desde código sync del pipeline.
+trace_tree_for_trade() arma el árbol de spans de un trade (API en
+/api/monitoring/traces/trade/<id>/).
+"""
+
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+
+_active_span = ContextVar("active_span", default=None)
+
+
+def _symbol_label(symbol):
+    return symbol if symbol is None or isinstance(symbol, str) else symbol.symbol
+
+
+def _new_span(trace_id, parent_id, name, symbol, started_at=None, **attributes):
+    return SimpleNamespace(
+        trace_id=trace_id,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent_id,
+        name=name,
+        symbol=_symbol_label(symbol),
+        started_at=started_at or timezone.now(),
+        ended_at=None,
+        signal_id=None,
+        trade_id=None,
+        attributes=attributes,
+    )
+
+
+class SpanBuffer:
+    """Ring buffer de spans terminados + flush en lotes a TraceSpan."""
+
+    def __init__(self, size=None):
+        self.size = size or getattr(settings, "TRACE_BUFFER_SIZE", 10_000)
+        self._spans = deque(maxlen=self.size)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._spans)
+
+    def append(self, span):
+        with self._lock:
+            if len(self._spans) == self.size:
+                self.dropped += 1
+            self._spans.append(span)
+
+    def drain(self, limit=None) -> list:
+        with self._lock:
+            count = len(self._spans) if limit is None else min(limit, len(self._spans))
+            return [self._spans.popleft() for _ in range(count)]
+
+    def flush(self, batch_size=None) -> int:
+        """Guarda los spans del buffer en lotes de batch_size (bulk_create). Devuelve cuántos."""
+        from monitoring.models import TraceSpan
+
+        batch_size = batch_size or getattr(settings, "TRACE_FLUSH_BATCH", 500)
+        written = 0
+        while True:
+            spans = self.drain(batch_size)
+            if not spans:
+                return written
+            TraceSpan.objects.bulk_create([
+                TraceSpan(
+                    trace_id=s.trace_id, span_id=s.span_id, parent_id=s.parent_id, name=s.name,
+                    symbol=s.symbol, started_at=s.started_at, ended_at=s.ended_at,
+                    signal_id=s.signal_id, trade_id=s.trade_id, attributes=s.attributes,
+                )
+                for s in spans
+            ])
+            written += len(spans)
+
+
+class Tracer:
+    """
+    tracer.start_trace(symbol, "5m", bar_start)       # span raíz de la vela (traza en curso del símbolo)
+    with tracer.span("risk", symbol) as s: ...        # span hijo; s es None si no hay traza
+    """
+
+    def __init__(self, buffer=None):
+        self.buffer = buffer or SpanBuffer()
+        self._current = {}  # símbolo → span raíz de la última vela
+        self._lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return getattr(settings, "TRACING_ENABLED", True)
+
+    def start_trace(self, symbol, timeframe, bar_time, started_at=None, finish=True):
+        """
+        Abre una traza para la vela y la deja como traza en curso del símbolo.
+        Con finish=True el span raíz termina ya (agregador); si no, lo cierra finish().
+        """
+        if not self.enabled():
+            return None
+        root = _new_span(uuid.uuid4().hex, None, "bar", symbol, started_at,
+                         timeframe=timeframe, bar_time=bar_time.isoformat())
+        with self._lock:
+            self._current[root.symbol] = root
+        if finish:
+            self.finish(root)
+        return root
+
+    def finish(self, span, **attributes):
+        if span is None or span.ended_at is not None:
+            return
+        span.attributes.update(attributes)
+        span.ended_at = timezone.now()
+        self.buffer.append(span)
+
+    def parent_for(self, symbol=None):
+        """Span activo del contexto (si es del mismo símbolo) o la traza en curso del símbolo."""
+        active = _active_span.get()
+        label = _symbol_label(symbol)
+        if active is not None and (label is None or active.symbol == label):
+            return active
+        return self._current.get(label) if label else None
+
+    @contextmanager
+    def activate(self, span):
+        """Deja `span` como span activo del contexto dentro del bloque."""
+        token = _active_span.set(span)
+        try:
+            yield span
+        finally:
+            _active_span.reset(token)
+
+    @contextmanager
+    def trace_bar(self, symbol, timeframe, bar_time):
+        """start_trace + span raíz activo durante el bloque (dispatcher)."""
+        root = self.start_trace(symbol, timeframe, bar_time, finish=False)
+        if root is None:
+            yield None
+            return
+        try:
+            with self.activate(root):
+                yield root
+        finally:
+            self.finish(root)
+
+    @contextmanager
+    def span(self, name, symbol=None, **attributes):
+        parent = self.parent_for(symbol) if self.enabled() else None
+        if parent is None:
+            yield None
+            return
+
+        span = _new_span(parent.trace_id, parent.span_id, name, symbol or parent.symbol, **attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except Exception as e:
+            span.attributes["error"] = str(e)[:200]
+            raise
+        finally:
+            self.finish(span)
+
+    def add_span(self, name, symbol, started_at, **attributes):
+        """Span ya medido (p.ej. un lote de varios símbolos): de started_at a ahora bajo la traza del símbolo."""
+        parent = self.parent_for(symbol) if self.enabled() else None
+        if parent is None:
+            return None
+        span = _new_span(parent.trace_id, parent.span_id, name, symbol, started_at, **attributes)
+        self.finish(span)
+        return span
+
+
+# Tracer del proceso
+tracer = Tracer()
+
+_last_flush = {"at": None}
+
+
+def maybe_flush_traces():
+    """Vacía el buffer si pasaron TRACE_FLUSH_SECONDS o llenó un lote. Solo desde código sync."""
+    interval = getattr(settings, "TRACE_FLUSH_SECONDS", 5)
+    batch_size = getattr(settings, "TRACE_FLUSH_BATCH", 500)
+    last = _last_flush["at"]
+    if last is not None and monotonic() - last < interval and len(tracer.buffer) < batch_size:
+        return 0
+    _last_flush["at"] = monotonic()
+    return tracer.buffer.flush(batch_size)
+
+
+# ---------- lectura ----------
+
+def _span_dict(span) -> dict:
+    return {
+        "span_id": span.span_id,
+        "name": span.name,
+        "symbol": span.symbol,
+        "started_at": span.started_at.isoformat(),
+        "ended_at": span.ended_at.isoformat(),
+        "duration_ms": span.duration_ms,
+        "signal_id": span.signal_id,
+        "trade_id": span.trade_id,
+        "attributes": span.attributes,
+        "children": [],
+    }
+
+
+def build_span_tree(spans) -> list:
+    """Spans de una traza → raíces con children anidados (ordenados por inicio)."""
+    nodes = {s.span_id: _span_dict(s) for s in sorted(spans, key=lambda s: s.started_at)}
+    roots = []
+    for span in sorted(spans, key=lambda s: s.started_at):
+        parent = nodes.get(span.parent_id)
+        (parent["children"] if parent else roots).append(nodes[span.span_id])
+    return roots
+
+
+def trace_tree_for_trade(trade) -> list:
+    """
+    Trazas de un trade: la de la vela en que se creó (span "trade") y las de las
+    señales que lo dispararon (triggered_by). Una entrada por traza con su árbol.
+    """
+    from monitoring.models import TraceSpan
+
+    signal_ids = list(trade.triggered_by.values_list("id", flat=True))
+    trace_ids = set(
+        TraceSpan.objects.filter(trade_id=trade.id).values_list("trace_id", flat=True)
+    ) | set(
+        TraceSpan.objects.filter(signal_id__in=signal_ids).values_list("trace_id", flat=True)
+    )
+
+    spans_by_trace = {}
+    for span in TraceSpan.objects.filter(trace_id__in=trace_ids):
+        spans_by_trace.setdefault(span.trace_id, []).append(span)
+
+    traces = []
+    for trace_id, spans in spans_by_trace.items():
+        started = min(s.started_at for s in spans)
+        ended = max(s.ended_at for s in spans)
+        traces.append({
+            "trace_id": trace_id,
+            "symbol": spans[0].symbol,
+            "started_at": started.isoformat(),
+            "duration_ms": round((ended - started).total_seconds() * 1000, 3),
+            "spans": build_span_tree(spans),
+        })
+    return sorted(traces, key=lambda t: t["started_at"])
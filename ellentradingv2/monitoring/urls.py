@@ -3,4 +3,7 @@ from monitoring import views
 
 urlpatterns = [
     path("logs/", views.get_logs, name="get_logs"),
+    path("profile/", views.get_profile, name="get_profile"),
+    path("metrics/", views.prometheus_metrics, name="prometheus_metrics"),
+    path("traces/trade/<int:trade_id>/", views.get_trade_traces, name="get_trade_traces"),
 ]
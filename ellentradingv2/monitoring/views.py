@@ -1,5 +1,10 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from monitoring.models import SystemLog
+from monitoring.profiler import profiler, published_profile
+from monitoring.metrics import pipeline_metrics, published_metrics, render_prometheus
+from monitoring.tracing import trace_tree_for_trade
+from monitoring.process_cache import process_role
+from trades.models.trade import Trade
 from django.utils.timezone import now, timedelta
 
 def get_logs(request):
@@ -25,3 +30,45 @@ def get_logs(request):
     ]
 
     return JsonResponse(data, safe=False)
+
+
+def get_profile(request):
+    """
+    Latencias p50/p95/p99, queries y asignaciones por etapa / estrategia / símbolo / timeframe.
+    Lee el último snapshot publicado por cada proceso del pipeline; si no hay, el profiler
+    de este proceso. Filtros opcionales: process, stage, strategy, symbol, timeframe.
+    """
+    filters = {k: request.GET.get(k) for k in ("process", "stage", "strategy", "symbol", "timeframe")}
+
+    published = published_profile() or {
+        process_role(): {"process": process_role(), "pid": None, "since": profiler.started_at.isoformat(),
+                         "published_at": None, "rows": profiler.snapshot()}
+    }
+
+    rows = [
+        {"process": process, **r}
+        for process, snapshot in published.items() for r in snapshot["rows"]
+    ]
+    rows = [r for r in rows if all(v is None or r[k] == v for k, v in filters.items())]
+    processes = {process: {k: v for k, v in snapshot.items() if k != "rows"} for process, snapshot in published.items()}
+    return JsonResponse({"processes": processes, "rows": sorted(rows, key=lambda r: r["p95_ms"] or 0, reverse=True)})
+
+
+def prometheus_metrics(request):
+    """
+    Latencias por etapa / end-to-end, lag por símbolo y colas en formato texto de Prometheus.
+    Usa el último estado publicado por cada proceso del pipeline; si no hay, el de este proceso.
+    """
+    states = published_metrics() or {process_role(): pipeline_metrics.state()}
+    return HttpResponse(render_prometheus(states), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def get_trade_traces(request, trade_id):
+    """
+    Árbol de spans (vela → resample → indicators → strategies → signal → risk → trade)
+    de las trazas que llevaron al trade: la de su creación y las de sus señales.
+    """
+    trade = Trade.objects.filter(id=trade_id).first()
+    if trade is None:
+        return JsonResponse({"error": f"Trade {trade_id} no existe"}, status=404)
+    return JsonResponse({"trade_id": trade.id, "traces": trace_tree_for_trade(trade)})
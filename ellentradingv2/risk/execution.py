@@ -5,6 +5,8 @@ from trades.models.portfolio import Position, Portfolio
 from trades.logic.portfolio_ops import buy_position, sell_position
 from streaming.websocket.helpers import emit_trade
 from monitoring.utils import log_event
+from monitoring.metrics import pipeline_metrics
+from monitoring.tracing import tracer
 from asgiref.sync import async_to_sync
 from datetime import timedelta
 
@@ -316,8 +318,12 @@ def execute_simulated_trade(signal, direction, size, config):
 
     try:
         # Create trade record
-        trade = Trade.objects.create(**trade_data)
-        trade.triggered_by.add(signal)
+        with tracer.span("trade", signal.symbol, signal_id=signal.id) as span:
+            trade = Trade.objects.create(**trade_data)
+            trade.triggered_by.add(signal)
+            if span is not None:
+                span.trade_id = trade.id
+        pipeline_metrics.mark(signal.symbol, "trade")
 
         # Enhanced logging
         async_to_sync(log_event)(
@@ -3,6 +3,7 @@ from risk.decision_engine import resolve_direction, categorize_signals
 from risk.signal_scoring import evaluate_categorized
 from risk.validation import can_execute_trade
 from risk.execution import execute_simulated_trade
+from monitoring.profiler import measure
 
 class RiskManager:
     def __init__(self, symbol_name, execution_mode="simulated", capital=None, config=None):
@@ -31,9 +32,12 @@ class RiskManager:
                 current_time=now()
             )
 
-    def analyze_and_execute(self, price, current_time=None, verbose=True):
-
-        self.signals = self.get_valid_signals(current_time=current_time)
+    def analyze_and_execute(self, price, current_time=None, verbose=True, signals=None):
+        """
+        Si se pasan `signals` (backtest / replay de signal tape) se usan tal cual
+        en vez de consultarlas a la base de datos.
+        """
+        self.signals = signals if signals is not None else self.get_valid_signals(current_time=current_time)
         direction, filtered_signals, reason = resolve_direction(self.signals, self.config, verbose=verbose)
         if not direction:
             return None
@@ -55,17 +59,19 @@ class RiskManager:
             return None
 
         if self.execution_mode == "simulated":
-            return execute_simulated_trade(signal_to_use, direction, size_or_reason, self.config)
+            with measure("execution", symbol=self.symbol_name):
+                return execute_simulated_trade(signal_to_use, direction, size_or_reason, self.config)
 
         if self.execution_mode == "backtest":
             from types import SimpleNamespace
             from risk.utils import generate_exit_parameters
 
-            exit_params = generate_exit_parameters(price, direction, self.config)
+            exit_params = generate_exit_parameters(price, direction.lower(), self.config)
+            # can_execute_trade devuelve el monto aprobado en USD
             return SimpleNamespace(
                 symbol=signal_to_use.symbol,
-                quantity=size_or_reason["value"] if size_or_reason["mode"] == "qty" else 0,
-                notional=size_or_reason["value"] if size_or_reason["mode"] == "notional" else None,
+                quantity=round(size_or_reason / price, 6),
+                notional=size_or_reason,
                 strategy=signal_to_use.strategy.name if signal_to_use.strategy else None,
                 status="BACKTEST",
                 price=price,
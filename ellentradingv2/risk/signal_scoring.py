@@ -60,11 +60,12 @@ def get_market_regime(bars):
         return "neutral"
 
 
-def evaluate_categorized(categorized, direction, config):
+def evaluate_categorized(categorized, direction, config, verbose=True):
     """
     Evalúa si las señales tienen el peso suficiente para justificar un trade.
     OPTIMIZADO para rangos universales 30-100
     """
+    log = async_to_sync(log_event) if verbose else (lambda *args, **kwargs: None)
 
     # ===== REGLAS GENERALES OPTIMIZADAS =====
 
@@ -73,7 +74,7 @@ def evaluate_categorized(categorized, direction, config):
         best = max(categorized["Primary"], key=lambda s: weighted_score(s, config))
         best_score = weighted_score(best, config)
         if best_score >= config.get("primary_min_score", 45):  # Era 50, ahora 45
-            async_to_sync(log_event)("✅ Trade aprobado: Primary fuerte", source='risk_manager', level='INFO')
+            log("✅ Trade aprobado: Primary fuerte", source='risk_manager', level='INFO')
             return {
                 "approved": True,
                 "action": direction,
@@ -87,7 +88,7 @@ def evaluate_categorized(categorized, direction, config):
         if len(combined) >= 2:
             avg_score = avg_weighted(combined, config)
             if avg_score >= config.get("context_confirm_avg_score", 42):  # Era 50, ahora 42
-                async_to_sync(log_event)("✅ Trade aprobado: Context + Confirm", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Context + Confirm", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -99,7 +100,7 @@ def evaluate_categorized(categorized, direction, config):
     if len(categorized["Confirm"]) >= 3:
         avg_score = avg_weighted(categorized["Confirm"], config)
         if avg_score >= config.get("confirm_min_avg_score", 40):  # Era 50, ahora 40
-            async_to_sync(log_event)("✅ Trade aprobado: 3+ Confirm signals", source='risk_manager', level='INFO')
+            log("✅ Trade aprobado: 3+ Confirm signals", source='risk_manager', level='INFO')
             return {
                 "approved": True,
                 "action": direction,
@@ -111,7 +112,7 @@ def evaluate_categorized(categorized, direction, config):
     if len(categorized["Primary"]) >= 2:
         avg_score = avg_weighted(categorized["Primary"], config)
         if avg_score >= config.get("primary_group_avg_score", 48):  # Era 50, ahora 48
-            async_to_sync(log_event)("✅ Trade aprobado: 2+ Primary aligned", source='risk_manager', level='INFO')
+            log("✅ Trade aprobado: 2+ Primary aligned", source='risk_manager', level='INFO')
             return {
                 "approved": True,
                 "action": direction,
@@ -132,7 +133,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):  # Era 5 min, ahora 8
             avg_score = avg_weighted(combo, config)
             if avg_score >= 60:  # Era 75, ahora 60
-                async_to_sync(log_event)("✅ Trade aprobado: RSI + Engulfing + Volume", source='risk_manager',
+                log("✅ Trade aprobado: RSI + Engulfing + Volume", source='risk_manager',
                                          level='INFO')
                 return {
                     "approved": True,
@@ -151,7 +152,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):
             avg_score = avg_weighted(combo, config)
             if avg_score >= 55:  # Era 70, ahora 55
-                async_to_sync(log_event)("✅ Trade aprobado: Triple EMA + ADX", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Triple EMA + ADX", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -169,7 +170,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):
             avg_score = avg_weighted(combo, config)
             if avg_score >= 52:  # Era 72, ahora 52
-                async_to_sync(log_event)("✅ Trade aprobado: Bollinger + Volume", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Bollinger + Volume", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -187,7 +188,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):
             avg_score = avg_weighted(combo, config)
             if avg_score >= 58:  # Era 75, ahora 58
-                async_to_sync(log_event)("✅ Trade aprobado: MACD + Ichimoku", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: MACD + Ichimoku", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -205,7 +206,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):
             avg_score = avg_weighted(combo, config)
             if avg_score >= 60:
-                async_to_sync(log_event)("✅ Trade aprobado: Donchian + PSAR", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Donchian + PSAR", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -223,7 +224,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=8):
             avg_score = avg_weighted(combo, config)
             if avg_score >= 55:
-                async_to_sync(log_event)("✅ Trade aprobado: Fibonacci + MA", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Fibonacci + MA", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -238,7 +239,7 @@ def evaluate_categorized(categorized, direction, config):
         if max(timestamps) - min(timestamps) <= timedelta(minutes=10):  # Ventana más amplia
             avg_score = avg_weighted(all_signals, config)
             if avg_score >= 45:  # Score más bajo pero muchas señales
-                async_to_sync(log_event)("✅ Trade aprobado: Múltiple confluencia", source='risk_manager', level='INFO')
+                log("✅ Trade aprobado: Múltiple confluencia", source='risk_manager', level='INFO')
                 return {
                     "approved": True,
                     "action": direction,
@@ -247,7 +248,7 @@ def evaluate_categorized(categorized, direction, config):
                 }
 
     # ===== FINAL: No se aprueba =====
-    async_to_sync(log_event)("❌ Trade no aprobado por scoring", source='risk_manager', level='INFO')
+    log("❌ Trade no aprobado por scoring", source='risk_manager', level='INFO')
     return {
         "approved": False,
         "reason": f"Signals in '{direction}' direction do not meet optimized requirements"
@@ -4,6 +4,211 @@ from asgiref.sync import async_to_sync
 from django.utils.timezone import now, timedelta
 from django.db.models import Sum
 
+# Límites de riesgo compartidos por el path live y el backtest de portafolio
+MAX_SYMBOL_TRADES_PER_DAY = 3
+MAX_TOTAL_TRADES_PER_DAY = 10
+MAX_PORTFOLIO_EXPOSURE_PCT = 0.95
+MAX_CONCURRENT_POSITIONS = 8
+MAX_SINGLE_TRADE_PCT = 0.2
+
+
+# ===== REGLAS PURAS (sin DB) =====
+# Reciben el estado ya calculado (posiciones abiertas, exposición, conteos)
+# para que el backtest de portafolio pueda aplicarlas sobre su ledger en memoria.
+
+def correlation_multiplier(symbol, open_symbols):
+    """
+    Multiplicador por correlación con las posiciones abiertas (lista de símbolos)
+    """
+    # Cryptocurrencies correlation
+    if is_crypto(symbol):
+        crypto_count = sum(1 for s in open_symbols if is_crypto(s))
+        if crypto_count >= 3:  # Ya hay muchas cryptos
+            return 0.7  # Reduce size by 30%
+        elif crypto_count >= 2:
+            return 0.85  # Reduce size by 15%
+
+    # Same sector correlation (básico)
+    same_asset_class = sum(1 for s in open_symbols if s.asset_class == symbol.asset_class)
+    if same_asset_class >= 5:
+        return 0.8  # Reduce size by 20%
+    elif same_asset_class >= 3:
+        return 0.9  # Reduce size by 10%
+
+    return 1.0  # No correlation risk
+
+
+def volatility_multiplier(pnls):
+    """
+    Multiplicador por volatilidad del PnL reciente del símbolo
+    """
+    if len(pnls) < 2:
+        return 1.0
+
+    avg_pnl = sum(pnls) / len(pnls)
+    variance = sum((pnl - avg_pnl) ** 2 for pnl in pnls) / len(pnls)
+    volatility = variance ** 0.5
+
+    # High volatility = smaller position
+    if volatility > 100:  # High volatility
+        return 0.7
+    elif volatility > 50:  # Medium volatility
+        return 0.85
+    else:  # Low volatility
+        return 1.1  # Can take slightly larger position
+
+
+def exposure_multiplier(current_exposure, capital):
+    exposure_ratio = current_exposure / capital if capital > 0 else 0
+
+    if exposure_ratio > 0.8:  # Portfolio muy expuesto
+        return 0.5
+    elif exposure_ratio > 0.6:
+        return 0.7
+    elif exposure_ratio > 0.4:
+        return 0.85
+    return 1.0
+
+
+def size_position(price, symbol, capital, base_risk_pct, confidence_score,
+                  volatility_mult=1.0, correlation_mult=1.0, current_exposure=0.0, verbose=True):
+    """
+    Tamaño de posición dinámico a partir de multiplicadores ya calculados
+    """
+    confidence_mult = calculate_confidence_multiplier(confidence_score)
+    exposure_mult = exposure_multiplier(current_exposure, capital)
+
+    # Calcular risk percentage ajustado
+    adjusted_risk_pct = base_risk_pct * confidence_mult * volatility_mult * correlation_mult * exposure_mult
+
+    # Cap the risk
+    adjusted_risk_pct = min(adjusted_risk_pct, base_risk_pct * 1.5)  # Max 1.5x base risk
+    adjusted_risk_pct = max(adjusted_risk_pct, base_risk_pct * 0.3)  # Min 0.3x base risk
+
+    max_allocation = capital * adjusted_risk_pct
+
+    if verbose:
+        async_to_sync(log_event)(
+            f"💡 Dynamic sizing: base_risk={base_risk_pct:.1%} → adjusted={adjusted_risk_pct:.1%} "
+            f"(conf={confidence_mult:.2f}, vol={volatility_mult:.2f}, corr={correlation_mult:.2f}, exp={exposure_mult:.2f})",
+            source='risk_manager', level='INFO'
+        )
+
+    if is_crypto(symbol):
+        # Crypto: siempre usar notional
+        notional = min(max_allocation, capital * 0.3)  # Cap crypto at 30% of capital
+        return {"mode": "notional", "value": round(notional, 2)}
+
+    # Stocks: usar qty si alcanza, sino usar notional
+    qty = int(max_allocation // price)
+    if qty >= 1:
+        return {"mode": "qty", "value": qty}
+    else:
+        return {"mode": "notional", "value": round(max_allocation, 2)}
+
+
+def daily_limits_ok(symbol_trades_today, total_trades_today):
+    if symbol_trades_today >= MAX_SYMBOL_TRADES_PER_DAY:
+        return False, f"Daily symbol trade limit reached ({MAX_SYMBOL_TRADES_PER_DAY})"
+
+    if total_trades_today >= MAX_TOTAL_TRADES_PER_DAY:
+        return False, f"Daily total trade limit reached ({MAX_TOTAL_TRADES_PER_DAY})"
+
+    return True, "Within daily limits"
+
+
+def portfolio_limits_ok(capital, new_trade_size, current_exposure, open_positions):
+    total_exposure_after = current_exposure + new_trade_size
+
+    # No más del 95% del capital en trades activos
+    if total_exposure_after > capital * MAX_PORTFOLIO_EXPOSURE_PCT:
+        return False, f"Portfolio exposure limit: {total_exposure_after:.0f} > {capital * MAX_PORTFOLIO_EXPOSURE_PCT:.0f}"
+
+    # Check for concentration risk
+    if open_positions >= MAX_CONCURRENT_POSITIONS:
+        return False, f"Maximum concurrent positions reached ({MAX_CONCURRENT_POSITIONS})"
+
+    return True, "Portfolio risk within limits"
+
+
+def evaluate_trade_rules(price, symbol, confidence_score, capital, risk_pct, min_notional, state, verbose=True):
+    """
+    Núcleo de can_execute_trade sobre un snapshot del portafolio.
+
+    state: dict (o LiveRiskState) con
+      - in_position (bool), symbol_trades_today (int), total_trades_today (int)
+      - open_symbols (list de símbolos con posición abierta), current_exposure (float)
+      - recent_pnls (list de PnL recientes del símbolo)
+    Devuelve (True, amount_usd) o (False, reason).
+    """
+    def blocked(reason, message=None):
+        if verbose:
+            async_to_sync(log_event)(message or f"🚫 Trade bloqueado: {reason}", source='risk_manager', level='INFO')
+        return False, reason
+
+    # Check 1: Posición existente
+    if state["in_position"]:
+        return blocked("Trade already active for this symbol", f"🚫 Trade bloqueado: posición activa para {symbol}")
+
+    # Check 2: Límites diarios
+    daily_ok, daily_reason = daily_limits_ok(state["symbol_trades_today"], state["total_trades_today"])
+    if not daily_ok:
+        return blocked(daily_reason)
+
+    # Check 3: Calcular tamaño dinámico
+    size = size_position(
+        price, symbol, capital, risk_pct, confidence_score,
+        volatility_mult=volatility_multiplier(state["recent_pnls"]),
+        correlation_mult=correlation_multiplier(symbol, state["open_symbols"]),
+        current_exposure=state["current_exposure"],
+        verbose=verbose,
+    )
+
+    # Check 4: Validar tamaño mínimo
+    if size["mode"] == "qty":
+        amount_usd = size["value"] * price
+        if size["value"] <= 0:
+            return blocked("Insufficient capital for minimum qty",
+                           "🚫 Trade bloqueado: capital insuficiente para qty mínima")
+    else:
+        amount_usd = size["value"]
+        if amount_usd < min_notional:
+            return blocked(f"Minimum notional too small (below ${min_notional})",
+                           "🚫 Trade bloqueado: notional muy pequeño")
+
+    # Check 5: Límites de portafolio
+    portfolio_ok, portfolio_reason = portfolio_limits_ok(
+        capital, amount_usd, state["current_exposure"], len(state["open_symbols"])
+    )
+    if not portfolio_ok:
+        return blocked(portfolio_reason)
+
+    # Check 6: Sanity check - no más del 20% del capital en un solo trade
+    if amount_usd > capital * MAX_SINGLE_TRADE_PCT:
+        adjusted_amount = capital * MAX_SINGLE_TRADE_PCT
+        if size["mode"] == "qty":
+            size["value"] = int(adjusted_amount // price)
+            amount_usd = size["value"] * price
+        else:
+            size["value"] = adjusted_amount
+            amount_usd = adjusted_amount
+
+        if verbose:
+            async_to_sync(log_event)(
+                f"⚠️ Trade size reducido por límite de concentración: ${amount_usd:.0f}",
+                source='risk_manager', level='INFO'
+            )
+
+    if verbose:
+        async_to_sync(log_event)(
+            f"✅ Trade aprobado: ${amount_usd:.0f} ({amount_usd / capital:.1%} del capital)",
+            source='risk_manager', level='INFO'
+        )
+
+    return True, amount_usd
+
+
+# ===== PATH LIVE (lee el estado desde la DB) =====
 
 def is_symbol_already_in_position(symbol):
     """
@@ -39,65 +244,39 @@ def get_portfolio_exposure():
         return 0
 
 
+def get_open_symbols():
+    return [t.symbol for t in Trade.objects.filter(status="EXECUTED").select_related('symbol')]
+
+
 def get_symbol_correlation_risk(symbol):
     """
     Evalúa riesgo de correlación con posiciones existentes
     """
     try:
-        active_trades = Trade.objects.filter(status="EXECUTED").select_related('symbol')
-
-        # Cryptocurrencies correlation
-        if is_crypto(symbol):
-            crypto_trades = [t for t in active_trades if is_crypto(t.symbol)]
-            if len(crypto_trades) >= 3:  # Ya hay muchas cryptos
-                return 0.7  # Reduce size by 30%
-            elif len(crypto_trades) >= 2:
-                return 0.85  # Reduce size by 15%
-
-        # Same sector correlation (básico)
-        same_asset_class = [t for t in active_trades if t.symbol.asset_class == symbol.asset_class]
-        if len(same_asset_class) >= 5:
-            return 0.8  # Reduce size by 20%
-        elif len(same_asset_class) >= 3:
-            return 0.9  # Reduce size by 10%
-
-        return 1.0  # No correlation risk
+        return correlation_multiplier(symbol, get_open_symbols())
     except Exception:
         return 1.0
 
 
+def get_recent_pnls(symbol):
+    recent_trades = Trade.objects.filter(
+        symbol=symbol,
+        status__in=["EXECUTED", "CLOSED"],
+        executed_at__gte=now() - timedelta(days=30)
+    )
+
+    if recent_trades.count() < 3:
+        return []  # Default if not enough data
+
+    return [t.pnl for t in recent_trades if t.pnl is not None]
+
+
 def calculate_volatility_multiplier(symbol):
     """
     Calcula multiplicador basado en volatilidad del símbolo
     """
     try:
-        # Get recent trades for this symbol to estimate volatility
-        recent_trades = Trade.objects.filter(
-            symbol=symbol,
-            status__in=["EXECUTED", "CLOSED"],
-            executed_at__gte=now() - timedelta(days=30)
-        )
-
-        if recent_trades.count() < 3:
-            return 1.0  # Default if not enough data
-
-        # Calculate PnL volatility
-        pnls = [t.pnl for t in recent_trades if t.pnl is not None]
-        if len(pnls) < 2:
-            return 1.0
-
-        avg_pnl = sum(pnls) / len(pnls)
-        variance = sum((pnl - avg_pnl) ** 2 for pnl in pnls) / len(pnls)
-        volatility = variance ** 0.5
-
-        # High volatility = smaller position
-        if volatility > 100:  # High volatility
-            return 0.7
-        elif volatility > 50:  # Medium volatility
-            return 0.85
-        else:  # Low volatility
-            return 1.1  # Can take slightly larger position
-
+        return volatility_multiplier(get_recent_pnls(symbol))
     except Exception:
         return 1.0
 
@@ -125,51 +304,13 @@ def calculate_dynamic_position_size(price, symbol, capital, base_risk_pct, confi
     """
     Calcula tamaño de posición dinámico basado en múltiples factores
     """
-    # Multiplicadores de riesgo
-    confidence_mult = calculate_confidence_multiplier(confidence_score)
-    volatility_mult = calculate_volatility_multiplier(symbol)
-    correlation_mult = get_symbol_correlation_risk(symbol)
-
-    # Risk management por exposición del portafolio
-    current_exposure = get_portfolio_exposure()
-    exposure_ratio = current_exposure / capital if capital > 0 else 0
-
-    if exposure_ratio > 0.8:  # Portfolio muy expuesto
-        exposure_mult = 0.5
-    elif exposure_ratio > 0.6:
-        exposure_mult = 0.7
-    elif exposure_ratio > 0.4:
-        exposure_mult = 0.85
-    else:
-        exposure_mult = 1.0
-
-    # Calcular risk percentage ajustado
-    adjusted_risk_pct = base_risk_pct * confidence_mult * volatility_mult * correlation_mult * exposure_mult
-
-    # Cap the risk
-    adjusted_risk_pct = min(adjusted_risk_pct, base_risk_pct * 1.5)  # Max 1.5x base risk
-    adjusted_risk_pct = max(adjusted_risk_pct, base_risk_pct * 0.3)  # Min 0.3x base risk
-
-    max_allocation = capital * adjusted_risk_pct
-
-    async_to_sync(log_event)(
-        f"💡 Dynamic sizing: base_risk={base_risk_pct:.1%} → adjusted={adjusted_risk_pct:.1%} "
-        f"(conf={confidence_mult:.2f}, vol={volatility_mult:.2f}, corr={correlation_mult:.2f}, exp={exposure_mult:.2f})",
-        source='risk_manager', level='INFO'
+    return size_position(
+        price, symbol, capital, base_risk_pct, confidence_score,
+        volatility_mult=calculate_volatility_multiplier(symbol),
+        correlation_mult=get_symbol_correlation_risk(symbol),
+        current_exposure=get_portfolio_exposure(),
     )
 
-    if is_crypto(symbol):
-        # Crypto: siempre usar notional
-        notional = min(max_allocation, capital * 0.3)  # Cap crypto at 30% of capital
-        return {"mode": "notional", "value": round(notional, 2)}
-
-    # Stocks: usar qty si alcanza, sino usar notional
-    qty = int(max_allocation // price)
-    if qty >= 1:
-        return {"mode": "qty", "value": qty}
-    else:
-        return {"mode": "notional", "value": round(max_allocation, 2)}
-
 
 def check_daily_trade_limits(symbol):
     """
@@ -183,37 +324,66 @@ def check_daily_trade_limits(symbol):
         executed_at__date=today
     ).count()
 
-    if symbol_trades_today >= 3:  # Max 3 trades per symbol per day
-        return False, "Daily symbol trade limit reached (3)"
-
     # Límite total de trades por día
     total_trades_today = Trade.objects.filter(
         executed_at__date=today
     ).count()
 
-    if total_trades_today >= 10:  # Max 10 trades per day
-        return False, "Daily total trade limit reached (10)"
-
-    return True, "Within daily limits"
+    return daily_limits_ok(symbol_trades_today, total_trades_today)
 
 
 def check_portfolio_risk_limits(capital, new_trade_size):
     """
     Verifica límites de riesgo a nivel de portafolio
     """
-    current_exposure = get_portfolio_exposure()
-    total_exposure_after = current_exposure + new_trade_size
+    return portfolio_limits_ok(
+        capital,
+        new_trade_size,
+        get_portfolio_exposure(),
+        Trade.objects.filter(status="EXECUTED").count()
+    )
 
-    # No más del 95% del capital en trades activos
-    if total_exposure_after > capital * 0.95:
-        return False, f"Portfolio exposure limit: {total_exposure_after:.0f} > {capital * 0.95:.0f}"
 
-    # Check for concentration risk
-    active_trades_count = Trade.objects.filter(status="EXECUTED").count()
-    if active_trades_count >= 8:  # Max 8 concurrent positions
-        return False, "Maximum concurrent positions reached (8)"
+def _safe(func, default):
+    def load():
+        try:
+            return func()
+        except Exception:
+            return default
+    return load
 
-    return True, "Portfolio risk within limits"
+
+class LiveRiskState:
+    """
+    Snapshot lazy del portafolio live para evaluate_trade_rules: cada valor se
+    consulta a la DB recién cuando una regla lo lee (y una sola vez), así un trade
+    bloqueado por posición activa o límites diarios no paga las queries de
+    exposición / correlación / PnL.
+    """
+
+    def __init__(self, symbol):
+        today = now().date()
+        self._values = {}
+        self._loaders = {
+            "in_position": lambda: is_symbol_already_in_position(symbol),
+            "symbol_trades_today": lambda: Trade.objects.filter(symbol=symbol, executed_at__date=today).count(),
+            "total_trades_today": lambda: Trade.objects.filter(executed_at__date=today).count(),
+            "open_symbols": _safe(get_open_symbols, []),
+            "current_exposure": get_portfolio_exposure,
+            "recent_pnls": _safe(lambda: get_recent_pnls(symbol), []),
+        }
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+
+def get_live_risk_state(symbol):
+    """
+    Snapshot del portafolio live para evaluate_trade_rules (lazy, ver LiveRiskState)
+    """
+    return LiveRiskState(symbol)
 
 
 def can_execute_trade(signal, price, capital, risk_pct, min_notional):
@@ -223,58 +393,7 @@ def can_execute_trade(signal, price, capital, risk_pct, min_notional):
     symbol = signal.symbol
     confidence_score = signal.confidence_score or 50
 
-    # Check 1: Posición existente
-    if is_symbol_already_in_position(symbol):
-        async_to_sync(log_event)(f"🚫 Trade bloqueado: posición activa para {symbol}", source='risk_manager',
-                                 level='INFO')
-        return False, "Trade already active for this symbol"
-
-    # Check 2: Límites diarios
-    daily_ok, daily_reason = check_daily_trade_limits(symbol)
-    if not daily_ok:
-        async_to_sync(log_event)(f"🚫 Trade bloqueado: {daily_reason}", source='risk_manager', level='INFO')
-        return False, daily_reason
-
-    # Check 3: Calcular tamaño dinámico
-    size = calculate_dynamic_position_size(price, symbol, capital, risk_pct, confidence_score)
-
-    # Check 4: Validar tamaño mínimo
-    if size["mode"] == "qty":
-        amount_usd = size["value"] * price
-        if size["value"] <= 0:
-            async_to_sync(log_event)("🚫 Trade bloqueado: capital insuficiente para qty mínima", source='risk_manager',
-                                     level='INFO')
-            return False, "Insufficient capital for minimum qty"
-    else:
-        amount_usd = size["value"]
-        if amount_usd < min_notional:
-            async_to_sync(log_event)("🚫 Trade bloqueado: notional muy pequeño", source='risk_manager', level='INFO')
-            return False, f"Minimum notional too small (below ${min_notional})"
-
-    # Check 5: Límites de portafolio
-    portfolio_ok, portfolio_reason = check_portfolio_risk_limits(capital, amount_usd)
-    if not portfolio_ok:
-        async_to_sync(log_event)(f"🚫 Trade bloqueado: {portfolio_reason}", source='risk_manager', level='INFO')
-        return False, portfolio_reason
-
-    # Check 6: Sanity check - no más del 20% del capital en un solo trade
-    if amount_usd > capital * 0.2:
-        adjusted_amount = capital * 0.2
-        if size["mode"] == "qty":
-            size["value"] = int(adjusted_amount // price)
-            amount_usd = size["value"] * price
-        else:
-            size["value"] = adjusted_amount
-            amount_usd = adjusted_amount
-
-        async_to_sync(log_event)(
-            f"⚠️ Trade size reducido por límite de concentración: ${amount_usd:.0f}",
-            source='risk_manager', level='INFO'
-        )
-
-    async_to_sync(log_event)(
-        f"✅ Trade aprobado: ${amount_usd:.0f} ({amount_usd / capital:.1%} del capital)",
-        source='risk_manager', level='INFO'
+    return evaluate_trade_rules(
+        price, symbol, confidence_score, capital, risk_pct, min_notional,
+        state=get_live_risk_state(symbol)
     )
-
-    return True, amount_usd
\ No newline at end of file
@@ -0,0 +1,128 @@
+# signals/recent_index.py
+
+"""
+Índice en memoria de la última señal emitida por (símbolo, estrategia, dirección).
+
+Reemplaza el Signal.objects.filter(...).exists() que cada estrategia hacía al
+final para evitar duplicados: el índice se reconstruye con una sola query al
+primer uso, run_entry_strategies lo actualiza al guardar cada señal y las
+estrategias lo consultan vía EntryStrategy.is_duplicate_signal().
+
+El índice es memoria del proceso: start_stream y startaggregator guardan
+señales cada uno por su lado, así que persist_signal además confirma contra la
+DB (is_recent_in_db) antes de guardar, para no duplicar lo que emitió el otro.
+
+Los backtests usan su propia instancia (sin DB) y fijan `as_of` a la vela en curso.
+"""
+
+import threading
+from datetime import timedelta
+
+from django.db.models import Max
+from django.utils import timezone
+
+DEFAULT_LOAD_WINDOW = timedelta(days=1)  # mayor ventana de deduplicación (timeframe 1d)
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+class RecentSignalIndex:
+    def __init__(self, use_db=True):
+        self.use_db = use_db
+        self.as_of = None  # None = timezone.now(); los backtests lo fijan a la vela actual
+        self._last = {}
+        self._lock = threading.Lock()
+        self._loaded = not use_db
+
+    @staticmethod
+    def key(symbol, strategy, direction):
+        return _pk(symbol), _pk(strategy), str(direction).lower()
+
+    def now(self):
+        return self.as_of or timezone.now()
+
+    def load(self, window=DEFAULT_LOAD_WINDOW):
+        """Reconstruye el índice con una query agregada sobre las señales de la ventana."""
+        from signals.signal import Signal
+
+        rows = (
+            Signal.objects.filter(received_at__gte=timezone.now() - window, strategy__isnull=False)
+            .values("symbol_id", "strategy_id", "signal")
+            .annotate(last=Max("received_at"))
+        )
+        last = {self.key(r["symbol_id"], r["strategy_id"], r["signal"]): r["last"] for r in rows}
+        with self._lock:
+            self._last = last
+            self._loaded = True
+        return len(last)
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def record(self, symbol, strategy, direction, when=None):
+        """Registra una emisión (se queda con la más reciente)."""
+        key = self.key(symbol, strategy, direction)
+        when = when or self.now()
+        with self._lock:
+            previous = self._last.get(key)
+            if previous is None or when > previous:
+                self._last[key] = when
+
+    def record_signal(self, signal):
+        self.record(signal.symbol_id, signal.strategy_id, signal.signal, signal.received_at)
+
+    def last(self, symbol, strategy, direction):
+        self.ensure_loaded()
+        return self._last.get(self.key(symbol, strategy, direction))
+
+    def is_recent(self, symbol, strategy, direction, window: timedelta) -> bool:
+        """True si hubo una emisión dentro de `window` hasta now()."""
+        last = self.last(symbol, strategy, direction)
+        return last is not None and last >= self.now() - window
+
+    def is_recent_in_db(self, symbol, strategy, direction, window: timedelta) -> bool:
+        """
+        is_recent contra Signal en la DB: ve las señales que guardaron otros procesos.
+        Si encuentra una, la registra en el índice para que las próximas consultas no vayan a la DB.
+        """
+        if not self.use_db:
+            return False
+        from signals.signal import Signal
+
+        last = (
+            Signal.objects.filter(
+                symbol_id=_pk(symbol), strategy_id=_pk(strategy), signal=direction,
+                received_at__gte=self.now() - window,
+            )
+            .order_by("-received_at")
+            .values_list("received_at", flat=True)
+            .first()
+        )
+        if last is None:
+            return False
+        self.record(symbol, strategy, direction, last)
+        return True
+
+    def snapshot(self, symbol=None) -> dict:
+        """Copia de las entradas (de un símbolo, si se pasa) para sembrar otro índice, p.ej. en un worker."""
+        self.ensure_loaded()
+        symbol_id = None if symbol is None else _pk(symbol)
+        with self._lock:
+            return {k: v for k, v in self._last.items() if symbol_id is None or k[0] == symbol_id}
+
+    def seed(self, entries: dict):
+        """Agrega entradas de snapshot() (se queda con la más reciente por clave)."""
+        for (symbol, strategy, direction), when in entries.items():
+            self.record(symbol, strategy, direction, when)
+
+    def clear(self):
+        with self._lock:
+            self._last = {}
+            self._loaded = not self.use_db
+
+
+# Índice compartido del proceso en vivo
+recent_signals = RecentSignalIndex()
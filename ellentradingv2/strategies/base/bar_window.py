@@ -0,0 +1,219 @@
+# strategies/base/bar_window.py
+
+"""
+Ventana de velas como struct-of-arrays (columnas NumPy) en lugar de listas de
+instancias del ORM.
+
+- BarWindow guarda time (epoch ns) + OHLCV + las columnas de indicadores pedidas.
+  Slicear (bars[-20:], bars[::4]) devuelve otra BarWindow con vistas, sin copiar.
+- bars[i] / iterar devuelve BarRow: un proxy con la misma forma que una vela del
+  ORM (open / high / low / close / volume / start_time / timestamp / indicators),
+  así las estrategias existentes siguen funcionando sin cambios.
+- Los helpers nuevos pueden usar las columnas directo: bars.high[-10:].max().
+"""
+
+import numpy as np
+
+from core.utils.time import from_epoch_ns, to_epoch_ns
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _scalar(value):
+    """float de Python; NaN → None (mismo contrato que un FloatField null)."""
+    value = float(value)
+    return None if value != value else value
+
+
+class IndicatorRow:
+    """Reemplazo de `bar.indicators` (LiveTechnicalIndicator / TechnicalIndicator) para una fila."""
+
+    __slots__ = ("_window", "_i")
+
+    def __init__(self, window, i):
+        self._window = window
+        self._i = i
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        column = self._window.indicator_columns.get(name)
+        return None if column is None else _scalar(column[self._i])
+
+    def get(self, name, default=None):
+        value = getattr(self, name)
+        return default if value is None else value
+
+
+class BarRow:
+    """Proxy de una vela de la ventana (compatibilidad con el acceso por atributos)."""
+
+    __slots__ = ("_window", "_i")
+
+    def __init__(self, window, i):
+        self._window = window
+        self._i = i
+
+    @property
+    def open(self):
+        return _scalar(self._window.open[self._i])
+
+    @property
+    def high(self):
+        return _scalar(self._window.high[self._i])
+
+    @property
+    def low(self):
+        return _scalar(self._window.low[self._i])
+
+    @property
+    def close(self):
+        return _scalar(self._window.close[self._i])
+
+    @property
+    def volume(self):
+        return _scalar(self._window.volume[self._i])
+
+    @property
+    def start_time(self):
+        return from_epoch_ns(self._window.time[self._i])
+
+    timestamp = start_time
+
+    @property
+    def indicators(self):
+        return IndicatorRow(self._window, self._i)
+
+    def indicator(self, name):
+        column = self._window.indicator_columns.get(name)
+        return None if column is None else _scalar(column[self._i])
+
+    def __repr__(self):
+        return f"BarRow({self.start_time:%Y-%m-%d %H:%M}, close={self.close})"
+
+
+class BarWindow:
+    """
+    bars = BarWindow(columns)          # dict con time + OHLCV + indicadores
+    bars[-1].close                     # BarRow (compatibilidad)
+    bars[-20:].high.max()              # vistas NumPy
+    bars.indicator("rsi_14")[-5:]      # columna de indicador
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume", "indicator_columns")
+
+    def __init__(self, columns, indicators=None):
+        self.time = np.asarray(columns["time"], dtype=np.int64)
+        for name in OHLCV_COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=np.float64))
+        if indicators is None:
+            names = columns.columns if hasattr(columns, "columns") else list(columns.keys())
+            indicators = [n for n in names if n != "time" and n not in OHLCV_COLUMNS]
+        self.indicator_columns = {name: np.asarray(columns[name], dtype=np.float64) for name in indicators}
+
+    # ---------- construcción ----------
+
+    @classmethod
+    def _from_arrays(cls, time, ohlcv, indicator_columns):
+        window = cls.__new__(cls)
+        window.time = time
+        for name, arr in zip(OHLCV_COLUMNS, ohlcv):
+            setattr(window, name, arr)
+        window.indicator_columns = indicator_columns
+        return window
+
+    @classmethod
+    def from_queryset(cls, queryset, time_field="start_time", indicators=(), limit=None):
+        """
+        Últimas `limit` velas del queryset en orden cronológico, con una sola query
+        values_list (sin instanciar modelos). Los indicadores que no existen en el
+        modelo relacionado quedan fuera (se leen como None).
+        """
+        indicator_model = queryset.model._meta.get_field("indicators").related_model
+        known = {f.name for f in indicator_model._meta.fields}
+        indicators = [name for name in dict.fromkeys(indicators) if name in known]
+
+        fields = [time_field, *OHLCV_COLUMNS, *[f"indicators__{name}" for name in indicators]]
+        qs = queryset.order_by(f"-{time_field}").values_list(*fields)
+        rows = list(qs[:limit] if limit else qs)[::-1]
+        return cls(_rows_to_columns(rows, [*OHLCV_COLUMNS, *indicators]), indicators=indicators)
+
+    @classmethod
+    def from_bars(cls, bars, indicators=()):
+        """Convierte una lista de velas (ORM o SimpleNamespace) en BarWindow."""
+        if isinstance(bars, BarWindow):
+            return bars
+        n = len(bars)
+        columns = {"time": np.fromiter((_bar_time_ns(b) for b in bars), dtype=np.int64, count=n)}
+        for name in OHLCV_COLUMNS:
+            columns[name] = np.fromiter(
+                (np.nan if getattr(b, name) is None else getattr(b, name) for b in bars), dtype=np.float64, count=n
+            )
+        for name in indicators:
+            columns[name] = np.fromiter((_bar_indicator(b, name) for b in bars), dtype=np.float64, count=n)
+        return cls(columns, indicators=list(indicators))
+
+    @classmethod
+    def concat(cls, windows):
+        """Une ventanas consecutivas con las mismas columnas de indicadores (copia)."""
+        first = windows[0]
+        return cls._from_arrays(
+            np.concatenate([w.time for w in windows]),
+            [np.concatenate([getattr(w, name) for w in windows]) for name in OHLCV_COLUMNS],
+            {name: np.concatenate([w.indicator_columns[name] for w in windows]) for name in first.indicator_columns},
+        )
+
+    # ---------- acceso ----------
+
+    def __len__(self):
+        return len(self.time)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return BarWindow._from_arrays(
+                self.time[key],
+                [getattr(self, name)[key] for name in OHLCV_COLUMNS],
+                {name: arr[key] for name, arr in self.indicator_columns.items()},
+            )
+        n = len(self.time)
+        i = key + n if key < 0 else key
+        if not 0 <= i < n:
+            raise IndexError("BarWindow index out of range")
+        return BarRow(self, i)
+
+    def __iter__(self):
+        return (BarRow(self, i) for i in range(len(self.time)))
+
+    def __repr__(self):
+        return f"BarWindow({len(self)} velas, indicadores={list(self.indicator_columns)})"
+
+    def indicator(self, name):
+        """Columna del indicador (NaN donde falta); None si no se cargó."""
+        return self.indicator_columns.get(name)
+
+    def column(self, name):
+        if name == "time" or name in OHLCV_COLUMNS:
+            return getattr(self, name)
+        return self.indicator_columns.get(name)
+
+
+def _rows_to_columns(rows, names) -> dict:
+    n = len(rows)
+    columns = {"time": np.fromiter((to_epoch_ns(r[0]) for r in rows), dtype=np.int64, count=n)}
+    for offset, name in enumerate(names, start=1):
+        columns[name] = np.fromiter(
+            (np.nan if r[offset] is None else r[offset] for r in rows), dtype=np.float64, count=n
+        )
+    return columns
+
+
+def _bar_time_ns(bar):
+    """Inicio de la vela en epoch ns (start_time / timestamp del ORM, o `time` ya en ns)."""
+    when = getattr(bar, "start_time", None) or getattr(bar, "timestamp", None)
+    return int(bar.time) if when is None else to_epoch_ns(when)
+
+
+def _bar_indicator(bar, name):
+    indicators = getattr(bar, "indicators", None)
+    value = indicators.get(name) if isinstance(indicators, dict) else getattr(indicators, name, None)
+    return np.nan if value is None else value
@@ -7,8 +7,37 @@ from core.models.marketdatapoint import MarketDataPoint
 import traceback
 from monitoring.utils import log_event
 from asgiref.sync import async_to_sync
+from datetime import timedelta
+from core.utils.time import TIMEFRAME_MINUTES, timeframe_to_timedelta
+from signals.recent_index import recent_signals
+from strategies.indicators.multi_timeframe import HIGHER_TIMEFRAME
+from strategies.base.bar_window import BarWindow, BarRow
+from strategies.base.feature_context import FeatureContext, FeatureWindow, get_feature_context
+from strategies.base.decision import StrategyDecision, notes_to_log, log_notes
+
+# Symbol por string, cacheado por proceso (las estrategias reciben "BTC/USD" o la instancia)
+_SYMBOL_CACHE = {}
+
 
 class EntryStrategy:
+    # Columnas de indicadores que lee la estrategia (ver strategies/indicators/registry.py)
+    REQUIRED_INDICATORS = ()
+    # True si la estrategia lee contexto de timeframes superiores (ver higher_timeframe_bars)
+    USES_MULTI_TIMEFRAME = False
+    # MultiTimeframeView del símbolo en curso (lo asigna el runner; None = sin vista)
+    mtf_view = None
+    # dict compartido de FeatureContext por (timeframe, vela) (lo asigna el runner; None = sin compartir)
+    feature_cache = None
+    # RecentSignalIndex propio (p.ej. un backtest con reloj de vela); None = índice compartido en vivo
+    signal_index = None
+    # Notas de la evaluación en curso (ver note()); None = fuera de evaluate()
+    _notes = None
+    # Notas de la última evaluate() (level, source, message)
+    last_notes = ()
+    # generate_signals_vectorized(bars): señales de toda la historia en una pasada
+    # (ver strategies/base/vectorized.py); None = el backtest evalúa vela a vela
+    generate_signals_vectorized = None
+
     def __init__(self, strategy_instance=None):
         self.name = getattr(self, "name", None)
         self.strategy_instance = strategy_instance or self.get_strategy_instance()
@@ -31,21 +60,33 @@ class EntryStrategy:
     def get_indicator_value(self, bar, name: str, fallback_func=None):
         """
         Devuelve el valor del indicador 'name' desde:
+        - una BarWindow (valor de la última vela) o un BarRow (columna NumPy)
         - bar.indicators (si es un dict o JSON)
         - o desde la relación LiveTechnicalIndicator o TechnicalIndicator
 
         Si no se encuentra, usa fallback_func() si se proporciona.
         """
+        if isinstance(bar, BarWindow):
+            bar = bar[-1]
+
         timestamp = getattr(bar, 'timestamp', getattr(bar, 'start_time', '???'))
 
         try:
+            if isinstance(bar, BarRow):
+                value = bar.indicator(name)
+                if value is not None:
+                    return value
+                self.note(f"⚠️ Estrategia: {self.name}, Indicador '{name}' es None en ventana @ {timestamp}",
+                          source='strategies', level='WARNING')
+                return None
+
             indicators = getattr(bar, "indicators", None)
 
             if isinstance(indicators, dict):
                 value = indicators.get(name)
                 if value is not None:
                     return value
-                async_to_sync(log_event)(f"⚠️ Estrategia: {self.name}, Indicador '{name}' es None en JSON @ {timestamp}",
+                self.note(f"⚠️ Estrategia: {self.name}, Indicador '{name}' es None en JSON @ {timestamp}",
                           source='strategies', level='WARNING')
                 return None
 
@@ -53,7 +94,7 @@ class EntryStrategy:
                 value = getattr(indicators, name, None)
                 if value is not None:
                     return value
-                async_to_sync(log_event)(f"⚠️ Estrategia: {self.name}, Indicador '{name}' es None en modelo @ {timestamp}",
+                self.note(f"⚠️ Estrategia: {self.name}, Indicador '{name}' es None en modelo @ {timestamp}",
                           source='strategies', level='WARNING')
                 return None
 
@@ -61,7 +102,7 @@ class EntryStrategy:
 
         except Exception as e:
             traceback.print_exc()
-            async_to_sync(log_event)(f"❌ Estrategia: {self.name}, No se encontró indicador '{name}' para {timestamp}: {e}",
+            self.note(f"❌ Estrategia: {self.name}, No se encontró indicador '{name}' para {timestamp}: {e}",
                       source='strategies', level='ERROR')
 
         if fallback_func:
@@ -71,32 +112,140 @@ class EntryStrategy:
 
     def get_candles(self, symbol, execution_mode: str = "simulated"):
         # 🛡️ Asegurarse de que 'symbol' es una instancia del modelo
-        if isinstance(symbol, str):
-            symbol = SymbolModel.objects.get(symbol=symbol)
+        symbol = self.resolve_symbol(symbol)
 
         if not self.timeframe:
             async_to_sync(log_event)(f"Estrategia: {self.name} no tiene timeframe asignado.",
                       source='strategies', level='ERROR')
             raise ValueError(f"⛔ {self.name} no tiene timeframe asignado.")
 
+        # Una query values_list → columnas NumPy (OHLCV + indicadores que usa la estrategia)
         if execution_mode == "backtest":
-            queryset = HistoricalMarketDataPoint.objects.filter(
-                symbol=symbol,
-                timeframe=self.timeframe
-            ).select_related('indicators').order_by("-timestamp")[:self.required_bars]
+            queryset = HistoricalMarketDataPoint.objects.filter(symbol=symbol, timeframe=self.timeframe)
+            time_field = "timestamp"
         else:
-            queryset = MarketDataPoint.objects.filter(
-                symbol=symbol,
-                timeframe=self.timeframe
-            ).select_related('indicators').order_by("-start_time")[:self.required_bars]
+            queryset = MarketDataPoint.objects.filter(symbol=symbol, timeframe=self.timeframe)
+            time_field = "start_time"
 
-        return list(queryset[::-1])  # cronológico
+        return BarWindow.from_queryset(
+            queryset, time_field=time_field, indicators=self.REQUIRED_INDICATORS, limit=self.required_bars
+        )  # cronológico
 
 
 
 
+    def resolve_symbol(self, symbol):
+        """Instancia de Symbol a partir de un string (cacheada) o de la propia instancia."""
+        if not isinstance(symbol, str):
+            return symbol
+        cached = _SYMBOL_CACHE.get(symbol)
+        if cached is None:
+            cached = _SYMBOL_CACHE[symbol] = SymbolModel.objects.get(symbol=symbol)
+        return cached
+
+    def is_duplicate_signal(self, symbol, signal_type, execution_mode="simulated") -> bool:
+        """
+        True si esta estrategia ya emitió `signal_type` para el símbolo dentro del
+        último timeframe. Consulta el índice en memoria, sin ir a la DB.
+        En backtest solo se usa un índice propio (signal_index) si el runner lo asigna.
+        """
+        index = self.signal_index
+        if index is None:
+            if execution_mode == "backtest":
+                return False
+            index = recent_signals
+        minutes = TIMEFRAME_MINUTES.get(self.timeframe, 60)
+        return index.is_recent(self.resolve_symbol(symbol), self.strategy_instance, signal_type, timedelta(minutes=minutes))
+
+    def features(self, bars):
+        """
+        FeatureContext de la última vela de `bars`, compartido entre estrategias vía
+        feature_cache y limitado a las len(bars) velas de esta estrategia (FeatureWindow).
+        """
+        last = bars[-1]
+        key = (self.timeframe, getattr(last, "start_time", None) or getattr(last, "timestamp", None))
+        if self.feature_cache is None:
+            # Sin cache compartido: se memoiza solo la vela en curso
+            cached = getattr(self, "_last_features", None)
+            if cached is None or cached[0] != key:
+                cached = self._last_features = (key, FeatureContext(bars))
+            return FeatureWindow(cached[1].extend(bars), len(bars))
+        return FeatureWindow(get_feature_context(bars, self.feature_cache, key), len(bars))
+
+    def higher_timeframe_bars(self, bars, count=None, timeframe=None):
+        """
+        Velas cerradas del timeframe superior al cierre de bars[-1], leídas de mtf_view
+        (sin DB, sin mirar velas superiores aún abiertas). None si no hay vista.
+        """
+        if self.mtf_view is None or not bars:
+            return None
+        timeframe = timeframe or HIGHER_TIMEFRAME.get(self.timeframe)
+        if timeframe is None:
+            return None
+
+        last = bars[-1]
+        start = getattr(last, "start_time", None) or getattr(last, "timestamp", None)
+        if start is None:
+            return None
+        bar_close = start + timeframe_to_timedelta(self.timeframe) - timedelta(microseconds=1)
+        return self.mtf_view.bars_at_time(timeframe, bar_close, count)
+
+    # ---------- evaluación pura ----------
+
+    def note(self, message, source="strategies", level="INFO"):
+        """Log de la estrategia: dentro de evaluate() se acumula como nota; fuera va a log_event."""
+        if self._notes is None:
+            async_to_sync(log_event)(message, source=source, level=level)
+        else:
+            self._notes.append((level, source, message))
+
+    def decision(self, signal_type, confidence, price, bar, source, **diagnostics) -> StrategyDecision:
+        """StrategyDecision de esta estrategia para la vela `bar`."""
+        return StrategyDecision(
+            signal_type, confidence, price,
+            timestamp=getattr(bar, "timestamp", getattr(bar, "start_time", None)),
+            source=source,
+            strategy=self.strategy_instance,
+            timeframe=self.timeframe,
+            diagnostics=diagnostics,
+        )
+
+    def evaluate(self, bars, symbol=None) -> StrategyDecision | None:
+        """
+        Ventana de velas (cronológica) + contexto asignado (mtf_view, feature_cache)
+        → StrategyDecision o None. Sin DB, sin deduplicar y sin logs: las notas quedan
+        en decision.notes / self.last_notes y las escribe quien llama.
+        """
+        self._notes = []
+        try:
+            decision = self.score(bars, symbol)
+        finally:
+            self.last_notes, self._notes = self._notes, None
+        if decision is not None:
+            decision.notes = self.last_notes
+        return decision
+
     @abstractmethod
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
+        """Lógica de la estrategia sobre `bars`. Usar note() en vez de log_event."""
+
     def should_generate_signal(self, symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        pass
+        """
+        Camino clásico alrededor de evaluate(): carga velas si no se pasan, deduplica,
+        loguea las notas (fuera de backtest) y devuelve la Signal sin guardar.
+        """
+        bars = candles or self.get_candles(symbol, execution_mode)
+        decision = self.evaluate(bars, symbol)
+
+        symbol_obj = None
+        if decision is not None:
+            symbol_obj = self.resolve_symbol(symbol)
+            if self.is_duplicate_signal(symbol_obj, decision.signal_type, execution_mode):
+                decision = None
+
+        if execution_mode != "backtest":
+            log_notes(notes_to_log(self.last_notes, emitted=decision is not None))
+
+        return None if decision is None else decision.to_signal(symbol_obj)
 
 
@@ -0,0 +1,73 @@
+# strategies/base/decision.py
+
+"""
+Resultado puro de una estrategia (EntryStrategy.evaluate()).
+
+Una StrategyDecision es dirección + score + precio de la vela + diagnóstico,
+sin tocar la DB. El runner en vivo la convierte en Signal (to_signal) después de
+deduplicar; los backtests la usan directo o la graban en el signal tape.
+Es picklable, así que también viaja desde los workers del pool de evaluación.
+"""
+
+from asgiref.sync import async_to_sync
+
+from monitoring.utils import log_event
+from signals.signal import Signal
+
+# Niveles de nota que se loguean aunque la evaluación no termine en señal
+ALWAYS_LOGGED = ("WARNING", "ERROR")
+
+
+class StrategyDecision:
+    __slots__ = ("signal_type", "confidence", "price", "timestamp", "source", "strategy", "timeframe",
+                 "diagnostics", "notes")
+
+    def __init__(self, signal_type, confidence, price, timestamp=None, source=None, strategy=None,
+                 timeframe=None, diagnostics=None, notes=None):
+        self.signal_type = signal_type
+        self.confidence = confidence
+        self.price = price
+        self.timestamp = timestamp
+        self.source = source
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.diagnostics = diagnostics or {}
+        self.notes = notes or []
+
+    # Alias con los nombres de Signal (lo que lee la capa de riesgo)
+    @property
+    def signal(self):
+        return self.signal_type
+
+    @property
+    def confidence_score(self):
+        return self.confidence
+
+    def to_signal(self, symbol) -> Signal:
+        """Signal sin guardar, igual a la que armaban las estrategias en should_generate_signal()."""
+        s = Signal(
+            symbol=symbol,
+            signal=self.signal_type,
+            price=self.price,
+            confidence_score=self.confidence,
+            source=self.source,
+            strategy=self.strategy,
+            timeframe=self.timeframe,
+        )
+        s.timestamp = self.timestamp
+        s.received_at = self.timestamp
+        return s
+
+    def __repr__(self):
+        return f"StrategyDecision({self.signal_type}, confidence={self.confidence}, price={self.price}, source={self.source})"
+
+
+def notes_to_log(notes, emitted=False) -> list:
+    """Warnings / errores siempre; el resto de las notas solo si la evaluación emitió señal."""
+    return [n for n in notes or () if emitted or n[0] in ALWAYS_LOGGED]
+
+
+def log_notes(notes):
+    """Escribe notas (level, source, message) con log_event."""
+    for level, source, message in notes:
+        async_to_sync(log_event)(message, source=source, level=level)
@@ -17,33 +17,41 @@ from strategies.strategies.DonchianChannelBreakoutStrategy import DonchianChanne
 from strategies.strategies.FibonacciRetracementStrategy import FibonacciRetracementStrategy
 
 
-def build_entry_strategies():
-    strategy_map = {}
-    for s in OpenStrategy.objects.filter(auto_execute=True):
-        name_map = {
-            # ✨ NOMBRES EXACTOS que deben coincidir con la base de datos
-            "Moving Average Cross Strategy": MovingAverageCrossStrategy,
-            "RSI Breakout Strategy": RSIBreakoutStrategy,
-            "Bollinger Band Breakout": BollingerBandBreakoutStrategy,
-            "MACD Crossover Strategy": MACDCrossoverStrategy,
-            "Bullish Engulfing Pattern": BullishEngulfingStrategy,
-            "Bearish Engulfing Pattern": BearishEngulfingStrategy,
-            "Volume Spike Breakout Strategy": VolumeSpikeStrategy,
-            "ADX Trend Strength Strategy": ADXTrendStrengthStrategy,
-            "Ichimoku Cloud Breakout": IchimokuCloudBreakout,
-            "Parabolic SAR Trend Strategy": ParabolicSARStrategy,
-            "Stochastic Oscillator Strategy": StochasticOscillatorStrategy,
-            "CCI Extreme Strategy": CCIExtremeStrategy,
-            "Triple EMA Crossover Strategy": TripleEMACrossoverStrategy,
-            "Donchian Channel Breakout": DonchianChannelBreakoutStrategy,
-            "Fibonacci Retracement Strategy": FibonacciRetracementStrategy,
+# ✨ NOMBRES EXACTOS que deben coincidir con la base de datos
+STRATEGY_CLASS_MAP = {
+    "Moving Average Cross Strategy": MovingAverageCrossStrategy,
+    "RSI Breakout Strategy": RSIBreakoutStrategy,
+    "Bollinger Band Breakout": BollingerBandBreakoutStrategy,
+    "MACD Crossover Strategy": MACDCrossoverStrategy,
+    "Bullish Engulfing Pattern": BullishEngulfingStrategy,
+    "Bearish Engulfing Pattern": BearishEngulfingStrategy,
+    "Volume Spike Breakout Strategy": VolumeSpikeStrategy,
+    "ADX Trend Strength Strategy": ADXTrendStrengthStrategy,
+    "Ichimoku Cloud Breakout": IchimokuCloudBreakout,
+    "Parabolic SAR Trend Strategy": ParabolicSARStrategy,
+    "Stochastic Oscillator Strategy": StochasticOscillatorStrategy,
+    "CCI Extreme Strategy": CCIExtremeStrategy,
+    "Triple EMA Crossover Strategy": TripleEMACrossoverStrategy,
+    "Donchian Channel Breakout": DonchianChannelBreakoutStrategy,
+    "Fibonacci Retracement Strategy": FibonacciRetracementStrategy,
+
+    # ✨ ALIAS para backward compatibility (nombres alternativos)
+    "Moving Average Crossover": MovingAverageCrossStrategy,
+    "Volume Spike": VolumeSpikeStrategy,
+    "Stochastic Oscillator": StochasticOscillatorStrategy,
+}
 
-            # ✨ ALIAS para backward compatibility (nombres alternativos)
-            "Moving Average Crossover": MovingAverageCrossStrategy,
-            "Volume Spike": VolumeSpikeStrategy,
-            "Stochastic Oscillator": StochasticOscillatorStrategy,
-        }
 
+def build_entry_strategies(open_strategies=None):
+    """
+    Instancia las estrategias con auto_execute. `open_strategies` permite pasar
+    las filas de OpenStrategy ya cargadas (p.ej. a un worker) y evitar la query.
+    """
+    strategy_map = {}
+    name_map = STRATEGY_CLASS_MAP
+    if open_strategies is None:
+        open_strategies = OpenStrategy.objects.filter(auto_execute=True)
+    for s in open_strategies:
         class_ref = name_map.get(s.name)
         if class_ref:
             # Create a safe key for the strategy map
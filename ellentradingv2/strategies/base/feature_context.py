@@ -0,0 +1,223 @@
+# strategies/base/feature_context.py
+
+"""
+Features derivados de la vela cerrada, calculados una sola vez por
+(símbolo, timeframe, vela) y compartidos por todas las estrategias.
+
+Antes cada estrategia recorría las mismas ventanas (volumen promedio de las
+últimas 10 velas, tendencia 5/20, máximos/mínimos de 20, pivots, cuerpo de la
+vela...). FeatureContext calcula cada feature bajo demanda sobre las columnas
+de la BarWindow y lo memoiza; el runner comparte el mismo contexto entre las
+15 estrategias del símbolo.
+
+Todos los features miran solo las últimas N velas y se memoizan por
+(N pedido, N disponible), así que un contexto creado con una ventana corta se
+puede extender con una más larga (otra estrategia con más required_bars) sin
+invalidar lo ya calculado. `available` limita cada feature a las últimas velas de
+la ventana de quien pregunta: con el contexto extendido por otra estrategia el
+resultado es el mismo que sobre su propia ventana (ver FeatureWindow).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from strategies.base.bar_window import BarWindow
+from strategies.indicators.range_index import RangeExtremumIndex, find_pivots
+
+
+class FeatureContext:
+    def __init__(self, bars):
+        self.bars = bars if isinstance(bars, BarWindow) else BarWindow.from_bars(bars)
+        self._memo = {}
+        self._range_index = None
+
+    def __len__(self):
+        return len(self.bars)
+
+    def extend(self, bars):
+        """Reemplaza la ventana por una más larga que termina en la misma vela."""
+        if len(bars) > len(self.bars):
+            self.bars = bars if isinstance(bars, BarWindow) else BarWindow.from_bars(bars)
+            self._range_index = None
+        return self
+
+    def _available(self, available=None):
+        return len(self.bars) if available is None else min(available, len(self.bars))
+
+    def _cached(self, key, lookback, func, available=None):
+        key = (*key, lookback, min(lookback, self._available(available)))
+        if key not in self._memo:
+            self._memo[key] = func()
+        return self._memo[key]
+
+    # ---------- volumen ----------
+
+    def volume_ratio(self, lookback=10, available=None):
+        """
+        Volumen actual / promedio de los volúmenes no nulos de las últimas `lookback`
+        velas (incluida la actual). None si no hay volumen o velas suficientes.
+        """
+        def compute():
+            volume = self.bars.volume
+            if self._available(available) < lookback:
+                return None
+            current = volume[-1]
+            if not current or np.isnan(current):
+                return None
+            recent = volume[-lookback:]
+            recent = recent[(recent != 0) & ~np.isnan(recent)]
+            return float(current / recent.mean()) if len(recent) else None
+
+        return self._cached(("volume_ratio",), lookback, compute, available)
+
+    # ---------- rangos ----------
+
+    @property
+    def range_index(self) -> RangeExtremumIndex:
+        """Sparse tables de high / low de la ventana (max / min de cualquier rango en O(1))."""
+        if self._range_index is None:
+            self._range_index = RangeExtremumIndex(self.bars.high, self.bars.low)
+        return self._range_index
+
+    def range_high(self, lookback, skip=0, available=None):
+        """
+        Máximo de high en las `lookback` velas que terminan `skip` velas antes de la
+        actual (o las que haya; None si el rango queda vacío). O(1).
+        """
+        lookback = min(lookback, self._available(available) - skip)
+        return self.range_index.highest(lookback, skip) if lookback > 0 else None
+
+    def range_low(self, lookback, skip=0, available=None):
+        """Mínimo de low, mismo rango que range_high(). O(1)."""
+        lookback = min(lookback, self._available(available) - skip)
+        return self.range_index.lowest(lookback, skip) if lookback > 0 else None
+
+    def lowest_lows(self, lookback=20, count=5, available=None) -> list:
+        """Los `count` lows distintos más bajos de las últimas `lookback` velas (orden ascendente)."""
+        n = min(lookback, self._available(available))
+        return self._cached(
+            ("lowest_lows", count), lookback,
+            lambda: np.unique(self.bars.low[len(self.bars) - n:])[:count].tolist(), available,
+        )
+
+    def highest_highs(self, lookback=20, count=5, available=None) -> list:
+        """Los `count` highs distintos más altos de las últimas `lookback` velas (orden descendente)."""
+        n = min(lookback, self._available(available))
+        return self._cached(
+            ("highest_highs", count), lookback,
+            lambda: np.unique(self.bars.high[len(self.bars) - n:])[::-1][:count].tolist(), available,
+        )
+
+    # ---------- tendencia ----------
+
+    def trend(self, lookback, available=None):
+        """(close[-1] - close[-lookback]) / close[-lookback]; None si no hay velas suficientes."""
+        def compute():
+            close = self.bars.close
+            if self._available(available) < lookback:
+                return None
+            return float((close[-1] - close[-lookback]) / close[-lookback])
+
+        return self._cached(("trend",), lookback, compute, available)
+
+    # ---------- pivots ----------
+
+    def pivot_extremes(self, order=5, lookback=None, available=None):
+        """
+        (máximo pivot high, mínimo pivot low) de las últimas `lookback` velas, donde
+        un pivot es una vela >= / <= a las `order` velas de cada lado.
+        Cada extremo es None si no hay pivots.
+        """
+        lookback = min(lookback or len(self.bars), self._available(available))
+
+        def compute():
+            offset = max(0, len(self.bars) - lookback)
+            high = self.bars.high[offset:]
+            low = self.bars.low[offset:]
+            # Con la ventana completa se reusan las sparse tables ya construidas
+            index = self.range_index if offset == 0 else None
+            pivot_high, pivot_low = find_pivots(high, low, order, index=index)
+            return (
+                float(high[pivot_high].max()) if pivot_high.any() else None,
+                float(low[pivot_low].min()) if pivot_low.any() else None,
+            )
+
+        return self._cached(("pivot_extremes", order), lookback, compute, available)
+
+    # ---------- vela actual ----------
+
+    @property
+    def candle(self):
+        """Métricas del cuerpo de la última vela: body, range, body_ratio, wicks, color."""
+        def compute():
+            bar = self.bars[-1]
+            body = abs(bar.close - bar.open)
+            candle_range = bar.high - bar.low
+            return SimpleNamespace(
+                open=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                body=body,
+                range=candle_range,
+                body_ratio=body / candle_range if candle_range > 0 else 0,
+                upper_wick=bar.high - max(bar.open, bar.close),
+                lower_wick=min(bar.open, bar.close) - bar.low,
+                is_green=bar.close > bar.open,
+                is_red=bar.close < bar.open,
+            )
+
+        return self._cached(("candle",), 1, compute)
+
+
+class FeatureWindow:
+    """
+    FeatureContext compartido visto desde una ventana de `available` velas: cada
+    feature se limita a esas velas aunque otra estrategia haya extendido el contexto.
+    """
+
+    def __init__(self, context, available):
+        self.context = context
+        self.available = available
+
+    def __len__(self):
+        return min(self.available, len(self.context))
+
+    def volume_ratio(self, lookback=10):
+        return self.context.volume_ratio(lookback, available=self.available)
+
+    def range_high(self, lookback, skip=0):
+        return self.context.range_high(lookback, skip, available=self.available)
+
+    def range_low(self, lookback, skip=0):
+        return self.context.range_low(lookback, skip, available=self.available)
+
+    def lowest_lows(self, lookback=20, count=5) -> list:
+        return self.context.lowest_lows(lookback, count, available=self.available)
+
+    def highest_highs(self, lookback=20, count=5) -> list:
+        return self.context.highest_highs(lookback, count, available=self.available)
+
+    def trend(self, lookback):
+        return self.context.trend(lookback, available=self.available)
+
+    def pivot_extremes(self, order=5, lookback=None):
+        return self.context.pivot_extremes(order, lookback, available=self.available)
+
+    @property
+    def candle(self):
+        return self.context.candle
+
+
+def get_feature_context(bars, cache=None, key=None) -> FeatureContext:
+    """
+    Devuelve el FeatureContext de `key` desde `cache` (dict), creándolo o
+    extendiéndolo con `bars` si hace falta. Sin cache crea uno nuevo.
+    """
+    if cache is None:
+        return FeatureContext(bars)
+    context = cache.get(key)
+    if context is None:
+        context = cache[key] = FeatureContext(bars)
+    return context.extend(bars)
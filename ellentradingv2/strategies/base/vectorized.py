@@ -0,0 +1,154 @@
+# strategies/base/vectorized.py
+
+"""
+Generación de señales vectorizada sobre toda la historia (backtests).
+
+El backtest evalúa cada estrategia vela a vela: una evaluate() por vela sobre una
+vista de required_bars velas. Las estrategias de umbrales sobre indicadores (RSI,
+Bollinger, cruce de medias) se pueden expresar como máscaras + sumas de bonus
+sobre las columnas completas de la BarWindow, en una sola pasada.
+
+Una estrategia lo ofrece definiendo
+
+    def generate_signals_vectorized(self, bars) -> SimpleNamespace
+
+que devuelve vector_signals(...): por vela, dirección (BUY / SELL / NONE) y
+confianza final. Para cada i >= required_bars - 1 tiene que dar lo mismo que
+evaluate(bars[i + 1 - required_bars:i + 1]), sin deduplicar (eso lo hace el motor).
+
+Los helpers reproducen la semántica del camino por vela: indicador None ↔ NaN,
+`if x:` ↔ truthy(), `x or y` ↔ or_else(), sum() ↔ rolling_sum() (mismo orden de
+suma), int() ↔ trunc. La paridad se verifica con
+backtesting.strategies.adapter.check_vectorized_parity().
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.models.enums import SignalType
+
+BUY, SELL, NONE = 1, -1, 0
+SIGNAL_TYPES = {BUY: SignalType.BUY, SELL: SignalType.SELL}
+
+
+# ---------- columnas ----------
+
+def column(bars, name):
+    """Columna de la BarWindow; todo NaN si el indicador no se cargó (se lee como None)."""
+    values = bars.column(name)
+    return np.full(len(bars), np.nan) if values is None else values
+
+
+def lag(values, k=1):
+    """values[i - k] en la posición i (NaN en las primeras k velas)."""
+    out = np.full(len(values), np.nan)
+    if k < len(values):
+        out[k:] = values[:len(values) - k]
+    return out
+
+
+def present(values):
+    """`x is not None` por vela."""
+    return ~np.isnan(values)
+
+
+def truthy(values):
+    """`if x:` por vela (ni None ni 0)."""
+    return ~np.isnan(values) & (values != 0)
+
+
+def or_else(values, fallback):
+    """`x or fallback` por vela."""
+    return np.where(truthy(values), values, fallback)
+
+
+# ---------- ventanas ----------
+
+def rolling_sum(values, window):
+    """sum(values[i - window + 1:i + 1]) sumando en el mismo orden que sum() (NaN si faltan velas)."""
+    total = np.zeros(len(values))
+    for k in range(window - 1, -1, -1):
+        total = total + lag(values, k)
+    return total
+
+
+def rolling_max(values, window):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return out
+
+
+def rolling_min(values, window):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return out
+
+
+# ---------- features ----------
+
+def volume_ratio(volume, lookback=10, window=None):
+    """
+    FeatureContext.volume_ratio(lookback) en cada vela: volumen / promedio de los
+    volúmenes no nulos de las últimas `lookback`. `window` = velas que ve cada
+    evaluación (required_bars); si es menor que lookback no hay ratio, como en vivo.
+    """
+    n = len(volume)
+    out = np.full(n, np.nan)
+    if n < lookback or (window is not None and window < lookback):
+        return out
+
+    recent = sliding_window_view(volume, lookback)
+    valid = (recent != 0) & ~np.isnan(recent)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, recent, 0.0).sum(axis=1)
+    current = volume[lookback - 1:]
+    ok = truthy(current) & (counts > 0)
+    out[lookback - 1:][ok] = current[ok] / (sums[ok] / counts[ok])
+    return out
+
+
+def candle(bars):
+    """FeatureContext.candle por vela: body, range, body_ratio, color."""
+    body = np.abs(bars.close - bars.open)
+    candle_range = bars.high - bars.low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        body_ratio = np.where(candle_range > 0, body / candle_range, 0.0)
+    return SimpleNamespace(
+        body=body,
+        range=candle_range,
+        body_ratio=body_ratio,
+        is_green=bars.close > bars.open,
+        is_red=bars.close < bars.open,
+    )
+
+
+# ---------- resultado ----------
+
+def vector_signals(strategy, direction, confidence, source):
+    """
+    Cierra el cálculo como el final de score(): confidence = min(int(confidence), 100)
+    y se descartan las velas bajo el confidence_threshold del OpenStrategy.
+    """
+    direction = np.asarray(direction, dtype=np.int8)
+    confidence = np.where(direction != NONE, confidence, 0)
+    confidence = np.minimum(np.trunc(confidence), 100).astype(np.int64)
+    threshold = getattr(strategy.strategy_instance, "confidence_threshold", 50)
+    direction = np.where(confidence >= threshold, direction, NONE).astype(np.int8)
+    return SimpleNamespace(direction=direction, confidence=confidence, source=source)
+
+
+def vectorized_decisions(strategy, bars, start=0) -> list:
+    """[(índice, StrategyDecision)] de generate_signals_vectorized() desde la vela `start`."""
+    signals = strategy.generate_signals_vectorized(bars)
+    indices = np.flatnonzero(signals.direction[start:]) + start
+    return [
+        (int(i), strategy.decision(
+            SIGNAL_TYPES[int(signals.direction[i])], int(signals.confidence[i]),
+            price=float(bars.close[i]), bar=bars[int(i)], source=signals.source,
+        ))
+        for i in indices
+    ]
@@ -0,0 +1,398 @@
+# strategies/indicators/batched.py
+
+"""
+Cálculo de indicadores por lotes sobre arrays 2D (símbolo × tiempo).
+
+Las ventanas de todos los símbolos que cierran en el mismo boundary se apilan
+(agrupadas por largo, sin padding) y cada indicador se calcula en una sola
+pasada vectorizada sobre el eje del tiempo; después los resultados se
+reparten por símbolo.
+
+Los indicadores sin kernel 2D (ADX, Parabolic SAR, MFI, A/D, Chaikin
+Oscillator) se calculan por símbolo con la función del registro y se
+apilan de vuelta, así el orden de dependencias se mantiene.
+
+Las fórmulas replican las de registry.py / ta (mismos min_periods y
+convención de warm-up); ver batched_parity_check().
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from strategies.indicators.registry import resolve, OHLCV_COLUMNS, compute_indicators
+
+MIN_BATCH_BARS = 15
+
+BATCHED = {}  # nombre del indicador en el registro → func(arrays) -> {columna: 2D}
+
+
+def batched(name):
+    def decorator(func):
+        BATCHED[name] = func
+        return func
+    return decorator
+
+
+# ---------- primitivas 2D (eje 1 = tiempo) ----------
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if periods > 0:
+        out[:, periods:] = x[:, :-periods]
+    elif periods < 0:
+        out[:, :periods] = x[:, -periods:]
+    else:
+        out[:] = x
+    return out
+
+
+def _rolling(x: np.ndarray, window: int, reducer) -> np.ndarray:
+    """reducer(ventanas) sobre cada ventana completa; NaN en las primeras window - 1."""
+    out = np.full_like(x, np.nan)
+    if x.shape[1] >= window:
+        out[:, window - 1:] = reducer(sliding_window_view(x, window, axis=1))
+    return out
+
+
+def rolling_mean(x, window):
+    return _rolling(x, window, lambda w: w.mean(axis=-1))
+
+
+def rolling_std(x, window, ddof=1):
+    return _rolling(x, window, lambda w: w.std(axis=-1, ddof=ddof))
+
+
+def rolling_max(x, window):
+    return _rolling(x, window, lambda w: w.max(axis=-1))
+
+
+def rolling_min(x, window):
+    return _rolling(x, window, lambda w: w.min(axis=-1))
+
+
+def rolling_dot(x, weights):
+    return _rolling(x, len(weights), lambda w: w @ np.asarray(weights, dtype=np.float64))
+
+
+def ewm(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """Como Series.ewm(alpha=alpha, adjust=False, min_periods=...).mean() fila por fila."""
+    out = np.full_like(x, np.nan)
+    state = np.full(x.shape[0], np.nan)
+    count = np.zeros(x.shape[0], dtype=np.int64)
+    threshold = max(min_periods, 1)
+
+    for t in range(x.shape[1]):
+        value = x[:, t]
+        valid = ~np.isnan(value)
+        state = np.where(valid, np.where(np.isnan(state), value, (1 - alpha) * state + alpha * value), state)
+        count += valid
+        out[:, t] = np.where(count >= threshold, state, np.nan)
+    return out
+
+
+def _span(period):
+    return 2.0 / (period + 1)
+
+
+# ---------- indicadores 2D ----------
+
+def _register_moving_averages():
+    for period in [9, 10, 12, 20, 21, 26, 50, 55, 100, 200]:
+        batched(f"sma_{period}")(lambda a, p=period: {f"sma_{p}": rolling_mean(a["close"], p)})
+        batched(f"ema_{period}")(lambda a, p=period: {f"ema_{p}": ewm(a["close"], _span(p))})
+
+
+_register_moving_averages()
+
+
+@batched("wma_10")
+def _wma_10(a):
+    weights = np.arange(1, 11, dtype=np.float64)
+    return {"wma_10": rolling_dot(a["close"], weights) / weights.sum()}
+
+
+@batched("slope")
+def _slope(a):
+    centered = np.arange(5, dtype=np.float64) - 2.0
+    return {"slope": rolling_dot(a["close"], centered) / (centered ** 2).sum()}
+
+
+@batched("macd")
+def _macd(a):
+    macd = ewm(a["close"], _span(12), 12) - ewm(a["close"], _span(26), 26)
+    signal = ewm(macd, _span(9), 9)
+    return {"macd": macd, "macd_signal": signal, "macd_hist": macd - signal}
+
+
+@batched("rsi_14")
+def _rsi_14(a, window=14):
+    diff = a["close"] - _shift(a["close"], 1)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    ema_up = ewm(up, 1 / window, window)
+    ema_down = ewm(down, 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+    return {"rsi_14": rsi}
+
+
+@batched("atr_14")
+def _atr_14(a, window=14):
+    prev_close = _shift(a["close"], 1)
+    tr = np.fmax(a["high"] - a["low"], np.fmax(np.abs(a["high"] - prev_close), np.abs(a["low"] - prev_close)))
+    atr = np.zeros_like(tr)
+    if tr.shape[1] >= window:
+        atr[:, window - 1] = tr[:, :window].mean(axis=1)
+        for t in range(window, tr.shape[1]):
+            atr[:, t] = (atr[:, t - 1] * (window - 1) + tr[:, t]) / window
+    return {"atr_14": atr}
+
+
+@batched("bollinger")
+def _bollinger(a):
+    middle = rolling_mean(a["close"], 20)
+    std = rolling_std(a["close"], 20, ddof=0)
+    return {"bollinger_upper": middle + 2 * std, "bollinger_middle": middle, "bollinger_lower": middle - 2 * std}
+
+
+@batched("donchian")
+def _donchian(a):
+    return {"donchian_upper": rolling_max(a["high"], 20), "donchian_lower": rolling_min(a["low"], 20)}
+
+
+@batched("_typical_price")
+def _typical_price(a):
+    return {"_typical_price": (a["high"] + a["low"] + a["close"]) / 3}
+
+
+@batched("keltner")
+def _keltner(a):
+    return {
+        "keltner_upper": a["_typical_price"] + 2 * a["atr_14"],
+        "keltner_lower": a["_typical_price"] - 2 * a["atr_14"],
+    }
+
+
+@batched("ichimoku")
+def _ichimoku(a):
+    tenkan = (rolling_max(a["high"], 9) + rolling_min(a["low"], 9)) / 2
+    kijun = (rolling_max(a["high"], 26) + rolling_min(a["low"], 26)) / 2
+    return {
+        "ichimoku_tenkan": tenkan,
+        "ichimoku_kijun": kijun,
+        "ichimoku_span_a": _shift((tenkan + kijun) / 2, 26),
+        "ichimoku_span_b": _shift((rolling_max(a["high"], 52) + rolling_min(a["low"], 52)) / 2, 26),
+        "ichimoku_chikou": _shift(a["close"], -26),
+    }
+
+
+@batched("supertrend")
+def _supertrend(a, multiplier=3):
+    close = a["close"]
+    hl2 = (a["high"] + a["low"]) / 2
+    upper = hl2 + multiplier * a["atr_14"]
+    lower = hl2 - multiplier * a["atr_14"]
+    out = np.full_like(close, np.nan)
+    bullish = np.ones(close.shape[0], dtype=bool)
+
+    for t in range(1, close.shape[1]):
+        prev_close = close[:, t - 1]
+        upper[:, t] = np.where((upper[:, t] < upper[:, t - 1]) & (prev_close > upper[:, t - 1]), upper[:, t - 1], upper[:, t])
+        lower[:, t] = np.where((lower[:, t] > lower[:, t - 1]) & (prev_close < lower[:, t - 1]), lower[:, t - 1], lower[:, t])
+
+        flip_down = bullish & (close[:, t] < lower[:, t])
+        flip_up = ~bullish & (close[:, t] > upper[:, t])
+        bullish = (bullish & ~flip_down) | flip_up
+        out[:, t] = np.where(bullish, lower[:, t], upper[:, t])
+
+    return {"supertrend": out}
+
+
+@batched("stochastic")
+def _stochastic(a):
+    low_min = rolling_min(a["low"], 14)
+    high_max = rolling_max(a["high"], 14)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100 * (a["close"] - low_min) / (high_max - low_min)
+    return {"stochastic_k": k, "stochastic_d": rolling_mean(k, 3)}
+
+
+@batched("cci_20")
+def _cci_20(a, window=20):
+    tp = (a["high"] + a["low"] + a["close"]) / 3
+    mad = _rolling(tp, window, lambda w: np.abs(w - w.mean(axis=-1, keepdims=True)).mean(axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {"cci_20": (tp - rolling_mean(tp, window)) / (0.015 * mad)}
+
+
+@batched("roc")
+def _roc(a):
+    prev = _shift(a["close"], 12)
+    return {"roc": (a["close"] - prev) / prev * 100}
+
+
+@batched("momentum_10")
+def _momentum_10(a):
+    return {"momentum_10": a["close"] - _shift(a["close"], 10)}
+
+
+@batched("chaikin_volatility")
+def _chaikin_volatility(a, window=10):
+    ema = ewm(a["high"] - a["low"], _span(window))
+    return {"chaikin_volatility": ema - _shift(ema, window)}
+
+
+@batched("obv")
+def _obv(a):
+    signed = np.where(a["close"] < _shift(a["close"], 1), -a["volume"], a["volume"])
+    return {"obv": np.cumsum(signed, axis=1)}
+
+
+@batched("volume_sma_20")
+def _volume_sma_20(a):
+    return {"volume_sma_20": rolling_mean(a["volume"], 20)}
+
+
+@batched("normalized_volume")
+def _normalized_volume(a):
+    return {"normalized_volume": (a["volume"] - a["volume_sma_20"]) / rolling_std(a["volume"], 20, ddof=1)}
+
+
+@batched("vwap")
+def _vwap(a):
+    return {"vwap": np.cumsum(a["close"] * a["volume"], axis=1) / np.cumsum(a["volume"], axis=1)}
+
+
+@batched("heikin_ashi_close")
+def _heikin_ashi_close(a):
+    return {"heikin_ashi_close": (a["open"] + a["high"] + a["low"] + a["close"]) / 4}
+
+
+@batched("_candle_parts")
+def _candle_parts(a):
+    return {
+        "_body": np.abs(a["close"] - a["open"]),
+        "_range": a["high"] - a["low"],
+        "_upper_shadow": a["high"] - np.maximum(a["close"], a["open"]),
+        "_lower_shadow": np.minimum(a["close"], a["open"]) - a["low"],
+    }
+
+
+@batched("hammer")
+def _hammer(a):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {"hammer": ((a["_body"] / a["_range"] < 0.3) & (a["_lower_shadow"] > a["_body"] * 2)).astype(np.float64)}
+
+
+@batched("shooting_star")
+def _shooting_star(a):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {"shooting_star": ((a["_body"] / a["_range"] < 0.3) & (a["_upper_shadow"] > a["_body"] * 2)).astype(np.float64)}
+
+
+@batched("doji")
+def _doji(a):
+    return {"doji": (a["_body"] <= a["_range"] * 0.1).astype(np.float64)}
+
+
+@batched("engulfing")
+def _engulfing(a):
+    o, c = a["open"], a["close"]
+    po, pc = _shift(o, 1), _shift(c, 1)
+    return {
+        "bullish_engulfing": ((pc < po) & (c > o) & (c > po) & (o < pc)).astype(np.float64),
+        "bearish_engulfing": ((pc > po) & (c < o) & (o > pc) & (c < po)).astype(np.float64),
+    }
+
+
+@batched("star")
+def _star(a):
+    o, h, l, c = a["open"], a["high"], a["low"], a["close"]
+    o1, c1 = _shift(o, 2), _shift(c, 2)
+    o2, h2, l2, c2 = _shift(o, 1), _shift(h, 1), _shift(l, 1), _shift(c, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        small_body = np.abs(c2 - o2) / (h2 - l2 + 1e-6) < 0.1
+    return {
+        "morning_star": ((c1 < o1) & small_body & (c > o) & (c > o1)).astype(np.float64),
+        "evening_star": ((c1 > o1) & small_body & (c < o) & (c < o1)).astype(np.float64),
+    }
+
+
+# ---------- orquestación ----------
+
+def _compute_group(keys, frames, specs, context_label, log) -> dict:
+    """Un grupo de símbolos con el mismo largo de ventana: una pasada 2D por indicador."""
+    arrays = {c: np.vstack([frames[k][c].to_numpy(dtype=np.float64) for k in keys]) for c in OHLCV_COLUMNS}
+
+    for spec in specs:
+        try:
+            if spec.name in BATCHED:
+                results = BATCHED[spec.name](arrays)
+            else:
+                # Sin kernel 2D: función del registro por símbolo, apilada de vuelta
+                per_symbol = [
+                    spec.func(pd.DataFrame({c: arrays[c][i] for c in arrays}))
+                    for i in range(len(keys))
+                ]
+                results = {
+                    column: np.vstack([np.asarray(r[column], dtype=np.float64) for r in per_symbol])
+                    for column in spec.outputs
+                }
+        except Exception as e:
+            log(f"[{context_label}] ⚠️ No se pudo calcular {spec.name} (batch): {e}")
+            results = {column: np.full((len(keys), arrays["close"].shape[1]), np.nan) for column in spec.outputs}
+        arrays.update(results)
+
+    public = [c for spec in specs for c in spec.outputs if not c.startswith("_")]
+    out = {}
+    for i, key in enumerate(keys):
+        df = frames[key].copy()
+        for column in public:
+            df[column] = arrays[column][i]
+        out[key] = df
+    return out
+
+
+def compute_indicators_batched(frames: dict, columns=None, context_label: str = "", logger=None) -> dict:
+    """
+    frames: {clave: DataFrame OHLCV}. Devuelve {clave: DataFrame con indicadores}.
+
+    Los símbolos con el mismo largo de ventana se calculan juntos en 2D; grupos
+    con menos de MIN_BATCH_BARS velas usan el camino por símbolo del registro.
+    """
+    log = logger or print
+    specs = resolve(columns)
+
+    groups = {}
+    for key, df in frames.items():
+        groups.setdefault(len(df), []).append(key)
+
+    out = {}
+    for length, keys in groups.items():
+        if length < MIN_BATCH_BARS:
+            for key in keys:
+                out[key] = compute_indicators(frames[key], columns, context_label=f"{context_label} {key}", logger=logger)
+            continue
+        out.update(_compute_group(keys, {k: frames[k].reset_index(drop=True) for k in keys}, specs, context_label, log))
+    return out
+
+
+def batched_parity_check(frames: dict, columns=None, rtol=1e-7, atol=1e-9) -> dict:
+    """
+    Compara el camino batch contra compute_indicators() por símbolo.
+    Devuelve {columna: máxima diferencia absoluta} de las columnas que no coinciden.
+    """
+    batch = compute_indicators_batched(frames, columns)
+    mismatches = {}
+    for key, df in frames.items():
+        reference = compute_indicators(df.reset_index(drop=True), columns)
+        for column in reference.columns:
+            if column in df.columns:
+                continue
+            expected = pd.to_numeric(reference[column], errors="coerce").to_numpy(dtype=np.float64)
+            got = pd.to_numeric(batch[key][column], errors="coerce").to_numpy(dtype=np.float64)
+            if not np.allclose(expected, got, rtol=rtol, atol=atol, equal_nan=True):
+                diff = np.nanmax(np.abs(expected - got)) if np.any(~np.isnan(expected - got)) else np.inf
+                mismatches[column] = max(mismatches.get(column, 0.0), float(diff))
+    return mismatches
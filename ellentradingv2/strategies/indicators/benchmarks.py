@@ -0,0 +1,182 @@
+# strategies/indicators/benchmarks.py
+
+"""
+Benchmark + verificación de paridad de los kernels de strategies/indicators/kernels.py
+(y del detector de pivots de range_index.py) contra las implementaciones anteriores
+(loop .iloc / rolling.apply / all(...) por vela).
+
+    from strategies.indicators.benchmarks import benchmark_kernels
+    benchmark_kernels(n=100_000)
+"""
+
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import ta
+
+from strategies.indicators import kernels
+from strategies.indicators.range_index import find_pivots
+
+
+# ---------- implementaciones anteriores (referencia) ----------
+
+def legacy_supertrend(df: pd.DataFrame, atr: pd.Series, multiplier=3) -> list:
+    hl2 = (df['high'] + df['low']) / 2
+    upperband = hl2 + multiplier * atr
+    lowerband = hl2 - multiplier * atr
+
+    supertrend = [np.nan] * len(df)
+    direction = [True] * len(df)
+
+    for i in range(1, len(df)):
+        curr_close = df['close'].iloc[i]
+        prev_close = df['close'].iloc[i - 1]
+
+        if upperband.iloc[i] < upperband.iloc[i - 1] and prev_close > upperband.iloc[i - 1]:
+            upperband.iloc[i] = upperband.iloc[i - 1]
+
+        if lowerband.iloc[i] > lowerband.iloc[i - 1] and prev_close < lowerband.iloc[i - 1]:
+            lowerband.iloc[i] = lowerband.iloc[i - 1]
+
+        if direction[i - 1]:
+            if curr_close < lowerband.iloc[i]:
+                direction[i] = False
+                supertrend[i] = upperband.iloc[i]
+            else:
+                direction[i] = True
+                supertrend[i] = lowerband.iloc[i]
+        else:
+            if curr_close > upperband.iloc[i]:
+                direction[i] = True
+                supertrend[i] = lowerband.iloc[i]
+            else:
+                direction[i] = False
+                supertrend[i] = upperband.iloc[i]
+
+    return supertrend
+
+
+def legacy_star_patterns(df: pd.DataFrame):
+    morning = [0.0] * len(df)
+    evening = [0.0] * len(df)
+    for i in range(2, len(df)):
+        p1 = df.iloc[i - 2]
+        p2 = df.iloc[i - 1]
+        p3 = df.iloc[i]
+        small_body = abs(p2['close'] - p2['open']) / (p2['high'] - p2['low'] + 1e-6) < 0.1
+        if (p1['close'] < p1['open']) and small_body and (p3['close'] > p3['open']) and (p3['close'] > p1['open']):
+            morning[i] = 1.0
+        if (p1['close'] > p1['open']) and small_body and (p3['close'] < p3['open']) and (p3['close'] < p1['open']):
+            evening[i] = 1.0
+    return morning, evening
+
+
+def legacy_wma_10(close: pd.Series) -> pd.Series:
+    return close.rolling(window=10).apply(lambda x: np.average(x, weights=range(1, 11)), raw=True)
+
+
+def legacy_slope(close: pd.Series) -> pd.Series:
+    return close.rolling(window=5).apply(lambda x: np.polyfit(range(len(x)), x, 1)[0], raw=True)
+
+
+def legacy_pivot_highs(df: pd.DataFrame, order=5) -> list:
+    highs = df["high"].tolist()
+    pivots = [0.0] * len(highs)
+    for i in range(order, len(highs) - order):
+        if all(highs[i] >= highs[j] for j in range(i - order, i + order + 1) if j != i):
+            pivots[i] = 1.0
+    return pivots
+
+
+# ---------- benchmark ----------
+
+def synthetic_bars(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random walk OHLCV reproducible (incluye algunas velas doji para los patrones de 3 velas)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    doji = rng.random(n) < 0.1
+    open_[doji] = close[doji] * (1 + rng.normal(0, 1e-5, doji.sum()))
+    spread = np.abs(rng.normal(0, 0.002, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.uniform(1, 100, n)
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume})
+
+
+def _timed(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = perf_counter()
+        result = func()
+        elapsed = perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _compare(legacy, vectorized) -> float:
+    a = np.asarray(legacy, dtype=np.float64)
+    b = np.asarray(vectorized, dtype=np.float64)
+    if not np.array_equal(np.isnan(a), np.isnan(b)):
+        return float("inf")
+    mask = ~np.isnan(a)
+    return float(np.max(np.abs(a[mask] - b[mask]), initial=0.0))
+
+
+def benchmark_kernels(n: int = 100_000, repeat: int = 3, seed: int = 0, legacy_limit: int = None) -> list:
+    """
+    Compara tiempos (mejor de `repeat`) y resultados de cada kernel contra su
+    versión anterior. legacy_limit acota las velas usadas por las versiones
+    lentas (los loops .iloc tardan minutos en 100k); los tiempos legacy se
+    extrapolan linealmente a n.
+    """
+    df = synthetic_bars(n, seed)
+    legacy_n = min(n, legacy_limit or n)
+    legacy_df = df.iloc[:legacy_n].copy()
+    atr = ta.volatility.AverageTrueRange(df["high"], df["low"], df["close"], window=14).average_true_range()
+    close = df["close"].to_numpy()
+
+    cases = [
+        (
+            "supertrend",
+            lambda: legacy_supertrend(legacy_df, atr.iloc[:legacy_n].copy()),
+            lambda: kernels.supertrend(df["high"], df["low"], df["close"], atr),
+        ),
+        (
+            "morning_star",
+            lambda: legacy_star_patterns(legacy_df)[0],
+            lambda: kernels.star_patterns(df["open"], df["high"], df["low"], df["close"])[0],
+        ),
+        (
+            "evening_star",
+            lambda: legacy_star_patterns(legacy_df)[1],
+            lambda: kernels.star_patterns(df["open"], df["high"], df["low"], df["close"])[1],
+        ),
+        ("wma_10", lambda: legacy_wma_10(legacy_df["close"]), lambda: kernels.wma(close, 10)),
+        ("slope", lambda: legacy_slope(legacy_df["close"]), lambda: kernels.rolling_slope(close, 5)),
+        (
+            "pivot_highs",
+            lambda: legacy_pivot_highs(legacy_df),
+            lambda: find_pivots(df["high"], df["low"], order=5)[0].astype(np.float64),
+        ),
+    ]
+
+    results = []
+    for name, legacy, vectorized in cases:
+        legacy_s, legacy_out = _timed(legacy, repeat)
+        vector_s, vector_out = _timed(vectorized, repeat)
+        legacy_s *= n / legacy_n
+        max_diff = _compare(legacy_out, np.asarray(vector_out)[:legacy_n])
+        results.append({
+            "kernel": name,
+            "bars": n,
+            "legacy_s": round(legacy_s, 4),
+            "vectorized_s": round(vector_s, 4),
+            "speedup": round(legacy_s / vector_s, 1) if vector_s else float("inf"),
+            "max_abs_diff": max_diff,
+            "match": max_diff <= 1e-9 * max(1.0, float(np.nanmax(np.abs(close)))),
+        })
+        print(f"⏱️ {name}: legacy {legacy_s:.3f}s → vectorizado {vector_s:.4f}s "
+              f"(x{results[-1]['speedup']}) | max diff {max_diff:.2e}")
+    return results
@@ -0,0 +1,135 @@
+# strategies/indicators/kernels.py
+
+"""
+Kernels de indicadores sobre arrays NumPy (1D, float64).
+
+Reemplazan los loops por fila con .iloc y los rolling(...).apply(lambda):
+- supertrend: loop de estado sobre listas de floats (sin pandas por fila);
+  supertrend_with_state continúa desde el estado de un tramo anterior
+- morning / evening star: máscaras booleanas desplazadas
+- wma y slope (OLS rolling): convolución con pesos cerrados
+
+Los resultados coinciden con las versiones anteriores dentro de la tolerancia de punto
+flotante (1e-9 · max|close|) y con el mismo tratamiento de NaN;
+ver strategies/indicators/benchmarks.py para la verificación y los tiempos.
+"""
+
+import numpy as np
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Como Series.shift(periods) para periods > 0: rellena con NaN al inicio."""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def rolling_dot(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    out[i] = sum(values[i - w + 1 + k] * weights[k]); NaN en las primeras w - 1
+    posiciones y en toda ventana que contenga un NaN (como rolling con min_periods = w).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    w = len(weights)
+    out = np.full(len(values), np.nan)
+    if len(values) >= w:
+        out[w - 1:] = np.convolve(values, weights[::-1], mode="valid")
+    return out
+
+
+def wma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Media ponderada lineal (pesos 1..window): np.average(x, weights=range(1, window + 1))
+    dentro de la tolerancia de punto flotante.
+    """
+    weights = np.arange(1, window + 1, dtype=np.float64)
+    return rolling_dot(values, weights) / weights.sum()
+
+
+def rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Pendiente OLS de cada ventana contra x = 0..window-1, en forma cerrada:
+    slope = sum((x - x̄) · y) / sum((x - x̄)²). Igual a np.polyfit(x, y, 1)[0] dentro
+    de la tolerancia de punto flotante.
+    """
+    x = np.arange(window, dtype=np.float64)
+    centered = x - x.mean()
+    return rolling_dot(values, centered) / (centered ** 2).sum()
+
+
+def supertrend(high, low, close, atr, multiplier=3) -> np.ndarray:
+    """
+    Supertrend con bandas finales: el estado (bandas previas + dirección) se
+    arrastra en un loop sobre floats de Python, sin indexación pandas.
+    """
+    return supertrend_with_state(high, low, close, atr, multiplier)[0]
+
+
+def supertrend_with_state(high, low, close, atr, multiplier=3, state=None):
+    """
+    supertrend() que además devuelve el estado al final (bandas finales, close y
+    dirección de la última vela) y puede continuar desde `state`: calcular por
+    tramos encadenando el estado da lo mismo que una sola pasada.
+    """
+    hl2 = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)) / 2
+    atr = np.asarray(atr, dtype=np.float64)
+    upper = (hl2 + multiplier * atr).tolist()
+    lower = (hl2 - multiplier * atr).tolist()
+    close = np.asarray(close, dtype=np.float64).tolist()
+
+    bullish = True
+    if state is not None:
+        # La última vela del tramo anterior va adelante como índice 0
+        upper.insert(0, state["upper"])
+        lower.insert(0, state["lower"])
+        close.insert(0, state["close"])
+        bullish = state["bullish"]
+
+    n = len(close)
+    out = [np.nan] * n
+
+    for i in range(1, n):
+        prev_close = close[i - 1]
+
+        if upper[i] < upper[i - 1] and prev_close > upper[i - 1]:
+            upper[i] = upper[i - 1]
+        if lower[i] > lower[i - 1] and prev_close < lower[i - 1]:
+            lower[i] = lower[i - 1]
+
+        if bullish:
+            if close[i] < lower[i]:
+                bullish = False
+                out[i] = upper[i]
+            else:
+                out[i] = lower[i]
+        else:
+            if close[i] > upper[i]:
+                bullish = True
+                out[i] = lower[i]
+            else:
+                out[i] = upper[i]
+
+    final = {"upper": upper[-1], "lower": lower[-1], "close": close[-1], "bullish": bullish} if n else state
+    return np.asarray(out[1:] if state is not None else out, dtype=np.float64), final
+
+
+def star_patterns(open_, high, low, close):
+    """
+    Morning / evening star (3 velas) con máscaras desplazadas.
+    Devuelve (morning, evening) como arrays float 0.0 / 1.0.
+    """
+    o = np.asarray(open_, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+
+    o1, c1 = shift(o, 2), shift(c, 2)
+    o2, h2, l2, c2 = shift(o, 1), shift(h, 1), shift(l, 1), shift(c, 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        small_body = np.abs(c2 - o2) / (h2 - l2 + 1e-6) < 0.1
+
+    morning = (c1 < o1) & small_body & (c > o) & (c > o1)
+    evening = (c1 > o1) & small_body & (c < o) & (c < o1)
+    return morning.astype(np.float64), evening.astype(np.float64)
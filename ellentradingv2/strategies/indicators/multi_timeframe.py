@@ -0,0 +1,182 @@
+# strategies/indicators/multi_timeframe.py
+
+"""
+Vista multi-timeframe alineada a partir de un único array 1m en memoria.
+
+- Los timeframes superiores (5m / 15m / 1h / 4h) se derivan con reduceat sobre
+  buckets alineados a epoch (los mismos boundaries que usa el agregador).
+- Para cada vela base se precalcula el índice de la última vela superior ya
+  cerrada: leer el contexto de un timeframe superior en la vela actual es O(1)
+  y nunca mira velas que todavía no cerraron.
+- Los indicadores de cada timeframe se calculan con el registro bajo demanda y
+  quedan cacheados en la vista. Nada de esto toca la DB después de cargar.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from core.models import MarketDataPoint
+from core.utils.time import TIMEFRAME_MINUTES, to_epoch_ns
+from strategies.indicators.registry import compute_indicators
+
+DEFAULT_TIMEFRAMES = ("5m", "15m", "1h", "4h")
+# Timeframe "superior" de referencia para cada timeframe de estrategia
+HIGHER_TIMEFRAME = {"1m": "5m", "5m": "15m", "15m": "1h", "30m": "4h", "1h": "4h"}
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+
+def resample_ohlcv(time_ns: np.ndarray, columns: dict, minutes: int) -> dict:
+    """
+    Agrega velas base a buckets de `minutes` alineados a epoch.
+    Devuelve columnas del timeframe superior + 'bucket_of' (bucket de cada vela base).
+    """
+    step = minutes * _NS_PER_MINUTE
+    buckets = time_ns // step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(time_ns)] - 1
+
+    return {
+        "time": buckets[starts] * step,
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "volume": np.add.reduceat(columns["volume"], starts),
+        "bucket_of": np.cumsum(np.r_[True, buckets[1:] != buckets[:-1]]) - 1,
+    }
+
+
+class MultiTimeframeView:
+    """
+    view = MultiTimeframeView.from_market_data(symbol, lookback_minutes=4 * 24 * 60)
+    view.bar("1h")                     # última vela 1h cerrada al momento de la vela base actual
+    view.value("4h", "rsi_14", i)      # indicador 4h visible en la vela base i (O(1))
+    """
+
+    def __init__(self, time_ns, open_, high, low, close, volume, base_minutes=1, timeframes=DEFAULT_TIMEFRAMES):
+        self.base_minutes = base_minutes
+        self.time = np.asarray(time_ns, dtype=np.int64)
+        self.base = {
+            "open": np.asarray(open_, dtype=np.float64),
+            "high": np.asarray(high, dtype=np.float64),
+            "low": np.asarray(low, dtype=np.float64),
+            "close": np.asarray(close, dtype=np.float64),
+            "volume": np.asarray(volume, dtype=np.float64),
+        }
+        self._frames = {}
+        self._closed_index = {}
+        self._indicators = {}
+        for tf in timeframes:
+            self._build(tf)
+
+    @classmethod
+    def from_market_data(cls, symbol, end=None, lookback_minutes=4 * 24 * 60, base_tf="1m", **kwargs):
+        """Una sola query sobre MarketDataPoint del timeframe base."""
+        qs = MarketDataPoint.objects.filter(symbol=symbol, timeframe=base_tf)
+        if end is not None:
+            qs = qs.filter(start_time__lte=end)
+        rows = list(qs.order_by("-start_time").values_list("start_time", *OHLCV_FIELDS)[:lookback_minutes])[::-1]
+        if not rows:
+            return None
+        times, *values = zip(*rows)
+        return cls(
+            np.fromiter((to_epoch_ns(t) for t in times), dtype=np.int64, count=len(times)),
+            *values, base_minutes=TIMEFRAME_MINUTES[base_tf], **kwargs
+        )
+
+    def _build(self, tf):
+        minutes = TIMEFRAME_MINUTES[tf]
+        if minutes % self.base_minutes:
+            raise ValueError(f"❌ {tf} no es múltiplo del timeframe base ({self.base_minutes}m)")
+
+        frame = resample_ohlcv(self.time, self.base, minutes)
+        bucket_of = frame.pop("bucket_of")
+
+        # La vela superior que contiene a la base i está cerrada si i es su último minuto
+        bucket_end = frame["time"][bucket_of] + minutes * _NS_PER_MINUTE
+        closed = self.time + self.base_minutes * _NS_PER_MINUTE >= bucket_end
+        self._closed_index[tf] = np.where(closed, bucket_of, bucket_of - 1)
+        self._frames[tf] = frame
+
+    def timeframes(self) -> list:
+        return list(self._frames)
+
+    def __len__(self):
+        return len(self.time)
+
+    def ohlcv(self, tf) -> dict:
+        """Columnas OHLCV + time (epoch ns de inicio) del timeframe superior, incluida la vela en curso."""
+        if tf not in self._frames:
+            self._build(tf)
+        return self._frames[tf]
+
+    def indicators(self, tf, columns=None) -> pd.DataFrame:
+        """Indicadores del timeframe (cacheados por columna)."""
+        frame = self.ohlcv(tf)
+        if tf not in self._indicators:
+            self._indicators[tf] = pd.DataFrame(index=range(len(frame["time"])))
+        cached = self._indicators[tf]
+        wanted = None if columns is None else [c for c in columns if c not in cached.columns]
+        if wanted is None or wanted:
+            df = compute_indicators(pd.DataFrame({c: frame[c] for c in OHLCV_FIELDS}), wanted, context_label=f"mtf {tf}")
+            for column in df.columns:
+                if column not in OHLCV_FIELDS and column not in cached.columns:
+                    cached[column] = df[column].to_numpy()
+        return cached if columns is None else cached[list(columns)]
+
+    def index_at(self, tf, base_index=-1) -> int:
+        """Índice de la última vela `tf` cerrada en la vela base `base_index` (-1 si ninguna). O(1)."""
+        if tf not in self._closed_index:
+            self._build(tf)
+        return int(self._closed_index[tf][base_index])
+
+    def base_index_at(self, when) -> int:
+        """Última vela base que empieza en/antes de `when` (datetime o epoch ns); -1 si ninguna."""
+        when_ns = when if isinstance(when, (int, np.integer)) else to_epoch_ns(when)
+        return int(np.searchsorted(self.time, when_ns, side="right")) - 1
+
+    def index_at_time(self, tf, when) -> int:
+        """Como index_at() para un datetime / epoch ns (búsqueda binaria sobre las velas base)."""
+        base_index = self.base_index_at(when)
+        return self.index_at(tf, base_index) if base_index >= 0 else -1
+
+    def bar(self, tf, base_index=-1):
+        """Última vela `tf` cerrada como SimpleNamespace (None si no hay)."""
+        i = self.index_at(tf, base_index)
+        if i < 0:
+            return None
+        frame = self.ohlcv(tf)
+        return SimpleNamespace(index=i, **{c: frame[c][i].item() for c in ("time", *OHLCV_FIELDS)})
+
+    def value(self, tf, column, base_index=-1):
+        """Valor del indicador `column` en la última vela `tf` cerrada (None si no hay / NaN)."""
+        i = self.index_at(tf, base_index)
+        if i < 0:
+            return None
+        value = self.indicators(tf, [column])[column].iloc[i]
+        return None if value is None or pd.isna(value) else float(value)
+
+    def bars(self, tf, base_index=-1, count=None) -> list:
+        """Velas `tf` cerradas hasta la vela base (las últimas `count`), como SimpleNamespace."""
+        i = self.index_at(tf, base_index)
+        frame = self.ohlcv(tf)
+        lo = 0 if count is None else max(0, i + 1 - count)
+        columns = {c: frame[c][lo:i + 1].tolist() for c in ("time", *OHLCV_FIELDS)}
+        return [
+            SimpleNamespace(index=lo + k, **{c: columns[c][k] for c in columns})
+            for k in range(i + 1 - lo)
+        ]
+
+    def bars_at_time(self, tf, when, count=None) -> list:
+        """Como bars() para un datetime / epoch ns."""
+        base_index = self.base_index_at(when)
+        return self.bars(tf, base_index, count) if base_index >= 0 else []
+
+    def closes(self, tf, base_index=-1, count=None) -> np.ndarray:
+        """Cierres de las velas `tf` ya cerradas hasta la vela base (vista, sin copia)."""
+        i = self.index_at(tf, base_index)
+        closes = self.ohlcv(tf)["close"][:i + 1]
+        return closes if count is None else closes[-count:]
@@ -0,0 +1,112 @@
+# strategies/indicators/range_index.py
+
+"""
+Índices de máximos / mínimos por rango para detección de swings y breakouts.
+
+- SparseTable: se construye una vez por ventana en O(n log n) (NumPy) y responde
+  max / min sobre [i, j] en O(1) (dos lecturas que se solapan).
+- RangeExtremumIndex: par de tablas (max high / min low) sobre una ventana de velas.
+- find_pivots: pivots high/low con `order` velas de cada lado, con una consulta O(1)
+  por vela (antes: all(...) sobre 2·order velas por vela).
+"""
+
+import numpy as np
+
+
+class SparseTable:
+    """
+    table = SparseTable(highs, np.maximum)
+    table.query(3, 10)        # max(highs[3:11]) en O(1)
+    table.query(-20, -1)      # índices negativos como en las listas
+    """
+
+    def __init__(self, values, op=np.maximum):
+        values = np.asarray(values, dtype=np.float64)
+        self.op = op
+        self.n = len(values)
+        self.levels = [values]
+        span = 1
+        while 2 * span <= self.n:
+            prev = self.levels[-1]
+            self.levels.append(op(prev[:-span], prev[span:]))
+            span *= 2
+
+    def _bounds(self, i, j):
+        i = i + self.n if i < 0 else i
+        j = j + self.n if j < 0 else j
+        if not 0 <= i <= j < self.n:
+            raise IndexError(f"Rango inválido [{i}, {j}] para {self.n} valores")
+        return i, j
+
+    def query(self, i, j) -> float:
+        """Extremo de values[i..j] (ambos inclusive)."""
+        i, j = self._bounds(i, j)
+        k = (j - i + 1).bit_length() - 1
+        level = self.levels[k]
+        return float(self.op(level[i], level[j - (1 << k) + 1]))
+
+    def query_many(self, starts, ends) -> np.ndarray:
+        """query() vectorizado sobre arrays de inicios / fines (inclusive, no negativos)."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        lengths = ends - starts + 1
+        ks = np.floor(np.log2(lengths)).astype(np.int64)
+        out = np.empty(len(starts), dtype=np.float64)
+        for k in np.unique(ks):
+            mask = ks == k
+            level = self.levels[k]
+            out[mask] = self.op(level[starts[mask]], level[ends[mask] - (1 << k) + 1])
+        return out
+
+
+class RangeExtremumIndex:
+    """Max high / min low sobre cualquier rango de una ventana de velas, en O(1)."""
+
+    def __init__(self, high, low):
+        self.highs = SparseTable(high, np.maximum)
+        self.lows = SparseTable(low, np.minimum)
+        self.n = self.highs.n
+
+    def max_high(self, i, j) -> float:
+        return self.highs.query(i, j)
+
+    def min_low(self, i, j) -> float:
+        return self.lows.query(i, j)
+
+    def _last(self, lookback, skip):
+        """[i, j] de las `lookback` velas que terminan `skip` velas antes de la última."""
+        j = self.n - 1 - skip
+        return max(0, j - lookback + 1), j
+
+    def highest(self, lookback, skip=0):
+        """max(high[-(lookback + skip):-skip or None]); None si el rango queda vacío."""
+        i, j = self._last(lookback, skip)
+        return self.highs.query(i, j) if j >= i else None
+
+    def lowest(self, lookback, skip=0):
+        """min(low[-(lookback + skip):-skip or None]); None si el rango queda vacío."""
+        i, j = self._last(lookback, skip)
+        return self.lows.query(i, j) if j >= i else None
+
+
+def find_pivots(high, low, order=5, index=None):
+    """
+    Máscaras (pivot_high, pivot_low) del largo de la ventana: una vela es pivot si su
+    high es >= (low <=) que las `order` velas de cada lado. Las primeras / últimas
+    `order` velas nunca son pivot. Reusa `index` (RangeExtremumIndex) si se pasa.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    pivot_high = np.zeros(n, dtype=bool)
+    pivot_low = np.zeros(n, dtype=bool)
+    if n < 2 * order + 1:
+        return pivot_high, pivot_low
+
+    if index is None:
+        index = RangeExtremumIndex(high, low)
+    centers = np.arange(order, n - order)
+    pivot_high[centers] = high[centers] >= index.highs.query_many(centers - order, centers + order)
+    pivot_low[centers] = low[centers] <= index.lows.query_many(centers - order, centers + order)
+    return pivot_high, pivot_low
+
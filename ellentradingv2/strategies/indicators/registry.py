@@ -0,0 +1,361 @@
+# strategies/indicators/registry.py
+
+"""
+Registro único de indicadores técnicos.
+
+Cada indicador declara:
+- outputs: columnas que produce (las que terminan en LiveTechnicalIndicator / TechnicalIndicator)
+- inputs: columnas OHLCV que lee
+- depends: otros indicadores cuyas columnas reutiliza (Keltner y Supertrend → atr_14, ...)
+- warmup: velas necesarias antes del primer valor válido
+
+compute_indicators(df, columns) calcula solo la unión pedida + sus dependencias,
+en orden topológico, compartiendo intermedios. Los intermedios privados
+(prefijo "_") se descartan al final.
+
+Las estrategias declaran REQUIRED_INDICATORS; active_indicator_columns() da la
+unión para las OpenStrategy activas.
+"""
+
+from graphlib import TopologicalSorter
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import ta
+
+from strategies.indicators import kernels
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+INDICATORS = {}      # nombre → spec
+COLUMN_INDEX = {}    # columna → nombre del indicador que la produce
+
+
+def register(name, outputs=None, inputs=("close",), depends=(), warmup=1):
+    """Decorador: func(df) -> {columna: serie} para cada columna de outputs."""
+    def decorator(func):
+        spec = SimpleNamespace(
+            name=name,
+            outputs=tuple(outputs or (name,)),
+            inputs=tuple(inputs),
+            depends=tuple(depends),
+            warmup=warmup,
+            func=func,
+        )
+        INDICATORS[name] = spec
+        for column in spec.outputs:
+            COLUMN_INDEX[column] = name
+        return func
+    return decorator
+
+
+def all_columns() -> list:
+    return [c for spec in INDICATORS.values() for c in spec.outputs if not c.startswith("_")]
+
+
+def resolve(columns=None) -> list:
+    """Specs necesarios para producir `columns` (None = todos), en orden de dependencias."""
+    if columns is None:
+        wanted = set(INDICATORS)
+    else:
+        unknown = [c for c in columns if c not in COLUMN_INDEX]
+        if unknown:
+            raise ValueError(f"❌ Indicadores desconocidos: {unknown}")
+        wanted = {COLUMN_INDEX[c] for c in columns}
+
+    graph = {}
+    pending = list(wanted)
+    while pending:
+        name = pending.pop()
+        if name in graph:
+            continue
+        graph[name] = INDICATORS[name].depends
+        pending.extend(INDICATORS[name].depends)
+
+    return [INDICATORS[name] for name in TopologicalSorter(graph).static_order()]
+
+
+def required_warmup(columns=None) -> int:
+    """Velas de warm-up que necesita el conjunto `columns` (incluye dependencias)."""
+    return max((spec.warmup for spec in resolve(columns)), default=0)
+
+
+def compute_indicators(df: pd.DataFrame, columns=None, context_label: str = "", logger=None) -> pd.DataFrame:
+    """
+    Calcula sobre un DataFrame OHLCV solo los indicadores necesarios para `columns`
+    (None = todos). Si un indicador falla, sus columnas quedan en None y se avisa
+    vía logger(msg) (print por defecto).
+    """
+    log = logger or print
+    df = df.copy()
+    specs = resolve(columns)
+
+    for spec in specs:
+        try:
+            for column, values in spec.func(df).items():
+                df[column] = values
+        except Exception as e:
+            log(f"[{context_label}] ⚠️ No se pudo calcular {spec.name}: {e}")
+            for column in spec.outputs:
+                df[column] = None
+
+    private = [c for spec in specs for c in spec.outputs if c.startswith("_")]
+    return df.drop(columns=private)
+
+
+# ---------- declaración por estrategia ----------
+
+def strategy_indicator_columns(strategy_classes) -> set:
+    """Unión de REQUIRED_INDICATORS de las clases de estrategia dadas."""
+    return {c for cls in strategy_classes for c in getattr(cls, "REQUIRED_INDICATORS", ())}
+
+
+def active_indicator_columns() -> set:
+    """Columnas que leen las OpenStrategy con auto_execute=True (una query)."""
+    from strategies.base.factory import STRATEGY_CLASS_MAP
+    from strategies.models import OpenStrategy
+
+    names = OpenStrategy.objects.filter(auto_execute=True).values_list("name", flat=True)
+    return strategy_indicator_columns(STRATEGY_CLASS_MAP[n] for n in names if n in STRATEGY_CLASS_MAP)
+
+
+# ---------- tendencia ----------
+
+def _register_moving_averages():
+    for period in [9, 10, 12, 20, 21, 26, 50, 55, 100, 200]:
+        register(f"sma_{period}", warmup=period)(
+            lambda df, p=period: {f"sma_{p}": df["close"].rolling(window=p).mean()}
+        )
+        register(f"ema_{period}", warmup=period)(
+            lambda df, p=period: {f"ema_{p}": df["close"].ewm(span=p, adjust=False).mean()}
+        )
+
+
+_register_moving_averages()
+
+
+@register("wma_10", warmup=10)
+def _wma_10(df):
+    return {"wma_10": kernels.wma(df["close"].to_numpy(dtype=np.float64), 10)}
+
+
+@register("macd", outputs=("macd", "macd_signal", "macd_hist"), warmup=35)
+def _macd(df):
+    macd = ta.trend.MACD(df["close"], window_slow=26, window_fast=12, window_sign=9)
+    return {"macd": macd.macd(), "macd_signal": macd.macd_signal(), "macd_hist": macd.macd_diff()}
+
+
+@register("adx", outputs=("adx", "plus_di", "minus_di"), inputs=("high", "low", "close"), warmup=28)
+def _adx(df):
+    adx = ta.trend.ADXIndicator(df["high"], df["low"], df["close"], window=14)
+    return {"adx": adx.adx(), "plus_di": adx.adx_pos(), "minus_di": adx.adx_neg()}
+
+
+@register(
+    "ichimoku",
+    outputs=("ichimoku_tenkan", "ichimoku_kijun", "ichimoku_span_a", "ichimoku_span_b", "ichimoku_chikou"),
+    inputs=("high", "low", "close"),
+    warmup=78,
+)
+def _ichimoku(df):
+    tenkan = (df["high"].rolling(window=9).max() + df["low"].rolling(window=9).min()) / 2
+    kijun = (df["high"].rolling(window=26).max() + df["low"].rolling(window=26).min()) / 2
+    return {
+        "ichimoku_tenkan": tenkan,
+        "ichimoku_kijun": kijun,
+        "ichimoku_span_a": ((tenkan + kijun) / 2).shift(26),
+        "ichimoku_span_b": ((df["high"].rolling(window=52).max() + df["low"].rolling(window=52).min()) / 2).shift(26),
+        "ichimoku_chikou": df["close"].shift(-26),
+    }
+
+
+@register("parabolic_sar", inputs=("high", "low", "close"), warmup=2)
+def _parabolic_sar(df):
+    return {"parabolic_sar": ta.trend.PSARIndicator(df["high"], df["low"], df["close"]).psar()}
+
+
+@register("supertrend", inputs=("high", "low", "close"), depends=("atr_14",), warmup=15)
+def _supertrend(df, period=10, multiplier=3):
+    if not df["atr_14"].isnull().all():
+        atr = df["atr_14"]
+    else:
+        atr = ta.volatility.AverageTrueRange(df["high"], df["low"], df["close"], window=period).average_true_range()
+    return {"supertrend": kernels.supertrend(df["high"], df["low"], df["close"], atr, multiplier=multiplier)}
+
+
+# ---------- momentum ----------
+
+@register("rsi_14", warmup=14)
+def _rsi_14(df):
+    return {"rsi_14": ta.momentum.RSIIndicator(df["close"], window=14).rsi()}
+
+
+@register("stochastic", outputs=("stochastic_k", "stochastic_d"), inputs=("high", "low", "close"), warmup=16)
+def _stochastic(df):
+    stoch = ta.momentum.StochasticOscillator(df["high"], df["low"], df["close"])
+    return {"stochastic_k": stoch.stoch(), "stochastic_d": stoch.stoch_signal()}
+
+
+@register("cci_20", inputs=("high", "low", "close"), warmup=20)
+def _cci_20(df):
+    return {"cci_20": ta.trend.CCIIndicator(df["high"], df["low"], df["close"], window=20).cci()}
+
+
+@register("roc", warmup=13)
+def _roc(df):
+    return {"roc": ta.momentum.ROCIndicator(df["close"]).roc()}
+
+
+@register("momentum_10", warmup=11)
+def _momentum_10(df):
+    return {"momentum_10": df["close"].diff(periods=10)}
+
+
+# ---------- volatilidad ----------
+
+@register("atr_14", inputs=("high", "low", "close"), warmup=14)
+def _atr_14(df):
+    return {"atr_14": ta.volatility.AverageTrueRange(df["high"], df["low"], df["close"], window=14).average_true_range()}
+
+
+@register("bollinger", outputs=("bollinger_upper", "bollinger_middle", "bollinger_lower"), warmup=20)
+def _bollinger(df):
+    bb = ta.volatility.BollingerBands(df["close"])
+    return {
+        "bollinger_upper": bb.bollinger_hband(),
+        "bollinger_middle": bb.bollinger_mavg(),
+        "bollinger_lower": bb.bollinger_lband(),
+    }
+
+
+@register("donchian", outputs=("donchian_upper", "donchian_lower"), inputs=("high", "low"), warmup=20)
+def _donchian(df):
+    return {
+        "donchian_upper": df["high"].rolling(window=20).max(),
+        "donchian_lower": df["low"].rolling(window=20).min(),
+    }
+
+
+@register("_typical_price", inputs=("high", "low", "close"), warmup=1)
+def _typical_price(df):
+    return {"_typical_price": (df["high"] + df["low"] + df["close"]) / 3}
+
+
+@register("keltner", outputs=("keltner_upper", "keltner_lower"), depends=("atr_14", "_typical_price"), warmup=14)
+def _keltner(df):
+    if df["atr_14"].isnull().all():
+        return {"keltner_upper": None, "keltner_lower": None}
+    return {
+        "keltner_upper": df["_typical_price"] + 2 * df["atr_14"],
+        "keltner_lower": df["_typical_price"] - 2 * df["atr_14"],
+    }
+
+
+@register("chaikin_volatility", inputs=("high", "low"), warmup=20)
+def _chaikin_volatility(df, window=10):
+    ema = (df["high"] - df["low"]).ewm(span=window, adjust=False).mean()
+    return {"chaikin_volatility": ema - ema.shift(window)}
+
+
+# ---------- volumen ----------
+
+@register("obv", inputs=("close", "volume"), warmup=1)
+def _obv(df):
+    return {"obv": ta.volume.OnBalanceVolumeIndicator(df["close"], df["volume"]).on_balance_volume()}
+
+
+@register("mfi", inputs=("high", "low", "close", "volume"), warmup=15)
+def _mfi(df):
+    return {"mfi": ta.volume.MFIIndicator(df["high"], df["low"], df["close"], df["volume"]).money_flow_index()}
+
+
+@register("ad_line", inputs=("high", "low", "close", "volume"), warmup=1)
+def _ad_line(df):
+    return {"ad_line": ta.volume.AccDistIndexIndicator(df["high"], df["low"], df["close"], df["volume"]).acc_dist_index()}
+
+
+@register("chaikin_oscillator", inputs=("high", "low", "close", "volume"), warmup=20)
+def _chaikin_oscillator(df):
+    return {"chaikin_oscillator": ta.volume.ChaikinMoneyFlowIndicator(
+        df["high"], df["low"], df["close"], df["volume"]).chaikin_money_flow()}
+
+
+@register("volume_sma_20", inputs=("volume",), warmup=20)
+def _volume_sma_20(df):
+    return {"volume_sma_20": df["volume"].rolling(window=20).mean()}
+
+
+@register("normalized_volume", inputs=("volume",), depends=("volume_sma_20",), warmup=20)
+def _normalized_volume(df):
+    return {"normalized_volume": (df["volume"] - df["volume_sma_20"]) / df["volume"].rolling(window=20).std()}
+
+
+@register("vwap", inputs=("close", "volume"), warmup=1)
+def _vwap(df):
+    return {"vwap": (df["close"] * df["volume"]).cumsum() / df["volume"].cumsum()}
+
+
+# ---------- precio derivado ----------
+
+@register("slope", warmup=5)
+def _slope(df):
+    return {"slope": kernels.rolling_slope(df["close"].to_numpy(dtype=np.float64), 5)}
+
+
+@register("heikin_ashi_close", inputs=tuple(OHLCV_COLUMNS[:4]), warmup=1)
+def _heikin_ashi_close(df):
+    return {"heikin_ashi_close": (df["open"] + df["high"] + df["low"] + df["close"]) / 4}
+
+
+# ---------- patrones de velas ----------
+
+@register(
+    "_candle_parts",
+    outputs=("_body", "_range", "_upper_shadow", "_lower_shadow"),
+    inputs=tuple(OHLCV_COLUMNS[:4]),
+    warmup=1,
+)
+def _candle_parts(df):
+    return {
+        "_body": (df["close"] - df["open"]).abs(),
+        "_range": df["high"] - df["low"],
+        "_upper_shadow": df["high"] - df[["close", "open"]].max(axis=1),
+        "_lower_shadow": df[["close", "open"]].min(axis=1) - df["low"],
+    }
+
+
+@register("hammer", depends=("_candle_parts",), warmup=1)
+def _hammer(df):
+    return {"hammer": ((df["_body"] / df["_range"] < 0.3) & (df["_lower_shadow"] > df["_body"] * 2)).astype(float)}
+
+
+@register("shooting_star", depends=("_candle_parts",), warmup=1)
+def _shooting_star(df):
+    return {"shooting_star": ((df["_body"] / df["_range"] < 0.3) & (df["_upper_shadow"] > df["_body"] * 2)).astype(float)}
+
+
+@register("doji", depends=("_candle_parts",), warmup=1)
+def _doji(df):
+    return {"doji": (df["_body"] <= df["_range"] * 0.1).astype(float)}
+
+
+@register("engulfing", outputs=("bullish_engulfing", "bearish_engulfing"), inputs=("open", "close"), warmup=2)
+def _engulfing(df):
+    prev_open, prev_close = df["open"].shift(1), df["close"].shift(1)
+    return {
+        "bullish_engulfing": (
+            (prev_close < prev_open) & (df["close"] > df["open"]) &
+            (df["close"] > prev_open) & (df["open"] < prev_close)
+        ).astype(float),
+        "bearish_engulfing": (
+            (prev_close > prev_open) & (df["close"] < df["open"]) &
+            (df["open"] > prev_close) & (df["close"] < prev_open)
+        ).astype(float),
+    }
+
+
+@register("star", outputs=("morning_star", "evening_star"), inputs=tuple(OHLCV_COLUMNS[:4]), warmup=3)
+def _star(df):
+    morning, evening = kernels.star_patterns(df["open"], df["high"], df["low"], df["close"])
+    return {"morning_star": morning, "evening_star": evening}
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from strategies.indicators.benchmarks import benchmark_kernels
+
+
+class Command(BaseCommand):
+    help = "Benchmark + paridad de los kernels vectorizados de indicadores contra las versiones pandas anteriores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bars", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--legacy-limit", type=int, default=20_000,
+                            help="Velas para las versiones lentas (el tiempo se extrapola a --bars)")
+
+    def handle(self, *args, **options):
+        results = benchmark_kernels(n=options["bars"], repeat=options["repeat"], legacy_limit=options["legacy_limit"])
+        mismatched = [r["kernel"] for r in results if not r["match"]]
+        if mismatched:
+            raise CommandError(f"❌ Resultados distintos en: {', '.join(mismatched)}")
+        self.stdout.write(self.style.SUCCESS("✅ Todos los kernels coinciden con la versión anterior (tolerancia de punto flotante)"))
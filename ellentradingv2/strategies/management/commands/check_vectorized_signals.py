@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from backtesting.models import HistoricalMarketDataPoint
+from backtesting.strategies.adapter import check_vectorized_parity, load_window
+from core.utils.time import TIMEFRAME_MINUTES, to_epoch_ns
+from strategies.base.bar_window import BarWindow
+from strategies.base.factory import STRATEGY_CLASS_MAP
+from strategies.indicators.benchmarks import synthetic_bars
+from strategies.indicators.registry import compute_indicators
+from strategies.models import OpenStrategy
+
+
+class Command(BaseCommand):
+    help = "Paridad + tiempos de generate_signals_vectorized() contra la evaluación vela a vela."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bars", type=int, default=20_000, help="Velas sintéticas (sin --symbol)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--symbol", help="Usar las velas históricas del símbolo en vez de sintéticas")
+        parser.add_argument("--timeframe", default="5m")
+        parser.add_argument("--required-bars", type=int, default=50,
+                            help="required_bars si la estrategia no existe en OpenStrategy")
+
+    def handle(self, *args, **options):
+        failed = []
+        for class_ref in dict.fromkeys(STRATEGY_CLASS_MAP.values()):
+            if class_ref.generate_signals_vectorized is None:
+                continue
+
+            strategy = class_ref(strategy_instance=self._strategy_instance(class_ref, options))
+            bars = self._bars(strategy, options)
+            result = check_vectorized_parity(strategy, bars, options["symbol"])
+
+            speedup = result.per_bar_seconds / result.vectorized_seconds if result.vectorized_seconds else float("inf")
+            self.stdout.write(
+                f"{result.strategy}: {result.signals} señales en {result.bars} velas | "
+                f"vela a vela {result.per_bar_seconds:.2f}s, vectorizado {result.vectorized_seconds:.3f}s (x{speedup:.0f})"
+            )
+            if result.mismatches:
+                failed.append(result.strategy)
+                for i, per_bar, vectorized in result.mismatches[:10]:
+                    self.stderr.write(f"   vela {i}: vela a vela={per_bar} vectorizado={vectorized}")
+
+        if failed:
+            self.stderr.write(f"❌ Señales distintas en: {', '.join(failed)}")
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ Las estrategias vectorizadas coinciden con la evaluación vela a vela"))
+
+    def _strategy_instance(self, class_ref, options):
+        """OpenStrategy real si existe (timeframe / umbral de la DB); si no, una copia en memoria."""
+        instance = OpenStrategy.objects.filter(name=class_ref.name).first()
+        if instance is not None:
+            return instance
+        return SimpleNamespace(
+            id=None,
+            name=class_ref.name,
+            timeframe=options["timeframe"],
+            required_bars=options["required_bars"],
+            confidence_threshold=50,
+        )
+
+    def _bars(self, strategy, options) -> BarWindow:
+        if options["symbol"]:
+            queryset = HistoricalMarketDataPoint.objects.filter(symbol=options["symbol"], timeframe=strategy.timeframe)
+            return load_window(queryset, strategy)
+
+        df = compute_indicators(synthetic_bars(options["bars"], options["seed"]), strategy.REQUIRED_INDICATORS)
+        step = TIMEFRAME_MINUTES.get(strategy.timeframe, 5) * 60 * 10**9
+        df["time"] = to_epoch_ns(datetime(2024, 1, 1, tzinfo=timezone.utc)) + np.arange(len(df), dtype=np.int64) * step
+        return BarWindow(df, indicators=[c for c in strategy.REQUIRED_INDICATORS if c in df.columns])
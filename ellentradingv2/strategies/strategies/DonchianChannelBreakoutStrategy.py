@@ -1,22 +1,21 @@
-from signals.signal import Signal
+import numpy as np
+
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class DonchianChannelBreakoutStrategy(EntryStrategy):
     name = "Donchian Channel Breakout"
+    REQUIRED_INDICATORS = ("donchian_upper", "donchian_lower", "sma_20")
 
     def __init__(self, strategy_instance=None, period=20):
         self.name = "Donchian Channel Breakout"
         self.period = period
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.period + 5:
             return None
 
@@ -31,10 +30,9 @@ class DonchianChannelBreakoutStrategy(EntryStrategy):
 
         # Fallback: calcular manualmente si no hay indicadores
         if upper is None or lower is None:
-            highs = [bar.high for bar in bars[-self.period:]]
-            lows = [bar.low for bar in bars[-self.period:]]
-            upper = max(highs)
-            lower = min(lows)
+            features = self.features(bars)
+            upper = features.range_high(self.period)
+            lower = features.range_low(self.period)
 
         middle = (upper + lower) / 2
 
@@ -126,39 +124,14 @@ class DonchianChannelBreakoutStrategy(EntryStrategy):
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 Donchian Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="donchian_breakout",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
+        self.note(f"📊 Donchian Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="donchian_breakout",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="donchian_breakout")
 
-        async_to_sync(log_event)(
-            f"🚀 DONCHIAN AWAKENS! {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | Upper: {upper:.4f} | Lower: {lower:.4f} | Confidence: {confidence}",
+        self.note(
+            f"🚀 DONCHIAN AWAKENS! {signal_type} for {symbol} | Price: {current_price:.4f} | Upper: {upper:.4f} | Lower: {lower:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -320,22 +293,10 @@ class DonchianChannelBreakoutStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 2.5:
                 return 15  # Huge volume
             elif volume_ratio > 2.0:
@@ -447,4 +408,119 @@ class DonchianChannelBreakoutStrategy(EntryStrategy):
         elif current_price < lower and avg_position > 0.7:  # Was near top, broke bottom
             return 8
         else:
-            return 0
\ No newline at end of file
+            return 0
+
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (ver strategies/base/vectorized.py)."""
+        n = len(bars)
+        window = self.required_bars
+        if window < self.period + 5:
+            return vz.vector_signals(self, np.zeros(n), np.zeros(n), source="donchian_breakout")
+
+        close, open_ = bars.close, bars.open
+        prev_close = vz.lag(close)
+
+        # Canal del indicador; si falta cualquiera de los dos, el del rango de las últimas `period` velas
+        indicator_upper = vz.column(bars, "donchian_upper")
+        indicator_lower = vz.column(bars, "donchian_lower")
+        has_channel = vz.present(indicator_upper) & vz.present(indicator_lower)
+        upper = np.where(has_channel, indicator_upper, vz.rolling_max(bars.high, self.period))
+        lower = np.where(has_channel, indicator_lower, vz.rolling_min(bars.low, self.period))
+        middle = (upper + lower) / 2
+
+        # Signal Type 1: breakout real
+        breakout_buy = (prev_close <= upper) & (close > upper)
+        breakout_sell = ~breakout_buy & (prev_close >= lower) & (close < lower)
+        strength = np.where(breakout_buy, (close - upper) / upper, (lower - close) / lower)
+        breakout_bonus = 25 + np.select([strength > 0.02, strength > 0.01], [10, 5], 0)
+
+        # Signal Type 2: retest del canal roto en las 4 velas previas
+        prior = np.column_stack([vz.lag(close, k) for k in range(1, 5)])
+        retest_buy = (
+            (prior > upper[:, None]).any(axis=1) & (np.abs(close - upper) / upper < 0.01) & (close > upper * 0.998)
+        )
+        retest_sell = ~retest_buy & (
+            (prior < lower[:, None]).any(axis=1) & (np.abs(close - lower) / lower < 0.01) & (close < lower * 1.002)
+        )
+
+        # Signal Type 3: expansión después de squeeze (ancho del indicador en las 9 velas previas)
+        total, count = np.zeros(n), np.zeros(n)
+        for k in range(9, 0, -1):
+            hist_upper, hist_lower = vz.lag(indicator_upper, k), vz.lag(indicator_lower, k)
+            ok = vz.truthy(hist_upper) & vz.truthy(hist_lower)
+            total = total + np.where(ok, (hist_upper - hist_lower) / hist_lower, 0.0)
+            count = count + ok
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expanding = (count > 0) & ((upper - lower) / lower > total / count * 1.3)
+        squeeze_buy = expanding & (close > upper)
+        squeeze_sell = expanding & ~squeeze_buy & (close < lower)
+
+        # Signal Type 4: breakout con momentum y vela fuerte
+        candle = vz.candle(bars)
+        price_momentum = (close - prev_close) / prev_close
+        momentum_buy = (close > upper) & (price_momentum > 0.015) & (candle.body_ratio > 0.6) & candle.is_green
+        momentum_sell = ~momentum_buy & (close < lower) & (price_momentum < -0.015) & (
+            candle.body_ratio > 0.6
+        ) & candle.is_red
+
+        signals = [breakout_buy, breakout_sell, momentum_buy, momentum_sell,
+                   squeeze_buy, squeeze_sell, retest_buy, retest_sell]
+        direction = np.select(signals, [vz.BUY, vz.SELL] * 4, vz.NONE)
+        buy, sell = direction == vz.BUY, direction == vz.SELL
+
+        confidence = 40 + np.select(
+            [breakout_buy | breakout_sell, momentum_buy | momentum_sell,
+             squeeze_buy | squeeze_sell, retest_buy | retest_sell],
+            [breakout_bonus, 20, 18, 15], 0
+        )
+
+        # Bonus 1: ancho del canal
+        width_ratio = (upper - lower) / middle
+        confidence = confidence + np.select([width_ratio > 0.15, width_ratio > 0.08, width_ratio > 0.04], [12, 8, 5], 2)
+
+        # Bonus 2: distancia al punto de breakout
+        distance = np.where(buy, (close - upper) / upper, (lower - close) / lower)
+        confidence = confidence + np.select(
+            [distance > 0.03, distance > 0.02, distance > 0.01, distance > 0.005], [15, 10, 6, 3], 0
+        )
+
+        # Bonus 3: volumen
+        volume_ratio = vz.volume_ratio(bars.volume, 10, window=window)
+        confidence = confidence + np.select(
+            [volume_ratio > 2.5, volume_ratio > 2.0, volume_ratio > 1.5, volume_ratio > 1.2], [15, 12, 8, 4], 0
+        )
+
+        # Bonus 4: momentum de 5 velas (la mitad si va en contra)
+        momentum_5 = (close - vz.lag(close, 4)) / vz.lag(close, 4)
+        momentum_strength = np.abs(momentum_5)
+        momentum_bonus = np.select(
+            [momentum_strength > 0.05, momentum_strength > 0.03, momentum_strength > 0.02], [12, 8, 5], 0
+        )
+        aligned = (buy & (momentum_5 > 0)) | (sell & (momentum_5 < 0))
+        confidence = confidence + np.where(aligned, momentum_bonus, momentum_bonus // 2)
+
+        # Bonus 5: precio del lado de la SMA20
+        sma_20 = vz.column(bars, "sma_20")
+        trend_ok = vz.truthy(sma_20) & ((buy & (close > sma_20)) | (sell & (close < sma_20)))
+        confidence = confidence + np.where(trend_ok, 6, 0)
+
+        # Bonus 6: velas dentro del canal en las 9 previas
+        recent = np.column_stack([vz.lag(close, k) for k in range(1, 10)])
+        in_channel = ((lower[:, None] <= recent) & (recent <= upper[:, None])).sum(axis=1)
+        confidence = confidence + np.select([in_channel >= 7, in_channel >= 5, in_channel >= 3], [10, 6, 3], 0)
+
+        # Bonus 7: fuerza de la vela
+        strong = candle.body_ratio > 0.7
+        confidence = confidence + np.select(
+            [buy & candle.is_green & strong, sell & candle.is_red & strong, candle.body_ratio > 0.5], [8, 8, 4], 0
+        )
+
+        # Bonus 8: posición previa en el canal (4 velas) vs. lado del breakout
+        position_sum = 0.0
+        for k in range(4, 0, -1):
+            position_sum = position_sum + (vz.lag(close, k) - lower) / (upper - lower)
+        avg_position = position_sum / 4
+        reversal = ((close > upper) & (avg_position < 0.3)) | ((close < lower) & (avg_position > 0.7))
+        confidence = confidence + np.where((upper != lower) & reversal, 8, 0)
+
+        return vz.vector_signals(self, direction, confidence, source="donchian_breakout")
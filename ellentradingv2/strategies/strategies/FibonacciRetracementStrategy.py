@@ -1,14 +1,13 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
+from strategies.base.feature_context import FeatureContext
 
 
 class FibonacciRetracementStrategy(EntryStrategy):
     name = "Fibonacci Retracement Strategy"
+    REQUIRED_INDICATORS = ()
+    USES_MULTI_TIMEFRAME = True
 
     def __init__(self, strategy_instance=None):
         self.name = "Fibonacci Retracement Strategy"
@@ -31,8 +30,7 @@ class FibonacciRetracementStrategy(EntryStrategy):
             "161.8%": swing_high - diff * 1.618,
         }
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -81,7 +79,7 @@ class FibonacciRetracementStrategy(EntryStrategy):
         confidence += volume_bonus
 
         # Bonus 4: Price action at Fibonacci level
-        price_action_bonus = self._calculate_price_action_bonus(current_bar, signal_type)
+        price_action_bonus = self._calculate_price_action_bonus(bars, signal_type)
         confidence += price_action_bonus
 
         # Bonus 5: Fibonacci extension targets
@@ -111,39 +109,14 @@ class FibonacciRetracementStrategy(EntryStrategy):
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 Fibonacci Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="fibonacci_retracement",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
+        self.note(f"📊 Fibonacci Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="fibonacci_retracement",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(bars[-1], "timestamp", getattr(bars[-1], "start_time", None))
-        s.received_at = s.timestamp
-
-        async_to_sync(log_event)(
-            f"🌟 FIBONACCI GOLDEN: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | Confidence: {confidence}",
+        s = self.decision(signal_type, confidence, price=current_price, bar=bars[-1], source="fibonacci_retracement")
+
+        self.note(
+            f"🌟 FIBONACCI GOLDEN: {signal_type} for {symbol} | Price: {current_price:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -189,40 +162,21 @@ class FibonacciRetracementStrategy(EntryStrategy):
 
         return None, 0
 
-    def _find_significant_swing(self, bars, period):
+    def _find_significant_swing(self, bars, period, features=None):
         """Encuentra swings significativos usando pivots"""
+        features = self.features(bars) if features is None else features
 
         if len(bars) < period + 10:
             # Fallback to simple high/low
-            highs = [bar.high for bar in bars[-period:]]
-            lows = [bar.low for bar in bars[-period:]]
-            return max(highs), min(lows)
-
-        # ✨ DETECCIÓN DE PIVOTS MEJORADA
-        swing_high = 0
-        swing_low = float('inf')
+            return features.range_high(period), features.range_low(period)
 
-        # Look for pivot highs and lows
-        for i in range(5, len(bars) - 5):  # Need 5 bars on each side
-            current_high = bars[i].high
-            current_low = bars[i].low
-
-            # Check if it's a pivot high
-            is_pivot_high = all(current_high >= bars[j].high for j in range(i - 5, i + 6) if j != i)
-            if is_pivot_high and current_high > swing_high:
-                swing_high = current_high
-
-            # Check if it's a pivot low
-            is_pivot_low = all(current_low <= bars[j].low for j in range(i - 5, i + 6) if j != i)
-            if is_pivot_low and current_low < swing_low:
-                swing_low = current_low
+        # ✨ PIVOTS (5 velas de cada lado) sobre toda la ventana, compartidos vía FeatureContext
+        swing_high, swing_low = features.pivot_extremes(order=5, lookback=len(bars))
 
         # Fallback if no significant pivots found
-        if swing_high == 0 or swing_low == float('inf'):
-            highs = [bar.high for bar in bars[-period:]]
-            lows = [bar.low for bar in bars[-period:]]
-            swing_high = max(highs)
-            swing_low = min(lows)
+        if swing_high is None or swing_low is None:
+            swing_high = features.range_high(period)
+            swing_low = features.range_low(period)
 
         return swing_high, swing_low
 
@@ -233,7 +187,7 @@ class FibonacciRetracementStrategy(EntryStrategy):
         base_bonus = 15
 
         # Determine if we're in an uptrend or downtrend
-        recent_trend = (bars[-1].close - bars[-20].close) / bars[-20].close if len(bars) >= 20 else 0
+        recent_trend = self.features(bars).trend(20) if len(bars) >= 20 else 0
 
         # ✨ SEÑALES POR NIVEL FIBONACCI
         if level_name == "23.6%":
@@ -316,8 +270,8 @@ class FibonacciRetracementStrategy(EntryStrategy):
             return 0
 
         # Multiple timeframe trend analysis
-        short_trend = (bars[-1].close - bars[-5].close) / bars[-5].close  # 5-bar trend
-        medium_trend = (bars[-1].close - bars[-20].close) / bars[-20].close  # 20-bar trend
+        short_trend = self.features(bars).trend(5)  # 5-bar trend
+        medium_trend = self.features(bars).trend(20)  # 20-bar trend
 
         bonus = 0
         if signal_type == SignalType.BUY:
@@ -336,22 +290,10 @@ class FibonacciRetracementStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen en nivel Fibonacci"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.8:
                 return 10  # High volume at Fibonacci level
             elif volume_ratio > 1.4:
@@ -363,26 +305,22 @@ class FibonacciRetracementStrategy(EntryStrategy):
         except:
             return 0
 
-    def _calculate_price_action_bonus(self, current_bar, signal_type):
+    def _calculate_price_action_bonus(self, bars, signal_type):
         """Calcula bonus basado en price action en nivel Fibonacci"""
-        candle_body = abs(current_bar.close - current_bar.open)
-        candle_range = current_bar.high - current_bar.low
-        body_ratio = candle_body / candle_range if candle_range > 0 else 0
+        candle = self.features(bars).candle
 
         # Strong rejection candle at Fibonacci level
         if signal_type == SignalType.BUY:
             # Long lower wick (rejection of lower prices)
-            lower_wick = current_bar.open - current_bar.low if current_bar.close > current_bar.open else current_bar.close - current_bar.low
-            if lower_wick > candle_body * 2:  # Wick > 2x body
+            if candle.lower_wick > candle.body * 2:  # Wick > 2x body
                 return 12
-            elif current_bar.close > current_bar.open and body_ratio > 0.6:
+            elif candle.is_green and candle.body_ratio > 0.6:
                 return 8  # Strong green candle
         elif signal_type == SignalType.SELL:
             # Long upper wick (rejection of higher prices)
-            upper_wick = current_bar.high - current_bar.open if current_bar.close < current_bar.open else current_bar.high - current_bar.close
-            if upper_wick > candle_body * 2:  # Wick > 2x body
+            if candle.upper_wick > candle.body * 2:  # Wick > 2x body
                 return 12
-            elif current_bar.close < current_bar.open and body_ratio > 0.6:
+            elif candle.is_red and candle.body_ratio > 0.6:
                 return 8  # Strong red candle
 
         return 0
@@ -438,18 +376,20 @@ class FibonacciRetracementStrategy(EntryStrategy):
             return 0
 
     def _calculate_multi_timeframe_bonus(self, bars, current_price, signal_type):
-        """Calcula bonus por alineación multi-timeframe simulada"""
-        if len(bars) < 60:
-            return 0
+        """Calcula bonus por alineación multi-timeframe (real si hay mtf_view, si no simulada)"""
+        htf_bars = self.higher_timeframe_bars(bars, count=max(20, len(bars) // 4))
 
-        # Simulate higher timeframe by sampling every 4th bar
-        htf_bars = bars[::4]  # Every 4th bar
+        if htf_bars is None:
+            if len(bars) < 60:
+                return 0
+            # Simulate higher timeframe by sampling every 4th bar
+            htf_bars = bars[::4]  # Every 4th bar
 
         if len(htf_bars) < 20:
             return 0
 
         # Check HTF Fibonacci levels
-        htf_swing_high, htf_swing_low = self._find_significant_swing(htf_bars, 15)
+        htf_swing_high, htf_swing_low = self._find_significant_swing(htf_bars, 15, FeatureContext(htf_bars))
 
         if htf_swing_high <= htf_swing_low:
             return 0
@@ -1,20 +1,17 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class TripleEMACrossoverStrategy(EntryStrategy):
     name = "Triple EMA Crossover Strategy"
+    REQUIRED_INDICATORS = ("ema_9", "ema_21", "ema_55")
 
     def __init__(self, strategy_instance=None):
         self.name = "Triple EMA Crossover Strategy"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -123,36 +120,11 @@ class TripleEMACrossoverStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Avoid duplicates
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="triple_ema_crossover",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-        if recent_signal:
-            return None
-
         # Create signal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="triple_ema_crossover",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="triple_ema_crossover")
 
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ TRIPLE EMA: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | EMA9: {ema_9_curr:.4f} | EMA21: {ema_21_curr:.4f} | EMA55: {ema_55_curr:.4f} | Confidence: {confidence}",
+        self.note(
+            f"✅ TRIPLE EMA: {signal_type} for {symbol} | Price: {current_price:.4f} | EMA9: {ema_9_curr:.4f} | EMA21: {ema_21_curr:.4f} | EMA55: {ema_55_curr:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -331,22 +303,10 @@ class TripleEMACrossoverStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.5:
                 return 10
             elif volume_ratio > 1.2:
@@ -1,14 +1,11 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class ADXTrendStrengthStrategy(EntryStrategy):
     name = "ADX Trend Strength Strategy"
+    REQUIRED_INDICATORS = ("adx", "plus_di", "minus_di")
 
     def __init__(self, strategy_instance=None, adx_period=14):
         self.name = "ADX Trend Strength Strategy"
@@ -17,10 +14,9 @@ class ADXTrendStrengthStrategy(EntryStrategy):
         self.required_bars = adx_period + 5
 
     def log(self, message, level="INFO"):
-        async_to_sync(log_event)(f"[{self.name}] {message}", source="strategies", level=level)
+        self.note(f"[{self.name}] {message}", source="strategies", level=level)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             self.log(f"❌ Faltan velas ({len(bars)}/{self.required_bars}) para {symbol}", level="WARNING")
             return None
@@ -104,7 +100,7 @@ class ADXTrendStrengthStrategy(EntryStrategy):
         confidence += momentum_bonus
 
         # Bonus 4: Price action confirmation
-        price_action_bonus = self._calculate_price_action_bonus(current_bar, signal_type)
+        price_action_bonus = self._calculate_price_action_bonus(bars, signal_type)
         confidence += price_action_bonus
 
         # Bonus 5: Volume confirmation
@@ -133,37 +129,11 @@ class ADXTrendStrengthStrategy(EntryStrategy):
         quality_level = self._get_quality_description(confidence)
         self.log(f"📊 ADX Score: {confidence} - {quality_level}")
 
-        # Evitar señales duplicadas
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 0
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="adx_trend",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            self.log(f"🚫 Ya existe una señal {signal_type} reciente para {symbol}")
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_bar.close,
-            confidence_score=confidence,
-            source="adx_trend",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_bar.close, bar=current_bar, source="adx_trend")
 
         self.log(
-            f"✅ ADX Signal: {signal_type} para {symbol_obj.symbol} @ {s.price} | ADX: {adx_current:.1f} | +DI: {plus_di_current:.1f} | -DI: {minus_di_current:.1f} | Confidence: {confidence}")
+            f"✅ ADX Signal: {signal_type} para {symbol} @ {s.price} | ADX: {adx_current:.1f} | +DI: {plus_di_current:.1f} | -DI: {minus_di_current:.1f} | Confidence: {confidence}")
         return s
 
     def _get_quality_description(self, score: int) -> str:
@@ -335,24 +305,22 @@ class ADXTrendStrengthStrategy(EntryStrategy):
         else:
             return 0
 
-    def _calculate_price_action_bonus(self, current_bar, signal_type):
+    def _calculate_price_action_bonus(self, bars, signal_type):
         """Calcula bonus basado en price action"""
-        candle_body = abs(current_bar.close - current_bar.open)
-        candle_range = current_bar.high - current_bar.low
-        body_ratio = candle_body / candle_range if candle_range > 0 else 0
+        candle = self.features(bars).candle
 
         bonus = 0
 
         # Strong candle in signal direction
-        if signal_type == SignalType.BUY and current_bar.close > current_bar.open:
-            if body_ratio > 0.7:
+        if signal_type == SignalType.BUY and candle.is_green:
+            if candle.body_ratio > 0.7:
                 bonus = 8
-            elif body_ratio > 0.5:
+            elif candle.body_ratio > 0.5:
                 bonus = 5
-        elif signal_type == SignalType.SELL and current_bar.close < current_bar.open:
-            if body_ratio > 0.7:
+        elif signal_type == SignalType.SELL and candle.is_red:
+            if candle.body_ratio > 0.7:
                 bonus = 8
-            elif body_ratio > 0.5:
+            elif candle.body_ratio > 0.5:
                 bonus = 5
 
         return bonus
@@ -360,22 +328,10 @@ class ADXTrendStrengthStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.8:
                 return 10
             elif volume_ratio > 1.4:
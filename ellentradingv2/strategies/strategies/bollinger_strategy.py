@@ -1,15 +1,14 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
+from strategies.base.decision import StrategyDecision
+import numpy as np
 import pandas as pd
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
 
 
 class BollingerBandBreakoutStrategy(EntryStrategy):
     name = "Bollinger Band Breakout"
+    REQUIRED_INDICATORS = ("bollinger_upper", "bollinger_middle", "bollinger_lower", "rsi_14", "sma_20")
 
     def __init__(self, strategy_instance=None, mode="smart"):
         self.name = "Bollinger Band Breakout"
@@ -17,12 +16,10 @@ class BollingerBandBreakoutStrategy(EntryStrategy):
         super().__init__(strategy_instance)
         self.required_bars = 21
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
-
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
-            async_to_sync(log_event)(f"[{symbol}] ❌ No hay suficientes velas ({len(bars)}/{self.required_bars})",
-                                     source="bollinger", level="DEBUG")
+            self.note(f"[{symbol}] ❌ No hay suficientes velas ({len(bars)}/{self.required_bars})",
+                      source="bollinger", level="DEBUG")
             return None
 
         last_bar = bars[-1]
@@ -35,7 +32,7 @@ class BollingerBandBreakoutStrategy(EntryStrategy):
         last_price = last_bar.close
 
         if any(v is None for v in [upper, middle, lower, last_price]):
-            async_to_sync(log_event)(
+            self.note(
                 f"[{symbol}] ❌ Indicadores incompletos: upper={upper}, middle={middle}, lower={lower}",
                 source="bollinger", level="WARNING")
             return None
@@ -50,8 +47,8 @@ class BollingerBandBreakoutStrategy(EntryStrategy):
 
         # 🔧 FILTRO MEJORADO: Más flexible para banda angosta
         if band_width < 0.005:  # 0.5% en lugar de 1%
-            async_to_sync(log_event)(f"[{symbol}] 📉 Banda muy angosta ({band_width:.3%}). Ignorado.",
-                                     source="bollinger", level="DEBUG")
+            self.note(f"[{symbol}] 📉 Banda muy angosta ({band_width:.3%}). Ignorado.",
+                      source="bollinger", level="DEBUG")
             return None
 
         # Calcular posición relativa del precio en la banda
@@ -129,24 +126,14 @@ class BollingerBandBreakoutStrategy(EntryStrategy):
 
         # Bonus 4: Confirmación de volumen
         try:
-            current_volume = getattr(last_bar, 'volume', None) or self.get_indicator_value(last_bar, "volume")
-            if current_volume and len(bars) >= 10:
-                volumes = []
-                for bar in bars[-10:]:
-                    vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                    if vol:
-                        volumes.append(vol)
-
-                if volumes:
-                    avg_volume = sum(volumes) / len(volumes)
-                    volume_ratio = current_volume / avg_volume
-
-                    if volume_ratio > 2.0:
-                        confidence += 15
-                    elif volume_ratio > 1.5:
-                        confidence += 10
-                    elif volume_ratio > 1.2:
-                        confidence += 5
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is not None:
+                if volume_ratio > 2.0:
+                    confidence += 15
+                elif volume_ratio > 1.5:
+                    confidence += 10
+                elif volume_ratio > 1.2:
+                    confidence += 5
         except:
             pass
 
@@ -178,51 +165,97 @@ class BollingerBandBreakoutStrategy(EntryStrategy):
         # Para Primary: 50 (DECENTE) mínimo, 65+ (BUENA) preferido
         min_confidence = getattr(self.strategy_instance, "confidence_threshold", 50)
         if confidence < min_confidence:
-            async_to_sync(log_event)(
+            self.note(
                 f"[{symbol}] ⚠️ Confianza {confidence} < umbral mínimo ({min_confidence}). Ignorado.",
                 source="bollinger", level="DEBUG")
             return None
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 Bollinger Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="bollinger_breakout",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            async_to_sync(log_event)(f"[{symbol}] ⚠️ Ya existe una señal reciente ({signal_type}). Ignorado.",
-                                     source="bollinger", level="DEBUG")
-            return None
+        self.note(f"📊 Bollinger Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=last_price,
-            confidence_score=confidence,
-            source="bollinger_breakout",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(bars[-1], "timestamp", getattr(bars[-1], "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=last_price, bar=bars[-1], source="bollinger_breakout")
 
-        async_to_sync(log_event)(
-            f"✅ BOLLINGER Signal: {signal_type} for {symbol_obj.symbol} | Price: {last_price:.4f} | Band Pos: {band_position:.1%} | Confidence: {confidence}",
+        self.note(
+            f"✅ BOLLINGER Signal: {signal_type} for {symbol} | Price: {last_price:.4f} | Band Pos: {band_position:.1%} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (los tres modos)."""
+        close = bars.close
+        upper = vz.column(bars, "bollinger_upper")
+        middle = vz.column(bars, "bollinger_middle")
+        lower = vz.column(bars, "bollinger_lower")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            band_width = (upper - lower) / middle
+            band_position = np.where(upper != lower, (close - lower) / (upper - lower), 0.5)
+
+            # Squeeze contra el ancho de banda de 4 velas atrás (bars[-5])
+            prev_middle = vz.lag(middle, 4)
+            prev_band_width = (vz.lag(upper, 4) - vz.lag(lower, 4)) / prev_middle
+            is_squeeze = (prev_middle != 0) & vz.truthy(prev_band_width) & (band_width < prev_band_width * 0.8)
+
+            sma_now = vz.column(bars, "sma_20")
+            sma_prev = vz.lag(sma_now, 4)
+            sma_slope = np.where(vz.truthy(sma_now) & vz.truthy(sma_prev), (sma_now - sma_prev) / sma_prev, 0.0)
+
+            prev_close = vz.lag(close)
+            price_momentum = (close - prev_close) / prev_close
+
+        valid = vz.present(upper) & vz.present(middle) & vz.present(lower) & vz.present(close) \
+            & ~(band_width < 0.005)
+        post_squeeze = is_squeeze & (band_width > 0.015)
+        breakout_buy = (close > upper) & (sma_slope > 0)
+        breakout_sell = (close < lower) & (sma_slope < 0)
+
+        if self.mode == "smart":
+            trending = np.abs(sma_slope) > 0.01
+            conditions = [
+                post_squeeze & breakout_buy, post_squeeze & breakout_sell,
+                trending & breakout_buy, trending & breakout_sell,
+                ~trending & (band_position < 0.2) & (sma_slope > -0.005),
+                ~trending & (band_position > 0.8) & (sma_slope < 0.005),
+            ]
+            directions = [vz.BUY, vz.SELL] * 3
+            base = [20, 20, 15, 15, 12, 12]
+        elif self.mode == "reversal":
+            conditions = [(close < lower) & (sma_slope > -0.01), (close > upper) & (sma_slope < 0.01)]
+            directions, base = [vz.BUY, vz.SELL], [15, 15]
+        elif self.mode == "breakout":
+            conditions = [breakout_buy, breakout_sell]
+            directions, base = [vz.BUY, vz.SELL], [15, 15]
+        else:
+            empty = np.zeros(len(bars))
+            return vz.vector_signals(self, empty, empty, source="bollinger_breakout")
+
+        conditions = [valid & c for c in conditions]
+        direction = np.select(conditions, directions, vz.NONE)
+        buy, sell = direction == vz.BUY, direction == vz.SELL
+        confidence = 40 + np.select(conditions, base, 0)
+
+        # Bonus 1: posición en la banda
+        confidence += np.select(
+            [band_position < 0.1, band_position > 0.9, (band_position < 0.2) | (band_position > 0.8)], [15, 15, 10], 0
+        )
+        # Bonus 2: ancho de banda
+        confidence += np.select([band_width > 0.04, band_width > 0.02], [12, 8], 0)
+        # Bonus 3: expansión post-squeeze
+        confidence += np.where(post_squeeze, 18, 0)
+        # Bonus 4: volumen
+        volume_ratio = vz.volume_ratio(bars.volume, 10, window=self.required_bars)
+        confidence += np.select([volume_ratio > 2.0, volume_ratio > 1.5, volume_ratio > 1.2], [15, 10, 5], 0)
+        # Bonus 5: momentum contra la vela anterior
+        confidence += np.where((buy & (price_momentum > 0.005)) | (sell & (price_momentum < -0.005)), 8, 0)
+        # Bonus 6: RSI
+        rsi = vz.column(bars, "rsi_14")
+        confidence += np.where(vz.truthy(rsi) & ((buy & (rsi < 40)) | (sell & (rsi > 60))), 10, 0)
+
+        return vz.vector_signals(self, direction, confidence, source="bollinger_breakout")
+
     def _get_quality_description(self, score: int) -> str:
         """Determina el nivel de calidad según rangos universales"""
         if score <= 34:
@@ -1,14 +1,11 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class BullishEngulfingStrategy(EntryStrategy):
     name = "Bullish Engulfing Pattern"
+    REQUIRED_INDICATORS = ("bollinger_lower", "rsi_14", "sma_20", "sma_50")
 
     def __init__(self, strategy_instance=None):
         self.name = "Bullish Engulfing Pattern"
@@ -16,9 +13,7 @@ class BullishEngulfingStrategy(EntryStrategy):
         self.required_bars = 20  # More bars for context analysis
         self.timeframe = getattr(strategy_instance, "timeframe", "1h")
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
-
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -102,39 +97,14 @@ class BullishEngulfingStrategy(EntryStrategy):
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 Bullish Engulfing Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = self._get_symbol_object(symbol)
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=SignalType.BUY,
-            source="bullish_engulfing",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
+        self.note(f"📊 Bullish Engulfing Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=SignalType.BUY,
-            price=current_price,
-            confidence_score=int(confidence),
-            source="bullish_engulfing",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
-
-        async_to_sync(log_event)(
-            f"🕯️ BULLISH ENGULFING: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | Confidence: {confidence}",
+        s = self.decision(SignalType.BUY, int(confidence), price=current_price, bar=current_bar, source="bullish_engulfing")
+
+        self.note(
+            f"🕯️ BULLISH ENGULFING: {signal_type} for {symbol} | Price: {current_price:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -271,12 +241,8 @@ class BullishEngulfingStrategy(EntryStrategy):
         if len(bars) < 20:
             return 0
 
-        # Find recent support/resistance levels
-        recent_lows = [bar.low for bar in bars[-20:]]
-        recent_highs = [bar.high for bar in bars[-20:]]
-
         # Check if we're near a support level
-        support_levels = sorted(set(recent_lows))[:5]  # Top 5 unique lows
+        support_levels = self.features(bars).lowest_lows(20, 5)  # Top 5 unique lows
 
         for support in support_levels:
             distance = abs(current_price - support) / current_price
@@ -291,8 +257,8 @@ class BullishEngulfingStrategy(EntryStrategy):
             return 0
 
         # Analyze trend context
-        short_trend = (bars[-1].close - bars[-5].close) / bars[-5].close
-        medium_trend = (bars[-1].close - bars[-20].close) / bars[-20].close
+        short_trend = self.features(bars).trend(5)
+        medium_trend = self.features(bars).trend(20)
 
         # Bullish reversal in downtrend is strongest
         if signal_type == SignalType.BUY:
@@ -308,22 +274,10 @@ class BullishEngulfingStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 2.0:
                 return 12  # Very high volume
             elif volume_ratio > 1.5:
@@ -432,6 +386,3 @@ class BullishEngulfingStrategy(EntryStrategy):
             return 8  # Breaking resistance
 
         return 0
-
-    def _get_symbol_object(self, symbol):
-        return Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
\ No newline at end of file
@@ -1,22 +1,22 @@
-from signals.signal import Signal
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from monitoring.utils import log_event
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class CCIExtremeStrategy(EntryStrategy):
     name = "CCI Extreme Strategy"
+    REQUIRED_INDICATORS = ("cci_20",)
 
     def __init__(self, strategy_instance=None, cci_period=20):
         self.name = "CCI Extreme Strategy"
         self.cci_period = cci_period
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.cci_period + 10:  # Extra bars for analysis
             return None
 
@@ -91,7 +91,7 @@ class CCIExtremeStrategy(EntryStrategy):
         confidence += momentum_bonus_extra
 
         # Bonus 3: Price action confirmation
-        price_action_bonus = self._calculate_price_action_bonus(current_bar, signal_type)
+        price_action_bonus = self._calculate_price_action_bonus(bars, signal_type)
         confidence += price_action_bonus
 
         # Bonus 4: Volume confirmation
@@ -121,39 +121,14 @@ class CCIExtremeStrategy(EntryStrategy):
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 CCI Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = symbol if isinstance(symbol, Symbol) else Symbol.objects.get(symbol=symbol)
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="cci_extreme",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
+        self.note(f"📊 CCI Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=bars[-1].close,
-            confidence_score=confidence,
-            source="cci_extreme",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(bars[-1], "timestamp", getattr(bars[-1], "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=bars[-1].close, bar=bars[-1], source="cci_extreme")
 
-        async_to_sync(log_event)(
-            f"⚡ CCI EMPOWERED: {signal_type} for {symbol_obj.symbol} | CCI: {current_cci:.1f} | Price: {s.price:.4f} | Confidence: {confidence}",
+        self.note(
+            f"⚡ CCI EMPOWERED: {signal_type} for {symbol} | CCI: {current_cci:.1f} | Price: {s.price:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -384,17 +359,15 @@ class CCIExtremeStrategy(EntryStrategy):
         else:
             return 0
 
-    def _calculate_price_action_bonus(self, current_bar, signal_type):
+    def _calculate_price_action_bonus(self, bars, signal_type):
         """Calcula bonus basado en price action"""
-        candle_body = abs(current_bar.close - current_bar.open)
-        candle_range = current_bar.high - current_bar.low
-        body_ratio = candle_body / candle_range if candle_range > 0 else 0
+        candle = self.features(bars).candle
 
-        if signal_type == SignalType.BUY and current_bar.close > current_bar.open and body_ratio > 0.6:
+        if signal_type == SignalType.BUY and candle.is_green and candle.body_ratio > 0.6:
             return 8  # Strong green candle
-        elif signal_type == SignalType.SELL and current_bar.close < current_bar.open and body_ratio > 0.6:
+        elif signal_type == SignalType.SELL and candle.is_red and candle.body_ratio > 0.6:
             return 8  # Strong red candle
-        elif body_ratio > 0.4:
+        elif candle.body_ratio > 0.4:
             return 4  # Moderate candle
         else:
             return 0
@@ -402,22 +375,10 @@ class CCIExtremeStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
-                return 0
-
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 2.0:
                 return 12
             elif volume_ratio > 1.6:
@@ -437,7 +398,7 @@ class CCIExtremeStrategy(EntryStrategy):
             return 0
 
         # Simple trend analysis
-        price_trend = (bars[-1].close - bars[-10].close) / bars[-10].close
+        price_trend = self.features(bars).trend(10)
 
         if signal_type == SignalType.BUY and price_trend > 0.02:  # 2%+ uptrend
             return 6
@@ -505,4 +466,164 @@ class CCIExtremeStrategy(EntryStrategy):
         elif signal_type == SignalType.SELL and longer_trend < -20:
             return 5  # Longer term bearish
         else:
-            return 0
\ No newline at end of file
+            return 0
+
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (ver strategies/base/vectorized.py)."""
+        n = len(bars)
+        if self.required_bars < self.cci_period + 10:
+            return vz.vector_signals(self, np.zeros(n), np.zeros(n), source="cci_extreme")
+
+        close = bars.close
+        cci = vz.column(bars, f"cci_{self.cci_period}")
+        prev_cci = vz.lag(cci)
+        has_prev = vz.truthy(prev_cci)
+
+        # Signal Type 1: reversión desde extremo
+        extreme_buy = has_prev & (cci < -120) & (prev_cci < cci)
+        extreme_sell = has_prev & ~extreme_buy & (cci > 120) & (prev_cci > cci)
+        extreme_bonus = 20 + np.where(
+            extreme_buy,
+            np.select([cci < -180, cci < -150], [15, 10], 0)
+            + np.select([cci - prev_cci > 15, cci - prev_cci > 8], [8, 5], 0),
+            np.select([cci > 180, cci > 150], [15, 10], 0)
+            + np.select([prev_cci - cci > 15, prev_cci - cci > 8], [8, 5], 0),
+        )
+
+        # Signal Type 2: divergencia con el precio (15 velas)
+        div_buy, div_sell = self._vectorized_divergence(close, cci)
+
+        # Signal Type 3: cruce de la línea cero
+        zero_buy = has_prev & (prev_cci <= 0) & (cci > 0)
+        zero_sell = has_prev & ~zero_buy & (prev_cci >= 0) & (cci < 0)
+        zero_bonus = 15 + np.where(
+            zero_buy,
+            np.where(prev_cci < -50, 8, 0) + np.where(cci - prev_cci > 20, 6, 0),
+            np.where(prev_cci > 50, 8, 0) + np.where(prev_cci - cci > 20, 6, 0),
+        )
+
+        # Signal Type 4: momentum del CCI (las 5 últimas velas con valor)
+        complete = has_prev & (vz.rolling_sum(vz.present(cci).astype(float), 5) == 5)
+        cci_trend = cci - vz.lag(cci, 4)
+        acceleration = (cci - prev_cci) - (prev_cci - vz.lag(cci, 2))
+        momentum_buy = complete & (cci_trend > 40) & (cci > -50) & (acceleration > 5)
+        momentum_sell = complete & ~momentum_buy & (cci_trend < -40) & (cci < 50) & (acceleration < -5)
+
+        # Signal Type 5: overbought / oversold moderado con vela a favor
+        candle = vz.candle(bars)
+        obos_buy = has_prev & (-80 <= cci) & (cci <= -50) & (cci > prev_cci) & candle.is_green
+        obos_sell = has_prev & ~obos_buy & (50 <= cci) & (cci <= 80) & (cci < prev_cci) & candle.is_red
+
+        signals = [extreme_buy, extreme_sell, div_buy, div_sell, zero_buy, zero_sell,
+                   momentum_buy, momentum_sell, obos_buy, obos_sell]
+        direction = np.select([vz.present(cci) & s for s in signals], [vz.BUY, vz.SELL] * 5, vz.NONE)
+        buy, sell = direction == vz.BUY, direction == vz.SELL
+
+        confidence = 30 + np.select(
+            [extreme_buy | extreme_sell, div_buy | div_sell, zero_buy | zero_sell,
+             momentum_buy | momentum_sell, obos_buy | obos_sell],
+            [extreme_bonus, 18, zero_bonus, 12, 10], 0
+        )
+
+        # Bonus 1: nivel extremo del CCI
+        cci_abs = np.abs(cci)
+        confidence = confidence + np.select([cci_abs > 200, cci_abs > 150, cci_abs > 100, cci_abs > 50], [15, 12, 8, 4], 0)
+
+        # Bonus 2: velocidad del CCI
+        speed = np.abs(cci - prev_cci)
+        confidence = confidence + np.where(has_prev, np.select([speed > 30, speed > 20, speed > 10], [10, 6, 3], 0), 0)
+
+        # Bonus 3: price action
+        strong = candle.body_ratio > 0.6
+        confidence = confidence + np.select(
+            [buy & candle.is_green & strong, sell & candle.is_red & strong, candle.body_ratio > 0.4], [8, 8, 4], 0
+        )
+
+        # Bonus 4: volumen
+        volume_ratio = vz.volume_ratio(bars.volume, 10, window=self.required_bars)
+        confidence = confidence + np.select(
+            [volume_ratio > 2.0, volume_ratio > 1.6, volume_ratio > 1.3, volume_ratio > 1.1], [12, 8, 5, 2], 0
+        )
+
+        # Bonus 5: tendencia del precio (10 velas)
+        price_trend = (close - vz.lag(close, 9)) / vz.lag(close, 9)
+        confidence = confidence + np.where((buy & (price_trend > 0.02)) | (sell & (price_trend < -0.02)), 6, 0)
+
+        # Bonus 6: patrones del CCI en las últimas 8 velas
+        confidence = confidence + self._vectorized_pattern_bonus(cci)
+
+        # Bonus 7: contexto (CCI cada 4 velas en las últimas 20)
+        longer = np.column_stack([vz.lag(cci, k) for k in (19, 15, 11, 7, 3)])
+        found = ~np.isnan(longer)
+        rows = np.arange(n)
+        longer_trend = longer[rows, 4 - np.argmax(found[:, ::-1], axis=1)] - longer[rows, np.argmax(found, axis=1)]
+        aligned = (buy & (longer_trend > 20)) | (sell & (longer_trend < -20))
+        confidence = confidence + np.where((found.sum(axis=1) >= 3) & aligned, 5, 0)
+
+        return vz.vector_signals(self, direction, confidence, source="cci_extreme")
+
+    @staticmethod
+    def _vectorized_divergence(close, cci):
+        """_detect_cci_divergence() por vela: (buy, sell). Un índice fuera de rango anula la divergencia, como el except."""
+        n = len(close)
+        div_buy, div_sell = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+        if n < 15:
+            return div_buy, div_sell
+
+        prices = sliding_window_view(close, 15)
+        values = sliding_window_view(cci, 15)
+        complete = ~np.isnan(values).any(axis=1)
+        rows = np.arange(len(prices))
+
+        def first_index(window, extreme):
+            # list.index(extreme(últimas 10)): primera aparición en las 15
+            return np.argmax(window == extreme(window[:, -10:], axis=1)[:, None], axis=1)
+
+        def at(window, index):
+            return window[rows, np.minimum(index + 5, 14)]
+
+        def divergence(extreme, price_beyond, cci_inside):
+            price_idx, cci_idx = first_index(prices, extreme), first_index(values, extreme)
+            differs = price_idx != cci_idx
+            price_ok = differs & (price_idx < 10) & price_beyond(prices[:, -1], at(prices, price_idx))
+            found = price_ok & (cci_idx < 10) & cci_inside(values[:, -1], at(values, cci_idx))
+            failed = (differs & (price_idx >= 10)) | (price_ok & (cci_idx >= 10))
+            return found, failed
+
+        bull, bull_failed = divergence(np.min, np.less, np.greater)
+        bear, _ = divergence(np.max, np.greater, np.less)
+        div_buy[14:] = complete & bull
+        div_sell[14:] = complete & ~bull & ~bull_failed & bear
+        return div_buy, div_sell
+
+    @staticmethod
+    def _vectorized_pattern_bonus(cci):
+        """_calculate_cci_pattern_bonus() por vela sobre los CCI presentes de las últimas 8."""
+        n = len(cci)
+        bonus = np.zeros(n)
+        if n < 8:
+            return bonus
+
+        window = sliding_window_view(cci, 8)
+        count = (~np.isnan(window)).sum(axis=1)
+
+        # Las 8 presentes: v[-3], v[-2], v[-1] son las últimas tres velas
+        full = count == 8
+        c2, c1, c0 = window[:, -3], window[:, -2], window[:, -1]
+        hook = (c2 < c1) & (c1 > c0) & (np.abs(c1) > 80)
+        lows = (window < -80).sum(axis=1) >= 2
+        highs = (window > 80).sum(axis=1) >= 2
+        pattern = np.select([hook, lows & (c0 > c1), highs & (c0 < c1)], [8, 6, 6], 0)
+        bonus[7:] = np.where(full, pattern, 0)
+
+        # 6 o 7 presentes (bordes de huecos): la lista compacta como en score()
+        for i in np.flatnonzero((count >= 6) & (count < 8)):
+            values = window[i][~np.isnan(window[i])]
+            current = cci[i + 7]
+            if values[-3] < values[-2] > values[-1] and abs(values[-2]) > 80:
+                bonus[i + 7] = 8
+            elif (values < -80).sum() >= 2 and current > values[-2]:
+                bonus[i + 7] = 6
+            elif (values > 80).sum() >= 2 and current < values[-2]:
+                bonus[i + 7] = 6
+        return bonus
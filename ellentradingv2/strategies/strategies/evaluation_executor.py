@@ -0,0 +1,249 @@
+# strategies/strategies/evaluation_executor.py
+
+"""
+Evaluación de estrategias en un pool de procesos.
+
+run_entry_strategies evalúa las 15 estrategias de un símbolo en serie dentro de
+un hilo; el scoring es Python puro y queda atado al GIL, así que cuando todos
+los símbolos cierran vela a la vez la evaluación se encola detrás de sí misma.
+
+- El agregador reparte un job por símbolo a un pool de workers (spawn + django.setup()
+  una sola vez por worker). Cada job evalúa todas las estrategias del símbolo para
+  compartir ventanas de velas, vista multi-timeframe y FeatureContext.
+- Los workers quedan tibios: guardan por (símbolo, timeframe) la última ventana de
+  velas y en cada cierre solo releen la cola (REFRESH_TAIL velas, por indicadores
+  revisables como chikou) en vez de la ventana completa.
+- La deduplicación usa un snapshot del índice de señales recientes del proceso
+  principal. Los workers corren EntryStrategy.evaluate() y devuelven decisiones +
+  notas; el proceso principal loguea, persiste, emite y corre el RiskManager
+  (persist_signal), igual que antes. persist_signal está serializado en el proceso
+  y vuelve a chequear el índice de recientes: el snapshot del job puede haber
+  quedado viejo si otro job del mismo símbolo emitió mientras tanto.
+
+El tiempo de un cierre queda cerca del del símbolo más lento en vez de la suma.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+from django.db import connections
+
+# Los imports de modelos / estrategias van dentro de las funciones: un worker
+# (spawn) importa este módulo antes de django.setup().
+
+# Velas finales que se releen en cada refresh (chikou se revisa 26 velas hacia atrás)
+REFRESH_TAIL = 30
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Estado por proceso worker
+_WORKER = {"windows": {}}
+
+
+# ---------- worker ----------
+
+def _init_worker():
+    import django
+    django.setup()
+    # Imports pesados (NumPy / pandas / ta / estrategias) una vez por worker
+    import strategies.base.factory  # noqa: F401
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _bar_window(symbol, timeframe, indicators, limit):
+    """
+    Últimas `limit` velas de (símbolo, timeframe) con las columnas `indicators`.
+    Reusa la ventana cacheada del worker y solo relee las últimas REFRESH_TAIL velas.
+    """
+    from core.models import MarketDataPoint
+    from core.utils.time import from_epoch_ns
+    from strategies.base.bar_window import BarWindow
+
+    key = (symbol.id, timeframe)
+    indicators = tuple(sorted(indicators))
+    queryset = MarketDataPoint.objects.filter(symbol=symbol, timeframe=timeframe)
+    cached = _WORKER["windows"].get(key)
+
+    if cached is not None and cached.indicators == indicators and cached.limit >= limit \
+            and len(cached.window) > REFRESH_TAIL:
+        keep = cached.window[:-REFRESH_TAIL]
+        since = from_epoch_ns(int(keep.time[-1]))
+        fresh = BarWindow.from_queryset(queryset.filter(start_time__gt=since), "start_time", indicators)
+        window = BarWindow.concat([keep, fresh])[-cached.limit:]
+        limit = cached.limit
+    else:
+        window = BarWindow.from_queryset(queryset, "start_time", indicators, limit=limit)
+
+    _WORKER["windows"][key] = SimpleNamespace(window=window, indicators=indicators, limit=limit)
+    return window
+
+
+def _evaluate_symbol(symbol, open_strategies, recent_entries):
+    """
+    Job del pool: evalúa todas las estrategias de un símbolo con evaluate() (sin DB ni logs).
+    Devuelve ([(name, timeframe, StrategyDecision)], notas a loguear, samples del profiler).
+    """
+    from django.db import close_old_connections
+    from monitoring.profiler import measure
+    from signals.recent_index import RecentSignalIndex
+    from strategies.base.decision import notes_to_log
+    from strategies.base.factory import build_entry_strategies
+    from strategies.indicators.multi_timeframe import MultiTimeframeView
+
+    close_old_connections()
+    strategies = build_entry_strategies(open_strategies)
+
+    signal_index = RecentSignalIndex(use_db=False)
+    signal_index.seed(recent_entries)
+    # Sin logs desde el worker: las notas vuelven al proceso principal
+    notes = []
+
+    mtf_view = None
+    if any(s.USES_MULTI_TIMEFRAME for s in strategies.values()):
+        try:
+            mtf_view = MultiTimeframeView.from_market_data(symbol)
+        except Exception as e:
+            notes.append(("WARNING", "strategies", f"⚠️ No se pudo armar la vista multi-timeframe de {symbol.symbol}: {e}"))
+
+    # Una ventana por timeframe con la unión de indicadores y el mayor required_bars
+    needs = {}
+    for strategy in strategies.values():
+        need = needs.setdefault(strategy.timeframe, SimpleNamespace(indicators=set(), limit=0))
+        need.indicators.update(strategy.REQUIRED_INDICATORS)
+        need.limit = max(need.limit, strategy.required_bars)
+    windows = {tf: _bar_window(symbol, tf, need.indicators, need.limit) for tf, need in needs.items()}
+
+    feature_cache = {}
+    results = []
+    samples = []  # el profiler vive en el proceso principal
+    for name, strategy in strategies.items():
+        strategy.mtf_view = mtf_view
+        strategy.feature_cache = feature_cache
+        strategy.signal_index = signal_index
+        try:
+            candles = windows[strategy.timeframe][-strategy.required_bars:]
+            with measure("strategy", strategy=name, symbol=symbol, timeframe=strategy.timeframe, record=False) as sample:
+                samples.append(sample)
+                decision = strategy.evaluate(candles, symbol)
+            if decision and strategy.is_duplicate_signal(symbol, decision.signal_type):
+                decision = None
+            notes.extend(notes_to_log(strategy.last_notes, emitted=decision is not None))
+            if decision:
+                signal_index.record(symbol, strategy.strategy_instance, decision.signal_type)
+                results.append((name, strategy.timeframe or "1m", decision))
+        except Exception as e:
+            notes.append(("ERROR", "strategies", f"❌ Error en estrategia '{name}' para {symbol.symbol}: {e}"))
+            traceback.print_exc()
+    return results, notes, samples
+
+
+# ---------- proceso principal ----------
+
+class StrategyEvaluationExecutor:
+    """
+    executor = StrategyEvaluationExecutor(max_workers=4)
+    executor.start()                       # antes de asyncio.run (levanta y calienta los workers)
+    await executor.run(symbols)            # evalúa en el pool y persiste en el proceso principal
+    executor.shutdown()
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None
+        self._restart_lock = threading.Lock()
+
+    def start(self):
+        # Conexiones cerradas antes de crear procesos (no se comparten sockets de DB)
+        connections.close_all()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        wait([self._pool.submit(_warm_up) for _ in range(self.max_workers)])
+        return self
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def run(self, symbols, verbose: bool = True):
+        """Evalúa los símbolos en paralelo; cada uno se persiste apenas vuelve su job."""
+        from strategies.models import OpenStrategy
+
+        open_strategies = await asyncio.to_thread(lambda: list(OpenStrategy.objects.filter(auto_execute=True)))
+        await asyncio.gather(*(self._run_symbol(symbol, open_strategies, verbose) for symbol in symbols))
+
+    async def _run_symbol(self, symbol, open_strategies, verbose):
+        from monitoring.metrics import pipeline_metrics
+        from monitoring.tracing import tracer
+
+        # Las señales persisten en hilos (to_thread copia el contexto): cuelgan de este span
+        with tracer.span("strategies", symbol, pool=True):
+            await self._evaluate_and_persist(symbol, open_strategies, verbose)
+        pipeline_metrics.mark(symbol, "strategies")
+
+    async def _evaluate_and_persist(self, symbol, open_strategies, verbose):
+        from monitoring.metrics import pipeline_metrics
+        from monitoring.profiler import profiler
+        from monitoring.utils import log_event
+        from signals.recent_index import recent_signals
+        from strategies.strategies.runner import run_entry_strategies
+
+        loop = asyncio.get_running_loop()
+        pipeline_metrics.adjust_queue("strategy_jobs", 1)
+        try:
+            recent_entries = await asyncio.to_thread(recent_signals.snapshot, symbol)
+            results, notes, samples = await loop.run_in_executor(
+                self._pool, _evaluate_symbol, symbol, open_strategies, recent_entries
+            )
+        except Exception as e:
+            # Pool roto (worker muerto) o job fallido: se reinicia el pool y el símbolo va por el camino en hilo
+            await log_event(f"⚠️ Pool de evaluación falló para {symbol.symbol}: {e}. Evaluando en hilo.",
+                            source="strategies", level="WARNING")
+            if isinstance(e, BrokenProcessPool):
+                await asyncio.to_thread(self._restart)
+            await asyncio.to_thread(run_entry_strategies, symbol, verbose)
+            return
+        finally:
+            pipeline_metrics.adjust_queue("strategy_jobs", -1)
+
+        for sample in samples:
+            profiler.record(sample)
+        if results or notes:
+            await asyncio.to_thread(_persist_results, symbol, results, notes, verbose)
+
+    def _restart(self):
+        with self._restart_lock:
+            pool = self._pool
+            if pool is None or not getattr(pool, "_broken", False):
+                return  # otro símbolo ya lo reinició
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.start()
+
+
+def _persist_results(symbol, results, notes, verbose):
+    from asgiref.sync import async_to_sync
+    from django.db import close_old_connections
+    from monitoring.utils import log_event
+    from strategies.base.decision import log_notes
+    from strategies.strategies.runner import persist_signal
+
+    close_old_connections()
+    log_notes(notes)
+    for name, timeframe, decision in results:
+        try:
+            persist_signal(symbol, name, decision.to_signal(symbol), timeframe, verbose=verbose)
+        except Exception as e:
+            async_to_sync(log_event)(f"❌ Error guardando señal de '{name}' para {symbol.symbol}: {e}",
+                      source="strategies", level="ERROR")
+            traceback.print_exc()
@@ -1,22 +1,17 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
-from monitoring.utils import log_event
+from strategies.base.decision import StrategyDecision
 
 
 class IchimokuCloudBreakout(EntryStrategy):
     name = "Ichimoku Cloud Breakout"
+    REQUIRED_INDICATORS = ("ichimoku_tenkan", "ichimoku_kijun", "ichimoku_span_a", "ichimoku_span_b", "ichimoku_chikou")
 
     def __init__(self, strategy_instance=None):
         self.name = "Ichimoku Cloud Breakout"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
-
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -111,40 +106,15 @@ class IchimokuCloudBreakout(EntryStrategy):
 
         # ✅ OPCIONAL: Log del rango alcanzado
         quality_level = self._get_quality_description(confidence)
-        async_to_sync(log_event)(f"📊 Ichimoku Score: {confidence} - {quality_level}",
-                                 source='strategies', level='INFO')
-
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="ichimoku_cloud",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
+        self.note(f"📊 Ichimoku Score: {confidence} - {quality_level}",
+                  source='strategies', level='INFO')
 
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="ichimoku_cloud",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="ichimoku_cloud")
 
         
-        async_to_sync(log_event)(
-            f"✅ ICHIMOKU Signal: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | Cloud: {min(ichimoku_data['span_a'], ichimoku_data['span_b']):.4f}-{max(ichimoku_data['span_a'], ichimoku_data['span_b']):.4f} | Confidence: {confidence}",
+        self.note(
+            f"✅ ICHIMOKU Signal: {signal_type} for {symbol} | Price: {current_price:.4f} | Cloud: {min(ichimoku_data['span_a'], ichimoku_data['span_b']):.4f}-{max(ichimoku_data['span_a'], ichimoku_data['span_b']):.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -268,8 +238,8 @@ class IchimokuCloudBreakout(EntryStrategy):
 
         # ✨ FALLBACK: Si chikou es None, usar análisis de momentum de precio
         if chikou is None:
-            async_to_sync(log_event)(f"Chikou is None, using price momentum analysis instead",
-                                     source='ichimoku', level='DEBUG')
+            self.note(f"Chikou is None, using price momentum analysis instead",
+                      source='ichimoku', level='DEBUG')
 
             # Momentum analysis: current price vs price 26 periods ago
             price_momentum = (current_price - price_26_ago) / price_26_ago
@@ -343,11 +313,11 @@ class IchimokuCloudBreakout(EntryStrategy):
             # ✨ CHIKOU BONUS: Solo si chikou no es None
             if chikou is not None and chikou > current_price:
                 bonus += 10
-                async_to_sync(log_event)(f"Perfect bullish setup with Chikou confirmation",
-                                         source='ichimoku', level='INFO')
+                self.note(f"Perfect bullish setup with Chikou confirmation",
+                          source='ichimoku', level='INFO')
             elif chikou is None:
-                async_to_sync(log_event)(f"Perfect bullish setup (Chikou N/A)",
-                                         source='ichimoku', level='INFO')
+                self.note(f"Perfect bullish setup (Chikou N/A)",
+                          source='ichimoku', level='INFO')
             return SignalType.BUY, bonus
 
         if bearish_perfect:
@@ -355,11 +325,11 @@ class IchimokuCloudBreakout(EntryStrategy):
             # ✨ CHIKOU BONUS: Solo si chikou no es None
             if chikou is not None and chikou < current_price:
                 bonus += 10
-                async_to_sync(log_event)(f"Perfect bearish setup with Chikou confirmation",
-                                         source='ichimoku', level='INFO')
+                self.note(f"Perfect bearish setup with Chikou confirmation",
+                          source='ichimoku', level='INFO')
             elif chikou is None:
-                async_to_sync(log_event)(f"Perfect bearish setup (Chikou N/A)",
-                                         source='ichimoku', level='INFO')
+                self.note(f"Perfect bearish setup (Chikou N/A)",
+                          source='ichimoku', level='INFO')
             return SignalType.SELL, bonus
 
         return None, 0
@@ -411,7 +381,7 @@ class IchimokuCloudBreakout(EntryStrategy):
             return 0
 
         # Simple trend analysis
-        price_trend = (bars[-1].close - bars[-10].close) / bars[-10].close
+        price_trend = self.features(bars).trend(10)
         tenkan_trend = (ichimoku_data['tenkan'] - ichimoku_data['prev_tenkan']) / ichimoku_data['prev_tenkan'] if \
         ichimoku_data['prev_tenkan'] else 0
 
@@ -426,22 +396,10 @@ class IchimokuCloudBreakout(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.8:
                 return 12
             elif volume_ratio > 1.4:
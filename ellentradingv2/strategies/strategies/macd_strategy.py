@@ -1,20 +1,20 @@
-from signals.signal import Signal
+import numpy as np
+
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class MACDCrossoverStrategy(EntryStrategy):
     name = "MACD Crossover Strategy"
+    REQUIRED_INDICATORS = ("macd", "macd_signal", "macd_hist", "sma_20")
 
     def __init__(self, strategy_instance=None):
         self.name = "MACD Crossover Strategy"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -114,22 +114,12 @@ class MACDCrossoverStrategy(EntryStrategy):
 
         # Bonus 4: Volume confirmation
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if current_volume and len(bars) >= 10:
-                volumes = []
-                for bar in bars[-10:]:
-                    vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                    if vol:
-                        volumes.append(vol)
-
-                if volumes:
-                    avg_volume = sum(volumes) / len(volumes)
-                    volume_ratio = current_volume / avg_volume
-
-                    if volume_ratio > 1.5:
-                        confidence += 12  # High volume confirmation
-                    elif volume_ratio > 1.2:
-                        confidence += 8  # Moderate volume
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is not None:
+                if volume_ratio > 1.5:
+                    confidence += 12  # High volume confirmation
+                elif volume_ratio > 1.2:
+                    confidence += 8  # Moderate volume
         except:
             pass
 
@@ -183,37 +173,11 @@ class MACDCrossoverStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="macd_cross",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="macd_cross",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="macd_cross")
 
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ MACD Signal: {signal_type} for {symbol_obj.symbol} | MACD: {curr_macd:.4f} vs Signal: {curr_signal:.4f} | Hist: {curr_hist:.4f} | Confidence: {confidence}",
+        self.note(
+            f"✅ MACD Signal: {signal_type} for {symbol} | MACD: {curr_macd:.4f} vs Signal: {curr_signal:.4f} | Hist: {curr_hist:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -316,4 +280,106 @@ class MACDCrossoverStrategy(EntryStrategy):
         except:
             pass
 
-        return None, 0
\ No newline at end of file
+        return None, 0
+
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (ver strategies/base/vectorized.py)."""
+        window = self.required_bars
+        close = bars.close
+        macd = vz.column(bars, "macd")
+        signal = vz.column(bars, "macd_signal")
+        hist = vz.column(bars, "macd_hist")
+        prev_macd, prev_signal, prev_hist = vz.lag(macd), vz.lag(signal), vz.lag(hist)
+        valid = vz.present(macd) & vz.present(signal) & vz.present(hist)
+        has_prev_lines = vz.truthy(prev_macd) & vz.truthy(prev_signal)
+
+        # Signal Type 1: cruce MACD / señal
+        near_zero = np.where(np.abs(macd) < 0.2, 8, 0)
+        cross_buy = has_prev_lines & (prev_macd <= prev_signal) & (macd > signal)
+        cross_sell = has_prev_lines & ~cross_buy & (prev_macd >= prev_signal) & (macd < signal)
+        cross_bonus = 15 + near_zero + np.where(
+            cross_buy, np.where(hist > prev_hist, 5, 0), np.where(hist < prev_hist, 5, 0)
+        )
+
+        # Signal Type 2: cruce de la línea cero
+        zero_buy = vz.truthy(prev_macd) & (prev_macd <= 0) & (macd > 0)
+        zero_sell = vz.truthy(prev_macd) & ~zero_buy & (prev_macd >= 0) & (macd < 0)
+        zero_bonus = 12 + np.where(zero_buy, np.where(hist > 0, 8, 0), np.where(hist < 0, 8, 0))
+
+        # Signal Type 3: momentum del histograma (3 de las últimas 4 velas, sin None)
+        hist_buy = hist_sell = np.zeros(len(bars), dtype=bool)
+        if window >= 5:
+            third = np.where(vz.present(vz.lag(hist, 2)), vz.lag(hist, 2), vz.lag(hist, 3))
+            hist_trend = hist - third
+            enough = vz.truthy(prev_hist) & vz.present(third)
+            hist_buy = enough & (hist_trend > 0.1) & (hist > prev_hist)
+            hist_sell = enough & ~hist_buy & (hist_trend < -0.1) & (hist < prev_hist)
+
+        # Signal Type 4: divergencia MACD / precio en las últimas 10 velas
+        div_buy = div_sell = np.zeros(len(bars), dtype=bool)
+        if window >= 10:
+            macd_ok = vz.rolling_sum(vz.present(macd).astype(float), 10) == 10
+            prior_close, prior_macd = vz.lag(close), vz.lag(macd)
+            div_sell = macd_ok & (close > vz.rolling_max(prior_close, 9)) & (macd < vz.rolling_max(prior_macd, 9))
+            div_buy = macd_ok & ~div_sell & (close < vz.rolling_min(prior_close, 9)) & (
+                macd > vz.rolling_min(prior_macd, 9)
+            )
+
+        signals = [cross_buy, cross_sell, zero_buy, zero_sell, hist_buy, hist_sell, div_buy, div_sell]
+        directions = [vz.BUY, vz.SELL] * 4
+        direction = np.select([valid & s for s in signals], directions, vz.NONE)
+        buy, sell = direction == vz.BUY, direction == vz.SELL
+
+        confidence = 65 + np.select(
+            [cross_buy | cross_sell, zero_buy | zero_sell, hist_buy | hist_sell, div_buy | div_sell],
+            [cross_bonus, zero_bonus, 10, 8], 0
+        )
+
+        # Bonus 1: MACD respecto de cero
+        confidence = confidence + np.select(
+            [(macd > 0) & buy, (macd < 0) & sell, np.abs(macd) < 0.5], [8, 8, 5], 0
+        )
+
+        # Bonus 2: momentum del histograma
+        hist_momentum = hist - prev_hist
+        hist_strength = np.abs(hist_momentum)
+        momentum_bonus = np.select([hist_strength > 0.3, hist_strength > 0.15, hist_strength > 0.05], [15, 10, 5], 0)
+        momentum_bonus = momentum_bonus + np.where((buy & (hist_momentum > 0)) | (sell & (hist_momentum < 0)), 8, 0)
+        confidence = confidence + np.where(vz.truthy(prev_hist), momentum_bonus, 0)
+
+        # Bonus 3: velocidad del cruce
+        crossover_speed = np.abs(macd - signal) - np.abs(prev_macd - prev_signal)
+        confidence = confidence + np.where(
+            has_prev_lines, np.select([crossover_speed > 0.1, crossover_speed > 0.05], [12, 8], 0), 0
+        )
+
+        # Bonus 4: volumen
+        volume_ratio = vz.volume_ratio(bars.volume, 10, window=window)
+        confidence = confidence + np.select([volume_ratio > 1.5, volume_ratio > 1.2], [12, 8], 0)
+
+        # Bonus 5: momentum del precio (3 velas)
+        if window >= 3:
+            price_momentum = (close - vz.lag(close, 2)) / vz.lag(close, 2)
+            confidence = confidence + np.where(
+                (buy & (price_momentum > 0.01)) | (sell & (price_momentum < -0.01)), 10, 0
+            )
+
+        # Bonus 6: precio del lado de la SMA20
+        sma_20 = vz.column(bars, "sma_20")
+        trend_ok = vz.truthy(sma_20) & ((buy & (close > sma_20)) | (sell & (close < sma_20)))
+        confidence = confidence + np.where(trend_ok, 10, 0)
+
+        # Bonus 7: tendencia del MACD en 10 velas
+        if window >= 10:
+            older_macd = vz.lag(macd, 9)
+            macd_trend = macd - older_macd
+            confidence = confidence + np.where(
+                vz.truthy(older_macd) & ((buy & (macd_trend > 0)) | (sell & (macd_trend < 0))), 8, 0
+            )
+
+        # Bonus 8: vela a favor
+        candle = vz.candle(bars)
+        strong = candle.body_ratio > 0.6
+        confidence = confidence + np.where((buy & candle.is_green & strong) | (sell & candle.is_red & strong), 8, 0)
+
+        return vz.vector_signals(self, direction, confidence, source="macd_cross")
@@ -1,13 +1,14 @@
-from signals.signal import Signal
+import numpy as np
+
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class MovingAverageCrossStrategy(EntryStrategy):
     name = "Moving Average Cross Strategy"
+    REQUIRED_INDICATORS = ("sma_10", "sma_20", "sma_50", "sma_200", "ema_10", "ema_20", "ema_50")
 
     def __init__(self, strategy_instance=None, short_period=10, long_period=30):
         self.name = "Moving Average Cross Strategy"
@@ -15,9 +16,7 @@ class MovingAverageCrossStrategy(EntryStrategy):
         self.long_period = long_period
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
-
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.long_period + 5:  # Extra bars for trend analysis
             return None
 
@@ -106,40 +105,111 @@ class MovingAverageCrossStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="ma_cross",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="ma_cross",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
-
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ MA CROSS Signal: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} | MA10: {ma_values.get('sma_10', 'N/A')} | MA30: {ma_values.get('sma_30', 'N/A')} | Confidence: {confidence}",
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="ma_cross")
+
+        self.note(
+            f"✅ MA CROSS Signal: {signal_type} for {symbol} | Price: {current_price:.4f} | MA10: {ma_values.get('sma_10', 'N/A')} | MA30: {ma_values.get('sma_30', 'N/A')} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (ver strategies/base/vectorized.py)."""
+        n = len(bars)
+        if self.required_bars < self.long_period + 5:
+            # score() descarta las ventanas más cortas
+            return vz.vector_signals(self, np.zeros(n), np.zeros(n), source="ma_cross")
+
+        close = bars.close
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # _get_ma_values: indicador si existe, si no la media calculada
+            calc_short = vz.rolling_sum(close, self.short_period) / self.short_period
+            calc_long = vz.rolling_sum(close, self.long_period) / self.long_period
+            sma_10_column = vz.column(bars, "sma_10")
+            sma_30_column = vz.column(bars, "sma_30")
+            sma_10 = vz.or_else(sma_10_column, calc_short)
+            sma_30 = vz.or_else(sma_30_column, calc_long)
+            prev_sma_10 = vz.or_else(vz.lag(sma_10_column), vz.lag(calc_short))
+            prev_sma_30 = vz.or_else(vz.lag(sma_30_column), vz.lag(calc_long))
+            sma_20 = vz.column(bars, "sma_20")
+            sma_50 = vz.column(bars, "sma_50")
+            sma_200 = vz.column(bars, "sma_200")
+            prev_sma_50 = vz.lag(sma_50)
+            prev_sma_200 = vz.lag(sma_200)
+
+            # Señal 1: cruce clásico
+            classic_ok = vz.truthy(sma_10) & vz.truthy(sma_30) & vz.truthy(prev_sma_10) & vz.truthy(prev_sma_30)
+            classic_buy = classic_ok & (prev_sma_10 <= prev_sma_30) & (sma_10 > sma_30)
+            classic_sell = classic_ok & (prev_sma_10 >= prev_sma_30) & (sma_10 < sma_30)
+            beyond = (classic_buy & (close > np.maximum(sma_10, sma_30))) \
+                | (classic_sell & (close < np.minimum(sma_10, sma_30)))
+            classic_bonus = 15 + np.where(beyond, 8, 0)
+
+            # Señal 2: golden / death cross
+            golden_ok = vz.truthy(sma_50) & vz.truthy(sma_200) & vz.truthy(prev_sma_50) & vz.truthy(prev_sma_200)
+            golden_buy = golden_ok & (prev_sma_50 <= prev_sma_200) & (sma_50 > sma_200)
+            golden_sell = golden_ok & (prev_sma_50 >= prev_sma_200) & (sma_50 < sma_200)
+
+            # Señal 3: alineación 10 / 20 / 50
+            aligned_ok = vz.present(sma_10) & vz.present(sma_20) & vz.present(sma_50)
+            aligned_buy = aligned_ok & (sma_10 > sma_20) & (sma_20 > sma_50) & (close > sma_10)
+            aligned_sell = aligned_ok & (sma_10 < sma_20) & (sma_20 < sma_50) & (close < sma_10)
+
+            # Señal 4: rebote en SMA20 y después SMA50
+            close_2, close_1 = vz.lag(close, 2), vz.lag(close)
+            bounces = []
+            for ma in (sma_20, sma_50):
+                ok = vz.truthy(ma)
+                bounces += [
+                    ok & (close_2 > ma) & (close_1 <= ma) & (close > ma),
+                    ok & (close_2 < ma) & (close_1 >= ma) & (close < ma),
+                ]
+
+            # Misma prioridad que score(): golden > clásico > alineación > rebote
+            conditions = [golden_buy, golden_sell, classic_buy, classic_sell, aligned_buy, aligned_sell, *bounces]
+            direction = np.select(conditions, [vz.BUY, vz.SELL] * 5, vz.NONE)
+            buy, sell = direction == vz.BUY, direction == vz.SELL
+            confidence = 40 + np.select(conditions, [25, 25, classic_bonus, classic_bonus, 20, 20, 12, 12, 12, 12], 0)
+
+            # Bonus 1 (pendiente de SMA20) no suma: ma_values no trae prev_sma_20
+
+            # Bonus 2: separación entre medias
+            separation = np.abs(sma_10 - sma_30) / sma_30
+            separation_bonus = np.select([separation > 0.05, separation > 0.02, separation > 0.01], [12, 8, 4], 0)
+            confidence += np.where(vz.truthy(sma_10) & vz.truthy(sma_30), separation_bonus, 0)
+
+            # Bonus 3: volumen
+            volume_ratio = vz.volume_ratio(bars.volume, 10, window=self.required_bars)
+            confidence += np.select([volume_ratio > 1.8, volume_ratio > 1.4, volume_ratio > 1.1], [15, 10, 5], 0)
+
+            # Bonus 4: momentum contra bars[-5], solo a favor de la señal
+            close_4 = vz.lag(close, 4)
+            momentum = (close - close_4) / close_4
+            strength = np.abs(momentum)
+            momentum_bonus = np.select([strength > 0.03, strength > 0.015, strength > 0.01], [12, 8, 4], 0)
+            confidence += np.where((buy & (momentum > 0)) | (sell & (momentum < 0)), momentum_bonus, 0)
+
+            # Bonus 5: contexto 50 vs 200
+            context_ok = vz.truthy(sma_50) & vz.truthy(sma_200)
+            confidence += np.where(context_ok & ((buy & (sma_50 > sma_200)) | (sell & (sma_50 < sma_200))), 8, 0)
+
+            # Bonus 6: vela fuerte a favor
+            candle = vz.candle(bars)
+            strong = (candle.body_ratio > 0.6) & ((buy & candle.is_green) | (sell & candle.is_red))
+            confidence += np.where(strong, 8, 0)
+
+            # Bonus 7: volatilidad de las últimas 20 velas
+            volatility = (vz.rolling_max(bars.high, 20) - vz.rolling_min(bars.low, 20)) / vz.rolling_sum(close, 20) * 20
+            confidence += np.select([volatility > 0.15, volatility > 0.08], [8, 5], 0)
+
+            # Bonus 8: convergencia contra bars[-10] (solo con columnas de indicador)
+            old_10, old_30 = vz.lag(sma_10_column, 9), vz.lag(sma_30_column, 9)
+            converging = vz.truthy(sma_10) & vz.truthy(sma_30) & vz.truthy(old_10) & vz.truthy(old_30) \
+                & (np.abs(old_10 - old_30) > np.abs(sma_10 - sma_30) * 1.5)
+            confidence += np.where(converging, 8, 0)
+
+        return vz.vector_signals(self, direction, confidence, source="ma_cross")
+
     def _get_ma_values(self, bars, current_bar, prev_bar):
         """Obtiene valores de múltiples MAs"""
         try:
@@ -317,22 +387,10 @@ class MovingAverageCrossStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
-                return 0
-
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.8:
                 return 15
             elif volume_ratio > 1.4:
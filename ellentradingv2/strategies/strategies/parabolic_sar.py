@@ -1,20 +1,17 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class ParabolicSARStrategy(EntryStrategy):
     name = "Parabolic SAR Trend Strategy"
+    REQUIRED_INDICATORS = ("parabolic_sar", "adx", "sma_20", "sma_50")
 
     def __init__(self, strategy_instance=None):
         self.name = "Parabolic SAR Trend Strategy"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -94,24 +91,14 @@ class ParabolicSARStrategy(EntryStrategy):
 
         # Bonus 4: Volume confirmation
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if current_volume and len(bars) >= 10:
-                volumes = []
-                for bar in bars[-10:]:
-                    vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                    if vol:
-                        volumes.append(vol)
-
-                if volumes:
-                    avg_volume = sum(volumes) / len(volumes)
-                    volume_ratio = current_volume / avg_volume
-
-                    if volume_ratio > 1.8:
-                        confidence += 15  # Volume muy alto
-                    elif volume_ratio > 1.4:
-                        confidence += 10  # Volume alto
-                    elif volume_ratio > 1.1:
-                        confidence += 5  # Volume moderado
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is not None:
+                if volume_ratio > 1.8:
+                    confidence += 15  # Volume muy alto
+                elif volume_ratio > 1.4:
+                    confidence += 10  # Volume alto
+                elif volume_ratio > 1.1:
+                    confidence += 5  # Volume moderado
         except:
             pass
 
@@ -171,37 +158,11 @@ class ParabolicSARStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="parabolic_sar",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="parabolic_sar",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
-
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ PARABOLIC SAR: {signal_type} for {symbol_obj.symbol} | Price: {current_price:.4f} vs SAR: {current_sar:.4f} | Confidence: {confidence}",
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="parabolic_sar")
+
+        self.note(
+            f"✅ PARABOLIC SAR: {signal_type} for {symbol} | Price: {current_price:.4f} vs SAR: {current_sar:.4f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -1,13 +1,14 @@
-from signals.signal import Signal
+import numpy as np
+
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
+from strategies.base import vectorized as vz
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class RSIBreakoutStrategy(EntryStrategy):
     name = "RSI Breakout Strategy"
+    REQUIRED_INDICATORS = ("rsi_14", "sma_20")
 
     RSI_OVERSOLD = 30
     RSI_OVERBOUGHT = 70
@@ -17,8 +18,7 @@ class RSIBreakoutStrategy(EntryStrategy):
         self.name = "RSI Breakout Strategy"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -55,23 +55,12 @@ class RSIBreakoutStrategy(EntryStrategy):
 
         # Bonus 2: Confirmación de volumen
         try:
-            current_volume = getattr(bars[-1], 'volume', None) or self.get_indicator_value(bars[-1], "volume")
-            if current_volume and len(bars) >= 10:
-                # Calcular volumen promedio de últimas 10 velas
-                volumes = []
-                for bar in bars[-10:]:
-                    vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                    if vol:
-                        volumes.append(vol)
-
-                if volumes:
-                    avg_volume = sum(volumes) / len(volumes)
-                    volume_ratio = current_volume / avg_volume
-
-                    if volume_ratio > 1.5:
-                        confidence += 15  # Volumen muy alto
-                    elif volume_ratio > 1.2:
-                        confidence += 10  # Volumen alto
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is not None:
+                if volume_ratio > 1.5:
+                    confidence += 15  # Volumen muy alto
+                elif volume_ratio > 1.2:
+                    confidence += 10  # Volumen alto
         except:
             pass  # Si no hay datos de volumen, continuar sin bonus
 
@@ -130,36 +119,56 @@ class RSIBreakoutStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="rsi_breakout",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=bars[-1].close,
-            confidence_score=confidence,
-            source="rsi_breakout",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(bars[-1], "timestamp", getattr(bars[-1], "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=bars[-1].close, bar=bars[-1], source="rsi_breakout")
 
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ RSI Signal: {signal_type} for {symbol_obj.symbol} | RSI: {rsi_curr:.1f} | Confidence: {confidence}",
+        self.note(
+            f"✅ RSI Signal: {signal_type} for {symbol} | RSI: {rsi_curr:.1f} | Confidence: {confidence}",
             source='strategies', level='INFO')
-        return s
\ No newline at end of file
+        return s
+
+    def generate_signals_vectorized(self, bars):
+        """score() sobre toda la historia con columnas NumPy (ver strategies/base/vectorized.py)."""
+        close = bars.close
+        rsi_curr = vz.column(bars, "rsi_14")
+        rsi_prev = vz.lag(rsi_curr)
+        no_prev = np.isnan(rsi_prev)
+
+        buy = (rsi_curr < self.RSI_OVERSOLD) & (no_prev | (rsi_curr > rsi_prev))
+        sell = ~buy & (rsi_curr > self.RSI_OVERBOUGHT) & (no_prev | (rsi_curr < rsi_prev))
+        direction = np.select([buy, sell], [vz.BUY, vz.SELL], vz.NONE)
+
+        # Mismo orden de sumas que score() (la confianza es float hasta el int() final)
+        confidence = 40 + np.where(
+            buy,
+            (self.RSI_OVERSOLD - rsi_curr) * self.RSI_REBOUND_MARGIN,
+            (rsi_curr - self.RSI_OVERBOUGHT) * self.RSI_REBOUND_MARGIN,
+        )
+
+        # Bonus 1: RSI extremo
+        confidence = confidence + np.where((rsi_curr < 25) | (rsi_curr > 75), 15, 0)
+
+        # Bonus 2: volumen
+        volume_ratio = vz.volume_ratio(bars.volume, 10, window=self.required_bars)
+        confidence = confidence + np.select([volume_ratio > 1.5, volume_ratio > 1.2], [15, 10], 0)
+
+        # Bonus 3: vela a favor (+8) con cuerpo dominante (+5)
+        candle = vz.candle(bars)
+        colored = (candle.range > 0) & ((buy & candle.is_green) | (sell & candle.is_red))
+        confidence = confidence + np.where(colored, 8, 0)
+        confidence = confidence + np.where(colored & (candle.body_ratio > 0.6), 5, 0)
+
+        # Bonus 4: precio del lado de la SMA20
+        sma_20 = vz.column(bars, "sma_20")
+        trend_ok = vz.truthy(sma_20) & ((buy & (close > sma_20)) | (sell & (close < sma_20)))
+        confidence = confidence + np.where(trend_ok, 12, 0)
+
+        # Bonus 5: momentum del RSI
+        confidence = confidence + np.where(vz.truthy(rsi_prev) & (np.abs(rsi_curr - rsi_prev) > 5), 8, 0)
+
+        # Bonus 6: intensidad oversold / overbought
+        confidence = confidence + np.where(
+            buy, np.trunc((30 - rsi_curr) / 30 * 10), np.trunc((rsi_curr - 70) / 30 * 10)
+        )
+
+        return vz.vector_signals(self, direction, confidence, source="rsi_breakout")
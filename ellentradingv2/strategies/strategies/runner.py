@@ -4,10 +4,61 @@ from strategies.models import OpenStrategy
 from django.utils.timezone import now
 from streaming.websocket.helpers import emit_signal
 from risk.risk_manager import RiskManager
+import threading
 import traceback
+from datetime import timedelta
 from django.db import close_old_connections
 from monitoring.utils import log_event
 from asgiref.sync import async_to_sync
+from strategies.indicators.multi_timeframe import MultiTimeframeView
+from signals.recent_index import recent_signals
+from monitoring.profiler import measure
+from monitoring.metrics import pipeline_metrics
+from monitoring.tracing import tracer
+from core.utils.time import TIMEFRAME_MINUTES
+
+# Serializa dedupe + guardado + RiskManager entre hilos del proceso: balance, posiciones
+# y límites del RiskManager son read-modify-write sin lock en la DB
+_persist_lock = threading.Lock()
+
+def persist_signal(symbol: Symbol, name: str, signal, strategy_timeframe: str, verbose: bool = True):
+    """
+    Guarda una señal generada, la registra en el índice de recientes, la emite
+    por websocket y corre el RiskManager del símbolo. Siempre en el proceso
+    principal (también para las señales que vienen del pool de evaluación).
+
+    Corre bajo _persist_lock y vuelve a chequear el índice de recientes: dos
+    evaluaciones concurrentes del mismo símbolo (cierres de timeframes que
+    coinciden, snapshots del pool) no emiten ni operan dos veces la misma
+    (estrategia, dirección). El índice es del proceso, así que también se
+    confirma contra la DB lo que guardó el otro proceso (start_stream /
+    startaggregator). Devuelve False si la señal quedó descartada.
+    """
+    window = timedelta(minutes=TIMEFRAME_MINUTES.get(strategy_timeframe, 60))
+    key = (signal.symbol_id, signal.strategy_id, signal.signal, window)
+    with _persist_lock:
+        if recent_signals.is_recent(*key) or recent_signals.is_recent_in_db(*key):
+            return False
+
+        pipeline_metrics.mark(symbol, "strategies")
+        with tracer.span("signal", symbol, strategy=name, timeframe=strategy_timeframe) as span:
+            signal.received_at = now()
+            signal.save()
+            if span is not None:
+                span.signal_id = signal.id
+                span.attributes.update(signal=signal.signal, confidence=signal.confidence_score)
+            recent_signals.record_signal(signal)
+            emit_signal(signal)
+
+            if verbose:
+                async_to_sync(log_event)(f"✅ [{name}] Señal generada para {symbol.symbol} en {strategy_timeframe}: {signal.signal} | Score: {signal.confidence_score}",
+                          source="strategies", level="INFO")
+
+            with measure("risk", symbol=symbol, timeframe=strategy_timeframe), tracer.span("risk", symbol):
+                rm = RiskManager(symbol.symbol, execution_mode="simulated")
+                rm.analyze_and_execute(price=signal.price)
+        pipeline_metrics.mark(symbol, "risk")
+    return True
 
 def run_entry_strategies(symbol: Symbol, verbose: bool = True):
     """
@@ -15,36 +66,47 @@ def run_entry_strategies(symbol: Symbol, verbose: bool = True):
     Usa el timeframe definido por cada estrategia.
     """
     close_old_connections()
-    for name, strategy in build_entry_strategies().items():
+    strategies = build_entry_strategies()
 
+    # Una sola query de velas 1m por símbolo; los timeframes superiores se derivan en memoria
+    mtf_view = None
+    if any(s.USES_MULTI_TIMEFRAME for s in strategies.values()):
         try:
-            # Asegurarse de que strategy_instance está seteado
-            if not strategy.strategy_instance:
-                strategy.strategy_instance = OpenStrategy.objects.filter(name=name).first()
+            mtf_view = MultiTimeframeView.from_market_data(symbol)
+        except Exception as e:
+            async_to_sync(log_event)(f"⚠️ No se pudo armar la vista multi-timeframe de {symbol.symbol}: {e}",
+                      source="strategies", level="WARNING")
 
-            if not strategy.strategy_instance:
-                async_to_sync(log_event)(f"❌ Estrategia '{name}' no está registrada en la base de datos",
-                    source="strategies", level="ERROR")
-                continue
+    # Features de la vela (volumen, rangos, pivots, tendencia...) calculados una vez para todas
+    feature_cache = {}
 
-            strategy_timeframe = strategy.strategy_instance.timeframe or "1m"
+    with tracer.span("strategies", symbol, strategies=len(strategies)):
+        for name, strategy in strategies.items():
+            strategy.mtf_view = mtf_view
+            strategy.feature_cache = feature_cache
 
-            signal = strategy.should_generate_signal(symbol, execution_mode="simulated")
+            try:
+                # Asegurarse de que strategy_instance está seteado
+                if not strategy.strategy_instance:
+                    strategy.strategy_instance = OpenStrategy.objects.filter(name=name).first()
 
-            if signal:
-                signal.received_at = now()
-                signal.save()
-                emit_signal(signal)
+                if not strategy.strategy_instance:
+                    async_to_sync(log_event)(f"❌ Estrategia '{name}' no está registrada en la base de datos",
+                        source="strategies", level="ERROR")
+                    continue
 
-                if verbose:
-                    async_to_sync(log_event)(f"✅ [{name}] Señal generada para {symbol.symbol} en {strategy_timeframe}: {signal.signal} | Score: {signal.confidence_score}",
-                              source="strategies", level="INFO")
+                strategy_timeframe = strategy.strategy_instance.timeframe or "1m"
 
-                rm = RiskManager(symbol.symbol, execution_mode="simulated")
-                rm.analyze_and_execute(price=signal.price)
+                with measure("strategy", strategy=name, symbol=symbol, timeframe=strategy_timeframe):
+                    signal = strategy.should_generate_signal(symbol, execution_mode="simulated")
 
+                if signal:
+                    persist_signal(symbol, name, signal, strategy_timeframe, verbose=verbose)
 
-        except Exception as e:
-            async_to_sync(log_event)(f"❌ Error en estrategia '{name}' para {symbol.symbol}: {e}",
-                      source="strategies", level="ERROR")
-            traceback.print_exc()
+
+            except Exception as e:
+                async_to_sync(log_event)(f"❌ Error en estrategia '{name}' para {symbol.symbol}: {e}",
+                          source="strategies", level="ERROR")
+                traceback.print_exc()
+
+    pipeline_metrics.mark(symbol, "strategies")
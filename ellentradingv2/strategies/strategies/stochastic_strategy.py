@@ -1,13 +1,12 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class StochasticOscillatorStrategy(EntryStrategy):
     name = "Stochastic Oscillator Strategy"
+    REQUIRED_INDICATORS = ("stochastic_k", "stochastic_d")
+    USES_MULTI_TIMEFRAME = True
 
     # ✨ THRESHOLDS MÁS DINÁMICOS
     EXTREME_OVERBOUGHT = 85  # Era 80 (más estricto)
@@ -24,8 +23,7 @@ class StochasticOscillatorStrategy(EntryStrategy):
         self.name = "Stochastic Oscillator Strategy"
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        bars = candles or self.get_candles(symbol, execution_mode)
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.required_bars:
             return None
 
@@ -105,7 +103,7 @@ class StochasticOscillatorStrategy(EntryStrategy):
         confidence += volume_bonus
 
         # Bonus 4: Price action confirmation
-        price_action_bonus = self._calculate_price_action_bonus(current_bar, signal_type)
+        price_action_bonus = self._calculate_price_action_bonus(bars, signal_type)
         confidence += price_action_bonus
 
         # Bonus 5: Trend alignment
@@ -131,37 +129,11 @@ class StochasticOscillatorStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        symbol_obj = symbol if isinstance(symbol, Symbol) else Symbol.objects.get(symbol=symbol)
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 0
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source=self.SOURCE,
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_bar.close,
-            confidence_score=confidence,
-            source=self.SOURCE,
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
+        s = self.decision(signal_type, confidence, price=current_bar.close, bar=current_bar, source=self.SOURCE)
 
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"📈 STOCHASTIC MASTER: {signal_type} for {symbol_obj.symbol} | %K: {k_current:.1f} | %D: {d_current:.1f} | Confidence: {confidence}",
+        self.note(
+            f"📈 STOCHASTIC MASTER: {signal_type} for {symbol} | %K: {k_current:.1f} | %D: {d_current:.1f} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -441,22 +413,10 @@ class StochasticOscillatorStrategy(EntryStrategy):
     def _calculate_volume_bonus(self, bars, current_bar):
         """Calcula bonus basado en volumen"""
         try:
-            current_volume = getattr(current_bar, 'volume', None) or self.get_indicator_value(current_bar, "volume")
-            if not current_volume or len(bars) < 10:
-                return 0
-
-            volumes = []
-            for bar in bars[-10:]:
-                vol = getattr(bar, 'volume', None) or self.get_indicator_value(bar, "volume")
-                if vol:
-                    volumes.append(vol)
-
-            if not volumes:
+            volume_ratio = self.features(bars).volume_ratio(10)
+            if volume_ratio is None:
                 return 0
 
-            avg_volume = sum(volumes) / len(volumes)
-            volume_ratio = current_volume / avg_volume
-
             if volume_ratio > 1.8:
                 return 10
             elif volume_ratio > 1.4:
@@ -468,17 +428,15 @@ class StochasticOscillatorStrategy(EntryStrategy):
         except:
             return 0
 
-    def _calculate_price_action_bonus(self, current_bar, signal_type):
+    def _calculate_price_action_bonus(self, bars, signal_type):
         """Calcula bonus basado en price action"""
-        candle_body = abs(current_bar.close - current_bar.open)
-        candle_range = current_bar.high - current_bar.low
-        body_ratio = candle_body / candle_range if candle_range > 0 else 0
+        candle = self.features(bars).candle
 
-        if signal_type == SignalType.BUY and current_bar.close > current_bar.open and body_ratio > 0.6:
+        if signal_type == SignalType.BUY and candle.is_green and candle.body_ratio > 0.6:
             return 8  # Strong green candle
-        elif signal_type == SignalType.SELL and current_bar.close < current_bar.open and body_ratio > 0.6:
+        elif signal_type == SignalType.SELL and candle.is_red and candle.body_ratio > 0.6:
             return 8  # Strong red candle
-        elif body_ratio > 0.4:
+        elif candle.body_ratio > 0.4:
             return 4  # Moderate candle
         else:
             return 0
@@ -489,8 +447,8 @@ class StochasticOscillatorStrategy(EntryStrategy):
             return 0
 
         # Simple trend analysis
-        short_trend = (bars[-1].close - bars[-5].close) / bars[-5].close
-        medium_trend = (bars[-1].close - bars[-20].close) / bars[-20].close
+        short_trend = self.features(bars).trend(5)
+        medium_trend = self.features(bars).trend(20)
 
         if signal_type == SignalType.BUY and medium_trend > 0.02:
             return 8  # Bullish trend alignment
@@ -500,12 +458,14 @@ class StochasticOscillatorStrategy(EntryStrategy):
             return 0
 
     def _calculate_multi_timeframe_bonus(self, bars, signal_type):
-        """Calcula bonus por contexto multi-timeframe simulado"""
-        if len(bars) < 20:
-            return 0
+        """Calcula bonus por contexto multi-timeframe (real si hay mtf_view, si no simulado)"""
+        htf_bars = self.higher_timeframe_bars(bars, count=max(5, len(bars) // 4))
 
-        # Simulate higher timeframe by sampling every 4th bar
-        htf_bars = bars[::4]
+        if htf_bars is None:
+            if len(bars) < 20:
+                return 0
+            # Simulate higher timeframe by sampling every 4th bar
+            htf_bars = bars[::4]
 
         if len(htf_bars) < 5:
             return 0
@@ -557,11 +517,9 @@ class StochasticOscillatorStrategy(EntryStrategy):
             return 0
 
         # Simple S/R analysis
-        recent_highs = [bar.high for bar in bars[-20:]]
-        recent_lows = [bar.low for bar in bars[-20:]]
-
-        resistance_level = max(recent_highs)
-        support_level = min(recent_lows)
+        features = self.features(bars)
+        resistance_level = features.range_high(20)
+        support_level = features.range_low(20)
 
         # Bonus if near key levels
         resistance_distance = abs(current_price - resistance_level) / current_price
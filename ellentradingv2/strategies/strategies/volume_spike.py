@@ -1,13 +1,11 @@
-from signals.signal import Signal
 from core.models.enums import SignalType
-from core.models.symbol import Symbol
 from strategies.base.base_entry import EntryStrategy
-from django.utils.timezone import now, timedelta
-from asgiref.sync import async_to_sync
+from strategies.base.decision import StrategyDecision
 
 
 class VolumeSpikeStrategy(EntryStrategy):
     name = "Volume Spike Breakout Strategy"
+    REQUIRED_INDICATORS = ("rsi_14", "sma_20")
 
     def __init__(self, strategy_instance=None, volume_window=20, volume_multiplier=1.3, rsi_period=14):
         self.volume_window = volume_window
@@ -15,10 +13,7 @@ class VolumeSpikeStrategy(EntryStrategy):
         self.rsi_period = rsi_period
         super().__init__(strategy_instance)
 
-    def should_generate_signal(self, symbol: Symbol, execution_mode="simulated", candles=None) -> Signal | None:
-        symbol_obj = Symbol.objects.get(symbol=symbol) if isinstance(symbol, str) else symbol
-        bars = candles or self.get_candles(symbol_obj, execution_mode)
-
+    def score(self, bars, symbol=None) -> StrategyDecision | None:
         if len(bars) < self.volume_window + 5:
             return None
 
@@ -72,8 +67,9 @@ class VolumeSpikeStrategy(EntryStrategy):
 
         # Scenario 2: Volume spike + breakout of recent range
         elif not signal_type:
-            high_range = max(bar.high for bar in bars[-10:-1])  # ⬆️ Más flexible (era [-6:-2])
-            low_range = min(bar.low for bar in bars[-10:-1])
+            features = self.features(bars)
+            high_range = features.range_high(9, skip=1)  # bars[-10:-1] ⬆️ Más flexible (era [-6:-2])
+            low_range = features.range_low(9, skip=1)
 
             if current_price > high_range:
                 signal_type = SignalType.BUY
@@ -176,36 +172,11 @@ class VolumeSpikeStrategy(EntryStrategy):
         if confidence < min_confidence:
             return None
 
-        # Evitar duplicados
-        timeframe_minutes = int(self.timeframe.replace("m", "")) if "m" in self.timeframe else 60
-        recent_cutoff = now() - timedelta(minutes=timeframe_minutes)
-        recent_signal = Signal.objects.filter(
-            symbol=symbol_obj,
-            signal=signal_type,
-            source="volume_spike",
-            strategy=self.strategy_instance,
-            received_at__gte=recent_cutoff
-        ).exists()
-
-        if recent_signal:
-            return None
-
         # Crear señal
-        s = Signal(
-            symbol=symbol_obj,
-            signal=signal_type,
-            price=current_price,
-            confidence_score=confidence,
-            source="volume_spike",
-            strategy=self.strategy_instance,
-            timeframe=self.timeframe
-        )
-        s.timestamp = getattr(current_bar, "timestamp", getattr(current_bar, "start_time", None))
-        s.received_at = s.timestamp
-
-        from monitoring.utils import log_event
-        async_to_sync(log_event)(
-            f"✅ VOLUME SPIKE: {signal_type} for {symbol_obj.symbol} | Vol Ratio: {volume_ratio:.1f}x | Price Move: {price_momentum:.1%} | Confidence: {confidence}",
+        s = self.decision(signal_type, confidence, price=current_price, bar=current_bar, source="volume_spike")
+
+        self.note(
+            f"✅ VOLUME SPIKE: {signal_type} for {symbol} | Vol Ratio: {volume_ratio:.1f}x | Price Move: {price_momentum:.1%} | Confidence: {confidence}",
             source='strategies', level='INFO')
         return s
 
@@ -1,3 +1,75 @@
-from django.test import TestCase
+from datetime import datetime, timezone
+from types import SimpleNamespace
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase
+
+from backtesting.strategies.adapter import check_vectorized_parity
+from core.utils.time import TIMEFRAME_MINUTES, to_epoch_ns
+from strategies.base.bar_window import BarWindow
+from strategies.indicators.benchmarks import synthetic_bars
+from strategies.indicators.registry import compute_indicators
+from strategies.strategies.DonchianChannelBreakoutStrategy import DonchianChannelBreakoutStrategy
+from strategies.strategies.bollinger_strategy import BollingerBandBreakoutStrategy
+from strategies.strategies.cci_strategy import CCIExtremeStrategy
+from strategies.strategies.macd_strategy import MACDCrossoverStrategy
+from strategies.strategies.moving_average import MovingAverageCrossStrategy
+from strategies.strategies.rsi_strategy import RSIBreakoutStrategy
+
+
+def _strategy_instance(name, timeframe="5m", required_bars=50):
+    """OpenStrategy en memoria (sin DB), como en check_vectorized_signals."""
+    return SimpleNamespace(id=None, name=name, timeframe=timeframe, required_bars=required_bars,
+                           confidence_threshold=50)
+
+
+def _synthetic_window(strategy, n=3000, seed=0, shifted=()) -> BarWindow:
+    """`shifted`: indicadores corridos una vela (valor de la vela anterior)."""
+    df = compute_indicators(synthetic_bars(n, seed), strategy.REQUIRED_INDICATORS)
+    for name in shifted:
+        df[name] = df[name].shift(1)
+    step = TIMEFRAME_MINUTES[strategy.timeframe] * 60 * 10**9
+    df["time"] = to_epoch_ns(datetime(2024, 1, 1, tzinfo=timezone.utc)) + np.arange(len(df), dtype=np.int64) * step
+    return BarWindow(df, indicators=[c for c in strategy.REQUIRED_INDICATORS if c in df.columns])
+
+
+class VectorizedSignalParityTests(SimpleTestCase):
+    """generate_signals_vectorized() emite las mismas señales que evaluate() vela a vela."""
+
+    def assert_parity(self, strategy, seeds=(0, 1), shifted=()):
+        for seed in seeds:
+            with self.subTest(strategy=strategy.name, seed=seed):
+                window = _synthetic_window(strategy, seed=seed, shifted=shifted)
+                self.assertTrue(strategy.generate_signals_vectorized(window).direction.any())
+                result = check_vectorized_parity(strategy, window)
+                self.assertEqual(result.mismatches, [])
+
+    def test_rsi_breakout(self):
+        strategy = RSIBreakoutStrategy(strategy_instance=_strategy_instance(RSIBreakoutStrategy.name))
+        self.assert_parity(strategy)
+
+    def test_bollinger_modes(self):
+        for mode in ("smart", "reversal", "breakout"):
+            strategy = BollingerBandBreakoutStrategy(
+                strategy_instance=_strategy_instance(BollingerBandBreakoutStrategy.name), mode=mode
+            )
+            self.assert_parity(strategy)
+
+    def test_moving_average_cross(self):
+        strategy = MovingAverageCrossStrategy(strategy_instance=_strategy_instance(MovingAverageCrossStrategy.name))
+        self.assert_parity(strategy)
+
+    def test_macd_crossover(self):
+        strategy = MACDCrossoverStrategy(strategy_instance=_strategy_instance(MACDCrossoverStrategy.name))
+        self.assert_parity(strategy)
+
+    def test_cci_extreme(self):
+        strategy = CCIExtremeStrategy(strategy_instance=_strategy_instance(CCIExtremeStrategy.name))
+        self.assert_parity(strategy)
+
+    def test_donchian_breakout(self):
+        strategy = DonchianChannelBreakoutStrategy(
+            strategy_instance=_strategy_instance(DonchianChannelBreakoutStrategy.name)
+        )
+        # Con el canal de la vela actual el cierre nunca lo rompe: se usa el de las 20 anteriores
+        self.assert_parity(strategy, shifted=("donchian_upper", "donchian_lower"))
@@ -5,6 +5,7 @@ from django.db import close_old_connections
 from asgiref.sync import sync_to_async
 from core.models.symbol import Symbol
 from streaming.websocket.dispatcher import dispatch_bar_message
+from monitoring.metrics import pipeline_metrics
 
 # 🔐 Claves Alpaca (usa las reales con precaución)
 API_KEY = "PKALPV6774BZYC8TQ29Q"
@@ -21,6 +22,8 @@ CRYPTO_TICKERS = ["BTC/USD", "ETH/USD", "SOL/USD", "USDT/USD", "DOGE/USD", "LTC/
 # Buffers
 bar_queue = asyncio.Queue()
 trade_queue = asyncio.Queue()
+pipeline_metrics.register_queue("alpaca_bars", bar_queue.qsize)
+pipeline_metrics.register_queue("alpaca_trades", trade_queue.qsize)
 
 # 🌐 Conectores
 async def connect_to_alpaca_stock():
@@ -0,0 +1,213 @@
+# streaming/indicators/persister.py
+
+"""
+Persistencia incremental de indicadores live (LiveTechnicalIndicator).
+
+- Por (símbolo, timeframe) se mantiene en memoria una ventana caliente de
+  WARMUP_BARS velas (suficiente para sma_200 / ema_200) y los valores ya
+  persistidos de esas velas.
+- En cada vela nueva solo se leen de la DB las velas posteriores a la
+  ventana, se recalcula sobre la ventana y se escriben únicamente las filas
+  que cambiaron: la(s) vela(s) nueva(s) y las columnas que miran hacia
+  adelante (ichimoku_chikou se completa 26 velas después).
+- Solo se calculan los indicadores que leen las estrategias activas
+  (registry.active_indicator_columns), salvo que se pasen `columns` explícitas.
+- update_many() calcula todos los símbolos de un boundary juntos en 2D
+  (strategies/indicators/batched.py).
+- Todo se escribe con un único bulk upsert.
+- Se lleva la métrica de escrituras por vela nueva contra WRITE_BUDGET_PER_BAR.
+"""
+
+import threading
+from contextlib import ExitStack
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from django.utils.timezone import now
+
+from core.models import MarketDataPoint
+from core.models.livetechnicalindicator import LiveTechnicalIndicator
+from monitoring.profiler import measure
+from monitoring.metrics import pipeline_metrics
+from monitoring.tracing import tracer
+from strategies.indicators.batched import compute_indicators_batched
+from strategies.indicators.registry import compute_indicators, active_indicator_columns
+
+WARMUP_BARS = 250  # sma_200 / ema_200 + margen
+WRITE_BUDGET_PER_BAR = 2  # la vela nueva + la vela cuyo chikou se completa
+MIN_BARS = 15
+
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+INDICATOR_FIELDS = [
+    f.name for f in LiveTechnicalIndicator._meta.fields
+    if f.name not in ("id", "market_data", "created_at")
+]
+# Columnas que dependen de velas futuras: {columna: velas hacia adelante}
+REVISABLE_COLUMNS = {"ichimoku_chikou": 26}
+REVISION_WINDOW = max(REVISABLE_COLUMNS.values()) + 1
+
+
+def _value(x):
+    if x is None:
+        return None
+    x = float(x)
+    return None if np.isnan(x) else x
+
+
+def _same(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return bool(np.isclose(a, b, rtol=1e-9, atol=1e-12))
+
+
+class IndicatorPersister:
+    """Un estado caliente por (símbolo, timeframe); seguro para llamarse desde varios hilos."""
+
+    def __init__(self, warmup_bars=WARMUP_BARS, write_budget=WRITE_BUDGET_PER_BAR, columns=None):
+        self.warmup_bars = warmup_bars
+        self.columns = columns
+        self.write_budget = write_budget
+        self._states = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.metrics = {"updates": 0, "new_bars": 0, "written": 0, "over_budget": 0}
+
+    def _state_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load_state(self, symbol, tf_str):
+        """Carga inicial: últimas warmup_bars velas + sus indicadores ya guardados (2 queries)."""
+        rows = list(
+            MarketDataPoint.objects.filter(symbol=symbol, timeframe=tf_str)
+            .order_by("-start_time")
+            .values_list("id", "start_time", *OHLCV_FIELDS)[:self.warmup_bars]
+        )[::-1]
+        bars = pd.DataFrame(rows, columns=["id", "timestamp", *OHLCV_FIELDS])
+
+        persisted = {
+            r.pop("market_data_id"): {k: _value(v) for k, v in r.items()}
+            for r in LiveTechnicalIndicator.objects.filter(
+                market_data_id__in=bars["id"].tolist()
+            ).values("market_data_id", *INDICATOR_FIELDS)
+        }
+        return SimpleNamespace(bars=bars, persisted=persisted)
+
+    def _append_new_bars(self, state, symbol, tf_str):
+        """Agrega a la ventana las velas posteriores a la última conocida y recorta a warmup_bars."""
+        qs = MarketDataPoint.objects.filter(symbol=symbol, timeframe=tf_str)
+        if not state.bars.empty:
+            qs = qs.filter(start_time__gt=state.bars["timestamp"].iloc[-1])
+        rows = list(qs.order_by("start_time").values_list("id", "start_time", *OHLCV_FIELDS))
+        if rows:
+            new = pd.DataFrame(rows, columns=["id", "timestamp", *OHLCV_FIELDS])
+            state.bars = pd.concat([state.bars, new], ignore_index=True).iloc[-self.warmup_bars:].reset_index(drop=True)
+            live_ids = set(state.bars["id"].tolist())
+            state.persisted = {i: v for i, v in state.persisted.items() if i in live_ids}
+
+    def _pending_rows(self, state, df, columns) -> list:
+        """Filas (id, valores) a escribir: velas sin indicadores + revisiones de columnas forward-looking."""
+        ids = state.bars["id"].tolist()
+        records = df[columns].to_dict(orient="records")
+        revision_from = len(ids) - REVISION_WINDOW
+        pending = []
+
+        for pos, (bar_id, row) in enumerate(zip(ids, records)):
+            values = {k: _value(v) for k, v in row.items()}
+            stored = state.persisted.get(bar_id)
+            if stored is None:
+                pending.append((bar_id, values))
+            elif pos >= revision_from:
+                changed = [c for c in REVISABLE_COLUMNS if c in values and not _same(stored.get(c), values[c])]
+                if changed:
+                    pending.append((bar_id, {**{c: stored.get(c) for c in columns}, **{c: values[c] for c in changed}}))
+        return pending
+
+    def _refresh(self, symbol, tf_str):
+        key = (symbol.id, tf_str)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = self._load_state(symbol, tf_str)
+        else:
+            self._append_new_bars(state, symbol, tf_str)
+        return state
+
+    def update(self, symbol, tf_str) -> dict:
+        """Sincroniza los indicadores de (symbol, tf_str) con las velas guardadas. Devuelve stats."""
+        return self.update_many([symbol], tf_str, batched=False)[symbol.id]
+
+    def update_many(self, symbols, tf_str, batched=True) -> dict:
+        """
+        Igual que update() para varios símbolos del mismo timeframe: con batched=True
+        los indicadores se calculan en una pasada 2D (símbolo × tiempo) y todas las
+        filas pendientes van en un único bulk upsert. Devuelve {symbol_id: stats}.
+        """
+        stats = {symbol.id: {"new_bars": 0, "written": 0} for symbol in symbols}
+        label = symbols[0] if len(symbols) == 1 else None  # batch de varios símbolos: sin símbolo
+        started_at = now()
+        with measure("indicators", symbol=label, timeframe=tf_str), ExitStack() as stack:
+            for key in sorted((symbol.id, tf_str) for symbol in symbols):
+                stack.enter_context(self._state_lock(key))
+
+            states = {symbol.id: self._refresh(symbol, tf_str) for symbol in symbols}
+            wanted = [c for c in (self.columns or active_indicator_columns()) if c in INDICATOR_FIELDS]
+            frames = {
+                symbol_id: state.bars.drop(columns="id")
+                for symbol_id, state in states.items() if len(state.bars) >= MIN_BARS
+            }
+            if not frames or not wanted:
+                return stats
+
+            if batched:
+                computed = compute_indicators_batched(frames, wanted, context_label=tf_str)
+            else:
+                computed = {
+                    symbol_id: compute_indicators(frame, wanted, context_label=f"{symbol_id} {tf_str}")
+                    for symbol_id, frame in frames.items()
+                }
+
+            all_pending = []
+            columns = None
+            for symbol_id, df in computed.items():
+                state = states[symbol_id]
+                columns = [c for c in INDICATOR_FIELDS if c in df.columns]
+                pending = self._pending_rows(state, df, columns)
+                stats[symbol_id] = {
+                    "new_bars": sum(1 for bar_id, _ in pending if bar_id not in state.persisted),
+                    "written": len(pending),
+                }
+                all_pending.append((state, pending))
+
+            rows = [row for _, pending in all_pending for row in pending]
+            if rows:
+                LiveTechnicalIndicator.objects.bulk_create(
+                    [LiveTechnicalIndicator(market_data_id=bar_id, **values) for bar_id, values in rows],
+                    update_conflicts=True,
+                    unique_fields=["market_data"],
+                    update_fields=columns,
+                )
+                for state, pending in all_pending:
+                    state.persisted.update(pending)
+
+        for symbol in symbols:
+            self._record(symbol, tf_str, stats[symbol.id])
+            pipeline_metrics.mark(symbol, "indicators")
+            tracer.add_span("indicators", symbol, started_at, timeframe=tf_str, batch=len(symbols),
+                            written=stats[symbol.id]["written"])
+        return stats
+
+    def _record(self, symbol, tf_str, stats):
+        over = stats["written"] > self.write_budget * max(stats["new_bars"], 1)
+        with self._lock:
+            self.metrics["updates"] += 1
+            self.metrics["new_bars"] += stats["new_bars"]
+            self.metrics["written"] += stats["written"]
+            self.metrics["over_budget"] += int(over)
+        if over:
+            print(f"⚠️ Indicadores {symbol.symbol} [{tf_str}]: {stats['written']} escrituras para "
+                  f"{stats['new_bars']} vela(s) nueva(s) (presupuesto {self.write_budget}/vela)")
+
+    def writes_per_bar(self) -> float:
+        with self._lock:
+            return self.metrics["written"] / self.metrics["new_bars"] if self.metrics["new_bars"] else 0.0
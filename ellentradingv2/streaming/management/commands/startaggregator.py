@@ -1,9 +1,11 @@
+import asyncio
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from django.core.management.base import BaseCommand
-from django.utils.timezone import make_aware, is_aware
+from django.db import close_old_connections
+from django.db.models import Max
 
 from alpaca.data.historical import CryptoHistoricalDataClient
 from alpaca.data.requests import CryptoBarsRequest
@@ -12,11 +14,16 @@ from django.utils.timezone import now as dj_now
 
 
 from core.models import Symbol, MarketDataPoint
-from core.models.livetechnicalindicator import LiveTechnicalIndicator
-from backtesting.indicators import calculate_all_indicators
+from streaming.indicators.persister import IndicatorPersister
 from strategies.strategies.runner import run_entry_strategies
+from strategies.strategies.evaluation_executor import StrategyEvaluationExecutor, DEFAULT_MAX_WORKERS
+from signals.recent_index import recent_signals
+from monitoring.profiler import measure, maybe_publish_profile
+from monitoring.metrics import pipeline_metrics, maybe_publish_metrics
+from monitoring.tracing import tracer, maybe_flush_traces
 
 crypto_client = CryptoHistoricalDataClient()
+indicator_persister = IndicatorPersister()
 
 TIMEFRAMES = {
     "5m": (TimeFrame(5, TimeFrameUnit.Minute), 5),
@@ -38,203 +45,289 @@ ENABLED_SYMBOLS = [
     "USDT/USD",
 ]
 
+# Segundos de espera después del cierre de la vela para que Alpaca la publique
+CLOSE_GRACE_SECONDS = 2
+# Reintentos (segundos) si alguna vela cerrada todavía no vino en la respuesta
+RETRY_DELAYS = (3, 5, 10)
+INITIAL_HOURS = 48
+BACKFILL_BARS = 50
+
 def is_crypto(symbol_str):
     return symbol_str.upper().endswith("/USD")
 
-last_call = {}  # {(symbol, timeframe): datetime}
+
+def next_boundary(now: datetime, tf_minutes: int) -> datetime:
+    """Próximo cierre de vela del timeframe (alineado a epoch, UTC)."""
+    step = tf_minutes * 60
+    return datetime.fromtimestamp((int(now.timestamp()) // step + 1) * step, tz=timezone.utc)
+
+
+def load_symbol_map(stderr=None) -> dict:
+    """{"BTC/USD": Symbol} con una sola query; se cachea para toda la vida del proceso."""
+    by_code = {s.symbol: s for s in Symbol.objects.filter(symbol__in=[s.replace("/", "") for s in ENABLED_SYMBOLS])}
+    symbol_map = {}
+    for symbol_str in ENABLED_SYMBOLS:
+        symbol = by_code.get(symbol_str.replace("/", ""))
+        if symbol is None:
+            if stderr:
+                stderr.write(f"⚠️ Symbol '{symbol_str.replace('/', '')}' no existe en la base de datos.")
+            continue
+        symbol_map[symbol_str] = symbol
+    return symbol_map
+
+
+def last_bar_times(symbol_map: dict, tf_str: str) -> dict:
+    """{symbol_id: start_time de la última vela} de todos los símbolos en una sola query."""
+    return dict(
+        MarketDataPoint.objects.filter(
+            symbol__in=list(symbol_map.values()),
+            timeframe=tf_str
+        ).values("symbol_id").annotate(last=Max("start_time")).values_list("symbol_id", "last")
+    )
+
+
+def fetch_bars(symbols: list, tf_obj, start: datetime, end: datetime) -> pd.DataFrame:
+    """Un único CryptoBarsRequest multi-símbolo; devuelve el frame plano (symbol, timestamp, ...)."""
+    req = CryptoBarsRequest(
+        symbol_or_symbols=symbols,
+        start=start,
+        end=end,
+        timeframe=tf_obj
+    )
+    df = crypto_client.get_crypto_bars(req).df
+    if df.empty:
+        return df
+    return df.reset_index()
+
+
+def upsert_bars(df: pd.DataFrame, symbol_map: dict, tf_str: str, tf_minutes: int, source: str, closed_before: datetime) -> dict:
+    """
+    Bulk upsert de las velas ya cerradas (start + tf <= closed_before) del frame.
+    Devuelve {symbol_str: [start_time de velas nuevas]}.
+    """
+    if df.empty:
+        return {}
+
+    bar_duration = timedelta(minutes=tf_minutes)
+    rows = []
+    for r in df.to_dict("records"):
+        symbol = symbol_map.get(r["symbol"])
+        ts = r["timestamp"].to_pydatetime()
+        if symbol is None or ts + bar_duration > closed_before:
+            continue  # símbolo no habilitado o vela todavía abierta
+        rows.append((r["symbol"], symbol, ts, r))
+
+    if not rows:
+        return {}
+
+    existing = set(
+        MarketDataPoint.objects.filter(
+            symbol__in=list(symbol_map.values()),
+            timeframe=tf_str,
+            start_time__gte=min(ts for _, _, ts, _ in rows)
+        ).values_list("symbol_id", "start_time")
+    )
+
+    MarketDataPoint.objects.bulk_create(
+        [
+            MarketDataPoint(
+                symbol=symbol,
+                timeframe=tf_str,
+                start_time=ts,
+                end_time=ts + bar_duration,
+                open=r["open"],
+                high=r["high"],
+                low=r["low"],
+                close=r["close"],
+                volume=r["volume"],
+                normalized_volume=r["volume"],
+                vwap=r.get("vwap"),
+                trade_count=r.get("trade_count"),
+                exchange=r.get("exchange"),
+                is_closed=True,
+                source=source
+            )
+            for _, symbol, ts, r in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["symbol", "timeframe", "start_time"],
+        update_fields=["open", "high", "low", "close", "volume", "normalized_volume",
+                       "vwap", "trade_count", "exchange", "end_time", "is_closed", "source"],
+    )
+
+    new_bars = {}
+    for symbol_str, symbol, ts, _ in rows:
+        if (symbol.id, ts) not in existing:
+            new_bars.setdefault(symbol_str, []).append(ts)
+    return new_bars
+
 
 class Command(BaseCommand):
     help = "Inicia el agregador de velas cripto (5m / 15m / 1h) desde Alpaca."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--strategy-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                            help="Procesos para evaluar estrategias (0 = en hilos del proceso principal)")
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("📡 Iniciando agregador de velas cripto (5m / 15m / 1h)..."))
-        self._load_initial_candles()
+        symbol_map = load_symbol_map(self.stderr)
+        if not symbol_map:
+            self.stderr.write("❌ Ningún símbolo habilitado existe en la base de datos.")
+            return
 
+        self._load_initial_candles(symbol_map)
+        loaded = recent_signals.load()
+        self.stdout.write(f"🧠 Índice de señales recientes cargado ({loaded} claves)")
+
+        # Pool de evaluación levantado antes del event loop (workers tibios desde el primer cierre)
+        self.executor = None
+        # Cola serial para run_entry_strategies (sin pool): estrategias, riesgo y ejecución
+        # no corren en paralelo entre símbolos ni entre los loops de 5m / 15m / 1h
+        self.strategy_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="strategies")
+        if options["strategy_workers"] > 0:
+            self.executor = StrategyEvaluationExecutor(options["strategy_workers"]).start()
+            self.stdout.write(f"⚙️ Pool de evaluación de estrategias: {options['strategy_workers']} procesos")
+        try:
+            asyncio.run(self._run(symbol_map))
+        finally:
+            if self.executor:
+                self.executor.shutdown()
+            self.strategy_queue.shutdown(cancel_futures=True)
+
+    async def _run(self, symbol_map):
+        await asyncio.gather(*(self._timeframe_loop(tf_str, symbol_map) for tf_str in TIMEFRAMES))
+
+    async def _timeframe_loop(self, tf_str, symbol_map):
+        """Duerme hasta cada cierre de vela del timeframe y sincroniza todos los símbolos."""
+        _, tf_minutes = TIMEFRAMES[tf_str]
         while True:
-            now = dj_now()
-
-            for symbol_str in ENABLED_SYMBOLS:
-                symbol_code = symbol_str.replace("/", "")
-                try:
-                    symbol = Symbol.objects.get(symbol=symbol_code)
-                except Symbol.DoesNotExist:
-                    self.stderr.write(f"⚠️ Symbol '{symbol_code}' no existe en la base de datos.")
-                    continue
-
-                for tf_str, (tf_obj, tf_minutes) in TIMEFRAMES.items():
-                    key = (symbol.symbol, tf_str)
-
-                    # Verifica si ya se actualizó recientemente
-                    if key in last_call and (now - last_call[key] < timedelta(minutes=tf_minutes)):
-                        continue
-
-                    try:
-                        # Obtiene la última vela guardada
-                        last_bar = MarketDataPoint.objects.filter(
-                            symbol=symbol,
-                            timeframe=tf_str
-                        ).order_by("-start_time").first()
-
-                        if last_bar:
-                            start_time = last_bar.start_time + timedelta(minutes=tf_minutes)
-                        else:
-                            start_time = now - timedelta(minutes=tf_minutes * 50)  # carga inicial
-
-                        end_time = datetime.utcnow()
-
-                        # Asegura que ambos timestamps tengan timezone
-                        if not is_aware(start_time):
-                            start_time = make_aware(start_time)
-                        if not is_aware(end_time):
-                            end_time = make_aware(end_time)
-
-                        if start_time >= end_time:
-                            continue  # ⛔ evita rangos inválidos
-
-                        req = CryptoBarsRequest(
-                            symbol_or_symbols=symbol_str,
-                            start=start_time,
-                            end=end_time,
-                            timeframe=tf_obj
-                        )
-
-                        df = crypto_client.get_crypto_bars(req).df
-                        df = df[df.index.get_level_values(0) == symbol_str]
-                        df = df.reset_index()
-
-                        for _, row in df.iterrows():
-                            ts = row["timestamp"].to_pydatetime()
-                            if not is_aware(ts):
-                                ts = make_aware(ts)
-
-                            obj, created = MarketDataPoint.objects.update_or_create(
-                                symbol=symbol,
-                                timeframe=tf_str,
-                                start_time=ts,
-                                defaults={
-                                    "open": row.open,
-                                    "high": row.high,
-                                    "low": row.low,
-                                    "close": row.close,
-                                    "volume": row.volume,
-                                    "normalized_volume": row.volume,
-                                    "vwap": getattr(row, "vwap", None),
-                                    "trade_count": getattr(row, "trade_count", None),
-                                    "exchange": getattr(row, "exchange", None),
-                                    "end_time": ts + timedelta(minutes=tf_minutes),
-                                    "is_closed": True,
-                                    "source": "historical_live"
-                                }
-                            )
-
-                            if created:
-                                self.stdout.write(f"🆕 Vela nueva {symbol.symbol} [{tf_str}] @ {ts}")
-                                self._calculate_indicators(symbol, tf_str)
-                                run_entry_strategies(symbol)
-
-                        last_call[key] = dj_now()
-
-
-                    except Exception as e:
-                        self.stderr.write(f"❌ Error {symbol.symbol} [{tf_str}]: {e}")
-
-            time.sleep(60)
-
-    def _load_initial_candles(self):
+            boundary = next_boundary(dj_now(), tf_minutes)
+            await asyncio.sleep(max(0.0, (boundary - dj_now()).total_seconds()) + CLOSE_GRACE_SECONDS)
+            try:
+                await self._poll_timeframe(tf_str, symbol_map, boundary)
+            except Exception as e:
+                self.stderr.write(f"❌ Error [{tf_str}] @ {boundary}: {e}")
+
+    async def _poll_timeframe(self, tf_str, symbol_map, boundary):
+        _, tf_minutes = TIMEFRAMES[tf_str]
+        expected = boundary - timedelta(minutes=tf_minutes)
+
+        for delay in (0, *RETRY_DELAYS):
+            if delay:
+                await asyncio.sleep(delay)
+
+            new_bars, missing = await asyncio.to_thread(self._sync_timeframe, tf_str, symbol_map, boundary, expected)
+            for symbol_str, times in new_bars.items():
+                self.stdout.write(f"🆕 {len(times)} vela(s) nueva(s) {symbol_str} [{tf_str}] → {max(times)}")
+
+            # Indicadores de todos los símbolos con velas nuevas en una pasada 2D, después
+            # las estrategias: evaluación en paralelo en el pool (persistencia y riesgo
+            # serializados en persist_signal) o, sin pool, de a un símbolo en la cola serial
+            symbols = [symbol_map[symbol_str] for symbol_str in new_bars]
+            if symbols:
+                await asyncio.to_thread(self._calculate_indicators, symbols, tf_str)
+                if self.executor:
+                    await self.executor.run(symbols)
+                else:
+                    loop = asyncio.get_running_loop()
+                    for symbol in symbols:
+                        await loop.run_in_executor(self.strategy_queue, self._run_strategies, symbol, tf_str)
+                await asyncio.to_thread(self._publish_monitoring)
+
+            if not missing:
+                return
+
+        self.stderr.write(f"⚠️ [{tf_str}] sin vela {expected} para: {', '.join(missing)}")
+
+    def _sync_timeframe(self, tf_str, symbol_map, boundary, expected):
+        """Corre en un hilo: una query de últimas velas, un request multi-símbolo y un bulk upsert."""
+        close_old_connections()
+        tf_obj, tf_minutes = TIMEFRAMES[tf_str]
+        step = timedelta(minutes=tf_minutes)
+
+        last = last_bar_times(symbol_map, tf_str)
+        starts = [
+            last[s.id] + step if s.id in last else boundary - step * BACKFILL_BARS
+            for s in symbol_map.values()
+        ]
+        start_time = min(starts)
+        if start_time >= boundary:
+            return {}, []
+
+        with measure("fetch", timeframe=tf_str):
+            df = fetch_bars(list(symbol_map), tf_obj, start_time, boundary)
+            fetched_at = dj_now()
+            new_bars = upsert_bars(df, symbol_map, tf_str, tf_minutes, "historical_live", closed_before=boundary)
+
+        # Timeline y traza de la última vela nueva de cada símbolo (exchange = cierre de la vela)
+        for symbol_str, times in new_bars.items():
+            pipeline_metrics.bar_received(symbol_map[symbol_str], tf_str, max(times), at=fetched_at)
+            pipeline_metrics.mark(symbol_map[symbol_str], "saved")
+            tracer.start_trace(symbol_map[symbol_str], tf_str, max(times), started_at=fetched_at)
+
+        missing = []
+        for symbol_str, symbol in symbol_map.items():
+            latest = max([*new_bars.get(symbol_str, []), *([last[symbol.id]] if symbol.id in last else [])], default=None)
+            if latest is None or latest < expected:
+                missing.append(symbol_str)
+        return new_bars, missing
+
+    def _run_strategies(self, symbol, tf_str):
+        close_old_connections()
+        try:
+            run_entry_strategies(symbol)
+        except Exception as e:
+            self.stderr.write(f"❌ Error {symbol.symbol} [{tf_str}]: {e}")
+
+    def _publish_monitoring(self):
+        try:
+            maybe_publish_profile()
+            maybe_publish_metrics()
+            maybe_flush_traces()
+        except Exception as e:
+            self.stderr.write(f"⚠️ No se pudo publicar profile / métricas / trazas: {e}")
+
+    def _load_initial_candles(self, symbol_map):
         if os.path.exists("initial_candles.lock"):
             self.stdout.write("⏩ Velas históricas ya cargadas (lock file detectado).")
             return
 
-        self.stdout.write("🚀 Cargando velas históricas (últimas 48h)...")
-
+        self.stdout.write(f"🚀 Cargando velas históricas (últimas {INITIAL_HOURS}h)...")
 
         now = dj_now()
+        start = now - timedelta(hours=INITIAL_HOURS)
 
-        start = now - timedelta(hours=48)
-
-        for symbol_str in ENABLED_SYMBOLS:
-            symbol_code = symbol_str.replace("/", "")
+        for tf_str, (tf_obj, tf_minutes) in TIMEFRAMES.items():
             try:
-                symbol = Symbol.objects.get(symbol=symbol_code)
-            except Symbol.DoesNotExist:
-                self.stderr.write(f"⚠️ Symbol '{symbol_code}' no existe en la base de datos.")
+                df = fetch_bars(list(symbol_map), tf_obj, start, now)
+                new_bars = upsert_bars(df, symbol_map, tf_str, tf_minutes, "historical_api", closed_before=now)
+                self.stdout.write(
+                    f"✅ [{tf_str}] {len(df)} velas cargadas ({sum(len(t) for t in new_bars.values())} nuevas)."
+                )
+            except Exception as e:
+                self.stderr.write(f"❌ Error inicial [{tf_str}]: {e}")
                 continue
 
-            for tf_str, (tf_obj, _) in TIMEFRAMES.items():
-                try:
-                    req = CryptoBarsRequest(
-                        symbol_or_symbols=symbol_str,
-                        start=start,
-                        end=now,
-                        timeframe=tf_obj
-                    )
-                    df = crypto_client.get_crypto_bars(req).df
-                    df = df[df.index.get_level_values(0) == symbol_str]
-                    df = df.reset_index()
-
-                    for _, row in df.iterrows():
-                        ts = row["timestamp"].to_pydatetime()
-                        if not is_aware(ts):
-                            ts = make_aware(ts)
-                        tf_minutes = {
-                            "5m": 5,
-                            "15m": 15,
-                            "1h": 60,
-                        }.get(tf_str, 5)
-                        MarketDataPoint.objects.update_or_create(
-                            symbol=symbol,
-                            timeframe=tf_str,
-                            start_time=ts,
-                            defaults={
-                                "open": row.open,
-                                "high": row.high,
-                                "low": row.low,
-                                "close": row.close,
-                                "volume": row.volume,
-                                "normalized_volume": row.volume,
-                                "vwap": getattr(row, "vwap", None),
-                                "trade_count": getattr(row, "trade_count", None),
-                                "exchange": getattr(row, "exchange", None),
-                                "end_time": ts + timedelta(minutes=tf_minutes),
-                                "is_closed": True,
-                                "source": "historical_api"
-                            }
-                        )
-
-                    self._calculate_indicators(symbol, tf_str)
-                    run_entry_strategies(symbol)
-                    self.stdout.write(f"✅ {symbol.symbol} [{tf_str}] cargado.")
-
-                except Exception as e:
-                    self.stderr.write(f"❌ Error inicial {symbol.symbol} [{tf_str}]: {e}")
+            self._calculate_indicators(list(symbol_map.values()), tf_str)
+            for symbol in symbol_map.values():
+                self._run_strategies(symbol, tf_str)
 
         with open("initial_candles.lock", "w") as f:
             f.write("done")
         self.stdout.write("✅ Carga inicial completada.\n")
 
-    def _calculate_indicators(self, symbol, tf_str):
-        latest = MarketDataPoint.objects.filter(
-            symbol=symbol,
-            timeframe=tf_str
-        ).order_by("-start_time")[:50]
-
-        bars = list(latest)[::-1]
-        df = pd.DataFrame([{
-            "timestamp": b.start_time,
-            "open": b.open,
-            "high": b.high,
-            "low": b.low,
-            "close": b.close,
-            "volume": b.volume,
-        } for b in bars])
-
-        df = calculate_all_indicators(df)
-        df = df.reset_index(drop=True)
-
-        for bar, row in zip(bars, df.to_dict(orient="records")):
-            allowed = {f.name for f in LiveTechnicalIndicator._meta.fields if f.name not in ["id", "market_data"]}
-            data = {k: row[k] for k in row if k in allowed}
-            LiveTechnicalIndicator.objects.update_or_create(
-                market_data=bar,
-                defaults=data
+    def _calculate_indicators(self, symbols, tf_str):
+        close_old_connections()
+        try:
+            stats = indicator_persister.update_many(symbols, tf_str)
+        except Exception as e:
+            self.stderr.write(f"❌ Error indicadores [{tf_str}]: {e}")
+            return
+
+        written = sum(s["written"] for s in stats.values())
+        if written:
+            self.stdout.write(
+                f"🧮 Indicadores [{tf_str}]: {written} fila(s) para {len(symbols)} símbolo(s) "
+                f"({indicator_persister.writes_per_bar():.2f} escrituras/vela acumulado)"
             )
@@ -3,12 +3,16 @@ from core.models.symbol import Symbol
 from core.models.livetechnicalindicator import LiveTechnicalIndicator
 from django.utils.timezone import make_aware, now
 from strategies.indicators.indicators import calculate_all_indicators
+from strategies.indicators.registry import active_indicator_columns
 from strategies.strategies.runner import run_entry_strategies
 from datetime import datetime, timedelta
 import pandas as pd
 from django.db import close_old_connections
 from math import ceil
 from monitoring.utils import log_event
+from monitoring.profiler import measure
+from monitoring.metrics import pipeline_metrics
+from monitoring.tracing import tracer
 from asgiref.sync import async_to_sync
 
 
@@ -21,6 +25,17 @@ def get_next_aligned_time(start, interval_minutes):
 def resample_symbol_full(symbol: Symbol, base_tf="1m", target_tf="15m", timestamp_cierre=None):
     close_old_connections()
 
+    with measure("resample", symbol=symbol, timeframe=target_tf), tracer.span("resample", symbol, timeframe=target_tf):
+        new_bars = _resample_bars(symbol, base_tf, target_tf, timestamp_cierre)
+    if new_bars is None:
+        return
+
+    run_entry_strategies(symbol, verbose=True)
+
+
+def _resample_bars(symbol: Symbol, base_tf, target_tf, timestamp_cierre):
+    """Crea las velas de target_tf desde base_tf y sus indicadores. None si no hubo nada que resamplear."""
+
     tf_minutes = {
         "5m": 5,
         "15m": 15,
@@ -97,6 +112,11 @@ def resample_symbol_full(symbol: Symbol, base_tf="1m", target_tf="15m", timestam
         ))
 
     MarketDataPoint.objects.bulk_create(new_bars)
+    pipeline_metrics.mark(symbol, "resampled")
+
+    # Solo los indicadores que leen las estrategias activas
+    indicator_columns = active_indicator_columns() if new_bars else None
+    indicators_started = now()
 
     for bar in new_bars:
         history = MarketDataPoint.objects.filter(
@@ -122,7 +142,7 @@ def resample_symbol_full(symbol: Symbol, base_tf="1m", target_tf="15m", timestam
             df_full.index = df_full.index.tz_localize("UTC")
 
         bar_time = bar.start_time.astimezone(df_full.index.tz)
-        df_full = calculate_all_indicators(df_full)
+        df_full = calculate_all_indicators(df_full, columns=indicator_columns)
 
         if bar_time in df_full.index:
             indicators_data = df_full.loc[bar_time].to_dict()
@@ -133,4 +153,6 @@ def resample_symbol_full(symbol: Symbol, base_tf="1m", target_tf="15m", timestam
             cleaned = {k: v for k, v in indicators_data.items() if k in valid_fields}
             LiveTechnicalIndicator.objects.update_or_create(market_data=bar, defaults=cleaned)
 
-    run_entry_strategies(symbol, verbose=True)
+    pipeline_metrics.mark(symbol, "indicators")
+    tracer.add_span("indicators", symbol, indicators_started, timeframe=target_tf, bars=len(new_bars))
+    return new_bars
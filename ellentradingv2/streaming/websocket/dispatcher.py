@@ -13,6 +13,9 @@ import asyncio
 import traceback
 from streaming.websocket.helpers import emit_live_prices
 from monitoring.utils import log_event
+from monitoring.metrics import pipeline_metrics, maybe_publish_metrics
+from monitoring.profiler import maybe_publish_profile
+from monitoring.tracing import tracer, maybe_flush_traces
 
 
 async def dispatch_bar_message(raw_msg: dict):
@@ -29,25 +32,36 @@ async def dispatch_bar_message(raw_msg: dict):
         except Symbol.DoesNotExist:
             await log_event(f"❌ Symbol '{symbol_str}' no existe en DB. Bar: {bar}", source="streaming", level="ERROR")
             return
-
-        # Guardar la vela de 1 minuto
-        mdp, created = await sync_to_async(save_market_datapoint)(symbol_obj, bar)
-        symbol_obj.live_price = bar["close"]
-        await sync_to_async(symbol_obj.save)(update_fields=["live_price"])
-
-        if created:
-            sema = asyncio.Semaphore(10)
-
-            async def limited_resample(symbol, tf, ts):
-                async with sema:
-                    await sync_to_async(resample_symbol_full)(symbol, base_tf="1m", target_tf=tf, timestamp_cierre=ts)
-
-            for tf, mins in {"5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240}.items():
-                if mdp.start_time.minute % mins == 0:
-                    asyncio.create_task(limited_resample(symbol_obj, tf, mdp.start_time))
-
-        await emit_market_data(symbol_obj, mdp)
-        await emit_live_prices()
+        # Traza de la vela: las tareas de resampleo copian el contexto y cuelgan de su span
+        with tracer.trace_bar(symbol_obj, "1m", bar["timestamp"]):
+            pipeline_metrics.bar_received(symbol_obj, "1m", bar["timestamp"])
+
+            # Guardar la vela de 1 minuto
+            mdp, created = await sync_to_async(save_market_datapoint)(symbol_obj, bar)
+            pipeline_metrics.mark(symbol_obj, "saved")
+            symbol_obj.live_price = bar["close"]
+            await sync_to_async(symbol_obj.save)(update_fields=["live_price"])
+
+            if created:
+                sema = asyncio.Semaphore(10)
+
+                async def limited_resample(symbol, tf, ts):
+                    try:
+                        async with sema:
+                            await sync_to_async(resample_symbol_full)(symbol, base_tf="1m", target_tf=tf, timestamp_cierre=ts)
+                    finally:
+                        pipeline_metrics.adjust_queue("resample", -1)
+
+                for tf, mins in {"5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240}.items():
+                    if mdp.start_time.minute % mins == 0:
+                        pipeline_metrics.adjust_queue("resample", 1)
+                        asyncio.create_task(limited_resample(symbol_obj, tf, mdp.start_time))
+
+            await emit_market_data(symbol_obj, mdp)
+            await emit_live_prices()
+        await sync_to_async(maybe_publish_profile)()
+        await sync_to_async(maybe_publish_metrics)()
+        await sync_to_async(maybe_flush_traces)()
 
     except Exception as e:
         await log_event(f"❌ Error en dispatcher: {e}", source="streaming", level="ERROR")